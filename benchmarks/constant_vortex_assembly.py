@@ -0,0 +1,104 @@
+# Copyright 2020 Kilian Swannet, San Kilkis
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied. See the License for the specific language governing
+# permissions and limitations under the License.
+
+"""Benchmarks the assembly of the constant vortex influence matrices.
+
+The reference assembly evaluates each panel pair with
+:py:func:`vortex_c_2d`, which allocates three arrays per pair for the
+coordinate transforms. This is compared against
+:py:func:`calc_constant_vortex_im`, which uses the allocation-free
+scalar kernel. Run with::
+
+    python benchmarks/constant_vortex_assembly.py --sizes 200 1000 5000
+"""
+
+import argparse
+import timeit
+
+import numba
+import numpy as np
+
+from gammapy.geometry.airfoil import NACA4Airfoil
+from gammapy.solver.base import BASE_NUMBA_CONFIG
+from gammapy.solver.m_constant_vortex import (
+    ConstantVortex,
+    calc_constant_vortex_im,
+    vortex_c_2d,
+)
+
+
+@numba.jit(parallel=True, **BASE_NUMBA_CONFIG)
+def reference_im(  # noqa: D103
+    start_pts: numba.float64[:, :],
+    end_pts: numba.float64[:, :],
+    col_pts: numba.float64[:, :],
+    panel_angles: numba.float64[:, :],
+    panel_normals: numba.float64[:, :],
+    panel_tangents: numba.float64[:, :],
+) -> numba.float64[:, :, :]:
+    """Assembles the influence matrices with :py:func:`vortex_c_2d`."""
+    n_panels, _ = start_pts.shape
+    influence_matrix = np.zeros((2, n_panels, n_panels), dtype=np.float64)
+    for i in numba.prange(n_panels):
+        for j in range(n_panels):
+            if i == j:
+                influence_matrix[:, i, j] = -0.5
+                continue
+            v_induced = vortex_c_2d(
+                -1, start_pts[j], end_pts[j], col_pts[i], panel_angles[j, 0]
+            )
+            influence_matrix[0, i, j] = v_induced @ panel_normals[i]
+            influence_matrix[1, i, j] = v_induced @ panel_tangents[i]
+    return influence_matrix
+
+
+def best_time(func, repeat: int) -> float:
+    """Returns the best wall time of ``repeat`` calls in SI second."""
+    return min(timeit.repeat(func, number=1, repeat=repeat))
+
+
+def main() -> None:
+    """Prints the assembly time of both kernels for each size."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[200, 1000, 5000]
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'N':>6} {'reference [s]':>14} {'scalar [s]':>11} {'speedup':>8}")
+    for n_panels in args.sizes:
+        method = ConstantVortex(NACA4Airfoil("2412"), n_panels=n_panels)
+        kernel_args = method.kernel_args
+        reference_args = dict(kernel_args, panel_angles=method.panels.angles)
+
+        # Compiling both kernels before timing
+        expected = reference_im(**reference_args)
+        result = calc_constant_vortex_im(**kernel_args)
+        assert np.allclose(result, expected)
+
+        t_reference = best_time(
+            lambda: reference_im(**reference_args), args.repeat
+        )
+        t_scalar = best_time(
+            lambda: calc_constant_vortex_im(**kernel_args), args.repeat
+        )
+        print(
+            f"{n_panels:>6} {t_reference:>14.4f} {t_scalar:>11.4f} "
+            f"{t_reference / t_scalar:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
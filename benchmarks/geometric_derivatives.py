@@ -0,0 +1,75 @@
+# Copyright 2020 Kilian Swannet, San Kilkis
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied. See the License for the specific language governing
+# permissions and limitations under the License.
+
+"""Benchmarks the geometric derivatives of the influence matrix.
+
+A one-sided finite difference of the system w.r.t. all node coordinates
+rebuilds the panels and assembles the influence matrix once per
+coordinate, i.e. 2 (N + 1) times. The cost of these assemblies is
+estimated from the wall time of a single assembly and compared with
+the derivative assembly of :py:meth:`PanelMethod.geometric_derivatives`
+including the right-hand-side. Run with::
+
+    python benchmarks/geometric_derivatives.py --n-panels 100 200 400
+"""
+
+import argparse
+import timeit
+
+from gammapy.geometry.airfoil import NACA4Airfoil
+from gammapy.solver.m_constant_vortex import ConstantVortex
+from gammapy.solver.m_linear_vortex import LinearVortex
+
+METHODS = (ConstantVortex, LinearVortex)
+
+
+def best_time(func, repeat: int) -> float:
+    """Returns the best wall time of ``repeat`` calls in SI second."""
+    return min(timeit.repeat(func, number=1, repeat=repeat))
+
+
+def main() -> None:
+    """Prints the derivative assembly time and the finite difference."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument(
+        "--n-panels", type=int, nargs="+", default=[100, 200, 400]
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    airfoil = NACA4Airfoil("2412")
+    print(
+        f"{'method':>14} {'N':>5} {'assembly [s]':>13} {'FD est. [s]':>12} "
+        f"{'derivs [s]':>11} {'speed-up':>9} {'nnz':>9}"
+    )
+    for method_cls in METHODS:
+        for n_panels in args.n_panels:
+            method = method_cls(airfoil, n_panels)
+            derivatives = method.geometric_derivatives()
+            assembly = best_time(
+                lambda: method_cls(airfoil, n_panels).influence_matrix,
+                args.repeat,
+            )
+            finite_difference = 2 * (n_panels + 1) * assembly
+            wall_time = best_time(method.geometric_derivatives, args.repeat)
+            print(
+                f"{method_cls.__name__:>14} {n_panels:>5} {assembly:>13.4f} "
+                f"{finite_difference:>12.3f} {wall_time:>11.4f} "
+                f"{finite_difference / wall_time:>9.1f} "
+                f"{derivatives['normal'].nnz:>9}"
+            )
+
+
+if __name__ == "__main__":
+    main()
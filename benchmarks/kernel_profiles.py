@@ -0,0 +1,100 @@
+# Copyright 2020 Kilian Swannet, San Kilkis
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied. See the License for the specific language governing
+# permissions and limitations under the License.
+
+"""Benchmarks the compilation profiles of the kernels.
+
+For each panel method and test airfoil the influence matrices are
+assembled with the "fast", "strict" and "checked" profiles. The
+accuracy report lists the largest deviation of the influence
+coefficients and of the lift coefficient from the "strict" profile,
+and whether repeated "strict" assemblies are bitwise identical. Run
+with::
+
+    python benchmarks/kernel_profiles.py --n-panels 2000
+"""
+
+import argparse
+import timeit
+
+import numpy as np
+
+from gammapy.geometry.airfoil import NACA4Airfoil
+from gammapy.jit import PROFILES
+from gammapy.solver.m_constant_vortex import ConstantVortex
+from gammapy.solver.m_linear_vortex import LinearVortex
+from gammapy.solver.m_lumped_vortex import LumpedVortex
+
+AIRFOILS = ("0012", "2412", "4412")
+METHODS = (LumpedVortex, ConstantVortex, LinearVortex)
+ALPHA = np.linspace(-5, 10, num=4)
+
+
+def best_time(func, repeat: int) -> float:
+    """Returns the best wall time of ``repeat`` calls in SI second."""
+    return min(timeit.repeat(func, number=1, repeat=repeat))
+
+
+def main() -> None:
+    """Prints the assembly time and accuracy of each profile."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--n-panels", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(
+        f"{'method':>14} {'airfoil':>8} {'profile':>8} {'time [s]':>9} "
+        f"{'max |dA|':>9} {'max |dCl|':>9} {'bitwise':>8}"
+    )
+    for method_cls in METHODS:
+        for naca_code in AIRFOILS:
+            methods = {
+                profile: method_cls(
+                    NACA4Airfoil(naca_code),
+                    n_panels=args.n_panels,
+                    profile=profile,
+                )
+                for profile in PROFILES
+            }
+            # Compiling all profiles before timing
+            matrices = {
+                profile: method.assemble(tangent=True)
+                for profile, method in methods.items()
+            }
+            lift = {
+                profile: method.solve_for(ALPHA).lift_coefficient
+                for profile, method in methods.items()
+            }
+            for profile, method in methods.items():
+                wall_time = best_time(
+                    lambda: method.assemble(tangent=True), args.repeat
+                )
+                error = max(
+                    np.abs(matrices[profile][k] - matrices["strict"][k]).max()
+                    for k in matrices[profile]
+                )
+                lift_error = np.abs(lift[profile] - lift["strict"]).max()
+                repeated = method.assemble(tangent=True)
+                bitwise = all(
+                    np.array_equal(repeated[k], matrices[profile][k])
+                    for k in repeated
+                )
+                print(
+                    f"{method_cls.__name__:>14} {naca_code:>8} {profile:>8} "
+                    f"{wall_time:>9.4f} {error:>9.1e} {lift_error:>9.1e} "
+                    f"{str(bitwise):>8}"
+                )
+
+
+if __name__ == "__main__":
+    main()
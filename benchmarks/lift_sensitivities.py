@@ -0,0 +1,78 @@
+# Copyright 2020 Kilian Swannet, San Kilkis
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied. See the License for the specific language governing
+# permissions and limitations under the License.
+
+"""Benchmarks the adjoint lift sensitivities.
+
+A central finite difference of the circulation lift w.r.t. all node
+coordinates assembles, factorizes and solves the system twice per
+coordinate, i.e. 4 (N + 1) times. The cost is estimated from the wall
+time of a single solution and compared with
+:py:meth:`FlowSolution.circulation_lift_sensitivities` of an already
+factorized system, which also yields the gradients w.r.t. the NACA
+parameters. Run with::
+
+    python benchmarks/lift_sensitivities.py --n-panels 100 200 400
+"""
+
+import argparse
+import timeit
+
+from gammapy.geometry.airfoil import NACA4Airfoil
+from gammapy.solver.m_linear_vortex import LinearVortex
+
+METHODS = (LinearVortex,)
+ALPHA = 5.0
+
+
+def best_time(func, repeat: int) -> float:
+    """Returns the best wall time of ``repeat`` calls in SI second."""
+    return min(timeit.repeat(func, number=1, repeat=repeat))
+
+
+def main() -> None:
+    """Prints the adjoint wall time and the finite difference."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument(
+        "--n-panels", type=int, nargs="+", default=[100, 200, 400]
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    airfoil = NACA4Airfoil("2412")
+    print(
+        f"{'method':>14} {'N':>5} {'solution [s]':>13} {'FD est. [s]':>12} "
+        f"{'adjoint [s]':>12} {'speed-up':>9}"
+    )
+    for method_cls in METHODS:
+        for n_panels in args.n_panels:
+            solution = method_cls(airfoil, n_panels).solve_for(ALPHA)
+            single = best_time(
+                lambda: method_cls(airfoil, n_panels)
+                .solve_for(ALPHA)
+                .circulation_lift_coefficient,
+                args.repeat,
+            )
+            finite_difference = 4 * (n_panels + 1) * single
+            wall_time = best_time(
+                solution.circulation_lift_sensitivities, args.repeat
+            )
+            print(
+                f"{method_cls.__name__:>14} {n_panels:>5} {single:>13.4f} "
+                f"{finite_difference:>12.3f} {wall_time:>12.4f} "
+                f"{finite_difference / wall_time:>9.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
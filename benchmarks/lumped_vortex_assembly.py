@@ -0,0 +1,117 @@
+# Copyright 2020 Kilian Swannet, San Kilkis
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied. See the License for the specific language governing
+# permissions and limitations under the License.
+
+"""Benchmarks the assembly of the lumped vortex influence matrix.
+
+The reference assembly evaluates each vortex pair with
+:py:func:`vortex_2d`, which allocates the separation vector and its
+rotation for every pair. This is compared against the closed-form
+scalar kernel :py:func:`calc_lumped_vortex_im`, the vectorized "numpy"
+backend, and the direct solve of the assembled system for a sweep of
+angles of attack. Run with::
+
+    python benchmarks/lumped_vortex_assembly.py --sizes 500 2000 5000
+"""
+
+import argparse
+import timeit
+
+import numba
+import numpy as np
+from scipy.linalg import lu_factor, lu_solve
+
+from gammapy.geometry.airfoil import NACA4Airfoil
+from gammapy.solver.base import BASE_NUMBA_CONFIG
+from gammapy.solver.m_lumped_vortex import (
+    LumpedVortex,
+    calc_lumped_vortex_im,
+    vortex_2d,
+)
+
+ALPHA = np.linspace(-5, 10, num=16)
+
+
+@numba.jit(parallel=True, **BASE_NUMBA_CONFIG)
+def reference_im(  # noqa: D103
+    vortex_pts: numba.float64[:, :],
+    col_pts: numba.float64[:, :],
+    panel_normals: numba.float64[:, :],
+) -> numba.float64[:, :]:
+    """Assembles the influence matrix with :py:func:`vortex_2d`."""
+    n_panels, _ = vortex_pts.shape
+    influence_matrix = np.zeros((n_panels, n_panels), dtype=np.float64)
+    for i in numba.prange(n_panels):
+        for j in range(n_panels):
+            influence_matrix[i, j] = (
+                vortex_2d(1, vortex_pts[j], col_pts[i]) @ panel_normals[i]
+            )
+    return influence_matrix
+
+
+def best_time(func, repeat: int) -> float:
+    """Returns the best wall time of ``repeat`` calls in SI second."""
+    return min(timeit.repeat(func, number=1, repeat=repeat))
+
+
+def main() -> None:
+    """Prints the assembly and solve time for each size."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[500, 2000, 5000]
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(
+        f"{'N':>6} {'reference [s]':>14} {'scalar [s]':>11} "
+        f"{'numpy [s]':>10} {'solve [s]':>10} {'max |dA|':>9}"
+    )
+    for n_panels in args.sizes:
+        method = LumpedVortex(NACA4Airfoil("2412"), n_panels=n_panels)
+        kernel_args = dict(
+            vortex_pts=method.collocation_points,
+            col_pts=method.panels.points_at(0.75),
+            panel_normals=method.panels.normals,
+        )
+        rhs = method.unit_rhs_vector @ method.get_flow_direction(ALPHA).T
+
+        # Compiling all kernels before timing
+        expected = reference_im(**kernel_args)
+        result = calc_lumped_vortex_im(**kernel_args)
+        error = np.max(np.abs(result - expected))
+        assert np.allclose(
+            method.assemble(backend="numpy")["normal"], expected
+        )
+
+        t_reference = best_time(
+            lambda: reference_im(**kernel_args), args.repeat
+        )
+        t_scalar = best_time(
+            lambda: calc_lumped_vortex_im(**kernel_args), args.repeat
+        )
+        t_numpy = best_time(
+            lambda: method.assemble(backend="numpy"), args.repeat
+        )
+        t_solve = best_time(
+            lambda: lu_solve(lu_factor(result, check_finite=False), rhs),
+            args.repeat,
+        )
+        print(
+            f"{n_panels:>6} {t_reference:>14.4f} {t_scalar:>11.4f} "
+            f"{t_numpy:>10.4f} {t_solve:>10.4f} {error:>9.1e}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+# Copyright 2020 Kilian Swannet, San Kilkis
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied. See the License for the specific language governing
+# permissions and limitations under the License.
+
+"""Benchmarks the process pool assembly against the numba threads.
+
+For each worker count the influence matrices are assembled by the
+"numba" backend, which distributes the rows with ``prange`` over the
+numba threads, and by the "process" backend, which distributes them
+over worker processes that write into shared memory. The start-up of
+the worker pool is reported separately and excluded from the timings.
+Run with::
+
+    python benchmarks/process_assembly.py --sizes 4000 --workers 1 4
+"""
+
+import argparse
+import time
+import timeit
+
+import numba
+import numpy as np
+
+from gammapy import config
+from gammapy.geometry.airfoil import NACA4Airfoil
+from gammapy.solver import backends
+from gammapy.solver.m_constant_vortex import ConstantVortex
+from gammapy.solver.m_linear_vortex import LinearVortex
+
+METHODS = (ConstantVortex, LinearVortex)
+
+
+def best_time(func, repeat: int) -> float:
+    """Returns the best wall time of ``repeat`` calls in SI second."""
+    return min(timeit.repeat(func, number=1, repeat=repeat))
+
+
+def main() -> None:
+    """Prints the assembly time of both backends for each size."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 4000])
+    parser.add_argument(
+        "--workers", type=int, nargs="+", default=[numba.get_num_threads()]
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(
+        f"{'method':>14} {'N':>6} {'workers':>8} {'prange [s]':>11} "
+        f"{'process [s]':>12} {'speedup':>8}"
+    )
+    for n_workers in args.workers:
+        with config.threads(numba_threads=n_workers):
+            start = time.perf_counter()
+            backends.process_pool(n_workers).submit(int).result()
+            startup = time.perf_counter() - start
+            for method_cls in METHODS:
+                for n_panels in args.sizes:
+                    method = method_cls(
+                        NACA4Airfoil("2412"), n_panels=n_panels
+                    )
+                    # Loading the kernels in the workers before timing
+                    expected = method.assemble(tangent=True)
+                    result = method.assemble(tangent=True, backend="process")
+                    for name in expected:
+                        assert np.array_equal(result[name], expected[name])
+
+                    t_prange = best_time(
+                        lambda: method.assemble(tangent=True), args.repeat
+                    )
+                    t_process = best_time(
+                        lambda: method.assemble(
+                            tangent=True, backend="process"
+                        ),
+                        args.repeat,
+                    )
+                    print(
+                        f"{method_cls.__name__:>14} {n_panels:>6} "
+                        f"{n_workers:>8} {t_prange:>11.4f} "
+                        f"{t_process:>12.4f} {t_prange / t_process:>7.2f}x"
+                    )
+        print(f"Start-up of {n_workers} workers: {startup:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+# Copyright 2020 Kilian Swannet, San Kilkis
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied. See the License for the specific language governing
+# permissions and limitations under the License.
+
+"""Benchmarks the convergence order of the quadratic vortex method.
+
+The lift coefficient of :py:class:`QuadraticVortex` and
+:py:class:`LinearVortex` follows from the total circulation at an
+increasing number of panels, for both the "cosine" and the "graded"
+spacing. The error is taken relative to a :py:class:`QuadraticVortex`
+solution with ``--reference-panels`` graded panels and the observed
+order is the base 2 logarithm of the ratio of successive errors. For
+each variant the smallest number of panels, and unknowns, that
+reaches the ``--target`` relative error is reported with the wall time
+of the assembly and solve at that size. Run with::
+
+    python benchmarks/quadratic_vortex_convergence.py --target 1e-6
+"""
+
+import argparse
+import math
+import timeit
+
+import numpy as np
+
+from gammapy.geometry.airfoil import NACA4Airfoil
+from gammapy.solver.m_linear_vortex import LinearVortex
+from gammapy.solver.m_quadratic_vortex import QuadraticVortex
+
+AIRFOILS = ("0012", "2412", "4415")
+VARIANTS = (
+    (QuadraticVortex, "graded"),
+    (QuadraticVortex, "cosine"),
+    (LinearVortex, "graded"),
+    (LinearVortex, "cosine"),
+)
+SIZES = (10, 20, 40, 80, 160, 320, 640)
+ALPHA = 5.0
+
+
+def circulation_lift(method, alpha: float) -> float:
+    """Returns the lift coefficient of the total circulation.
+
+    The strengths of :py:class:`LinearVortex` are normalized by 2 pi
+    and vary linearly along each panel.
+    """
+    solution = method.solve_for(alpha)
+    if isinstance(method, QuadraticVortex):
+        return float(np.ravel(solution.lift_coefficient)[0])
+    strengths = solution.circulations[:, 0]
+    lengths = method.panels.lengths[:, 0]
+    nodal = np.append(strengths, -strengths[0])
+    mean_strengths = 0.5 * (nodal[:-1] + nodal[1:])
+    return 2 * (2 * math.pi) * np.sum(mean_strengths * lengths)
+
+
+def solve_time(method, repeat: int) -> float:
+    """Returns the best wall time of the assembly and solve."""
+    method_cls, airfoil = type(method), method.airfoil
+    n_panels, spacing = method.n_panels, method.spacing
+    return min(
+        timeit.repeat(
+            lambda: method_cls(airfoil, n_panels, spacing).solve_for(ALPHA),
+            number=1,
+            repeat=repeat,
+        )
+    )
+
+
+def main() -> None:
+    """Prints the error and order of each variant and the size."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--target", type=float, default=1e-6)
+    parser.add_argument("--reference-panels", type=int, default=1280)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    names = [f"{m.__name__}/{spacing}" for m, spacing in VARIANTS]
+    for naca_code in AIRFOILS:
+        airfoil = NACA4Airfoil(naca_code, te_closed=True)
+        reference = circulation_lift(
+            QuadraticVortex(airfoil, args.reference_panels, "graded"), ALPHA
+        )
+        print(f"NACA {naca_code}, alpha = {ALPHA}, Cl_ref = {reference:.8f}")
+        print(f"{'N':>6} " + " ".join(f"{name:>22}" for name in names))
+        reached = {}
+        previous = [None] * len(VARIANTS)
+        for n_panels in SIZES:
+            columns = []
+            for idx, (method_cls, spacing) in enumerate(VARIANTS):
+                method = method_cls(airfoil, n_panels, spacing)
+                error = abs(circulation_lift(method, ALPHA) / reference - 1)
+                order = (
+                    f"{math.log2(previous[idx] / error):5.2f}"
+                    if previous[idx] and error
+                    else " " * 5
+                )
+                columns.append(f"{error:>15.2e} {order}")
+                previous[idx] = error
+                if error <= args.target and idx not in reached:
+                    reached[idx] = method
+            print(f"{n_panels:>6} " + " ".join(columns))
+
+        for idx, name in enumerate(names):
+            if idx not in reached:
+                print(
+                    f"{name:>22}: {args.target:.0e} not reached with "
+                    f"{SIZES[-1]} panels"
+                )
+                continue
+            method = reached[idx]
+            wall_time = solve_time(method, args.repeat)
+            print(
+                f"{name:>22}: {args.target:.0e} reached with "
+                f"{method.n_panels} panels, "
+                f"{method.coefficient_shape[1]} unknowns in {wall_time:.4f} s"
+            )
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+# Copyright 2020 Kilian Swannet, San Kilkis
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied. See the License for the specific language governing
+# permissions and limitations under the License.
+
+"""Benchmarks the panels needed to reach a lift coefficient accuracy.
+
+The lift coefficient of each method follows from its total
+circulation (Kutta-Joukowski) at an increasing number of panels. The
+error is taken relative to a :py:class:`LinearVortex` solution with
+``--reference-panels`` panels. For each method the smallest number of
+panels that reaches the ``--target`` relative error is reported with
+the wall time of the assembly and solve at that size. Run with::
+
+    python benchmarks/source_vortex_convergence.py --target 1e-3
+"""
+
+import argparse
+import math
+import timeit
+
+import numpy as np
+
+from gammapy.geometry.airfoil import NACA4Airfoil
+from gammapy.solver.m_constant_vortex import ConstantVortex
+from gammapy.solver.m_linear_vortex import LinearVortex
+from gammapy.solver.m_source_vortex import SourceVortex
+
+AIRFOILS = ("0012", "2412", "4415")
+METHODS = (SourceVortex, LinearVortex, ConstantVortex)
+SIZES = (10, 20, 40, 80, 160, 320, 640, 1280, 2560)
+ALPHA = 5.0
+
+
+def circulation_lift(method, alpha: float) -> float:
+    """Returns the lift coefficient of the total circulation.
+
+    The strengths of :py:class:`LinearVortex` are normalized by 2 pi
+    and vary linearly along each panel, while those of
+    :py:class:`ConstantVortex` are positive counter-clockwise.
+    """
+    solution = method.solve_for(alpha)
+    if isinstance(method, SourceVortex):
+        return float(np.ravel(solution.lift_coefficient)[0])
+    strengths = solution.circulations[:, 0]
+    lengths = method.panels.lengths[:, 0]
+    if isinstance(method, LinearVortex):
+        nodal = np.append(strengths, -strengths[0])
+        mean_strengths = 0.5 * (nodal[:-1] + nodal[1:])
+        return 2 * (2 * math.pi) * np.sum(mean_strengths * lengths)
+    return -2 * np.sum(strengths * lengths)
+
+
+def solve_time(method_cls, airfoil, n_panels: int, repeat: int) -> float:
+    """Returns the best wall time of the assembly and solve."""
+    return min(
+        timeit.repeat(
+            lambda: method_cls(airfoil, n_panels).solve_for(ALPHA),
+            number=1,
+            repeat=repeat,
+        )
+    )
+
+
+def main() -> None:
+    """Prints the error of each method and the size to reach it."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--target", type=float, default=1e-3)
+    parser.add_argument("--reference-panels", type=int, default=6400)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    for naca_code in AIRFOILS:
+        airfoil = NACA4Airfoil(naca_code, te_closed=True)
+        reference = circulation_lift(
+            LinearVortex(airfoil, args.reference_panels), ALPHA
+        )
+        print(f"NACA {naca_code}, alpha = {ALPHA}, Cl_ref = {reference:.6f}")
+        print(f"{'N':>6} " + " ".join(f"{m.__name__:>15}" for m in METHODS))
+        reached = {}
+        for n_panels in SIZES:
+            errors = []
+            for method_cls in METHODS:
+                lift = circulation_lift(method_cls(airfoil, n_panels), ALPHA)
+                error = abs(lift / reference - 1)
+                errors.append(error)
+                if error <= args.target and method_cls not in reached:
+                    reached[method_cls] = n_panels
+            print(f"{n_panels:>6} " + " ".join(f"{e:>15.2e}" for e in errors))
+
+        for method_cls in METHODS:
+            if method_cls not in reached:
+                print(
+                    f"{method_cls.__name__:>15}: {args.target:.0e} not "
+                    f"reached with {SIZES[-1]} panels"
+                )
+                continue
+            n_panels = reached[method_cls]
+            wall_time = solve_time(method_cls, airfoil, n_panels, args.repeat)
+            print(
+                f"{method_cls.__name__:>15}: {args.target:.0e} reached with "
+                f"{n_panels} panels in {wall_time:.4f} s"
+            )
+        print()
+
+
+if __name__ == "__main__":
+    main()
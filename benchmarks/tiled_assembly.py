@@ -0,0 +1,77 @@
+# Copyright 2020 Kilian Swannet, San Kilkis
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied. See the License for the specific language governing
+# permissions and limitations under the License.
+
+"""Benchmarks the row-wise against the tiled influence matrix assembly.
+
+Both the normal and tangent influence matrices of each panel method are
+assembled with the "numba" and the "tiled" backend. Run with::
+
+    python benchmarks/tiled_assembly.py --sizes 1000 4000 8000
+"""
+
+import argparse
+import timeit
+
+import numpy as np
+
+from gammapy.geometry.airfoil import NACA4Airfoil
+from gammapy.solver.m_constant_vortex import ConstantVortex
+from gammapy.solver.m_linear_vortex import LinearVortex
+from gammapy.solver.m_lumped_vortex import LumpedVortex
+
+METHODS = (LumpedVortex, ConstantVortex, LinearVortex)
+
+
+def best_time(func, repeat: int) -> float:
+    """Returns the best wall time of ``repeat`` calls in SI second."""
+    return min(timeit.repeat(func, number=1, repeat=repeat))
+
+
+def main() -> None:
+    """Prints the assembly time of both backends for each size."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[1000, 4000, 8000]
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(
+        f"{'method':>14} {'N':>6} {'numba [s]':>10} {'tiled [s]':>10} "
+        f"{'speedup':>8}"
+    )
+    for method_cls in METHODS:
+        for n_panels in args.sizes:
+            method = method_cls(NACA4Airfoil("2412"), n_panels=n_panels)
+
+            # Compiling both kernels before timing
+            expected = method.assemble(tangent=True, backend="numba")
+            result = method.assemble(tangent=True, backend="tiled")
+            assert all(np.allclose(result[k], expected[k]) for k in result)
+
+            t_numba, t_tiled = (
+                best_time(
+                    lambda: method.assemble(tangent=True, backend=backend),
+                    args.repeat,
+                )
+                for backend in ("numba", "tiled")
+            )
+            print(
+                f"{method_cls.__name__:>14} {n_panels:>6} {t_numba:>10.4f} "
+                f"{t_tiled:>10.4f} {t_numba / t_tiled:>7.2f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+# Copyright 2020 Kilian Swannet, San Kilkis
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied. See the License for the specific language governing
+# permissions and limitations under the License.
+
+"""Contains the ``gammapy`` command line interface.
+
+Available commands are:
+
+* ``gammapy warmup``: Fills the numba cache with all eager kernels,
+  refer to :py:mod:`gammapy.jit`. With ``--check`` the command exits
+  with status 1 if a kernel was compiled instead of loaded, which
+  verifies on startup that the cache of the warm-up is reused. The
+  kernels of additional compilation profiles are compiled with
+  ``--profiles fast strict checked``.
+"""
+
+import argparse
+from typing import Optional, Sequence
+
+from gammapy import jit
+
+
+def warmup(args: argparse.Namespace) -> int:
+    """Runs the warm-up and prints the state of each kernel."""
+    report, wall_time = jit.warmup(args.profiles)
+    if args.verbose:
+        for name, state in report.items():
+            print(f"{state:>8}  {name}")
+    n_cached = sum(state == "cached" for state in report.values())
+    print(
+        f"{n_cached} of {len(report)} kernels loaded from the cache, "
+        f"{len(report) - n_cached} compiled in {wall_time:.1f} s"
+    )
+    return int(args.check and n_cached < len(report))
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Parses the command line arguments and runs the command."""
+    parser = argparse.ArgumentParser(prog="gammapy")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    warmup_parser = commands.add_parser(
+        "warmup", help="compile the numba kernels into the cache"
+    )
+    warmup_parser.add_argument(
+        "--check",
+        action="store_true",
+        help="exit with status 1 if a kernel wasn't loaded from the cache",
+    )
+    warmup_parser.add_argument(
+        "--profiles",
+        nargs="+",
+        choices=jit.PROFILES,
+        default=[jit.DEFAULT_PROFILE],
+        help="compilation profiles of the kernels",
+    )
+    warmup_parser.add_argument(
+        "-v", "--verbose", action="store_true", help="list all kernels"
+    )
+    warmup_parser.set_defaults(func=warmup)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,239 @@
+# Copyright 2020 Kilian Swannet, San Kilkis
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied. See the License for the specific language governing
+# permissions and limitations under the License.
+
+"""Contains the runtime configuration of the thread pools.
+
+The influence coefficient kernels run in parallel on the numba thread
+pool, whereas the factorizations run on the thread pool of the BLAS
+library. Both use all cores by default, which oversubscribes the
+machine when several solvers run concurrently, i.e. in a process pool.
+The :py:func:`threads` context manager limits both thread pools::
+
+    with gammapy.config.threads(numba_threads=1, blas_threads=1):
+        solution = method.solve_for(alpha)
+
+Default limits of every solve are read from the environment variables
+``GAMMAPY_NUMBA_THREADS`` and ``GAMMAPY_BLAS_THREADS``. The numba limit
+also applies to every kernel called outside of a solve, refer to
+:py:func:`limit_numba_threads`. Limiting the
+BLAS threads requires the optional ``threadpoolctl`` package.
+
+Similarly, the :py:func:`backend` context manager or the
+``GAMMAPY_BACKEND`` environment variable select the default backend of
+the influence coefficient kernels (Refer to
+:py:mod:`gammapy.solver.backends`).
+"""
+
+import contextlib
+import functools
+import os
+import threading
+import warnings
+from typing import Callable, Dict, Iterator, Optional, Tuple
+
+import numba
+
+try:
+    import threadpoolctl
+except ImportError:  # pragma: no cover
+    threadpoolctl = None
+
+NUMBA_THREADS_ENV = "GAMMAPY_NUMBA_THREADS"
+BLAS_THREADS_ENV = "GAMMAPY_BLAS_THREADS"
+BACKEND_ENV = "GAMMAPY_BACKEND"
+
+# Limits and backend of the enclosing contexts of the current thread
+_state = threading.local()
+
+
+def env_threads(name: str) -> Optional[int]:
+    """Returns the number of threads set by the environment variable.
+
+    Raises:
+        ValueError: If the variable is not a positive integer.
+    """
+    value = os.environ.get(name, "").strip()
+    if not value:
+        return None
+    if not value.isdigit() or int(value) < 1:
+        raise ValueError(
+            f'The environment variable {name} value of "{value}" is '
+            "invalid. Please specify a positive integer."
+        )
+    return int(value)
+
+
+def thread_limits() -> Tuple[Optional[int], Optional[int]]:
+    """Returns the numba and BLAS limits of the enclosing context.
+
+    Limits are None outside of a :py:func:`threads` context or if the
+    context leaves them unchanged.
+    """
+    return getattr(_state, "limits", (None, None))
+
+
+def numba_limit() -> Optional[int]:
+    """Returns the numba thread limit of the context or environment."""
+    return thread_limits()[0] or env_threads(NUMBA_THREADS_ENV)
+
+
+def limit_numba_threads(func: Callable) -> Callable:
+    """Wraps ``func`` such that it runs within the numba thread limit.
+
+    Kernels are not only called by the solves of a :py:func:`threads`
+    context, but also lazily by the physical quantities of a solution.
+    The wrapper applies the limit of the enclosing context, or of the
+    environment variable, to these calls. Unlike :py:func:`threads`
+    this only sets the numba limit of the current thread, which is
+    cheap enough to wrap every kernel call.
+    """
+
+    @functools.wraps(func)
+    def limited(*args, **kwargs):
+        limit, current = numba_limit(), numba.get_num_threads()
+        if limit is None or limit == current:
+            return func(*args, **kwargs)
+        numba.set_num_threads(limit)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            numba.set_num_threads(current)
+
+    return limited
+
+
+def default_backend() -> Optional[str]:
+    """Returns the kernel backend of the enclosing context.
+
+    Outside of a :py:func:`backend` context this is the value of the
+    environment variable, or None if it is not set.
+    """
+    name = getattr(_state, "backend", None)
+    if name is None:
+        name = os.environ.get(BACKEND_ENV, "").strip() or None
+    return name
+
+
+@contextlib.contextmanager
+def backend(name: str) -> Iterator[str]:
+    """Sets the default kernel backend of the current thread.
+
+    The backend is validated when the kernels are looked up, refer to
+    :py:func:`gammapy.solver.backends.resolve_backend`.
+
+    Args:
+        name: Name of the kernel backend, i.e. "numba", "numpy",
+            "threaded", "tiled", "nodal" or "process"
+
+    Yields:
+        The name of the backend.
+    """
+    outer = getattr(_state, "backend", None)
+    _state.backend = name
+    try:
+        yield name
+    finally:
+        _state.backend = outer
+
+
+def thread_budget() -> Dict[str, Optional[int]]:
+    """Returns the process id and the thread limits of the caller.
+
+    The number of BLAS threads is None if ``threadpoolctl`` is not
+    installed, since it cannot be determined otherwise.
+    """
+    blas_threads = None
+    if threadpoolctl is not None:
+        blas_pools = [
+            pool["num_threads"]
+            for pool in threadpoolctl.threadpool_info()
+            if pool["user_api"] == "blas"
+        ]
+        blas_threads = max(blas_pools, default=None)
+    return {
+        "pid": os.getpid(),
+        "numba_threads": numba.get_num_threads(),
+        "blas_threads": blas_threads,
+    }
+
+
+@contextlib.contextmanager
+def threads(
+    numba_threads: Optional[int] = None, blas_threads: Optional[int] = None
+) -> Iterator[Dict[str, Optional[int]]]:
+    """Limits the numba and BLAS thread pools within the context.
+
+    Unspecified limits are inherited from an enclosing context or
+    otherwise read from the environment variables. The numba limit
+    only applies to the current thread, hence each thread of a thread
+    pool should enter its own context.
+
+    Args:
+        numba_threads: Maximum number of numba threads. Defaults to
+            None, which leaves the limit unchanged.
+        blas_threads: Maximum number of BLAS threads. Defaults to None,
+            which leaves the limit unchanged.
+
+    Yields:
+        The thread budget within the context, refer to
+        :py:func:`thread_budget`.
+
+    Raises:
+        ValueError: If ``numba_threads`` is not between 1 and the
+            number of threads of the numba thread pool.
+        ImportError: If ``blas_threads`` is specified but
+            ``threadpoolctl`` is not installed.
+    """
+    outer = thread_limits()
+    from_env = (env_threads(NUMBA_THREADS_ENV), env_threads(BLAS_THREADS_ENV))
+    if blas_threads is None and outer[1] is None and from_env[1] is not None:
+        if threadpoolctl is None:
+            warnings.warn(
+                f"{BLAS_THREADS_ENV} is ignored since threadpoolctl is not "
+                "installed",
+                RuntimeWarning,
+            )
+            from_env = (from_env[0], None)
+    numba_threads, blas_threads = (
+        next((n for n in candidates if n is not None), None)
+        for candidates in zip((numba_threads, blas_threads), outer, from_env)
+    )
+
+    if numba_threads is not None and not (
+        1 <= numba_threads <= numba.config.NUMBA_NUM_THREADS
+    ):
+        raise ValueError(
+            f"The supplied `numba_threads` value of {numba_threads} is "
+            "invalid. Please specify a value between 1 and "
+            f"{numba.config.NUMBA_NUM_THREADS}."
+        )
+    if blas_threads is not None and threadpoolctl is None:
+        raise ImportError(
+            "Limiting the BLAS threads requires threadpoolctl, which can "
+            "be installed with: pip install gammapy[threads]"
+        )
+
+    with contextlib.ExitStack() as stack:
+        if numba_threads is not None:
+            stack.callback(numba.set_num_threads, numba.get_num_threads())
+            numba.set_num_threads(numba_threads)
+        if blas_threads is not None:
+            stack.enter_context(
+                threadpoolctl.threadpool_limits(
+                    limits=blas_threads, user_api="blas"
+                )
+            )
+        stack.callback(setattr, _state, "limits", outer)
+        _state.limits = (numba_threads, blas_threads)
+        yield thread_budget()
@@ -154,6 +154,9 @@ class NACA4Airfoil(Airfoil):
         max_thickness: Maximum thickness as a percentage of the chord.
     """
 
+    #: Shape parameters of :py:meth:`surface_derivatives_at`
+    PARAMETERS = ("max_camber", "camber_location", "max_thickness")
+
     def __init__(
         self, naca_code: str, *, te_closed: bool = False,
     ):
@@ -254,6 +257,67 @@ class NACA4Airfoil(Airfoil):
             - (0.1036 if self.te_closed else 0.1015) * (x ** 4)
         )
 
+    def surface_derivatives_at(
+        self, x: np.ndarray, upper: bool = True
+    ) -> np.ndarray:
+        """Derivatives of surface points w.r.t. the shape parameters.
+
+        The surface points at a fixed chord-line fraction ``x`` move
+        with the camber-line ordinate y_c, the rotation of the camber
+        normal n_c = (-s, 1) / sqrt(1 + s^2) with the camber slope s and
+        the half-thickness y_t. For a ``camber_location`` of 0, i.e.
+        "0012", the derivatives are the limits of a maximum ordinate
+        that approaches the LE, where all points but the LE lie aft of
+        the maximum ordinate.
+
+        Args:
+            x: Chord-line fraction (0 = LE, 1 = TE)
+            upper: Sets if the points are on the upper or the lower
+                surface. Defaults to True.
+
+        Returns:
+            The derivatives with shape (n, 2, 3) w.r.t. the attributes
+            in :py:data:`PARAMETERS`.
+        """
+        x = self.ensure_1d_vector(x)
+        m, p = self.max_camber, self.camber_location
+        sign = 1 if upper else -1
+
+        # Derivatives of the ordinate and slope w.r.t. m and p
+        d_camber = np.zeros((x.size, 2))
+        d_slope = np.zeros((x.size, 2))
+        slope = self.camber_tangent_at(x)
+        slope = slope[:, 1] / slope[:, 0]
+        fwd, aft = x <= p, x > p  # Indices before and after max ordinate
+        x_fwd, x_aft, q = x[fwd], x[aft], 1 - p
+        if p > 0:
+            # Otherwise only the LE is forward, which remains at the
+            # origin and has no thickness to rotate
+            d_camber[fwd, 0] = (2 * p * x_fwd - x_fwd ** 2) / p ** 2
+            d_camber[fwd, 1] = 2 * m * x_fwd * (x_fwd - p) / p ** 3
+            d_slope[fwd, 0] = 2 * (p - x_fwd) / p ** 2
+            d_slope[fwd, 1] = 2 * m * (2 * x_fwd - p) / p ** 3
+        d_camber[aft, 0] = (1 - x_aft) * (1 + x_aft - 2 * p) / q ** 2
+        d_camber[aft, 1] = 2 * m * (1 - x_aft) * (x_aft - p) / q ** 3
+        d_slope[aft, 0] = 2 * (p - x_aft) / q ** 2
+        d_slope[aft, 1] = 2 * m * (1 + p - 2 * x_aft) / q ** 3
+
+        # The camber normal rotates by (-1, -s) / (1 + s^2)^1.5 ds
+        y_t = self.half_thickness_at(x)
+        d_normal = np.stack((-np.ones_like(slope), -slope), axis=1) / (
+            (1 + slope ** 2) ** 1.5
+        ).reshape(-1, 1)
+
+        derivatives = np.zeros((x.size, 2, 3))
+        derivatives[:, 1, :2] = d_camber
+        derivatives[:, :, :2] += (
+            sign * (y_t.reshape(-1, 1) * d_normal)[:, :, None]
+            * d_slope[:, None, :]
+        )
+        thickness = (y_t / self.max_thickness).reshape(-1, 1)
+        derivatives[:, :, 2] = sign * self.camber_normal_at(x) * thickness
+        return derivatives
+
     def plot(self, *args, show: bool = True, **kwargs):
         """Specializes the :py:class:`Airfoil` plot with a title."""
         # Turning off plot display to be able to display after the
@@ -0,0 +1,377 @@
+# Copyright 2020 Kilian Swannet, San Kilkis
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied. See the License for the specific language governing
+# permissions and limitations under the License.
+
+"""Contains the ahead-of-time compilation of the numba kernels.
+
+The kernels that are called from Python are decorated with
+:py:func:`eager`, which compiles them for the numba types of their
+annotations on first use. Importing the kernel modules hence doesn't
+compile anything. Since the kernels are compiled with ``cache=True``
+the machine code is written to the numba cache, such that subsequent
+processes load the kernels instead of compiling them. The cache is
+filled at build time of an image with::
+
+    gammapy warmup
+
+Workers can verify on startup that all kernels were loaded from the
+cache with ``gammapy warmup --check`` or :py:func:`check_cache`. Note
+that numba writes the cache to the ``__pycache__`` directories of the
+package unless ``NUMBA_CACHE_DIR`` is set, which must hence be
+writable during the warm-up and identical at runtime.
+
+The kernels are compiled with fast-math by default. The following
+compilation profiles are available, refer to :py:func:`profiled`:
+
+* "fast": Fast-math flags of ``BASE_NUMBA_CONFIG``, which assume that
+  no NaN or infinity occurs and allow reordering of floating point
+  operations. Results can differ in the last bits between machines.
+* "strict": Strict IEEE 754 semantics without fast-math flags, which
+  yields bit-reproducible influence coefficients on a given platform
+* "checked": Fast-math flags that preserve NaN and infinity, such that
+  the outputs of the kernels are checked for non-finite values
+"""
+
+import functools
+import importlib
+import inspect
+import threading
+import time
+import types
+import warnings
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+import numba
+import numpy as np
+from numba.core.dispatcher import Dispatcher
+
+# Modules that define eagerly compiled kernels
+KERNEL_MODULES = (
+    "gammapy.solver.m_constant_vortex",
+    "gammapy.solver.m_linear_vortex",
+    "gammapy.solver.m_lumped_vortex",
+    "gammapy.solver.m_quadratic_vortex",
+    "gammapy.solver.m_source_vortex",
+    "gammapy.solver.multipole",
+)
+
+# Numba types of the Python scalar annotations
+SCALAR_TYPES = {
+    bool: numba.boolean,
+    int: numba.int64,
+    float: numba.float64,
+    complex: numba.complex128,
+}
+
+PROFILES = ("fast", "strict", "checked")
+DEFAULT_PROFILE = "fast"
+
+# Fast-math flags that assume operands and results are finite
+FINITE_MATH_FLAGS = ("nnan", "ninf")
+
+EAGER_KERNELS: List[Dispatcher] = []
+
+# Serializes the first use of an eager kernel between threads
+_COMPILE_LOCK = threading.RLock()
+
+# Kernels and their profiled variants with key (kernel, profile)
+_VARIANTS: Dict[Tuple[Callable, str], Callable] = {}
+
+
+def annotated_signature(func: Callable) -> Tuple[numba.types.Type, ...]:
+    """Returns the numba argument types annotated on ``func``.
+
+    Raises:
+        TypeError: If an argument is not annotated with a numba type or
+            a Python scalar type.
+    """
+    signature = []
+    for name, parameter in inspect.signature(func).parameters.items():
+        arg_type = SCALAR_TYPES.get(parameter.annotation, parameter.annotation)
+        if not isinstance(arg_type, numba.types.Type):
+            raise TypeError(
+                f"Argument `{name}` of {func.__qualname__} is not annotated "
+                "with a numba type"
+            )
+        signature.append(arg_type)
+    return tuple(signature)
+
+
+def eager(kernel: Dispatcher) -> Dispatcher:
+    """Compiles ``kernel`` for the signature of its annotations.
+
+    The compilation is deferred to the first call of the kernel, or to
+    :py:func:`compile_annotated`. Further compilation is disabled
+    afterwards, hence arguments are converted to the annotated types
+    instead of compiling another specialization, i.e. for C-contiguous
+    arrays.
+
+    Args:
+        kernel: Function decorated with :py:func:`numba.jit`, which is
+            returned unchanged if the JIT compiler is disabled
+    """
+    if not isinstance(kernel, Dispatcher):
+        return kernel
+
+    def compile_on_first_use(sig) -> Dispatcher:
+        # Numba compiles a specialization for the arguments of the
+        # first call through ``compile``, which dispatches the call
+        # to the annotated signature instead
+        return compile_annotated(kernel)
+
+    kernel.compile = compile_on_first_use
+    EAGER_KERNELS.append(kernel)
+    return kernel
+
+
+def compile_annotated(kernel: Dispatcher) -> Dispatcher:
+    """Compiles an :py:func:`eager` kernel if it wasn't used yet.
+
+    The machine code is loaded from the numba cache if available.
+    """
+    with _COMPILE_LOCK:
+        if vars(kernel).pop("compile", None) is not None:
+            kernel.compile(annotated_signature(kernel.py_func))
+            kernel.disable_compile()
+    return kernel
+
+
+def kernel_name(kernel: Dispatcher) -> str:
+    """Returns the qualified name of ``kernel`` including its module."""
+    return f"{kernel.py_func.__module__}.{kernel.py_func.__qualname__}"
+
+
+def cache_report() -> Dict[str, str]:
+    """Returns if each eager kernel was "cached" or "compiled".
+
+    A kernel is "cached" if the machine code was loaded from the numba
+    cache and "compiled" otherwise. Kernels that weren't used yet are
+    loaded or compiled first, refer to :py:func:`compile_annotated`.
+    """
+    for module in KERNEL_MODULES:
+        importlib.import_module(module)
+    for kernel in list(EAGER_KERNELS):
+        compile_annotated(kernel)
+    return {
+        kernel_name(kernel): (
+            "compiled" if sum(kernel.stats.cache_misses.values()) else "cached"
+        )
+        for kernel in EAGER_KERNELS
+    }
+
+
+def check_cache() -> Dict[str, str]:
+    """Warns if an eager kernel was compiled instead of loaded.
+
+    Returns:
+        The :py:func:`cache_report` of the kernels.
+    """
+    report = cache_report()
+    compiled = [name for name, state in report.items() if state != "cached"]
+    if compiled:
+        warnings.warn(
+            f"{len(compiled)} of {len(report)} numba kernels were compiled "
+            f"instead of loaded from the cache: {', '.join(compiled)}. Run "
+            "`gammapy warmup` to fill the cache.",
+            RuntimeWarning,
+        )
+    return report
+
+
+def warmup(
+    profiles: Sequence[str] = (DEFAULT_PROFILE,)
+) -> Tuple[Dict[str, str], float]:
+    """Compiles all eager kernels that aren't cached.
+
+    Args:
+        profiles: Compilation profiles of the kernels, refer to
+            :py:data:`PROFILES`. Defaults to the default profile.
+
+    Returns:
+        The :py:func:`cache_report` of the kernels and the wall time of
+        the warm-up in SI second.
+    """
+    start = time.perf_counter()
+    cache_report()
+    variants = set(_VARIANTS.values())
+    for kernel in [k for k in EAGER_KERNELS if k not in variants]:
+        for profile in profiles:
+            variant(kernel, resolve_profile(profile))
+    report = cache_report()
+    return report, time.perf_counter() - start
+
+
+def resolve_profile(profile: str) -> str:
+    """Returns ``profile`` if it is a valid compilation profile.
+
+    Raises:
+        ValueError: If the profile is not one of :py:data:`PROFILES`.
+    """
+    if profile not in PROFILES:
+        raise ValueError(
+            f'The supplied `profile` value of "{profile}" is invalid. '
+            f"Please specify one of: {PROFILES}."
+        )
+    return profile
+
+
+def profile_options(kernel: Dispatcher, profile: str) -> Dict[str, Any]:
+    """Returns the numba options of ``kernel`` for the ``profile``.
+
+    Division by zero follows IEEE 754 semantics for the "strict" and
+    "checked" profiles, i.e. it results in an infinity or NaN instead
+    of raising an exception.
+    """
+    options = dict(kernel.targetoptions)
+    if profile == "strict":
+        options.update(fastmath=False, error_model="numpy")
+    elif profile == "checked":
+        flags = options.get("fastmath") or {}
+        if flags is True:
+            flags = {"nsz", "arcp", "contract", "afn", "reassoc"}
+        options.update(
+            fastmath={f for f in flags if f not in FINITE_MATH_FLAGS},
+            error_model="numpy",
+        )
+    return options
+
+
+def referenced_kernels(func: types.FunctionType) -> List[Dispatcher]:
+    """Returns the numba kernels referenced by the names of ``func``.
+
+    These are the kernels of its global names and of its closure.
+    """
+    values = [func.__globals__.get(name) for name in func.__code__.co_names]
+    values += [cell.cell_contents for cell in func.__closure__ or ()]
+    return [value for value in values if isinstance(value, Dispatcher)]
+
+
+def rebind(func: types.FunctionType, profile: str) -> types.FunctionType:
+    """Returns a copy of ``func`` that calls the profiled kernels.
+
+    The numba kernels referenced by the global names and the closure
+    of ``func`` are replaced by their variant of the ``profile``. The
+    copy has a distinct ``__qualname__``, hence the numba cache keeps a
+    separate entry for each profile.
+    """
+    namespace = dict(func.__globals__)
+    for name in func.__code__.co_names:
+        value = namespace.get(name)
+        if isinstance(value, Dispatcher):
+            namespace[name] = variant(value, profile)
+    closure = func.__closure__ and tuple(
+        types.CellType(
+            variant(cell.cell_contents, profile)
+            if isinstance(cell.cell_contents, Dispatcher)
+            else cell.cell_contents
+        )
+        for cell in func.__closure__
+    )
+    copy = types.FunctionType(
+        func.__code__, namespace, func.__name__, func.__defaults__, closure,
+    )
+    functools.update_wrapper(copy, func)
+    del copy.__wrapped__
+    copy.__qualname__ = f"{func.__qualname__}__{profile}"
+    return copy
+
+
+def variant(kernel: Callable, profile: str) -> Callable:
+    """Returns ``kernel`` and its callees compiled for the ``profile``.
+
+    Plain Python functions, i.e. wrappers of the kernel backends, are
+    copied such that they call the variants of their kernels.
+    """
+    func = getattr(kernel, "py_func", kernel)
+    if profile == DEFAULT_PROFILE or not inspect.isfunction(func):
+        return kernel
+    if not isinstance(kernel, Dispatcher) and not referenced_kernels(func):
+        return kernel
+    key = (kernel, profile)
+    if key not in _VARIANTS:
+        if isinstance(kernel, Dispatcher):
+            compiled = numba.jit(
+                cache=True, **profile_options(kernel, profile)
+            )(rebind(kernel.py_func, profile))
+            if kernel in EAGER_KERNELS:
+                compiled = eager(compiled)
+            _VARIANTS[key] = compiled
+        else:
+            _VARIANTS[key] = rebind(kernel, profile)
+    return _VARIANTS[key]
+
+
+def kernel_reference(kernel: Dispatcher) -> Tuple[str, str, str]:
+    """Returns the module, name and profile of ``kernel``.
+
+    Unlike the kernel itself, which is pickled by value and hence
+    compiled again, the reference allows other processes to load the
+    kernel from the numba cache with :py:func:`load_kernel`.
+    """
+    profile = DEFAULT_PROFILE
+    for (base, base_profile), compiled in _VARIANTS.items():
+        if compiled is kernel:
+            kernel, profile = base, base_profile
+            break
+    return kernel.py_func.__module__, kernel.py_func.__name__, profile
+
+
+def load_kernel(module: str, name: str, profile: str) -> Dispatcher:
+    """Returns the kernel of a :py:func:`kernel_reference`."""
+    kernel = getattr(importlib.import_module(module), name)
+    return variant(kernel, resolve_profile(profile))
+
+
+def check_finite(kernel: Callable) -> Callable:
+    """Raises if ``kernel`` returns or fills non-finite values.
+
+    Kernels that return None are assumed to fill their first argument.
+    """
+
+    @functools.wraps(kernel)
+    def checked_kernel(*args, **kwargs):
+        result = kernel(*args, **kwargs)
+        outputs = args[:1] if result is None else result
+        if not isinstance(outputs, tuple):
+            outputs = (outputs,)
+        for output in outputs:
+            if isinstance(output, np.ndarray) and not np.all(
+                np.isfinite(output)
+            ):
+                raise FloatingPointError(
+                    f"{kernel.__name__} resulted in non-finite values"
+                )
+        return result
+
+    return checked_kernel
+
+
+def profiled(kernel: Callable, profile: str = DEFAULT_PROFILE) -> Callable:
+    """Returns ``kernel`` compiled with the options of ``profile``.
+
+    The variants of the "strict" and "checked" profiles are compiled on
+    first use, or by ``gammapy warmup --profiles``. Outputs of the
+    "checked" variants are verified to be finite.
+
+    Raises:
+        ValueError: If the profile is not one of :py:data:`PROFILES`.
+        FloatingPointError: If a "checked" kernel results in non-finite
+            values.
+    """
+    kernel_variant = variant(kernel, resolve_profile(profile))
+    if profile == "checked":
+        key = (kernel_variant, "finite")
+        if key not in _VARIANTS:
+            _VARIANTS[key] = check_finite(kernel_variant)
+        return _VARIANTS[key]
+    return kernel_variant
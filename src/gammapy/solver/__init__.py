@@ -1,4 +1,5 @@
+from .batch import BatchPanelMethod
 from .m_constant_vortex import ConstantVortex
 from .m_lumped_vortex import LumpedVortex
 
-__all__ = ["LumpedVortex", "ConstantVortex"]
+__all__ = ["LumpedVortex", "ConstantVortex", "BatchPanelMethod"]
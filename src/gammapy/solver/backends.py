@@ -0,0 +1,379 @@
+# Copyright 2020 Kilian Swannet, San Kilkis
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied. See the License for the specific language governing
+# permissions and limitations under the License.
+
+"""Contains the registry of the influence coefficient kernel backends.
+
+The influence matrices of a panel method are assembled by a row kernel,
+which fills the normal and tangent influence coefficients of a set of
+collocation points (rows) into a preallocated array::
+
+    kernel(out, rows, **method.kernel_args)
+
+Here ``out`` has the shape (1, n_rows, n_unknowns) if only the normal
+coefficients are requested, or (2, n_rows, n_unknowns) if the tangent
+coefficients are filled as well. The following backends are available:
+
+* "numba": Compiled kernels that run on the numba thread pool
+* "numpy": Fully broadcast NumPy kernels, which evaluate all requested
+  rows at once and hence require O(n_rows N) temporary memory
+* "threaded": The "numpy" kernels evaluated on blocks of rows by a
+  thread pool, which bounds the temporary memory and runs in parallel
+  since NumPy releases the GIL
+* "tiled": Compiled kernels that evaluate tiles of collocation points
+  by panels sized by :py:func:`tile_shape`, such that the panel data
+  and the output tile of each plane stay in the L2 cache. Rows of the
+  normal and tangent planes are written as separate contiguous blocks
+  instead of alternating between the planes for every coefficient
+* "nodal": Compiled kernels that evaluate the logarithms and polar
+  angles once per node and collocation point, which are shared by the
+  two panels adjacent to the node, rather than once per panel pair
+* "process": The "numba" kernels evaluated on contiguous blocks of rows
+  by a pool of worker processes, refer to :py:func:`processes`. The
+  workers write into a shared memory block, which the parent views as
+  the assembled matrices without copying them
+
+Kernels are registered per panel method with :py:func:`register_kernel`
+and looked up along the method resolution order, hence specializations
+inherit the kernels of their base class. Methods without a dedicated
+kernel of a backend use their "numba" kernel instead.
+"""
+
+import functools
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import shared_memory
+from typing import Callable, Dict, Optional, Sequence, Tuple
+
+import numba
+import numpy as np
+
+from gammapy import config, jit
+
+BACKENDS = ("numba", "numpy", "threaded", "tiled", "nodal", "process")
+DEFAULT_BACKEND = "numba"
+
+# Start method of the workers of the "process" backend. Forked workers
+# inherit the state of the numba thread pool, which can deadlock.
+PROCESS_START_METHOD = "spawn"
+
+# Number of rows evaluated at once by a thread of the "threaded" backend
+THREADED_BLOCK_SIZE = 64
+
+# Number of collocation points (rows) of a tile of the "tiled" backend
+TILE_ROWS = 32
+
+# Size of the output of a tile in bytes, which should fit in L2 cache
+TILE_BYTES = 256 * 1024
+
+# Fills the influence coefficients of the rows into the first argument
+RowKernel = Callable[..., None]
+
+_KERNELS: Dict[Tuple[type, str], RowKernel] = {}
+
+# Worker pool of the "process" backend with key the number of workers
+_PROCESS_POOLS: Dict[int, ProcessPoolExecutor] = {}
+
+
+def resolve_backend(backend: Optional[str] = None) -> str:
+    """Returns ``backend`` or otherwise the configured default backend.
+
+    Refer to :py:func:`gammapy.config.backend`, which defaults to
+    :py:data:`DEFAULT_BACKEND` if no backend is configured.
+
+    Raises:
+        ValueError: If the backend is not one of :py:data:`BACKENDS`.
+    """
+    if backend is None:
+        backend = config.default_backend() or DEFAULT_BACKEND
+    if backend not in BACKENDS:
+        raise ValueError(
+            f'The supplied `backend` value of "{backend}" is invalid. '
+            f"Please specify one of: {BACKENDS}."
+        )
+    return backend
+
+
+def register_kernel(
+    method_cls: type, backend: str
+) -> Callable[[RowKernel], RowKernel]:
+    """Registers the decorated row kernel of ``method_cls``.
+
+    The "threaded" backend is derived from the "numpy" kernel and the
+    "process" backend from the "numba" kernel. The other backends fall
+    back to the "numba" kernel unless a dedicated kernel is registered.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(
+            f'The supplied `backend` value of "{backend}" is invalid. '
+            f"Please specify one of: {BACKENDS}."
+        )
+
+    def decorator(kernel: RowKernel) -> RowKernel:
+        _KERNELS[method_cls, backend] = kernel
+        return kernel
+
+    return decorator
+
+
+def get_kernel(method_cls: type, backend: Optional[str] = None) -> RowKernel:
+    """Returns the row kernel of ``method_cls`` for the ``backend``.
+
+    Methods without a kernel of the backend use their "numba" kernel,
+    i.e. methods that only provide a compiled kernel.
+
+    Raises:
+        ValueError: If the backend is invalid.
+        NotImplementedError: If no kernel is registered for the method.
+    """
+    backend = resolve_backend(backend)
+    for cls in method_cls.__mro__:
+        if (cls, backend) in _KERNELS:
+            return _KERNELS[cls, backend]
+        if backend == "threaded" and (cls, "numpy") in _KERNELS:
+            return threaded(_KERNELS[cls, "numpy"])
+        if backend == "process" and (cls, "numba") in _KERNELS:
+            return processes(_KERNELS[cls, "numba"])
+    for cls in method_cls.__mro__:
+        if (cls, "numba") in _KERNELS:
+            return _KERNELS[cls, "numba"]
+    raise NotImplementedError(
+        f'{method_cls.__name__} has no "{backend}" kernel'
+    )
+
+
+def registered_backends(method_cls: type) -> Tuple[str, ...]:
+    """Returns the backends that provide a kernel for ``method_cls``."""
+    available = []
+    for backend in BACKENDS:
+        try:
+            get_kernel(method_cls, backend)
+        except NotImplementedError:
+            continue
+        available.append(backend)
+    return tuple(available)
+
+
+def tile_shape(n_planes: int = 2) -> Tuple[int, int]:
+    """Returns the number of rows and columns of a tile.
+
+    Columns are added until the output of a tile, with ``n_planes``
+    planes of double precision coefficients, reaches
+    :py:data:`TILE_BYTES`.
+
+    Args:
+        n_planes: Number of planes filled by the kernel, i.e. 2 if the
+            tangent coefficients are filled alongside the normal
+            coefficients. Defaults to 2.
+    """
+    n_bytes = np.dtype(np.float64).itemsize * n_planes * TILE_ROWS
+    return TILE_ROWS, max(TILE_BYTES // n_bytes, 1)
+
+
+def zeros(shape: Sequence[int], backend: Optional[str] = None) -> np.ndarray:
+    """Returns an array of zeros to be filled by the ``backend``.
+
+    The array is allocated in shared memory for the "process" backend,
+    refer to :py:class:`SharedBlock`.
+    """
+    if resolve_backend(backend) == "process":
+        return np.asarray(SharedBlock(shape))
+    return np.zeros(shape)
+
+
+def pool_size() -> int:
+    """Returns the number of threads or processes of a backend.
+
+    This follows the numba thread limit of
+    :py:func:`gammapy.config.threads`, which defaults to all cores.
+    """
+    return (
+        config.thread_limits()[0]
+        or config.env_threads(config.NUMBA_THREADS_ENV)
+        or os.cpu_count()
+        or 1
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def threaded(kernel: RowKernel) -> RowKernel:
+    """Evaluates ``kernel`` on blocks of rows with a thread pool.
+
+    The number of threads is given by :py:func:`pool_size`.
+    """
+
+    def threaded_kernel(
+        out: np.ndarray, rows: np.ndarray, **kernel_args: np.ndarray
+    ) -> None:
+        starts = range(0, rows.size, THREADED_BLOCK_SIZE)
+        if len(starts) <= 1:
+            kernel(out, rows, **kernel_args)
+            return
+
+        def fill_block(start: int) -> None:
+            block = slice(start, start + THREADED_BLOCK_SIZE)
+            kernel(out[:, block], rows[block], **kernel_args)
+
+        n_threads = min(pool_size(), len(starts))
+        with ThreadPoolExecutor(n_threads) as executor:
+            # Consuming the results raises the exceptions of the threads
+            list(executor.map(fill_block, starts))
+
+    threaded_kernel.__doc__ = kernel.__doc__
+    return threaded_kernel
+
+
+class SharedBlock:
+    """Block of shared memory that is viewed as a float64 array.
+
+    Arrays of the block are created with :py:func:`numpy.asarray`,
+    which references the block as the base of the array. The shared
+    memory is hence released once the last array of the block is
+    garbage collected.
+
+    Args:
+        shape: Shape of the array, which is initialized with zeros
+    """
+
+    def __init__(self, shape: Sequence[int]):
+        n_bytes = int(np.prod(shape)) * np.dtype(np.float64).itemsize
+        self.shm = shared_memory.SharedMemory(create=True, size=n_bytes or 1)
+        self.array = np.ndarray(shape, dtype=np.float64, buffer=self.shm.buf)
+        self.__array_interface__ = self.array.__array_interface__
+
+    def __del__(self):
+        """Releases the shared memory of the block."""
+        # The array holds an export of the memoryview of the shared
+        # memory, closing it raises a BufferError while it is alive
+        self.array = None
+        self.shm.close()
+        try:
+            self.shm.unlink()
+        except FileNotFoundError:
+            # The block was already unlinked, i.e. by the resource
+            # tracker at interpreter shutdown
+            pass
+
+    @staticmethod
+    def locate(array: np.ndarray) -> Optional[Tuple[str, int]]:
+        """Returns the name and byte offset of the block of ``array``.
+
+        Returns None if ``array`` is not a view of a shared block.
+        """
+        base = array.base
+        while isinstance(base, np.ndarray):
+            base = base.base
+        if not isinstance(base, SharedBlock):
+            return None
+        return base.shm.name, array.ctypes.data - base.array.ctypes.data
+
+
+def process_pool(n_workers: int) -> ProcessPoolExecutor:
+    """Returns the worker pool of the "process" backend.
+
+    The pool is started on first use and reused afterwards, since each
+    worker imports the package and loads the kernels from the numba
+    cache. Each worker runs the kernels on a single numba thread.
+    """
+    if n_workers not in _PROCESS_POOLS:
+        _PROCESS_POOLS[n_workers] = ProcessPoolExecutor(
+            n_workers,
+            mp_context=multiprocessing.get_context(PROCESS_START_METHOD),
+            initializer=numba.set_num_threads,
+            initargs=(1,),
+        )
+    return _PROCESS_POOLS[n_workers]
+
+
+def fill_shared_rows(
+    name: str,
+    offset: int,
+    shape: Tuple[int, ...],
+    strides: Tuple[int, ...],
+    reference: Tuple[str, str, str],
+    rows: np.ndarray,
+    kernel_args: Dict[str, np.ndarray],
+) -> None:
+    """Fills ``rows`` into a view of a :py:class:`SharedBlock`.
+
+    This runs in the workers of :py:func:`process_pool`.
+
+    Args:
+        name: Name of the shared memory block
+        offset: Offset of the view in the block in bytes
+        shape: Shape of the view
+        strides: Strides of the view in bytes
+        reference: Reference of the row kernel, refer to
+            :py:func:`gammapy.jit.kernel_reference`
+        rows: Indices of the collocation points of the view
+        kernel_args: Keyword arguments of the row kernel
+    """
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        out = np.ndarray(
+            shape, np.float64, buffer=shm.buf, offset=offset, strides=strides
+        )
+        jit.load_kernel(*reference)(out, rows, **kernel_args)
+        del out
+    finally:
+        shm.close()
+
+
+@functools.lru_cache(maxsize=None)
+def processes(kernel: RowKernel) -> RowKernel:
+    """Evaluates ``kernel`` on blocks of rows with a process pool.
+
+    The rows are split into one contiguous block per worker of
+    :py:func:`process_pool`, where the number of workers is given by
+    :py:func:`pool_size`. Workers receive a reference to the kernel
+    and its arguments, and write the coefficients directly into the
+    :py:class:`SharedBlock` of the output, which is allocated by
+    :py:func:`zeros`. Other outputs are filled through a temporary
+    shared block and copied.
+    """
+
+    def process_kernel(
+        out: np.ndarray, rows: np.ndarray, **kernel_args: np.ndarray
+    ) -> None:
+        shared = out
+        if SharedBlock.locate(out) is None:
+            shared = np.asarray(SharedBlock(out.shape))
+        name, offset = SharedBlock.locate(shared)
+        reference = jit.kernel_reference(kernel)
+        pool = process_pool(pool_size())
+        futures = []
+        for block in np.array_split(np.arange(rows.size), pool_size()):
+            if block.size == 0:
+                continue
+            start, stop = block[0], block[-1] + 1
+            futures.append(
+                pool.submit(
+                    fill_shared_rows,
+                    name,
+                    offset + int(start) * shared.strides[1],
+                    (shared.shape[0], stop - start, *shared.shape[2:]),
+                    shared.strides,
+                    reference,
+                    rows[start:stop],
+                    kernel_args,
+                )
+            )
+        for future in futures:
+            # Consuming the results raises the exceptions of the workers
+            future.result()
+        if shared is not out:
+            out[...] = shared
+
+    process_kernel.__doc__ = kernel.__doc__
+    return process_kernel
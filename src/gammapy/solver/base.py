@@ -14,16 +14,44 @@
 
 """Contains definitions used to define a panel method solver."""
 
+import copy
 import math
+import shutil
+import tempfile
+import warnings
+import weakref
 from abc import ABCMeta, abstractmethod
 from functools import cached_property
-from typing import Optional, Sequence, Type, Union
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    Union,
+)
 
 import numpy as np
 from matplotlib import pyplot as plt
+from scipy.linalg import lu_factor, lu_solve
+from scipy.sparse import csr_matrix
 
-from gammapy.geometry import Airfoil
+from gammapy.config import limit_numba_threads, threads
+from gammapy.geometry import Airfoil, NACA4Airfoil
 from gammapy.geometry.panel import Panel2D
+from gammapy.jit import DEFAULT_PROFILE, profiled, resolve_profile
+from gammapy.solver.backends import get_kernel, resolve_backend, zeros
+from gammapy.solver.hmatrix import HMatrix
+from gammapy.solver.krylov import (
+    KRYLOV_SOLVERS,
+    PRECONDITIONERS,
+    build_preconditioner,
+    solve_krylov,
+)
+from gammapy.solver.outofcore import OutOfCoreLU, open_memmaps, stream_rows
+from gammapy.solver.woodbury import LowRankUpdate
 
 FAST_MATH_FLAGS = {
     # Refer to https://llvm.org/docs/LangRef.html#fast-math-flags
@@ -42,6 +70,57 @@ BASE_NUMBA_CONFIG = {
     "fastmath": FAST_MATH_FLAGS,
 }
 
+SOLVERS = ("direct", "hmatrix", *KRYLOV_SOLVERS)
+
+PRECISIONS = ("double", "mixed")
+
+SPACINGS = ("cosine", "linear", "graded")
+
+# Exponent of the "graded" spacing, which reduces the length of the
+# trailing edge panels from O(h^2) of the cosine spacing to O(h^3).
+# The vorticity vanishes as a small power of the distance to a sharp
+# trailing edge, which otherwise limits the lift coefficient of all
+# methods to second order convergence.
+TE_GRADING = 1.5
+
+# Maximum number of refinement steps of a mixed precision solve
+MAX_REFINEMENTS = 10
+
+# Number of rows of the influence matrix that are assembled at once
+ASSEMBLY_BLOCK_SIZE = 64
+
+INIT_ARGS = (
+    "airfoil",
+    "n_panels",
+    "spacing",
+    "solver",
+    "preconditioner",
+    "tolerance",
+    "multipole_order",
+    "opening_angle",
+    "precision",
+    "storage_dir",
+    "backend",
+    "profile",
+)
+
+
+def budgeted_solve(
+    solve: Callable[[], Tuple[np.ndarray, Dict[str, Any]]]
+) -> Tuple[np.ndarray, Dict[str, Any]]:
+    """Runs ``solve`` within :py:func:`gammapy.config.threads`.
+
+    Args:
+        solve: Returns a solution and the metadata of the solver
+
+    Returns:
+        The solution and the metadata, to which the thread budget of
+        the solve is added as ``metadata["threads"]``.
+    """
+    with threads() as budget:
+        solution, metadata = solve()
+    return solution, {**metadata, "threads": budget}
+
 
 class FlowSolution:
     """Transforms a panel method solution into physical quantitites.
@@ -58,14 +137,28 @@ class FlowSolution:
     pressure-coefficient is desired, then the equation for other
     physical quantities, such as the lift coefficient, are not called.
 
+    Physical quantities can also be obtained in superposition mode. In
+    this case ``basis_circulations`` holds the two solutions at an
+    Angle of Attack of 0 and 90 degree. Since the Right-Hand-Side of
+    the linear system is linear in the flow direction (cos, sin), the
+    quantities at any number of AoAs are then obtained with a cheap
+    (N, 2) @ (2, N_alpha) product instead of a linear solve.
+
     Args:
         method: The :py:class:`PanelMethod` used to obtain circulations
         circulations: Output singularity strengths from
             :py:class:`PanelMethod`. Assumed to contain N columns
             pertaining to each Angle of Attack specified by ``alpha``.
+            Can be None if ``basis_circulations`` is supplied.
         density: Density of air in SI kilogram per meter cubed
         velocity: Free-stream velocity in SI meter per second
         alpha: Angle of Attack in SI degree.
+        basis_circulations: Singularity strengths at an AoA of 0 and
+            90 degree as the columns of a (N, 2) array. Defaults to
+            None.
+        metadata: Information reported by the linear solver, such as
+            the number of iterations of an iterative solver. Defaults
+            to an empty dictionary.
 
     Attributes:
         delta lift:
@@ -79,12 +172,64 @@ class FlowSolution:
     def __init__(
         self,
         method: object,
-        circulations: np.ndarray,
+        circulations: Optional[np.ndarray],
         alpha: Union[float, Sequence[float]],
+        basis_circulations: Optional[np.ndarray] = None,
+        metadata: Optional[Dict[str, Any]] = None,
     ):
         self.method = method
-        self.circulations = circulations
         self.alpha = alpha
+        self.basis_circulations = basis_circulations
+        self.metadata = {} if metadata is None else metadata
+        if circulations is not None:
+            # Shadows the superimposed circulations cached_property
+            self.circulations = circulations
+        elif basis_circulations is None:
+            raise ValueError(
+                "Either `circulations` or `basis_circulations` must be "
+                "supplied to obtain a FlowSolution"
+            )
+
+    @property
+    def superposition(self) -> bool:
+        """Returns if the solution is built from basis circulations."""
+        return self.basis_circulations is not None
+
+    @cached_property
+    def flow_directions(self) -> np.ndarray:
+        """Free-stream direction of each AoA with shape (N_alpha, 2)."""
+        return self.method.get_flow_direction(self.alpha)
+
+    @cached_property
+    def circulations(self) -> np.ndarray:
+        """Circulations superimposed from the basis circulations."""
+        return self.superimpose(self.basis_circulations)
+
+    def velocities_at(self, points: np.ndarray) -> np.ndarray:
+        """Flow velocities at off-body ``points`` for each AoA.
+
+        Args:
+            points: Field points as a set of row vectors
+
+        Returns:
+            Velocity vectors normalized by the free-stream velocity with
+            shape (N_points, 2, N_alpha).
+        """
+        strengths = self.method.singularity_strengths(self.circulations)
+        induced = self.method.induced_velocities(points, strengths)
+        return induced + self.flow_directions.T[None, :, :]
+
+    def superimpose(self, basis_quantity: np.ndarray) -> np.ndarray:
+        """Superimposes a quantity linear in the flow direction.
+
+        Args:
+            basis_quantity: Quantity evaluated at an Angle of Attack of
+                0 and 90 degree as the columns of a (N, 2) array.
+
+        Returns:
+            The quantity at all AoAs with shape (N, N_alpha).
+        """
+        return basis_quantity @ self.flow_directions.T
 
     # @cached_property
     # def delta_lift(self):
@@ -105,8 +250,17 @@ class FlowSolution:
     @cached_property
     def delta_pressure_coefficients(self):
         """Pressure coefficient change across each panel."""
+        if self.superposition:
+            return self.superimpose(
+                2 * self.basis_circulations / self.method.panels.lengths
+            )
         return 2 * self.circulations / self.method.panels.lengths
 
+    @cached_property
+    def delta_pressure_locations(self) -> np.ndarray:
+        """Chord-wise location of each pressure coefficient change."""
+        return self.method.panels.points_at(0.5)[:, 0]
+
     @cached_property
     def pressure_coefficients(self):
         """Pressure coefficient measured on each panel."""
@@ -122,14 +276,139 @@ class FlowSolution:
     @cached_property
     def lift_coefficient(self) -> float:
         """Resultant lift coefficient of the current panel geometry."""
+        if self.superposition:
+            # Avoids forming the (N, N_alpha) circulations array
+            return np.sum(2 * self.basis_circulations, axis=0) @ (
+                self.flow_directions.T
+            )
         return np.sum(2 * self.circulations, axis=0)
 
+    @cached_property
+    def circulation_lift_coefficient(self) -> np.ndarray:
+        """Lift coefficient of the total circulation of the panels.
+
+        The lift follows from the total circulation by the
+        Kutta-Joukowski theorem, refer to
+        :py:attr:`PanelMethod.circulation_weights`.
+        """
+        method = self.method
+        weights = 2 * method.circulation_weights
+        if self.superposition:
+            strengths = method.singularity_strengths(self.basis_circulations)
+            return weights @ strengths @ self.flow_directions.T
+        return weights @ method.singularity_strengths(self.circulations)
+
+    @cached_property
+    def unknowns(self) -> np.ndarray:
+        """Solution of the linear system including auxiliary unknowns.
+
+        The solution is recovered with the cached factorization of the
+        method, hence this costs an O(N^2) solve per AoA.
+        """
+        method = self.method
+        if self.superposition:
+            return self.superimpose(method.basis_circulations)
+        return method.solve_system(method.get_rhs(self.alpha))[0]
+
+    def circulation_lift_sensitivities(self) -> Dict[str, np.ndarray]:
+        """Gradients of :py:attr:`circulation_lift_coefficient`.
+
+        The differentiated functional is the Kutta-Joukowski lift of
+        the total circulation Cl = 2 w . s, with the strengths s and the
+        :py:attr:`PanelMethod.circulation_weights` w. This differs from
+        :py:attr:`lift_coefficient`, which sums the raw unknowns. The
+        lift is linear in the unknowns x of the system A x = b, i.e.
+        Cl = g . x, hence its total derivative w.r.t. a node coordinate
+        is::
+
+            dCl = 2 s . dw + l . (db - dA x)
+
+        The adjoint solution l of A^T l = g is obtained once with the
+        cached factorization of the method for all node coordinates and
+        AoAs. The derivatives of the system follow from
+        :py:meth:`PanelMethod.geometric_derivatives`.
+
+        Returns:
+            The gradients w.r.t. the "nodes" with shape
+            (N + 1, 2, N_alpha) and, for a :py:class:`NACA4Airfoil`,
+            w.r.t. each of its :py:data:`NACA4Airfoil.PARAMETERS` with
+            shape (N_alpha,).
+
+        Raises:
+            NotImplementedError: If the circulation lift of the method
+                does not converge to the lift of the airfoil, see
+                :py:attr:`PanelMethod.CONVERGED_CIRCULATION_LIFT`.
+        """
+        method = self.method
+        if not method.CONVERGED_CIRCULATION_LIFT:
+            raise NotImplementedError(
+                f"The circulation lift of {type(method).__name__} does not "
+                "converge to the lift of the airfoil, hence its "
+                "sensitivities are not provided"
+            )
+        derivatives = method.geometric_derivatives()
+        n_unknowns = method.unit_rhs_vector.shape[0]
+
+        # Strengths of the singularities per unknown of the system
+        strengths = method.singularity_strengths(
+            method.trim_circulations(np.eye(n_unknowns))
+        )
+        functional = 2 * method.circulation_weights @ strengths
+        adjoint = method.solve_adjoint(functional)
+
+        explicit = 2 * derivatives["weights"].T @ (
+            method.singularity_strengths(self.circulations)
+        )
+        adjoint = np.repeat(adjoint[:, None], explicit.shape[1], axis=1)
+        return self.adjoint_gradients(adjoint, explicit, derivatives)
+
+    def adjoint_gradients(
+        self,
+        adjoint: np.ndarray,
+        explicit: np.ndarray,
+        derivatives: Dict[str, csr_matrix],
+    ) -> Dict[str, np.ndarray]:
+        """Gradients of a functional from its adjoint solution.
+
+        Args:
+            adjoint: Adjoint solution l of A^T l = dJ/dx with shape
+                (N_unknowns, N_alpha)
+            explicit: Explicit derivatives of the functional J w.r.t.
+                the node coordinates with shape (2 (N + 1), N_alpha)
+            derivatives: Output of
+                :py:meth:`PanelMethod.geometric_derivatives`
+
+        Returns:
+            The gradients of :py:meth:`circulation_lift_sensitivities`.
+        """
+        method = self.method
+        unknowns = self.unknowns
+        n_coords, n_alpha = explicit.shape
+
+        # Residual of A x = -U d, where U is the unit_rhs_vector
+        residual = adjoint[:, None, :] * unknowns[None, :, :]
+        rotation = adjoint[:, None, :] * self.flow_directions.T[None, :, :]
+        gradient = (
+            explicit
+            - derivatives["normal"].T @ residual.reshape(-1, n_alpha)
+            - derivatives["rhs"].T @ rotation.reshape(-1, n_alpha)
+        )
+
+        gradients = {"nodes": gradient.reshape(n_coords // 2, 2, n_alpha)}
+        if type(method.airfoil) is NACA4Airfoil:
+            parameters = np.einsum(
+                "nkp,nka->pa", method.shape_derivatives, gradients["nodes"]
+            )
+            gradients.update(zip(NACA4Airfoil.PARAMETERS, parameters))
+        return gradients
+
     def plot_delta_cp(self, alpha: Optional[float] = None):
+        """Plots the pressure coefficient difference along the chord."""
         fig, ax = plt.subplots()
         alpha_array = np.array(self.alpha)
         alpha_idx = (alpha_array == alpha) if alpha is not None else ...
         ax.plot(
-            self.method.panels.points_at(0.5)[:, 0],
+            self.delta_pressure_locations,
             self.delta_pressure_coefficients[:, alpha_idx],
             marker="o",
             markeredgecolor="black",
@@ -146,6 +425,7 @@ class FlowSolution:
         ax.set_ylabel("Pressure Coefficient Difference $\\Delta C_P$")
 
     def plot_pressure_distribution(self, alpha: Optional[float] = None):
+        """Plots the pressure coefficient over both surfaces."""
         fig, ax = plt.subplots()
         cp = self.pressure_coefficients
         stag_idx = np.argwhere(cp == np.max(cp))[0, 0]
@@ -175,6 +455,7 @@ class FlowSolution:
         return fig, ax
 
     def plot_lift_gradient(self, label: Optional[str] = "Numerical Solution"):
+        """Plots the lift coefficient against the angle of attack."""
         if self.lift_coefficient.size < 2:
             raise ValueError(
                 "A lift gradient plot can only be generated when more "
@@ -201,22 +482,52 @@ class FlowSolution:
 
 class ThickFlowSolution(FlowSolution):
     # TODO find a way to handle differing size due to the Kutta condition
+    def tangent_product(self, circulations: np.ndarray) -> np.ndarray:
+        """Multiplies the tangent influence matrix with the strengths.
+
+        The dense tangent influence matrix is only used if it was
+        already assembled, i.e. by a :py:class:`BatchPanelMethod`.
+        Otherwise, the product is evaluated directly from the influence
+        coefficient kernels, which costs a single O(N^2) pass over all
+        panel pairs for all columns of ``circulations`` at once.
+        Out-of-core methods stream the memory-mapped tangent matrix
+        from disk in blocks of rows.
+        """
+        method = self.method
+        if "influence_matrices" in vars(method):
+            tangent_im = method.influence_matrices["tangent"][:-1, :-1]
+            return tangent_im @ circulations
+        if method.storage_dir is not None and not method.matrix_free:
+            tangent_im = method.mapped_influence_matrices["tangent"]
+            return stream_rows(tangent_im[:-1, :-1], circulations)
+        # Padding the trimmed singularity strengths with zeros
+        n_rows, n_cols = circulations.shape
+        padded = np.zeros((n_rows + 1, n_cols))
+        padded[:-1] = circulations
+        return method.tangent_matvec(padded)[:n_rows]
+
     @cached_property
     def normalized_induced_velocities(self):
-        return (
-            self.method.influence_matrices["tangent"][:-1, :-1]
-            @ self.circulations
-        )
+        if self.superposition:
+            return self.superimpose(
+                self.tangent_product(self.basis_circulations)
+            )
+        return self.tangent_product(self.circulations)
 
     @cached_property
     def tangential_freestream_velocities(self):
-        return (
-            self.method.panels.tangents
-            @ self.method.get_flow_direction(self.alpha).T
-        )
+        return self.superimpose(self.method.collocation_tangents)
 
     @cached_property
     def pressure_coefficients(self):
+        if self.superposition:
+            # Superimposing the tangent velocities at 0 and 90 degree
+            # directly yields the total tangent velocity at each AoA
+            basis_velocities = (
+                self.tangent_product(self.basis_circulations)
+                + self.method.collocation_tangents
+            )
+            return 1 - self.superimpose(basis_velocities) ** 2
         return (
             1
             - (
@@ -226,6 +537,103 @@ class ThickFlowSolution(FlowSolution):
             ** 2
         )
 
+    @cached_property
+    def lift_directions(self) -> np.ndarray:
+        """Lift direction of each AoA with shape (N_alpha, 2)."""
+        return self.flow_directions[:, ::-1] * (-1, 1)
+
+    @cached_property
+    def pressure_lift_coefficient(self) -> np.ndarray:
+        """Lift coefficient of the integrated pressure distribution.
+
+        The pressure coefficient at each collocation point acts on the
+        :py:attr:`PanelMethod.collocation_lengths` of the surface, i.e.
+        a midpoint rule over the panels of one collocation point each.
+        Unlike :py:attr:`lift_coefficient` this includes the
+        discretization error of the pressure distribution.
+        """
+        method = self.method
+        lengths = np.asarray(method.collocation_lengths)
+        normals = np.asarray(method.collocation_normals)
+        projections = normals @ self.lift_directions.T
+        pressures = np.asarray(self.pressure_coefficients)
+        return -np.sum(pressures * projections * lengths, axis=0)
+
+    def pressure_lift_sensitivities(self) -> Dict[str, np.ndarray]:
+        """Gradients of :py:attr:`pressure_lift_coefficient`.
+
+        With the tangent velocity Vt = T P x + t . d, where T is the
+        tangent influence matrix, P the trimming of the unknowns x and t
+        the panel tangent, the pressure lift is::
+
+            Cl = -sum((1 - Vt^2) (n . e) l)
+
+        for the normal n and length l of each panel and the lift
+        direction e. The adjoint solution of A^T y = P^T T^T mu with
+        mu = 2 Vt (n . e) l then yields the gradients as in
+        :py:meth:`circulation_lift_sensitivities`, where one adjoint
+        solve is required per AoA.
+
+        Returns:
+            The gradients of :py:meth:`circulation_lift_sensitivities`.
+
+        Raises:
+            NotImplementedError: If the method does not evaluate a
+                single pressure coefficient per panel, or does not
+                provide geometric derivatives.
+        """
+        # Deferred import, the derivative kernels depend on this module
+        from gammapy.solver.derivatives import length_derivatives
+
+        method = self.method
+        panels = method.panels
+        if len(method.collocation_points) != panels.n_panels:
+            raise NotImplementedError(
+                f"{type(method).__name__} does not evaluate a single "
+                "pressure coefficient per panel, which the pressure lift "
+                "sensitivities require"
+            )
+        derivatives = method.geometric_derivatives(tangent=True)
+        tangent_im = method.influence_matrices["tangent"]
+        n_panels = panels.n_panels
+        n_unknowns = method.unit_rhs_vector.shape[0]
+        n_alpha = self.flow_directions.shape[0]
+
+        # Trimmed unknowns padded to the columns of the tangent matrix
+        trimming = method.trim_circulations(np.eye(n_unknowns))
+        padded = np.zeros((tangent_im.shape[1], n_alpha))
+        padded[: trimming.shape[0]] = self.circulations
+
+        velocities = (
+            self.normalized_induced_velocities
+            + self.tangential_freestream_velocities
+        )
+        pressures = 1 - velocities ** 2
+        lengths = np.asarray(panels.lengths)
+        projections = np.asarray(panels.normals) @ self.lift_directions.T
+        weights = np.zeros((tangent_im.shape[0], n_alpha))
+        weights[:n_panels] = 2 * velocities * projections * lengths
+        adjoint = method.solve_adjoint(
+            trimming.T @ (tangent_im.T @ weights)[: trimming.shape[0]]
+        )
+
+        # The tangent t = (n_y, -n_x) of the free-stream term rotates
+        # with the normal, as does the projection of the normal
+        directions = self.flow_directions.T[None, :, :]
+        normal_weights = np.zeros((n_unknowns, 2, n_alpha))
+        normal_weights[:n_panels] = (
+            weights[:n_panels, None] * directions[:, ::-1] * [[-1], [1]]
+            - (pressures * lengths)[:, None]
+            * self.lift_directions.T[None, :, :]
+        )
+        tangent_weights = weights[:, None, :] * padded[None, :, :]
+        explicit = (
+            derivatives["tangent"].T @ tangent_weights.reshape(-1, n_alpha)
+            + derivatives["rhs"].T @ normal_weights.reshape(-1, n_alpha)
+            - length_derivatives(panels).T @ (pressures * projections)
+        )
+        return self.adjoint_gradients(adjoint, explicit, derivatives)
+
 
 class PanelMethod(metaclass=ABCMeta):
     """Defines an Abstract Base Class (ABC) for all panel methods.
@@ -239,30 +647,154 @@ class PanelMethod(metaclass=ABCMeta):
         airfoil: An instance of :py:class:`Airfoil`
         n_points: Number of points to sample on the chord-line.
         spacing: Sets the spacing used for the points on the
-            chord-line between 0-1. Available options are "cosine"
-            and "linear". A linear spacing will return an array of
-            points that are equidistant from each other. Whereas a
-            cosine spacing increases accuracy of some aerodynamic
-            solvers by increasing the density of points close to the
-            leading and trailing edges. Defaults to "cosine".
+            chord-line between 0-1. Available options are "cosine",
+            "linear" and "graded". A linear spacing will return an
+            array of points that are equidistant from each other.
+            Whereas a cosine spacing increases accuracy of some
+            aerodynamic solvers by increasing the density of points
+            close to the leading and trailing edges. A graded spacing
+            refines the cosine spacing further towards the trailing
+            edge. Defaults to "cosine".
+
+    Keyword Arguments:
+        solver: Sets the solver of the linear system. Available options
+            are "direct", which uses a cached LU factorization of the
+            dense :py:attr:`influence_matrix`, "hmatrix", which uses an
+            approximate LU factorization of the compressed
+            :py:attr:`hierarchical_matrix`, and the matrix-free Krylov
+            solvers "gmres" and "bicgstab". Defaults to "direct".
+        preconditioner: Preconditioner used by the Krylov solvers.
+            Available options are "block-jacobi", "nearest-neighbour"
+            and None. Defaults to "block-jacobi".
+        tolerance: Relative residual tolerance of the Krylov solvers
+            and relative accuracy of the low-rank blocks of the
+            :py:attr:`hierarchical_matrix`. Defaults to 1e-10.
+        multipole_order: Highest power of the multipole expansions used
+            to accelerate the matrix-free products and the off-body
+            velocities. Defaults to None, which evaluates all
+            interactions exactly.
+        opening_angle: Maximum ratio of the radius of a panel cluster to
+            its distance from a target for which the multipole
+            expansion is used. Defaults to 0.5.
+        precision: Sets the precision of the "direct" solver. Available
+            options are "double" and "mixed". The latter assembles and
+            factorizes the :py:attr:`single_precision_matrix` and
+            refines the solution with float64 residuals until the
+            relative residual is below ``tolerance``. Defaults to
+            "double".
+        storage_dir: Directory in which the influence matrices of the
+            "direct" solver are stored as memory-mapped files. These
+            are assembled in blocks of rows and factorized out-of-core,
+            hence the matrices are never held in memory. Defaults to
+            None, which keeps all matrices in memory.
+        backend: Backend of the kernels that assemble the influence
+            matrices. Available options are "numba", "numpy",
+            "threaded", "tiled", "nodal" and "process", refer to
+            :py:mod:`gammapy.solver.backends`.
+            Defaults to None, which uses the backend configured with
+            :py:func:`gammapy.config.backend`.
+        profile: Compilation profile of the numba kernels. Available
+            options are "fast", "strict", which yields bit-reproducible
+            results, and "checked", which raises a FloatingPointError
+            if a kernel results in non-finite values. Refer to
+            :py:mod:`gammapy.jit`. Defaults to "fast".
+
+    Raises:
+        ValueError: If an invalid ``solver``, ``preconditioner``,
+            ``multipole_order``, ``opening_angle``, ``precision``,
+            ``storage_dir``, ``backend`` or ``profile`` is specified.
     """
 
+    # Set on methods created by with_perturbed_nodes
+    low_rank_update: Optional[LowRankUpdate] = None
+
+    # Options that are supported by the specialization
+    SUPPORTED_SOLVERS: Tuple[str, ...] = SOLVERS
+    SUPPORTED_PRECISIONS: Tuple[str, ...] = PRECISIONS
+    SUPPORTS_MULTIPOLE: bool = True
+
+    # If the circulation lift converges to the lift of the airfoil
+    CONVERGED_CIRCULATION_LIFT: bool = True
+
     def __init__(
         self,
         airfoil: Airfoil,
         n_panels: int,
         spacing: Optional[str] = "cosine",
+        *,
+        solver: str = "direct",
+        preconditioner: Optional[str] = "block-jacobi",
+        tolerance: float = 1e-10,
+        multipole_order: Optional[int] = None,
+        opening_angle: float = 0.5,
+        precision: str = "double",
+        storage_dir: Optional[str] = None,
+        backend: Optional[str] = None,
+        profile: str = DEFAULT_PROFILE,
     ):
+        if solver not in self.SUPPORTED_SOLVERS:
+            raise ValueError(
+                f'The supplied `solver` value of "{solver}" is invalid. '
+                f"Please specify one of: {self.SUPPORTED_SOLVERS}."
+            )
+        if preconditioner not in PRECONDITIONERS:
+            raise ValueError(
+                f'The supplied `preconditioner` value of "{preconditioner}" '
+                f"is invalid. Please specify one of: {PRECONDITIONERS}."
+            )
+        if multipole_order is not None and multipole_order < 1:
+            raise ValueError(
+                "The supplied `multipole_order` must be a positive integer "
+                "or None"
+            )
+        if multipole_order is not None and not self.SUPPORTS_MULTIPOLE:
+            raise ValueError(
+                f"{type(self).__name__} does not support multipole "
+                "acceleration, the supplied `multipole_order` must be None"
+            )
+        if not 0 < opening_angle < 1:
+            raise ValueError(
+                "The supplied `opening_angle` must lie between 0 and 1"
+            )
+        if precision not in self.SUPPORTED_PRECISIONS:
+            raise ValueError(
+                f'The supplied `precision` value of "{precision}" is '
+                "invalid. Please specify one of: "
+                f"{self.SUPPORTED_PRECISIONS}."
+            )
+        if precision == "mixed" and solver != "direct":
+            raise ValueError(
+                'A "mixed" `precision` is only available with the "direct" '
+                "solver"
+            )
+        if storage_dir is not None and (
+            solver != "direct" or precision != "double"
+        ):
+            raise ValueError(
+                "A `storage_dir` is only available with the \"direct\" "
+                'solver in "double" `precision`'
+            )
+        if backend is not None:
+            resolve_backend(backend)
+        resolve_profile(profile)
         # Setting attributes with object.__setattr__ since
         # PanelMethod.__setattr__ is blocked for these attributes
         super().__setattr__("airfoil", airfoil)
         super().__setattr__("n_panels", n_panels)
         super().__setattr__("spacing", spacing)
+        super().__setattr__("solver", solver)
+        super().__setattr__("preconditioner", preconditioner)
+        super().__setattr__("tolerance", tolerance)
+        super().__setattr__("multipole_order", multipole_order)
+        super().__setattr__("opening_angle", opening_angle)
+        super().__setattr__("precision", precision)
+        super().__setattr__("storage_dir", storage_dir)
+        super().__setattr__("backend", backend)
+        super().__setattr__("profile", profile)
 
     def __setattr__(self, name, value):
         """Makes initialization arguments unsettable."""
-        init_args = ("airfoil", "n_panels", "spacing")
-        if name in init_args:
+        if name in INIT_ARGS:
             raise AttributeError(
                 "Input arguments to a PanelMethod cannot be changed, "
                 "please create a new instance with the new inputs"
@@ -281,6 +813,36 @@ class PanelMethod(metaclass=ABCMeta):
         """Returns the collocation points used in the solution."""
         ...
 
+    @property
+    def collocation_tangents(self) -> np.ndarray:
+        """Unit tangents of the surface at the collocation points.
+
+        Defaults to the panel tangents, which holds if each panel has a
+        single collocation point. These yield the tangential free-stream
+        velocity of a :py:class:`ThickFlowSolution`.
+        """
+        return self.panels.tangents
+
+    @property
+    def collocation_normals(self) -> np.ndarray:
+        """Unit normals of the surface at the collocation points.
+
+        Defaults to the panel normals, which holds if each panel has a
+        single collocation point.
+        """
+        return self.panels.normals
+
+    @property
+    def collocation_lengths(self) -> np.ndarray:
+        """Surface length of each collocation point as a column vector.
+
+        The pressure at each collocation point acts on its length to
+        yield the pressure lift of a :py:class:`ThickFlowSolution`.
+        Defaults to the panel lengths, i.e. the midpoint rule of a
+        single collocation point per panel.
+        """
+        return self.panels.lengths
+
     @property
     @abstractmethod
     def influence_matrix(self) -> np.ndarray:
@@ -302,6 +864,592 @@ class PanelMethod(metaclass=ABCMeta):
         """."""
         ...
 
+    @property
+    def coefficient_shape(self) -> Tuple[int, int]:
+        """Shape of the matrices filled by :py:meth:`assemble`.
+
+        Defaults to one row per collocation point and one column per
+        panel. Specializations can reserve additional rows or columns,
+        i.e. for a Kutta condition, which are left zero.
+        """
+        n_panels = self.panels.n_panels
+        return n_panels, n_panels
+
+    def kernel(self, kernel: Callable) -> Callable:
+        """Returns ``kernel`` compiled with the :py:attr:`profile`.
+
+        All kernels of the panel method should be called through this
+        method, refer to :py:func:`gammapy.jit.profiled`. The kernel
+        runs within the numba thread limit of
+        :py:func:`gammapy.config.limit_numba_threads`.
+        """
+        return limit_numba_threads(profiled(kernel, self.profile))
+
+    def fill_influence_rows(
+        self,
+        out: np.ndarray,
+        rows: np.ndarray,
+        backend: Optional[str] = None,
+    ) -> None:
+        """Fills influence coefficients of collocation points ``rows``.
+
+        Args:
+            out: Array with shape (1, len(rows), n_unknowns) to fill
+                with the normal influence coefficients, or with shape
+                (2, len(rows), n_unknowns) to fill the tangent
+                influence coefficients as well
+            rows: Indices of the collocation points
+            backend: Backend of the row kernel. Defaults to None, which
+                uses :py:attr:`backend` or the configured backend.
+        """
+        kernel = self.kernel(get_kernel(type(self), backend or self.backend))
+        kernel(out, np.asarray(rows, dtype=np.int64), **self.kernel_args)
+
+    def assemble(
+        self, tangent: bool = False, backend: Optional[str] = None
+    ) -> Dict[str, np.ndarray]:
+        """Assembles the influence matrices of all collocation points.
+
+        Args:
+            tangent: Sets if the tangent influence matrix is assembled
+                alongside the normal influence matrix. Defaults to
+                False.
+            backend: Backend of the row kernel. Defaults to None, which
+                uses :py:attr:`backend` or the configured backend.
+
+        Returns:
+            The "normal" and optionally the "tangent" influence matrix
+            with shape :py:attr:`coefficient_shape`.
+        """
+        n_col_pts = len(self.collocation_points)
+        matrices = zeros(
+            (1 + tangent, *self.coefficient_shape), backend or self.backend
+        )
+        self.fill_influence_rows(
+            matrices[:, :n_col_pts], np.arange(n_col_pts), backend
+        )
+        return dict(zip(("normal", "tangent"), matrices))
+
+    def influence_entries(
+        self, rows: np.ndarray, cols: np.ndarray
+    ) -> np.ndarray:
+        """Returns :py:attr:`influence_matrix` entries at the indices.
+
+        Specializations can override this method to evaluate the
+        entries directly with the influence coefficient kernels, such
+        that blocks or sparse patterns of the matrix, i.e. for a
+        preconditioner, are obtained without assembling the matrix.
+
+        Args:
+            rows: Row index of each entry
+            cols: Column index of each entry
+        """
+        return self.influence_matrix[rows, cols]
+
+    def influence_rows(self, rows: np.ndarray) -> np.ndarray:
+        """Returns complete rows of :py:attr:`influence_matrix`.
+
+        Defaults to evaluating all entries of the rows with
+        :py:meth:`influence_entries`. Specializations can override
+        this when a row is cheaper to evaluate as a whole.
+
+        Args:
+            rows: Indices of the rows
+
+        Returns:
+            The rows with shape (len(rows), N_unknowns).
+        """
+        size = self.unit_rhs_vector.shape[0]
+        row_idx, col_idx = np.meshgrid(rows, np.arange(size), indexing="ij")
+        entries = self.influence_entries(row_idx.ravel(), col_idx.ravel())
+        return entries.reshape(len(rows), size)
+
+    def influence_blocks(self, rows: np.ndarray) -> Dict[str, np.ndarray]:
+        """Returns rows of all matrices stored by an out-of-core solve.
+
+        Defaults to the "system" rows of :py:meth:`influence_rows`.
+        Specializations add the "tangent" rows if their solution
+        requires the tangent influence matrix.
+
+        Args:
+            rows: Indices of the rows
+
+        Returns:
+            The rows of each matrix with shape (len(rows), N_unknowns).
+        """
+        return {"system": self.influence_rows(rows)}
+
+    def streamed_tangent_matvec(self, x: np.ndarray) -> np.ndarray:
+        """Product of the tangent influence matrix and ``x`` by rows.
+
+        The tangent influence coefficients of the collocation points
+        are evaluated in blocks of :py:data:`ASSEMBLY_BLOCK_SIZE` rows
+        and discarded after their product, hence the dense tangent
+        matrix is never stored. This retains the memory bound of the
+        out-of-core and "hmatrix" solvers for methods without a
+        matrix-free tangent product.
+
+        Args:
+            x: Strengths of all columns of :py:attr:`coefficient_shape`
+
+        Returns:
+            Tangent velocities induced at all collocation points.
+        """
+        n_rows = len(self.collocation_points)
+        n_cols = self.coefficient_shape[1]
+        product = np.empty((n_rows, *x.shape[1:]), dtype=np.float64)
+        for start in range(0, n_rows, ASSEMBLY_BLOCK_SIZE):
+            rows = np.arange(start, min(start + ASSEMBLY_BLOCK_SIZE, n_rows))
+            block = np.zeros((2, rows.size, n_cols), dtype=np.float64)
+            self.fill_influence_rows(block, rows)
+            product[rows] = block[1] @ x
+        return product
+
+    def perturbed_unknowns(
+        self, panels: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Rows and columns of the system that depend on ``panels``.
+
+        Defaults to a single row and column per panel, which holds if
+        each panel has one collocation point and one singularity.
+
+        Args:
+            panels: Indices of the panels
+
+        Returns:
+            Indices of the affected rows and columns.
+        """
+        return panels, panels
+
+    def matvec(self, x: np.ndarray) -> np.ndarray:
+        """Returns the product of :py:attr:`influence_matrix` and ``x``.
+
+        Specializations can override this method to evaluate the product
+        without storing the dense matrix, which is used by the
+        matrix-free Krylov solvers.
+        """
+        if self.multipole_order is not None or self.matrix_free:
+            x_2d = x.reshape(x.shape[0], -1)
+            return self.influence_products(x_2d)[0].reshape(x.shape)
+        return self.influence_matrix @ x
+
+    @limit_numba_threads
+    def influence_products(self, x: np.ndarray) -> np.ndarray:
+        """Normal and tangent influence of singularity strengths ``x``.
+
+        The products are approximated with :py:attr:`fast_multipole`
+        if a :py:attr:`multipole_order` is set, otherwise these are
+        evaluated exactly with :py:meth:`kernel_products`.
+
+        Args:
+            x: Singularity strengths with shape (N_singularities, m)
+
+        Returns:
+            Induced normal and tangent velocities at the collocation
+            points with shape (2, N_panels, m).
+        """
+        if self.multipole_order is not None:
+            return self.fast_multipole.products(x)
+        return self.kernel_products(x)
+
+    def kernel_products(self, x: np.ndarray) -> np.ndarray:
+        """Exact normal and tangent influence of ``x``.
+
+        Refer to :py:meth:`influence_products`.
+        """
+        raise NotImplementedError(
+            f"{type(self).__name__} does not provide matrix-free products"
+        )
+
+    @property
+    def multipole_layout(self) -> Dict[str, Any]:
+        """Singularities, targets and near-field kernel of the method.
+
+        Specializations provide the keyword arguments of a
+        :py:class:`~gammapy.solver.multipole.MultipoleTree` except for
+        the accuracy controls.
+        """
+        raise NotImplementedError(
+            f"{type(self).__name__} does not support multipole acceleration"
+        )
+
+    def geometric_derivatives(
+        self, tangent: bool = False
+    ) -> Dict[str, csr_matrix]:
+        """Derivatives of the linear system w.r.t. the panel nodes.
+
+        The derivatives are evaluated in closed form by the kernels of
+        the specialization, hence a gradient w.r.t. all node coordinates
+        requires a single derivative assembly instead of one assembly
+        per perturbed coordinate. Each entry only depends on the nodes
+        of a few panels, hence the derivatives are returned as sparse
+        matrices with a column per node coordinate, ordered as x_0,
+        y_0, x_1, ... for the N + 1 nodes of :py:attr:`panels`.
+
+        Args:
+            tangent: Sets if the derivatives of the tangent influence
+                matrix are evaluated alongside. Defaults to False.
+
+        Returns:
+            The derivatives of the "normal" :py:attr:`influence_matrix`,
+            optionally of the "tangent" influence matrix of
+            :py:meth:`assemble`, of the "rhs" :py:attr:`unit_rhs_vector`
+            and of the :py:attr:`circulation_weights` as "weights". Row
+            r * n_cols + c of a matrix holds the derivatives of entry
+            (r, c), where n_cols is the number of columns of the
+            differentiated array.
+        """
+        raise NotImplementedError(
+            f"{type(self).__name__} does not provide geometric derivatives"
+        )
+
+    @cached_property
+    def shape_derivatives(self) -> np.ndarray:
+        """Derivatives of the panel nodes w.r.t. the airfoil parameters.
+
+        The nodes are sampled on the lower surface from the TE to the LE
+        and back along the upper surface at fixed chord-line fractions,
+        hence they follow from
+        :py:meth:`NACA4Airfoil.surface_derivatives_at`.
+
+        Raises:
+            NotImplementedError: If :py:attr:`airfoil` is not exactly a
+                :py:class:`NACA4Airfoil`, since subclasses can redefine
+                its surface, or :py:attr:`panels` are not sampled in
+                this order.
+
+        Returns:
+            The derivatives with shape (N + 1, 2, 3) w.r.t. the
+            :py:data:`NACA4Airfoil.PARAMETERS`.
+        """
+        if type(self.airfoil) is not NACA4Airfoil:
+            raise NotImplementedError(
+                f"{type(self.airfoil).__name__} does not provide shape "
+                f"derivatives"
+            )
+        sample_u = self.get_sample_parameters(
+            num=(self.n_panels // 2) + 1, spacing=self.spacing
+        )
+        start_pts, end_pts = self.panels.nodes
+        nodes = np.vstack(
+            (
+                self.airfoil.lower_surface_at(sample_u[::-1]),
+                self.airfoil.upper_surface_at(sample_u[1:]),
+            )
+        )
+        panel_nodes = np.vstack((start_pts, end_pts[-1:]))
+        if not np.allclose(nodes, panel_nodes, rtol=0, atol=1e-12):
+            raise NotImplementedError(
+                f"The panels of {type(self).__name__} are not sampled "
+                f"along the airfoil surfaces from TE -> Bottom -> Top -> TE"
+            )
+        return np.vstack(
+            (
+                self.airfoil.surface_derivatives_at(sample_u[::-1], False),
+                self.airfoil.surface_derivatives_at(sample_u[1:], True),
+            )
+        )
+
+    @cached_property
+    @limit_numba_threads
+    def fast_multipole(self):
+        """Multipole tree of the singularities of the method."""
+        # Deferred import, the multipole kernels depend on this module
+        from gammapy.solver.multipole import MultipoleTree
+
+        return MultipoleTree(
+            **self.multipole_layout,
+            order=self.multipole_order,
+            opening_angle=self.opening_angle,
+        )
+
+    def singularity_strengths(self, circulations: np.ndarray) -> np.ndarray:
+        """Strengths of all singularities from trimmed circulations.
+
+        Refer to :py:meth:`trim_circulations`.
+        """
+        return circulations
+
+    @property
+    def circulation_weights(self) -> np.ndarray:
+        """Weights of the strengths that yield the total circulation.
+
+        The total circulation is the dot product of the weights and the
+        :py:meth:`singularity_strengths`, from which the lift follows by
+        the Kutta-Joukowski theorem. Defaults to unit weights of one
+        point vortex per panel.
+        """
+        return np.ones(self.panels.n_panels)
+
+    @limit_numba_threads
+    def induced_velocities(
+        self, points: np.ndarray, strengths: np.ndarray
+    ) -> np.ndarray:
+        """Velocities induced by the singularities at off-body points.
+
+        Args:
+            points: Field points as a set of row vectors
+            strengths: Singularity strengths with shape
+                (N_singularities, m)
+
+        Returns:
+            Induced velocity vectors with shape (N_points, 2, m).
+        """
+        if self.multipole_order is not None:
+            return self.fast_multipole.velocities_at(points, strengths)
+
+        # Deferred import, the multipole kernels depend on this module
+        from gammapy.solver.multipole import direct_velocities
+
+        layout = self.multipole_layout
+        return direct_velocities(
+            layout["pair_coefficients"], layout["dofs"], points, strengths
+        )
+
+    @property
+    def matrix_free(self) -> bool:
+        """Returns if the dense influence matrices should be avoided."""
+        return self.solver != "direct" or self.precision == "mixed"
+
+    @property
+    def border_matrix(self) -> csr_matrix:
+        """Sparse entries of the system not given by the kernels.
+
+        These are the rows and columns of the linear system which are
+        not influence coefficients, i.e. the Kutta condition. The
+        remaining entries of :py:meth:`influence_entries` are smooth,
+        hence the specializations with such entries override this.
+        """
+        size = self.unit_rhs_vector.shape[0]
+        return csr_matrix((size, size), dtype=np.float64)
+
+    @cached_property
+    def hierarchical_matrix(self) -> HMatrix:
+        """Compressed representation of :py:attr:`influence_matrix`.
+
+        Off-diagonal blocks are approximated by Adaptive Cross
+        Approximation from entries obtained with
+        :py:meth:`influence_entries`, hence the dense matrix is never
+        assembled.
+        """
+        border = self.border_matrix
+
+        def kernel_entries(rows: np.ndarray, cols: np.ndarray):
+            border_entries = np.asarray(border[rows, cols]).ravel()
+            return self.influence_entries(rows, cols) - border_entries
+
+        return HMatrix(
+            kernel_entries,
+            size=border.shape[0],
+            border=border,
+            tolerance=self.tolerance,
+        )
+
+    @cached_property
+    def hierarchical_lu(self) -> HMatrix:
+        """Hierarchical LU factorization of the compressed matrix."""
+        return self.hierarchical_matrix.lu()
+
+    @cached_property
+    def krylov_preconditioner(self):
+        """Preconditioner of the Krylov solvers built per geometry."""
+        return build_preconditioner(self, self.preconditioner)
+
+    @cached_property
+    def lu_factors(self) -> Tuple[np.ndarray, np.ndarray]:
+        """LU factorization of :py:attr:`influence_matrix` with pivots.
+
+        The influence matrix only depends on the panel geometry, hence
+        it is factorized once and the factors are reused by all later
+        solves. This reduces the cost of each solve from O(N^3) to
+        O(N^2).
+        """
+        if self.precision == "mixed":
+            return lu_factor(self.single_precision_matrix, check_finite=False)
+        return lu_factor(self.influence_matrix, check_finite=False)
+
+    @property
+    def mirror_maps(self) -> Optional[Tuple[np.ndarray, ...]]:
+        """Mirror symmetry of the system about the chord-line.
+
+        Reflecting a symmetric airfoil about its chord-line maps row i
+        and column j of the influence matrix A onto row R[i] and column
+        C[j], such that::
+
+            A[R[i], C[j]] = r[i] * c[j] * A[i, j]
+
+        Specializations return the maps and signs as ``(R, r, C, c)`` if
+        the panels of :py:attr:`airfoil` are symmetric and their system
+        has this property. Defaults to None.
+        """
+        return None
+
+    @property
+    def symmetric(self) -> bool:
+        """Returns if the system is reduced with :py:attr:`mirror_maps`.
+
+        Only the in-memory "direct" :py:attr:`solver` in "double"
+        :py:attr:`precision` uses the reduction.
+        """
+        return (
+            self.solver == "direct"
+            and self.precision == "double"
+            and self.storage_dir is None
+            and self.mirror_maps is not None
+        )
+
+    @cached_property
+    def symmetric_lu_factors(self) -> Tuple[Tuple[Any, ...], ...]:
+        """LU factorizations of the even and odd half-size systems.
+
+        A solution is split into an even and an odd part with respect
+        to the column map of :py:attr:`mirror_maps`, both of which are
+        described by their values at the representative columns j <=
+        ``col_map[j]``. The influence of the even part is even with
+        respect to the row map and vice versa, hence each part only
+        requires the representative rows i <= ``row_map[i]``. This
+        results in two systems of roughly half the size, which reduces
+        the factorization cost by a factor four. Furthermore, only the
+        representative rows are assembled.
+
+        Returns:
+            The parity, representative rows, representative columns
+            and LU factors of the even and odd systems.
+        """
+        row_map, row_signs, col_map, col_signs = self.mirror_maps
+        row_idx, col_idx = np.arange(row_map.size), np.arange(col_map.size)
+        all_rows = np.flatnonzero(row_idx <= row_map)
+        block = self.influence_rows(all_rows)
+
+        systems = []
+        for parity in (1, -1):
+            # Unknowns and equations that map onto themselves only exist
+            # in the system of the parity of their sign
+            rows = np.flatnonzero(
+                (row_idx < row_map)
+                | ((row_idx == row_map) & (row_signs == parity))
+            )
+            cols = np.flatnonzero(
+                (col_idx < col_map)
+                | ((col_idx == col_map) & (col_signs == parity))
+            )
+            mirror_signs = np.where(
+                col_map[cols] != cols, parity * col_signs[cols], 0
+            )
+            rows_block = block[np.searchsorted(all_rows, rows)]
+            matrix = (
+                rows_block[:, cols]
+                + mirror_signs * rows_block[:, col_map[cols]]
+            )
+            factors = lu_factor(matrix, check_finite=False)
+            systems.append((parity, rows, cols, factors))
+        return tuple(systems)
+
+    def solve_symmetric(
+        self, rhs: np.ndarray, transpose: bool = False
+    ) -> np.ndarray:
+        """Solves the system with the :py:attr:`symmetric_lu_factors`.
+
+        Args:
+            rhs: Right-Hand-Side (RHS) of the linear system with shape
+                (N_panels,) or (N_panels, N_alpha).
+            transpose: Sets if the transposed system is solved instead.
+                Defaults to False.
+
+        Returns:
+            Solution of the linear system with the same shape as
+            ``rhs``.
+        """
+        row_map, row_signs, col_map, col_signs = self.mirror_maps
+        rhs_2d = rhs.reshape(rhs.shape[0], -1)
+        if transpose:
+            solution = np.zeros((row_map.size, rhs_2d.shape[1]))
+            for parity, rows, cols, factors in self.symmetric_lu_factors:
+                # Transposing the mirroring of the unknowns
+                mirror_signs = np.where(
+                    col_map[cols] != cols, parity * col_signs[cols], 0
+                )
+                mirrored = mirror_signs[:, None] * rhs_2d[col_map[cols]]
+                rhs_part = rhs_2d[cols] + mirrored
+                part = lu_solve(factors, rhs_part, trans=1, check_finite=False)
+
+                # Transposing the projection onto the equations
+                solution[rows] += 0.5 * part
+                solution[row_map[rows]] += (
+                    0.5 * parity * row_signs[rows, None] * part
+                )
+            return solution.reshape(rhs.shape)
+
+        solution = np.zeros((col_map.size, rhs_2d.shape[1]))
+        for parity, rows, cols, factors in self.symmetric_lu_factors:
+            # Projecting the RHS onto the equations of this parity
+            rhs_part = 0.5 * (
+                rhs_2d[rows]
+                + parity * row_signs[rows, None] * rhs_2d[row_map[rows]]
+            )
+            part = lu_solve(factors, rhs_part, check_finite=False)
+
+            # Mirroring the representative unknowns to the full solution
+            part_full = np.zeros_like(solution)
+            part_full[col_map[cols]] = parity * col_signs[cols, None] * part
+            part_full[cols] = part
+            solution += part_full
+        return solution.reshape(rhs.shape)
+
+    @cached_property
+    def storage_path(self) -> str:
+        """Directory of the memory-mapped files of this instance.
+
+        The directory is created inside :py:attr:`storage_dir` and is
+        removed once the instance is garbage collected.
+        """
+        path = tempfile.mkdtemp(prefix="gammapy-", dir=self.storage_dir)
+        weakref.finalize(self, shutil.rmtree, path, ignore_errors=True)
+        return path
+
+    @cached_property
+    def mapped_influence_matrices(self) -> Dict[str, np.memmap]:
+        """Memory-mapped matrices of :py:meth:`influence_blocks`.
+
+        The matrices are assembled directly into files in
+        :py:attr:`storage_path` in blocks of rows. Note that the
+        "system" matrix is overwritten by its LU factors once
+        :py:attr:`out_of_core_lu` is accessed.
+        """
+        size = self.unit_rhs_vector.shape[0]
+        matrices = {}
+        for start in range(0, size, ASSEMBLY_BLOCK_SIZE):
+            stop = min(start + ASSEMBLY_BLOCK_SIZE, size)
+            blocks = self.influence_blocks(np.arange(start, stop))
+            if not matrices:
+                shapes = {k: (size, v.shape[1]) for k, v in blocks.items()}
+                matrices = open_memmaps(self.storage_path, shapes)
+            for name, block in blocks.items():
+                matrices[name][start:stop] = block
+        for matrix in matrices.values():
+            matrix.flush()
+        return matrices
+
+    @cached_property
+    def out_of_core_lu(self) -> OutOfCoreLU:
+        """In-place LU factorization of the mapped system matrix."""
+        return OutOfCoreLU(self.mapped_influence_matrices["system"])
+
+    @cached_property
+    def single_precision_matrix(self) -> np.ndarray:
+        """Float32 copy of :py:attr:`influence_matrix`.
+
+        The matrix is assembled in blocks of rows with
+        :py:meth:`influence_entries`, hence the float64 matrix is never
+        stored and only half the memory is required.
+        """
+        size = self.unit_rhs_vector.shape[0]
+        matrix = np.empty((size, size), dtype=np.float32)
+        for start in range(0, size, ASSEMBLY_BLOCK_SIZE):
+            stop = min(start + ASSEMBLY_BLOCK_SIZE, size)
+            matrix[start:stop] = self.influence_rows(np.arange(start, stop))
+        return matrix
+
     @property
     def solution_class(self) -> Type[FlowSolution]:
         """Flow solution class used to obtain physical quantities.
@@ -312,17 +1460,80 @@ class PanelMethod(metaclass=ABCMeta):
         """
         return FlowSolution
 
+    @cached_property
+    def basis_solution(self) -> Tuple[np.ndarray, Dict[str, Any]]:
+        """Solves the linear system at an AoA of 0 and 90 degree.
+
+        The Right-Hand-Side is the projection of the flow direction
+        (cos, sin) onto :py:attr:`unit_rhs_vector`. Therefore, the
+        solution at an arbitrary Angle of Attack is a linear combination
+        of the two columns of the returned (N, 2) array.
+
+        Returns:
+            The (N, 2) basis circulations and the solver metadata.
+        """
+        return self.solve_system(-self.unit_rhs_vector)
+
+    @property
+    def basis_circulations(self) -> np.ndarray:
+        """Solutions of the linear system at an AoA of 0 and 90 deg."""
+        return self.basis_solution[0]
+
     # TODO a solution should have cp, cl, delta cp THATS IT
     def solve_for(
-        self, alpha: Union[float, Sequence[float]], plot: bool = False,
+        self,
+        alpha: Union[float, Sequence[float]],
+        plot: bool = False,
+        superposition: bool = False,
     ) -> FlowSolution:
-        """."""
+        """Returns a :py:class:`FlowSolution` with lazy attributes.
+
+        Args:
+            alpha: A value or sequence of Angle of Attack in SI degree
+            plot: Sets if plots should be shown on initialization.
+                This evaluates all attributes and negates the
+                laziness of the returned object. Defaults to False.
+            superposition: Sets if the solution should be superimposed
+                from :py:attr:`basis_circulations`. This removes all
+                linear solves for large sweeps of ``alpha`` after the
+                first call. Defaults to False.
+
+        The linear solve runs within :py:func:`gammapy.config.threads`,
+        hence the thread limits of an enclosing context or environment
+        variables apply. The thread budget of the solve is reported as
+        ``metadata["threads"]``.
+        """
+        if superposition:
+            basis_circulations, metadata = budgeted_solve(
+                lambda: self.basis_solution
+            )
+            return self.solution_class(
+                method=self,
+                circulations=None,
+                alpha=alpha,
+                basis_circulations=self.trim_circulations(basis_circulations),
+                metadata=metadata,
+            )
+        circulations, metadata = budgeted_solve(
+            lambda: self.solve_system(self.get_rhs(alpha))
+        )
         return self.solution_class(
             method=self,
-            circulations=self.get_circulations(alpha),
+            circulations=self.trim_circulations(circulations),
             alpha=alpha,
+            metadata=metadata,
         )
 
+    def trim_circulations(self, circulations: np.ndarray) -> np.ndarray:
+        """Removes auxiliary unknowns from a solution of the system.
+
+        Specializations that append additional unknowns to the linear
+        system should override this method such that only the
+        singularity strengths are passed on to the
+        :py:attr:`solution_class`.
+        """
+        return circulations
+
     def get_circulations(
         self, alpha: Union[float, Sequence[float]]
     ) -> np.ndarray:
@@ -366,16 +1577,254 @@ class PanelMethod(metaclass=ABCMeta):
             Angle of Attack (AoA).
         """
 
-        a_matrix = self.influence_matrix
+        # Solution of the system has dimensions (N_panels, N_alpha)
+        circulations, _ = self.solve_system(self.get_rhs(alpha))
+        return circulations
+
+    def with_perturbed_nodes(
+        self, indices: Sequence[int], points: np.ndarray
+    ) -> "PanelMethod":
+        """Returns a new method with panel nodes moved to ``points``.
+
+        Only the rows and columns of the influence matrix that depend on
+        the panels adjacent to the moved nodes are evaluated for the new
+        geometry. The new system is then solved with the solver of this
+        method and a Sherman-Morrison-Woodbury correction of rank k,
+        the number of affected rows and columns. Hence, the new matrix
+        is neither assembled nor factorized, which reduces the cost of
+        an update from O(N^3) to O(k N^2).
+
+        Args:
+            indices: Indices of the k moved nodes
+            points: New locations of the nodes with shape (k, 2)
+
+        Returns:
+            A new instance of the same class with the updated
+            :py:attr:`panels`, which can be perturbed further.
+        """
+        indices = np.atleast_1d(np.asarray(indices, dtype=np.int64))
+        start_pts, end_pts = self.panels.nodes
+        nodes = np.vstack((start_pts, end_pts[-1:]))
+        nodes[indices] = points
+
+        # Only the initialization arguments are copied, the cached
+        # properties of the new geometry are evaluated lazily
+        method = copy.copy(self)
+        for name in set(vars(method)) - set(INIT_ARGS):
+            del vars(method)[name]
+        vars(method)["panels"] = Panel2D(nodes)
+
+        # Panels that start or end at a moved node
+        panels = np.union1d(indices - 1, indices)
+        panels = panels[(panels >= 0) & (panels < self.panels.n_panels)]
+        rows, cols = self.perturbed_unknowns(panels)
+
+        # The update U @ V.T replaces the affected rows first and then
+        # the remainder of the affected columns
+        size = self.unit_rhs_vector.shape[0]
+        other_rows = np.setdiff1d(np.arange(size), rows)
+        row_idx = np.repeat(other_rows, cols.size)
+        col_idx = np.tile(cols, other_rows.size)
+        u = np.zeros((size, rows.size + cols.size), dtype=np.float64)
+        v = np.zeros_like(u)
+        u[rows, np.arange(rows.size)] = 1
+        v[:, : rows.size] = (
+            method.influence_rows(rows) - self.influence_rows(rows)
+        ).T
+        u[other_rows, rows.size :] = (
+            method.influence_entries(row_idx, col_idx)
+            - self.influence_entries(row_idx, col_idx)
+        ).reshape(other_rows.size, cols.size)
+        v[cols, rows.size + np.arange(cols.size)] = 1
+
+        method.low_rank_update = LowRankUpdate(
+            lambda rhs: self.solve_system(rhs)[0], u, v
+        )
+        return method
+
+    def get_rhs(self, alpha: Union[float, Sequence[float]]) -> np.ndarray:
+        """Returns the Right-Hand-Side (RHS) of the linear system.
+
+        Args:
+            alpha: Angle of Attack (AoA) in SI degree
+
+        Returns:
+            The RHS with shape (N_panels, N_alpha)
+        """
         flow_dir = self.get_flow_direction(alpha)
 
         # Obtaining the Right-Hand-Side RHS by taking the dot product
         # with the flow direction. Resultant dimensions of the RHS
         # vector is (N_panels, 2), (2, N_alpha) -> (N_panels, N_alpha)
-        rhs = self.unit_rhs_vector @ -flow_dir.T
+        return self.unit_rhs_vector @ -flow_dir.T
 
-        # Solution of the system has dimensions (N_panels, N_alpha)
-        return np.linalg.solve(a_matrix, rhs)
+    def solve_system(
+        self, rhs: np.ndarray
+    ) -> Tuple[np.ndarray, Dict[str, Any]]:
+        """Solves the linear system for the supplied ``rhs``.
+
+        With the "direct" :py:attr:`solver` the cached
+        :py:attr:`lu_factors` are used such that only the forward and
+        backward substitutions are performed per call. Otherwise, the
+        system is solved with a matrix-free Krylov solver which only
+        requires :py:meth:`matvec`.
+
+        Args:
+            rhs: Right-Hand-Side (RHS) of the linear system with shape
+                (N_panels,) or (N_panels, N_alpha).
+
+        Returns:
+            Solution of the linear system with the same shape as
+            ``rhs`` and the metadata reported by the solver.
+        """
+        if self.low_rank_update is not None:
+            return self.low_rank_update.solve(rhs), {
+                "solver": self.solver,
+                "update_rank": self.low_rank_update.rank,
+            }
+        if self.solver in KRYLOV_SOLVERS:
+            return solve_krylov(
+                self, rhs, solver=self.solver, tolerance=self.tolerance
+            )
+        if self.solver == "hmatrix":
+            return self.solve_hierarchical(rhs)
+        if self.precision == "mixed":
+            return self.solve_refined(rhs)
+        if self.storage_dir is not None:
+            solution = self.out_of_core_lu.solve(rhs)
+            return solution, {
+                "solver": self.solver,
+                "storage_path": self.storage_path,
+            }
+        if self.symmetric:
+            solution = self.solve_symmetric(rhs)
+        else:
+            solution = lu_solve(self.lu_factors, rhs, check_finite=False)
+        return solution, {"solver": self.solver, "symmetric": self.symmetric}
+
+    def solve_adjoint(self, rhs: np.ndarray) -> np.ndarray:
+        """Solves the transposed system for the supplied ``rhs``.
+
+        The transposed system shares the cached :py:attr:`lu_factors`,
+        or :py:attr:`symmetric_lu_factors`, of the influence matrix,
+        hence an adjoint solve costs O(N^2) like
+        :py:meth:`solve_system`.
+
+        Args:
+            rhs: Right-Hand-Side (RHS) of the transposed system with
+                shape (N_panels,) or (N_panels, N_alpha).
+
+        Raises:
+            NotImplementedError: If the system isn't factorized by the
+                in-memory "direct" :py:attr:`solver` in "double"
+                :py:attr:`precision`.
+
+        Returns:
+            Solution of the transposed system with the same shape as
+            ``rhs``.
+        """
+        if (
+            self.low_rank_update is not None
+            or self.solver != "direct"
+            or self.precision != "double"
+            or self.storage_dir is not None
+        ):
+            raise NotImplementedError(
+                "Adjoint solves require the in-memory \"direct\" solver in "
+                "\"double\" precision"
+            )
+        if self.symmetric:
+            return self.solve_symmetric(rhs, transpose=True)
+        return lu_solve(self.lu_factors, rhs, trans=1, check_finite=False)
+
+    def solve_hierarchical(
+        self, rhs: np.ndarray
+    ) -> Tuple[np.ndarray, Dict[str, Any]]:
+        """Solves the system with the :py:attr:`hierarchical_lu`.
+
+        The residual is measured with the compressed matrix, hence it
+        only reflects the error of the approximate factorization.
+
+        Args:
+            rhs: Right-Hand-Side (RHS) of the linear system with shape
+                (N_panels,) or (N_panels, N_alpha).
+
+        Returns:
+            Solution of the linear system and the solver metadata.
+        """
+        solution = self.hierarchical_lu.solve(rhs)
+        matrix = self.hierarchical_matrix
+        rhs_2d = rhs.reshape(matrix.size, -1)
+        residual = rhs_2d - matrix.matvec(solution.reshape(rhs_2d.shape))
+        rhs_norm = np.linalg.norm(rhs_2d, axis=0)
+        residuals = np.linalg.norm(residual, axis=0) / np.where(
+            rhs_norm > 0, rhs_norm, 1
+        )
+        return solution, {
+            "solver": self.solver,
+            "tolerance": self.tolerance,
+            "max_rank": matrix.max_rank,
+            "compression": matrix.nbytes / (8 * matrix.size ** 2),
+            "residuals": residuals.tolist(),
+        }
+
+    def solve_refined(
+        self, rhs: np.ndarray
+    ) -> Tuple[np.ndarray, Dict[str, Any]]:
+        """Solves the system with mixed precision iterative refinement.
+
+        An initial solution is obtained with the float32
+        :py:attr:`lu_factors`. Each refinement step then computes the
+        float64 residual with the matrix-free :py:meth:`matvec` and
+        solves for a correction with the same factors. The error is
+        reduced by roughly the condition number times the float32
+        machine epsilon per step, hence a few steps suffice for a well
+        conditioned system.
+
+        Args:
+            rhs: Right-Hand-Side (RHS) of the linear system with shape
+                (N_panels,) or (N_panels, N_alpha).
+
+        Returns:
+            Solution of the linear system and the solver metadata
+            containing the number of refinement steps and the final
+            relative residual of each column.
+        """
+        rhs_2d = rhs.reshape(rhs.shape[0], -1)
+        rhs_norm = np.linalg.norm(rhs_2d, axis=0)
+        rhs_norm = np.where(rhs_norm > 0, rhs_norm, 1)
+
+        def correction(residual: np.ndarray) -> np.ndarray:
+            return lu_solve(
+                self.lu_factors,
+                residual.astype(np.float32),
+                check_finite=False,
+            ).astype(np.float64)
+
+        solution = correction(rhs_2d)
+        for refinements in range(MAX_REFINEMENTS + 1):
+            residual = rhs_2d - self.matvec(solution)
+            residuals = np.linalg.norm(residual, axis=0) / rhs_norm
+            if np.all(residuals <= self.tolerance):
+                break
+            if refinements < MAX_REFINEMENTS:
+                solution += correction(residual)
+
+        converged = bool(np.all(residuals <= self.tolerance))
+        if not converged:
+            warnings.warn(
+                "Iterative refinement did not converge to the requested "
+                f"tolerance of {self.tolerance:.1e}, maximum relative "
+                f"residual is {np.max(residuals):.1e}",
+                RuntimeWarning,
+            )
+        return solution.reshape(rhs.shape), {
+            "solver": self.solver,
+            "precision": self.precision,
+            "refinements": refinements,
+            "residuals": residuals.tolist(),
+            "converged": converged,
+        }
 
     # TODO change to get_flow_direction
     @staticmethod
@@ -405,20 +1854,26 @@ class PanelMethod(metaclass=ABCMeta):
         Args:
             num: Number of parameters to sample on the chord-line.
             spacing: Sets the spacing used for the parameters on the
-                chord-line between 0-1. Available options are "cosine"
-                and "linear". A linear spacing will return an array of
-                parameters that are equidistant from each other. Whereas
-                a cosine spacing increases accuracy of some aerodynamic
-                solvers by increasing the density of parameters close to
-                the leading and trailing edges. Defaults to "cosine".
+                chord-line between 0-1. Available options are "cosine",
+                "linear" and "graded". A linear spacing will return an
+                array of parameters that are equidistant from each
+                other. Whereas a cosine spacing increases accuracy of
+                some aerodynamic solvers by increasing the density of
+                parameters close to the leading and trailing edges. A
+                graded spacing refines the cosine spacing further
+                towards the trailing edge, refer to
+                :py:data:`TE_GRADING`. Defaults to "cosine".
         """
 
         if spacing == "cosine":
             return 0.5 * (1 - np.cos(np.linspace(0, np.pi, num=num)))
         elif spacing == "linear":
             return np.linspace(0, 1, num=num)
+        elif spacing == "graded":
+            cosine = PanelMethod.get_sample_parameters(num, "cosine")
+            return 1 - (1 - cosine) ** TE_GRADING
         else:
             raise ValueError(
                 f'The supplied `spacing` value of "{spacing}" is '
-                'invalid. Please specify either "cosine" or "linear".'
+                f"invalid. Please specify one of: {SPACINGS}."
             )
@@ -0,0 +1,230 @@
+# Copyright 2020 Kilian Swannet, San Kilkis
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied. See the License for the specific language governing
+# permissions and limitations under the License.
+
+"""Contains a solver for batches of airfoils sharing a panel method."""
+
+from functools import cached_property
+from typing import (
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    Union,
+)
+
+import numpy as np
+
+from gammapy.geometry import Airfoil
+from gammapy.jit import DEFAULT_PROFILE
+from gammapy.solver.base import FlowSolution, PanelMethod, budgeted_solve
+from gammapy.solver.m_constant_vortex import (
+    ConstantVortex,
+    calc_constant_vortex_batch_im,
+)
+from gammapy.solver.m_linear_vortex import (
+    LinearVortex,
+    calc_linear_vortex_batch_im,
+)
+
+# Returns the (B, N+1, N+1) system tensor and the normal and tangent
+# influence matrices of each geometry of the batch
+BatchAssembler = Callable[
+    [Sequence[PanelMethod]], Tuple[np.ndarray, np.ndarray, np.ndarray]
+]
+
+
+def assemble_linear_vortex_batch(
+    methods: Sequence[LinearVortex],
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Assembles the influence tensors of a batch of linear vortices."""
+    influence_matrices = methods[0].kernel(calc_linear_vortex_batch_im)(
+        col_pts=np.stack([m.collocation_points for m in methods]),
+        vort_pts=np.stack([m.panels.nodes[0] for m in methods]),
+        panel_angles=np.stack([m.panels.angles for m in methods]),
+        panel_lengths=np.stack([m.panels.lengths for m in methods]),
+    )
+    im_normal = influence_matrices[:, 0]
+    return im_normal, im_normal, influence_matrices[:, 1]
+
+
+def assemble_constant_vortex_batch(
+    methods: Sequence[ConstantVortex],
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Assembles the influence tensors of a constant vortex batch."""
+    influence_matrices = methods[0].kernel(calc_constant_vortex_batch_im)(
+        start_pts=np.stack([m.panels.nodes[0] for m in methods]),
+        end_pts=np.stack([m.panels.nodes[1] for m in methods]),
+        col_pts=np.stack([m.collocation_points for m in methods]),
+        panel_normals=np.stack([m.panels.normals for m in methods]),
+        panel_tangents=np.stack([m.panels.tangents for m in methods]),
+    )
+    im_normal = influence_matrices[:, 0]
+    return (
+        ConstantVortex.make_solveable(im_normal),
+        im_normal,
+        influence_matrices[:, 1],
+    )
+
+
+BATCH_ASSEMBLERS: Dict[Type[PanelMethod], BatchAssembler] = {
+    LinearVortex: assemble_linear_vortex_batch,
+    ConstantVortex: assemble_constant_vortex_batch,
+}
+
+
+class BatchPanelMethod:
+    """Solves a batch of airfoils with the same panel method at once.
+
+    Instead of assembling and solving the linear system of each airfoil
+    separately, the influence matrices of all airfoils are assembled in
+    a single parallel kernel into a (B, N+1, N+1) tensor which is then
+    solved with a single stacked solve. This keeps all cores occupied
+    for the whole batch and removes the Python overhead per airfoil.
+
+    The assembled matrices are also stored on the underlying
+    :py:attr:`methods` such that the returned :py:class:`FlowSolution`
+    objects do not trigger a re-assembly.
+
+    Args:
+        airfoils: A sequence of B :py:class:`Airfoil` instances
+        n_panels: Number of panels used for every airfoil
+        spacing: Sets the spacing used for the points on the
+            chord-line between 0-1. Available options are "cosine",
+            "linear" and "graded". Defaults to "cosine".
+        method: :py:class:`PanelMethod` specialization used for every
+            airfoil. Must be a key of :py:data:`BATCH_ASSEMBLERS`.
+            Defaults to :py:class:`LinearVortex`.
+        profile: Compilation profile of the kernels, refer to
+            :py:class:`PanelMethod`. Defaults to "fast".
+
+    Raises:
+        ValueError: If ``method`` does not support batched assembly or
+            if ``airfoils`` is empty.
+    """
+
+    def __init__(
+        self,
+        airfoils: Sequence[Airfoil],
+        n_panels: int,
+        spacing: Optional[str] = "cosine",
+        method: Type[PanelMethod] = LinearVortex,
+        profile: str = DEFAULT_PROFILE,
+    ):
+        if method not in BATCH_ASSEMBLERS:
+            raise ValueError(
+                f"Batched assembly is not available for {method.__name__}, "
+                "please use one of: "
+                + ", ".join(m.__name__ for m in BATCH_ASSEMBLERS)
+            )
+        if len(airfoils) == 0:
+            raise ValueError("At least one airfoil must be supplied")
+        self.method = method
+        self.methods = tuple(
+            method(a, n_panels, spacing, profile=profile) for a in airfoils
+        )
+
+    def __len__(self) -> int:
+        """Returns the number of airfoils in the batch."""
+        return len(self.methods)
+
+    @cached_property
+    def influence_tensor(self) -> np.ndarray:
+        """Solveable influence matrices with shape (B, N+1, N+1)."""
+        system, im_normal, im_tangent = BATCH_ASSEMBLERS[self.method](
+            self.methods
+        )
+        for b, method in enumerate(self.methods):
+            # Populating the cached_property storage of each method
+            vars(method)["influence_matrices"] = {
+                "normal": im_normal[b],
+                "tangent": im_tangent[b],
+            }
+            influence_matrix = getattr(type(method), "influence_matrix")
+            if isinstance(influence_matrix, cached_property):
+                vars(method)["influence_matrix"] = system[b]
+        return system
+
+    @cached_property
+    def unit_rhs_tensor(self) -> np.ndarray:
+        """Unit right-hand-side vectors of all airfoils (B, N+1, 2)."""
+        return np.stack([m.unit_rhs_vector for m in self.methods])
+
+    @cached_property
+    def basis_circulations(self) -> np.ndarray:
+        """Solutions at an AoA of 0 and 90 degree, shape (B, N+1, 2).
+
+        Refer to :py:attr:`PanelMethod.basis_circulations`.
+        """
+        return np.linalg.solve(self.influence_tensor, -self.unit_rhs_tensor)
+
+    def get_circulations(
+        self, alpha: Union[float, Sequence[float]]
+    ) -> np.ndarray:
+        """Solves the stacked linear system of all airfoils.
+
+        Args:
+            alpha: Angle of Attack (AoA) in SI degree
+
+        Returns:
+            Solution of all linear systems with shape (B, N+1, N_alpha)
+        """
+        flow_dir = PanelMethod.get_flow_direction(alpha)
+        rhs = self.unit_rhs_tensor @ -flow_dir.T
+        return np.linalg.solve(self.influence_tensor, rhs)
+
+    def solve_for(
+        self, alpha: Union[float, Sequence[float]], superposition: bool = False
+    ) -> List[FlowSolution]:
+        """Returns a :py:class:`FlowSolution` for each airfoil.
+
+        The assembly and stacked solve run within
+        :py:func:`gammapy.config.threads` like
+        :py:meth:`PanelMethod.solve_for`, the thread budget is reported
+        as ``metadata["threads"]`` of each solution.
+
+        Args:
+            alpha: A value or sequence of Angle of Attack in SI degree
+            superposition: Sets if the solutions should be superimposed
+                from :py:attr:`basis_circulations`. Defaults to False.
+        """
+        solver_metadata = {"solver": "direct", "batch_size": len(self)}
+        if superposition:
+            basis_circulations, metadata = budgeted_solve(
+                lambda: (self.basis_circulations, solver_metadata)
+            )
+            return [
+                m.solution_class(
+                    method=m,
+                    circulations=None,
+                    alpha=alpha,
+                    basis_circulations=m.trim_circulations(x),
+                    metadata=metadata,
+                )
+                for m, x in zip(self.methods, basis_circulations)
+            ]
+        circulations, metadata = budgeted_solve(
+            lambda: (self.get_circulations(alpha), solver_metadata)
+        )
+        return [
+            m.solution_class(
+                method=m,
+                circulations=m.trim_circulations(x),
+                alpha=alpha,
+                metadata=metadata,
+            )
+            for m, x in zip(self.methods, circulations)
+        ]
@@ -0,0 +1,198 @@
+# Copyright 2020 Kilian Swannet, San Kilkis
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied. See the License for the specific language governing
+# permissions and limitations under the License.
+
+"""Contains the geometric derivatives of the influence coefficients.
+
+The velocity induced by a straight vortex panel j is conveniently
+written with complex coordinates z = x + iy. With the collocation point
+zeta of panel i and the unit tangents tau_i and tau_j, the normal and
+tangent influence coefficients of both the constant and the linear
+vortex method take the form::
+
+    a = Re(k tau_i conj(tau_j) P(zeta, z_j, z_j+1))
+
+where k is a constant factor and P a holomorphic potential of the
+singularity distribution, i.e. log((zeta - z_j) / (zeta - z_j+1)) for
+a constant strength. The only non-holomorphic terms are the rotations
+of the tangents, which change by i tau d(phi) for a change d(phi) of
+the panel angle. Hence, the derivatives with respect to the four nodes
+of a pair of panels follow in closed form from the complex derivatives
+of P, refer to :py:func:`fill_pair_gradients`.
+
+The derivatives of all entries form a sparse matrix with a row per
+entry and a column per node coordinate, ordered as x_0, y_0, x_1, ...
+for the N + 1 nodes of the panels. Each entry only depends on the nodes
+of the collocation panel and of the vortex panels of its column, hence
+the matrix holds O(N^2) non-zeros instead of the 2 (N + 1) N^2 of the
+dense derivative tensor.
+"""
+
+from typing import Tuple
+
+import numba
+import numpy as np
+from scipy.sparse import csr_matrix
+
+from gammapy.geometry.panel import Panel2D
+from gammapy.solver.base import BASE_NUMBA_CONFIG
+
+
+@numba.jit(**BASE_NUMBA_CONFIG)
+def fill_pair_gradients(  # noqa: D103
+    out: numba.float64[:, :, :],
+    factor: complex,
+    potential: complex,
+    d_col: complex,
+    d_start: complex,
+    d_end: complex,
+    tangent_col: complex,
+    tangent_vort: complex,
+    length_col: float,
+    length_vort: float,
+) -> None:
+    """Fills the derivatives of a coefficient w.r.t. the panel nodes.
+
+    The coefficient is Re(``factor`` c ``potential``) for the normal and
+    Re(-i ``factor`` c ``potential``) for the tangent influence, with
+    the rotation c = ``tangent_col`` conj(``tangent_vort``).
+
+    Args:
+        out: Derivatives with shape (2, 4, 2) filled inplace, the axes
+            are the normal and tangent coefficient, the start and end
+            node of the collocation panel followed by those of the
+            vortex panel, and the x and y coordinate. If the shape is
+            (1, 4, 2) only the normal coefficient is filled.
+        factor: Constant factor of the normal coefficient
+        potential: Potential P of the singularity distribution
+        d_col: Derivative of P w.r.t. the collocation point
+        d_start: Derivative of P w.r.t. the start node of the vortex
+        d_end: Derivative of P w.r.t. the end node of the vortex
+        tangent_col: Unit tangent of the collocation panel
+        tangent_vort: Unit tangent of the vortex panel
+        length_col: Length of the collocation panel
+        length_vort: Length of the vortex panel
+    """
+    rotation = tangent_col * tangent_vort.conjugate()
+
+    # Gradients of the panel angles w.r.t. their end nodes
+    angle_col = -1j * tangent_col.conjugate() / length_col
+    angle_vort = -1j * tangent_vort.conjugate() / length_vort
+
+    for component in range(out.shape[0]):
+        weight = factor * rotation
+        if component == 1:
+            weight *= -1j
+        # Rotating both tangents by d(phi) changes the coefficient by
+        # -Im(weight P) d(phi)
+        rotated = (weight * potential).imag
+        # The collocation point is the midpoint of its panel
+        shift = 0.5 * weight * d_col
+        gradients = (
+            rotated * angle_col + shift,
+            -rotated * angle_col + shift,
+            -rotated * angle_vort + weight * d_start,
+            rotated * angle_vort + weight * d_end,
+        )
+        # Re(g dz) yields d/dx = Re(g) and d/dy = -Im(g)
+        for node in range(4):
+            out[component, node, 0] = gradients[node].real
+            out[component, node, 1] = -gradients[node].imag
+
+
+def derivative_matrix(
+    values: np.ndarray,
+    rows: np.ndarray,
+    nodes: np.ndarray,
+    shape: Tuple[int, int],
+) -> csr_matrix:
+    """Sparse derivatives of entries w.r.t. the node coordinates.
+
+    Args:
+        values: Derivatives w.r.t. the x and y coordinate of the nodes
+            with shape (..., 2)
+        rows: Row of each derivative, i.e. the flat index of the entry,
+            broadcastable to ``values.shape[:-1]``
+        nodes: Node of each derivative, broadcastable to
+            ``values.shape[:-1]``
+        shape: Shape of the sparse matrix
+
+    Returns:
+        The derivatives, where duplicate entries are summed.
+    """
+    rows, nodes = np.broadcast_arrays(rows, nodes, values[..., 0])[:2]
+    cols = 2 * nodes[..., None] + np.arange(2)
+    return csr_matrix(
+        (
+            values.ravel(),
+            (np.repeat(rows.ravel(), 2), cols.ravel()),
+        ),
+        shape=shape,
+    )
+
+
+def normal_derivatives(panels: Panel2D, n_rows: int) -> csr_matrix:
+    """Derivatives of the panel normals w.r.t. the node coordinates.
+
+    The normal n = (-t_y, t_x) of a panel rotates with its angle phi,
+    hence dn = -t d(phi) with d(phi) = n . (dz_end - dz_start) / l.
+
+    Args:
+        panels: Panels with N + 1 nodes
+        n_rows: Number of rows of the right-hand-side, where the panel
+            normals are the leading rows and the remainder is constant
+
+    Returns:
+        Derivatives of the right-hand-side with shape
+        (2 ``n_rows``, 2 (N + 1)), row 2 r + k is component k of row r.
+    """
+    n_panels = panels.n_panels
+    tangents = np.asarray(panels.tangents)
+    normals = np.asarray(panels.normals)
+    lengths = np.asarray(panels.lengths).reshape(-1, 1, 1)
+
+    # Axes are the panel, normal component, node and coordinate
+    values = np.empty((n_panels, 2, 2, 2), dtype=np.float64)
+    values[:, :, 1] = -tangents[:, :, None] * normals[:, None] / lengths
+    values[:, :, 0] = -values[:, :, 1]
+    rows = 2 * np.arange(n_panels)[:, None, None] + np.arange(2)[:, None]
+    nodes = np.arange(n_panels)[:, None, None] + np.arange(2)
+    return derivative_matrix(
+        values, rows, nodes, (2 * n_rows, 2 * (n_panels + 1))
+    )
+
+
+def length_derivatives(panels: Panel2D) -> csr_matrix:
+    """Derivatives of the panel lengths w.r.t. the node coordinates.
+
+    The length of a panel changes by t . (dz_end - dz_start), where t is
+    the unit tangent of the panel.
+
+    Args:
+        panels: Panels with N + 1 nodes
+
+    Returns:
+        Derivatives of the lengths with shape (N, 2 (N + 1)).
+    """
+    n_panels = panels.n_panels
+    tangents = np.asarray(panels.tangents)
+
+    # Axes are the panel, node and coordinate
+    values = np.stack((-tangents, tangents), axis=1)
+    panel_idx = np.arange(n_panels)[:, None]
+    return derivative_matrix(
+        values,
+        panel_idx,
+        panel_idx + np.arange(2),
+        (n_panels, 2 * (n_panels + 1)),
+    )
@@ -0,0 +1,483 @@
+# Copyright 2020 Kilian Swannet, San Kilkis
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied. See the License for the specific language governing
+# permissions and limitations under the License.
+
+"""Contains a hierarchical matrix representation of the linear system.
+
+The dense influence matrix requires O(N^2) memory. However, the
+interaction between two groups of panels along the contour is smooth
+and can be approximated by a low-rank product U @ V.T. The
+:py:class:`HMatrix` recursively splits the system into two halves of
+contiguous panels. The diagonal blocks are split further until a leaf
+is small enough to be stored densely, while both off-diagonal blocks
+are compressed with Adaptive Cross Approximation (ACA). This is also
+known as a Hierarchically Off-Diagonal Low-Rank (HODLR) matrix and
+requires O(N log N) memory.
+
+ACA only samples a few rows and columns of a block, which are obtained
+from the influence coefficient kernels without assembling the matrix.
+Rows and columns that are not part of the smooth kernel, such as the
+Kutta condition, are supplied separately as a sparse ``border`` matrix
+which is added to each block exactly.
+
+The linear system is solved with an approximate hierarchical LU
+factorization, the Schur complement updates of which are low-rank and
+recompressed to the same tolerance.
+"""
+
+import copy
+from typing import Callable, Optional, Tuple
+
+import numpy as np
+from scipy.linalg import lu_factor, solve_triangular
+from scipy.sparse import csr_matrix
+
+# Returns the entries of a matrix at (rows[k], cols[k])
+EntryFunction = Callable[[np.ndarray, np.ndarray], np.ndarray]
+
+LowRank = Tuple[np.ndarray, np.ndarray]
+
+
+def recompress(u: np.ndarray, v: np.ndarray, tolerance: float) -> LowRank:
+    """Truncates the low-rank product ``u @ v.T`` to ``tolerance``.
+
+    Args:
+        u: Left factor with shape (m, k)
+        v: Right factor with shape (n, k)
+        tolerance: Singular values smaller than ``tolerance`` times the
+            largest singular value are discarded
+
+    Returns:
+        Left and right factors of the truncated product.
+    """
+    if u.shape[1] == 0:
+        return u, v
+    q_u, r_u = np.linalg.qr(u)
+    q_v, r_v = np.linalg.qr(v)
+    w, s, z_t = np.linalg.svd(r_u @ r_v.T)
+    rank = int(np.sum(s > tolerance * s[0])) if s[0] > 0 else 0
+    return q_u @ (w[:, :rank] * s[:rank]), q_v @ z_t[:rank].T
+
+
+def pivot_row(col: np.ndarray, unused_rows: np.ndarray) -> int:
+    """Returns the unused row of the largest entry of ``col``."""
+    return int(np.argmax(np.where(unused_rows, np.abs(col), -1)))
+
+
+def sample_indices(
+    size: int, n_samples: int, rng: np.random.Generator
+) -> np.ndarray:
+    """Returns the first, last and ``n_samples`` random indices."""
+    return np.unique(np.r_[0, size - 1, rng.integers(0, size, n_samples)])
+
+
+def unconverged_row(
+    residual_row: Callable[[int], np.ndarray],
+    residual_col: Callable[[int], np.ndarray],
+    unused_rows: np.ndarray,
+    shape: Tuple[int, int],
+    limit: float,
+    samples: Tuple[np.ndarray, np.ndarray],
+) -> Optional[int]:
+    """Returns a row of the residual that exceeds the tolerance, if any.
+
+    Args:
+        residual_row: Returns row i of the residual
+        residual_col: Returns column j of the residual
+        unused_rows: Mask of the rows that are not yet a pivot
+        shape: Number of rows and columns of the block
+        limit: Squared tolerance times the squared Frobenius norm of
+            the approximation
+        samples: Rows and columns of the residual to verify
+
+    Returns:
+        The sampled row that exceeds the tolerance, or the unused row
+        with the largest entry of the first sampled column that does.
+        None if the approximation is converged.
+    """
+    rows, cols = samples
+    m, n = shape
+    for row in rows[unused_rows[rows]]:
+        if m * np.sum(residual_row(row) ** 2) > limit:
+            return row
+    for col in cols:
+        residual = residual_col(col)
+        if n * np.sum(residual[unused_rows] ** 2) > limit:
+            return pivot_row(residual, unused_rows)
+    return None
+
+
+def adaptive_cross_approximation(
+    get_row: Callable[[int], np.ndarray],
+    get_col: Callable[[int], np.ndarray],
+    shape: Tuple[int, int],
+    tolerance: float,
+    max_rank: Optional[int] = None,
+    n_samples: int = 4,
+) -> LowRank:
+    """Approximates a matrix block from a few of its rows and columns.
+
+    Implements ACA with partial pivoting. In each step the largest
+    entry of the residual of a row is used as pivot, after which the
+    next row is chosen as the largest entry of the residual column.
+    The approximation stops once the norm of the last cross is smaller
+    than ``tolerance`` times the Frobenius norm of the approximation.
+
+    This heuristic can terminate early if part of a block is poorly
+    approximated, i.e. where two panel clusters meet along the contour.
+    Such interactions are located at the first and last rows and
+    columns of a block, hence these are verified together with a few
+    random rows and columns before the approximation is accepted.
+
+    Args:
+        get_row: Returns row i of the block
+        get_col: Returns column j of the block
+        shape: Number of rows and columns of the block
+        tolerance: Relative accuracy of the approximation
+        max_rank: Maximum rank of the approximation. Defaults to the
+            smallest dimension of the block.
+        n_samples: Number of random rows and columns that are verified
+            in addition to the first and last. Defaults to 4.
+
+    Returns:
+        Left and right factors of the approximation.
+    """
+    m, n = shape
+    max_rank = min(m, n) if max_rank is None else min(max_rank, m, n)
+    u = np.zeros((m, max_rank), dtype=np.float64)
+    v = np.zeros((n, max_rank), dtype=np.float64)
+    unused_rows = np.ones(m, dtype=bool)
+    rng = np.random.default_rng(0)
+
+    def residual_row(i: int) -> np.ndarray:
+        return get_row(i) - u[i, :rank] @ v[:, :rank].T
+
+    def residual_col(j: int) -> np.ndarray:
+        return get_col(j) - u[:, :rank] @ v[j, :rank]
+
+    rank, i, norm2 = 0, 0, 0.0
+    while rank < max_rank and unused_rows.any():
+        unused_rows[i] = False
+        row = residual_row(i)
+        j = int(np.argmax(np.abs(row)))
+        if row[j] == 0:
+            # Zero residual row, retry with the next unused row
+            i = int(np.argmax(unused_rows))
+            continue
+        v[:, rank] = row / row[j]
+        u[:, rank] = residual_col(j)
+
+        # Updating the Frobenius norm of the approximation
+        u_k, v_k = u[:, rank], v[:, rank]
+        cross2 = (u_k @ u_k) * (v_k @ v_k)
+        norm2 += cross2 + 2 * np.sum(
+            (u[:, :rank].T @ u_k) * (v[:, :rank].T @ v_k)
+        )
+        rank += 1
+
+        if cross2 <= tolerance ** 2 * norm2:
+            i = unconverged_row(
+                residual_row,
+                residual_col,
+                unused_rows,
+                shape,
+                limit=tolerance ** 2 * norm2,
+                samples=(
+                    sample_indices(m, n_samples, rng),
+                    sample_indices(n, n_samples, rng),
+                ),
+            )
+            if i is None:
+                break
+        else:
+            i = pivot_row(u_k, unused_rows)
+
+    return u[:, :rank], v[:, :rank]
+
+
+def sparse_low_rank(block: csr_matrix) -> LowRank:
+    """Returns an exact low-rank factorization of a sparse block.
+
+    The block is split into its non-zero rows or columns, whichever
+    results in the lowest rank.
+    """
+    block = block.tocsr()
+    m, n = block.shape
+    rows = np.unique(block.nonzero()[0])
+    cols = np.unique(block.nonzero()[1])
+    if rows.size <= cols.size:
+        u = np.zeros((m, rows.size), dtype=np.float64)
+        u[rows, np.arange(rows.size)] = 1
+        return u, block[rows].toarray().T
+    v = np.zeros((n, cols.size), dtype=np.float64)
+    v[cols, np.arange(cols.size)] = 1
+    return block[:, cols].toarray(), v
+
+
+class HMatrix:
+    """Hierarchical (HODLR) representation of a square matrix.
+
+    Args:
+        entries: Returns the entries of the smooth kernel part of the
+            matrix at the requested (row, column) indices
+        size: Number of rows and columns of the matrix
+        border: Sparse part of the matrix which is not described by
+            ``entries``, i.e. the Kutta condition. Defaults to None.
+        tolerance: Relative accuracy of the low-rank blocks. Defaults
+            to 1e-8.
+        leaf_size: Maximum size of a dense diagonal block. Defaults to
+            64.
+        offset: Index of the first row and column of this block within
+            the full matrix. Defaults to 0.
+    """
+
+    def __init__(
+        self,
+        entries: EntryFunction,
+        size: int,
+        border: Optional[csr_matrix] = None,
+        tolerance: float = 1e-8,
+        leaf_size: int = 64,
+        offset: int = 0,
+    ):
+        border = csr_matrix((size, size)) if border is None else border
+        self.size = size
+        self.tolerance = tolerance
+        self.factorized = False
+
+        if size <= leaf_size:
+            self.dense = self.dense_block(
+                entries, border, offset, offset, size, size
+            )
+            return
+
+        half = size // 2
+        self.a11 = HMatrix(
+            entries, half, border, tolerance, leaf_size, offset=offset
+        )
+        self.a22 = HMatrix(
+            entries,
+            size - half,
+            border,
+            tolerance,
+            leaf_size,
+            offset=offset + half,
+        )
+        self.a12 = self.low_rank_block(
+            entries, border, offset, offset + half, half, size - half
+        )
+        self.a21 = self.low_rank_block(
+            entries, border, offset + half, offset, size - half, half
+        )
+
+    @property
+    def is_leaf(self) -> bool:
+        """Returns if the block is stored densely."""
+        return hasattr(self, "dense")
+
+    @staticmethod
+    def dense_block(
+        entries: EntryFunction,
+        border: csr_matrix,
+        row: int,
+        col: int,
+        n_rows: int,
+        n_cols: int,
+    ) -> np.ndarray:
+        """Evaluates a block of the matrix densely."""
+        rows, cols = np.meshgrid(
+            np.arange(row, row + n_rows),
+            np.arange(col, col + n_cols),
+            indexing="ij",
+        )
+        block = entries(rows.ravel(), cols.ravel()).reshape(n_rows, n_cols)
+        border_block = border[row : row + n_rows, col : col + n_cols]
+        return block + border_block.toarray()
+
+    def low_rank_block(
+        self,
+        entries: EntryFunction,
+        border: csr_matrix,
+        row: int,
+        col: int,
+        n_rows: int,
+        n_cols: int,
+    ) -> LowRank:
+        """Compresses an off-diagonal block of the matrix."""
+        row_idx = np.arange(row, row + n_rows)
+        col_idx = np.arange(col, col + n_cols)
+        u, v = adaptive_cross_approximation(
+            get_row=lambda i: entries(np.full(n_cols, row + i), col_idx),
+            get_col=lambda j: entries(row_idx, np.full(n_rows, col + j)),
+            shape=(n_rows, n_cols),
+            tolerance=self.tolerance,
+        )
+        u_border, v_border = sparse_low_rank(
+            border[row : row + n_rows, col : col + n_cols]
+        )
+        return recompress(
+            np.hstack((u, u_border)), np.hstack((v, v_border)), self.tolerance
+        )
+
+    @property
+    def max_rank(self) -> int:
+        """Returns the largest rank of all off-diagonal blocks."""
+        if self.is_leaf:
+            return 0
+        return max(
+            self.a12[0].shape[1],
+            self.a21[0].shape[1],
+            self.a11.max_rank,
+            self.a22.max_rank,
+        )
+
+    @property
+    def nbytes(self) -> int:
+        """Returns the memory in bytes used by all blocks."""
+        if self.is_leaf:
+            return self.dense.nbytes
+        return (
+            self.a11.nbytes
+            + self.a22.nbytes
+            + sum(f.nbytes for f in (*self.a12, *self.a21))
+        )
+
+    def split(self, x: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Splits ``x`` into the parts of the first and second half."""
+        half = self.a11.size
+        return x[:half], x[half:]
+
+    def matvec(self, x: np.ndarray) -> np.ndarray:
+        """Multiplies the matrix with ``x`` of shape (size, m)."""
+        if self.factorized:
+            raise RuntimeError("A factorized HMatrix cannot be multiplied")
+        if self.is_leaf:
+            return self.dense @ x
+        x_1, x_2 = self.split(x)
+        (u_12, v_12), (u_21, v_21) = self.a12, self.a21
+        return np.concatenate(
+            (
+                self.a11.matvec(x_1) + u_12 @ (v_12.T @ x_2),
+                u_21 @ (v_21.T @ x_1) + self.a22.matvec(x_2),
+            )
+        )
+
+    def add_low_rank(self, u: np.ndarray, v: np.ndarray) -> None:
+        """Adds the low-rank product ``u @ v.T`` inplace."""
+        if self.is_leaf:
+            self.dense += u @ v.T
+            return
+        u_1, u_2 = self.split(u)
+        v_1, v_2 = self.split(v)
+        self.a11.add_low_rank(u_1, v_1)
+        self.a22.add_low_rank(u_2, v_2)
+        self.a12 = recompress(
+            np.hstack((self.a12[0], u_1)),
+            np.hstack((self.a12[1], v_2)),
+            self.tolerance,
+        )
+        self.a21 = recompress(
+            np.hstack((self.a21[0], u_2)),
+            np.hstack((self.a21[1], v_1)),
+            self.tolerance,
+        )
+
+    def lu(self) -> "HMatrix":
+        """Returns the hierarchical LU factorization of the matrix.
+
+        The factorization is performed on a copy, refer to
+        :py:meth:`factorize`.
+        """
+        factors = copy.deepcopy(self)
+        factors.factorize()
+        return factors
+
+    def factorize(self) -> None:
+        """Performs an inplace hierarchical LU factorization.
+
+        The first diagonal block is factorized as A11 = L11 U11, after
+        which the off-diagonal factors are transformed to U12 =
+        L11^-1 A12 and L21 = A21 U11^-1. Both remain low-rank, hence
+        the Schur complement A22 - L21 U12 is a low-rank update of the
+        second diagonal block, which is factorized last. Partial
+        pivoting is only performed within the dense leaf blocks.
+        """
+        if self.is_leaf:
+            lu, pivots = lu_factor(self.dense, check_finite=False)
+            # Converting the sequential LAPACK swaps to a permutation
+            permutation = np.arange(self.size)
+            for i, p in enumerate(pivots):
+                permutation[[i, p]] = permutation[[p, i]]
+            self.dense, self.permutation = lu, permutation
+            self.factorized = True
+            return
+
+        self.a11.factorize()
+        u_12, v_12 = self.a12
+        u_21, v_21 = self.a21
+        self.a12 = (self.a11.solve_lower(u_12), v_12)
+        self.a21 = (u_21, self.a11.solve_upper_transposed(v_21))
+
+        schur_core = self.a21[1].T @ self.a12[0]
+        self.a22.add_low_rank(-u_21 @ schur_core, v_12)
+        self.a22.factorize()
+        self.factorized = True
+
+    def solve_lower(self, b: np.ndarray) -> np.ndarray:
+        """Solves L y = ``b`` with the lower factor."""
+        if self.is_leaf:
+            return solve_triangular(
+                self.dense,
+                b[self.permutation],
+                lower=True,
+                unit_diagonal=True,
+                check_finite=False,
+            )
+        b_1, b_2 = self.split(b)
+        u_21, v_21 = self.a21
+        y_1 = self.a11.solve_lower(b_1)
+        y_2 = self.a22.solve_lower(b_2 - u_21 @ (v_21.T @ y_1))
+        return np.concatenate((y_1, y_2))
+
+    def solve_upper(self, b: np.ndarray) -> np.ndarray:
+        """Solves U x = ``b`` with the upper factor."""
+        if self.is_leaf:
+            return solve_triangular(self.dense, b, check_finite=False)
+        b_1, b_2 = self.split(b)
+        u_12, v_12 = self.a12
+        x_2 = self.a22.solve_upper(b_2)
+        x_1 = self.a11.solve_upper(b_1 - u_12 @ (v_12.T @ x_2))
+        return np.concatenate((x_1, x_2))
+
+    def solve_upper_transposed(self, b: np.ndarray) -> np.ndarray:
+        """Solves U.T x = ``b`` with the upper factor."""
+        if self.is_leaf:
+            return solve_triangular(
+                self.dense, b, trans="T", check_finite=False
+            )
+        b_1, b_2 = self.split(b)
+        u_12, v_12 = self.a12
+        x_1 = self.a11.solve_upper_transposed(b_1)
+        x_2 = self.a22.solve_upper_transposed(b_2 - v_12 @ (u_12.T @ x_1))
+        return np.concatenate((x_1, x_2))
+
+    def solve(self, b: np.ndarray) -> np.ndarray:
+        """Solves the system with the factorized matrix.
+
+        Args:
+            b: Right-Hand-Side with shape (size,) or (size, m)
+        """
+        if not self.factorized:
+            raise RuntimeError("The HMatrix must be factorized first")
+        b_2d = b.reshape(self.size, -1)
+        return self.solve_upper(self.solve_lower(b_2d)).reshape(b.shape)
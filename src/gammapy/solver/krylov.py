@@ -0,0 +1,229 @@
+# Copyright 2020 Kilian Swannet, San Kilkis
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied. See the License for the specific language governing
+# permissions and limitations under the License.
+
+"""Contains matrix-free Krylov solvers for the panel method systems.
+
+Instead of factorizing the dense influence matrix, the linear system is
+solved iteratively with GMRES or BiCGSTAB. The solvers only require the
+product of the influence matrix with a vector, which a
+:py:class:`PanelMethod` provides through its ``matvec`` method. The
+specializations evaluate this product directly from the influence
+coefficient kernels, hence the dense matrix is never stored.
+
+The preconditioners are built from a small subset of the influence
+coefficients, obtained through the ``influence_entries`` method:
+
+    * "block-jacobi": Inverse of the diagonal blocks of contiguous
+      panels, which are neighbours along the airfoil contour.
+    * "nearest-neighbour": Sparse LU factorization of the banded
+      near-field interaction of each panel with its closest neighbours
+      along the contour.
+"""
+
+import inspect
+import math
+import warnings
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+from scipy.sparse import csc_matrix
+from scipy.sparse.linalg import LinearOperator, bicgstab, gmres, splu
+
+KRYLOV_SOLVERS = {"gmres": gmres, "bicgstab": bicgstab}
+
+PRECONDITIONERS = ("block-jacobi", "nearest-neighbour", None)
+
+# SciPy renamed the relative tolerance keyword from tol to rtol in 1.12
+TOLERANCE_KWARG = (
+    "rtol" if "rtol" in inspect.signature(gmres).parameters else "tol"
+)
+
+
+def block_jacobi_preconditioner(
+    method: object, block_size: int = 64
+) -> LinearOperator:
+    """Returns the inverse of the diagonal blocks of the system.
+
+    Args:
+        method: :py:class:`PanelMethod` providing ``influence_entries``
+        block_size: Number of contiguous unknowns per diagonal block
+
+    Returns:
+        A :py:class:`LinearOperator` applying the block inverses.
+    """
+    n = method.unit_rhs_vector.shape[0]
+    block_size = min(block_size, n)
+    n_blocks = math.ceil(n / block_size)
+
+    # Padding the final block with the identity to stack all blocks
+    idx = np.arange(n_blocks * block_size).reshape(n_blocks, block_size)
+    valid = idx < n
+    shape = (n_blocks, block_size, block_size)
+    rows = np.broadcast_to(idx[:, :, None], shape)
+    cols = np.broadcast_to(idx[:, None, :], shape)
+    mask = valid[:, :, None] & valid[:, None, :]
+
+    blocks = np.zeros(shape, dtype=np.float64)
+    blocks[mask] = method.influence_entries(rows[mask], cols[mask])
+    diagonal = np.einsum("kii->ki", blocks)  # Writeable diagonal view
+    diagonal[~valid] = 1
+    inverses = np.linalg.inv(blocks)
+
+    def apply(x: np.ndarray) -> np.ndarray:
+        x_padded = np.zeros(n_blocks * block_size, dtype=np.float64)
+        x_padded[:n] = x.ravel()
+        y = np.einsum(
+            "kij,kj->ki", inverses, x_padded.reshape(n_blocks, block_size)
+        )
+        return y.ravel()[:n]
+
+    return LinearOperator((n, n), matvec=apply, dtype=np.float64)
+
+
+def nearest_neighbour_preconditioner(
+    method: object, bandwidth: int = 8
+) -> LinearOperator:
+    """Returns a sparse LU solve of the near-field interactions.
+
+    Each unknown is coupled to the ``bandwidth`` unknowns before and
+    after it. The coupling wraps around at the ends since the first
+    and last panel meet at the trailing-edge.
+
+    Args:
+        method: :py:class:`PanelMethod` providing ``influence_entries``
+        bandwidth: Number of neighbours on each side of an unknown
+
+    Returns:
+        A :py:class:`LinearOperator` applying the sparse LU solve.
+    """
+    n = method.unit_rhs_vector.shape[0]
+    # Limiting the bandwidth such that wrapped columns never coincide
+    bandwidth = min(bandwidth, (n - 1) // 2)
+    offsets = np.arange(-bandwidth, bandwidth + 1)
+    rows = np.repeat(np.arange(n), offsets.size)
+    cols = np.mod(rows.reshape(n, -1) + offsets, n).ravel()
+
+    near_field = csc_matrix(
+        (method.influence_entries(rows, cols), (rows, cols)), shape=(n, n)
+    )
+    lu = splu(near_field)
+
+    return LinearOperator((n, n), matvec=lu.solve, dtype=np.float64)
+
+
+def build_preconditioner(
+    method: object, preconditioner: Optional[str]
+) -> Optional[LinearOperator]:
+    """Returns the ``preconditioner`` of the system of ``method``.
+
+    Raises:
+        ValueError: If ``preconditioner`` is not in
+            :py:data:`PRECONDITIONERS`.
+    """
+    if preconditioner == "block-jacobi":
+        return block_jacobi_preconditioner(method)
+    elif preconditioner == "nearest-neighbour":
+        return nearest_neighbour_preconditioner(method)
+    elif preconditioner is None:
+        return None
+    raise ValueError(
+        f'The supplied `preconditioner` value of "{preconditioner}" is '
+        f"invalid. Please specify one of: {PRECONDITIONERS}."
+    )
+
+
+def solve_krylov(
+    method: object,
+    rhs: np.ndarray,
+    solver: str = "gmres",
+    tolerance: float = 1e-10,
+    max_iterations: Optional[int] = None,
+) -> Tuple[np.ndarray, Dict[str, Any]]:
+    """Iteratively solves the system of ``method`` for ``rhs``.
+
+    Args:
+        method: :py:class:`PanelMethod` providing ``matvec`` and a
+            cached ``krylov_preconditioner``
+        rhs: Right-Hand-Side with shape (N,) or (N, N_rhs). Each column
+            is solved separately.
+        solver: Name of the Krylov solver in :py:data:`KRYLOV_SOLVERS`
+        tolerance: Relative residual tolerance used as the convergence
+            criterion
+        max_iterations: Maximum number of iterations per column
+
+    Returns:
+        The solution with the same shape as ``rhs`` and the solver
+        metadata containing the number of iterations and the relative
+        residual of each column.
+    """
+    n = rhs.shape[0]
+    rhs_2d = rhs.reshape(n, -1)
+    n_matvecs = [0]
+
+    def matvec(x: np.ndarray) -> np.ndarray:
+        n_matvecs[0] += 1
+        return method.matvec(x)
+
+    operator = LinearOperator((n, n), matvec=matvec, dtype=np.float64)
+    krylov_solver = KRYLOV_SOLVERS[solver]
+
+    solution = np.zeros_like(rhs_2d, dtype=np.float64)
+    iterations = []
+    for k in range(rhs_2d.shape[1]):
+        n_iter, n_matvecs[0] = [0], 0
+
+        def count(*args):
+            n_iter[0] += 1
+
+        kwargs = {TOLERANCE_KWARG: tolerance, "atol": 0.0}
+        if solver == "gmres":
+            kwargs["callback_type"] = "pr_norm"
+        solution[:, k], _ = krylov_solver(
+            operator,
+            rhs_2d[:, k],
+            M=method.krylov_preconditioner,
+            maxiter=max_iterations,
+            callback=count,
+            **kwargs,
+        )
+        if solver == "bicgstab":
+            # BiCGSTAB can return halfway an iteration before invoking
+            # the callback, hence its two products per step are counted
+            n_iter[0] = math.ceil(n_matvecs[0] / 2)
+        iterations.append(n_iter[0])
+
+    # Verifying convergence with the true (unpreconditioned) residual
+    residual = rhs_2d - method.matvec(solution)
+    rhs_norm = np.linalg.norm(rhs_2d, axis=0)
+    residuals = np.linalg.norm(residual, axis=0) / np.where(
+        rhs_norm > 0, rhs_norm, 1
+    )
+    converged = bool(np.all(residuals <= 10 * tolerance))
+    if not converged:
+        warnings.warn(
+            f"{solver} did not converge to the requested tolerance of "
+            f"{tolerance:.1e}, maximum relative residual is "
+            f"{np.max(residuals):.1e}",
+            RuntimeWarning,
+        )
+
+    metadata = {
+        "solver": solver,
+        "preconditioner": method.preconditioner,
+        "tolerance": tolerance,
+        "iterations": iterations,
+        "residuals": residuals.tolist(),
+        "converged": converged,
+    }
+    return solution.reshape(rhs.shape), metadata
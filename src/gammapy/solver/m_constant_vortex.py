@@ -14,15 +14,25 @@
 
 """Implements a First Order Constant Strength Vortex Panel Method."""
 
+import cmath
 import math
 from functools import cached_property
-from typing import Dict, Sequence, Tuple, Union
+from typing import Any, Dict, Tuple, Union
 
 import numba
 import numpy as np
+from scipy.sparse import csr_matrix
 
 from gammapy.geometry.panel import Panel2D
+from gammapy.jit import eager
+from gammapy.solver.backends import register_kernel, tile_shape
 from gammapy.solver.base import BASE_NUMBA_CONFIG, PanelMethod
+from gammapy.solver.derivatives import (
+    derivative_matrix,
+    fill_pair_gradients,
+    length_derivatives,
+    normal_derivatives,
+)
 
 # Great source explaining it
 # https://www.youtube.com/watch?v=Ai0o5ppUTuk
@@ -35,6 +45,11 @@ from gammapy.solver.base import BASE_NUMBA_CONFIG, PanelMethod
 
 
 class ConstantVortex(PanelMethod):
+    # The circulation lift of the constant strengths does not converge
+    # to the lift of the airfoil, e.g. 1.11 instead of 0.86 for a NACA
+    # 2412 at an AoA of 5 degree
+    CONVERGED_CIRCULATION_LIFT = False
+
     @cached_property
     def unit_rhs_vector(self):
         # Final entry is (0, 0) which will enforce the Kutta condition
@@ -58,22 +73,86 @@ class ConstantVortex(PanelMethod):
         return self.panels.points_at(0.5)
 
     @cached_property
-    def influence_matrices(self) -> Dict[str, np.ndarray]:
+    def kernel_args(self) -> Dict[str, np.ndarray]:
+        """Geometric arguments shared by all constant vortex kernels."""
         start_pts, end_pts = self.panels.nodes
-        im_normal, im_tangent = calc_constant_vortex_im(
+        return dict(
             start_pts=start_pts,
             end_pts=end_pts,
             col_pts=self.collocation_points,
-            panel_angles=self.panels.angles,
             panel_normals=self.panels.normals,
             panel_tangents=self.panels.tangents,
         )
-        return {"normal": im_normal, "tangent": im_tangent}
+
+    @cached_property
+    def influence_matrices(self) -> Dict[str, np.ndarray]:
+        return self.assemble(tangent=True)
 
     @cached_property
     def influence_matrix(self) -> np.ndarray:
+        # The tangent matrix is only assembled if it was requested
+        if "influence_matrices" in vars(self):
+            return self.make_solveable(self.influence_matrices["normal"])
+        return self.make_solveable(self.assemble()["normal"])
+
+    @property
+    def border_matrix(self) -> csr_matrix:
+        """Constant error column and the Kutta condition row.
+
+        Refer to :py:meth:`make_solveable`.
+        """
         n_panels = self.panels.n_panels
-        im_normal = self.influence_matrices["normal"]
+        rows = np.concatenate((np.arange(n_panels), [n_panels, n_panels]))
+        cols = np.concatenate(
+            (np.full(n_panels, n_panels), [0, n_panels - 1])
+        )
+        return csr_matrix(
+            (np.ones(n_panels + 2), (rows, cols)),
+            shape=(n_panels + 1, n_panels + 1),
+        )
+
+    def influence_entries(self, rows: np.ndarray, cols: np.ndarray):
+        """Evaluates :py:attr:`influence_matrix` entries on the fly."""
+        rows = np.asarray(rows, dtype=np.int64)
+        cols = np.asarray(cols, dtype=np.int64)
+        n_panels = self.panels.n_panels
+
+        # Constant error column and the Kutta condition row which
+        # shouldn't contain an error term (Refer to make_solveable)
+        entries = np.zeros(rows.shape, dtype=np.float64)
+        entries[cols == n_panels] = 1
+        kutta = rows == n_panels
+        entries[kutta] = (cols[kutta] == 0) | (cols[kutta] == n_panels - 1)
+
+        interior = ~kutta & (cols < n_panels)
+        entries[interior] = self.kernel(calc_constant_vortex_entries)(
+            rows[interior], cols[interior], **self.kernel_args
+        )[0]
+        return entries
+
+    def matvec(self, x: np.ndarray) -> np.ndarray:
+        """Matrix-free product of the influence matrix and ``x``."""
+        x_2d = x.reshape(x.shape[0], -1)
+        product = np.empty_like(x_2d, dtype=np.float64)
+        product[:-1] = self.influence_products(x_2d[:-1])[0]
+        product[:-1] += x_2d[-1]  # Constant error term
+        product[-1] = x_2d[0] + x_2d[-2]  # Kutta condition
+        return product.reshape(x.shape)
+
+    @staticmethod
+    def make_solveable(im_normal: np.ndarray) -> np.ndarray:
+        """Borders ``im_normal`` with the Kutta condition.
+
+        Args:
+            im_normal: Normal influence matrix with shape (N, N). A
+                stack of matrices with shape (B, N, N) is also
+                supported, in which case all are bordered at once.
+
+        Returns:
+            The solveable (N+1, N+1) influence matrix, or (B, N+1, N+1)
+            for a stack of normal influence matrices.
+        """
+        n_panels = im_normal.shape[-1]
 
         # Setting final row to kutta condition, summation of circulation
         # of first and last panel = 0
@@ -86,24 +165,109 @@ class ConstantVortex(PanelMethod):
 
         # Creating an empty N+1, M+1 influence matrix and broadcasting
         # Kutta condition row as well as the constant error column
-        solveable_im = np.zeros((n_panels + 1, n_panels + 1), dtype=np.float64)
-        solveable_im[:-1, :-1] = im_normal
-        solveable_im[:, -1] = error_column
+        solveable_im = np.zeros(
+            (*im_normal.shape[:-2], n_panels + 1, n_panels + 1),
+            dtype=np.float64,
+        )
+        solveable_im[..., :-1, :-1] = im_normal
+        solveable_im[..., :, -1] = error_column
 
         # Broadcasting Kutta row shouldn't contain an error term
-        solveable_im[-1, :] = kutta_row
+        solveable_im[..., -1, :] = kutta_row
 
         return solveable_im
 
-    def solve_for(
-        self, alpha: Union[float, Sequence[float]], plot: bool = False,
-    ) -> object:
-        """."""
-        return self.solution_class(
-            method=self,
-            # Removing constant error term in the solution
-            circulations=self.get_circulations(alpha)[:-1, :],
-            alpha=alpha,
+    def geometric_derivatives(
+        self, tangent: bool = False
+    ) -> Dict[str, csr_matrix]:
+        """Derivatives of the system w.r.t. the panel nodes.
+
+        The constant error column and the Kutta condition row of the
+        system don't depend on the geometry. Refer to
+        :py:meth:`PanelMethod.geometric_derivatives`.
+        """
+        n_panels = self.panels.n_panels
+        values = np.zeros((1 + tangent, n_panels, n_panels, 4, 2))
+        self.kernel(fill_constant_vortex_derivatives)(
+            values, **self.kernel_args
+        )
+
+        # Nodes of collocation panel i and vortex panel j
+        i, j = np.ogrid[:n_panels, :n_panels]
+        nodes = np.stack(np.broadcast_arrays(i, i + 1, j, j + 1), axis=-1)
+        n_coords = 2 * (n_panels + 1)
+        derivatives = {
+            "normal": derivative_matrix(
+                values[0],
+                (i * (n_panels + 1) + j)[..., None],
+                nodes,
+                ((n_panels + 1) ** 2, n_coords),
+            ),
+            "rhs": normal_derivatives(self.panels, n_panels + 1),
+            "weights": -length_derivatives(self.panels),
+        }
+        if tangent:
+            derivatives["tangent"] = derivative_matrix(
+                values[1],
+                (i * n_panels + j)[..., None],
+                nodes,
+                (n_panels ** 2, n_coords),
+            )
+        return derivatives
+
+    def trim_circulations(self, circulations: np.ndarray) -> np.ndarray:
+        """Removes the constant error term from the solution."""
+        return circulations[:-1, :]
+
+    @cached_property
+    def circulation_weights(self) -> np.ndarray:
+        """Negative panel lengths, the strengths are clockwise."""
+        return -self.panels.lengths[:, 0]
+
+    def kernel_products(self, x: np.ndarray) -> np.ndarray:
+        """Exact normal and tangent influence of ``x``."""
+        return self.kernel(calc_constant_vortex_matvec)(
+            np.ascontiguousarray(x, dtype=np.float64), **self.kernel_args
+        )
+
+    @cached_property
+    def multipole_layout(self) -> Dict[str, Any]:
+        """Singularities, targets and near-field kernel of the tree."""
+        start_pts, end_pts = self.panels.nodes
+        n_panels = self.panels.n_panels
+        return dict(
+            start_pts=start_pts,
+            end_pts=end_pts,
+            lengths=self.panels.lengths,
+            dofs=np.repeat(np.arange(n_panels)[:, None], 2, axis=1),
+            linear=False,
+            prefactor=-1j / (2 * math.pi),
+            pair_coefficients=self.pair_coefficients,
+            target_pts=self.collocation_points,
+            target_angles=self.panels.angles,
+        )
+
+    def pair_coefficients(
+        self,
+        targets: np.ndarray,
+        panels: np.ndarray,
+        target_pts: np.ndarray,
+        on_body: bool,
+    ) -> np.ndarray:
+        """Exact influence of the near-field target-element pairs.
+
+        Refer to :py:data:`gammapy.solver.multipole.PairCoefficients`.
+        """
+        kernel_args = self.kernel_args
+        return self.kernel(calc_constant_vortex_pairs)(
+            np.asarray(targets, dtype=np.int64),
+            np.asarray(panels, dtype=np.int64),
+            np.asarray(target_pts, dtype=np.float64),
+            on_body,
+            start_pts=kernel_args["start_pts"],
+            end_pts=kernel_args["end_pts"],
+            panel_normals=kernel_args["panel_normals"],
+            panel_tangents=kernel_args["panel_tangents"],
         )
 
 
@@ -195,12 +359,182 @@ def vortex_c_2d(  # noqa: D103
     return pcs_to_gcs((u_p, v_p), panel_angle)
 
 
+@numba.jit(**BASE_NUMBA_CONFIG)
+def constant_vortex_coefficients(  # noqa: D103
+    i: int,
+    j: int,
+    start_pts: numba.float64[:, :],
+    end_pts: numba.float64[:, :],
+    col_pts: numba.float64[:, :],
+    panel_normals: numba.float64[:, :],
+    panel_tangents: numba.float64[:, :],
+) -> Tuple[float, float]:
+    """Influence coefficients of vortex panel ``j`` at panel ``i``.
+
+    Args:
+        i: Index of the collocation point
+        j: Index of the constant vortex panel
+        start_pts: Start nodes (points) of all panels
+        end_pts: End nodes (points) of all panels
+        col_pts: Collocation points placed at the midpoint of each panel
+        panel_normals: Panel normal vectors as a set of row vectors
+        panel_tangents: Panel tangent vectors as a set of row vectors
+
+    Returns:
+        Normal and tangent influence coefficient a_ij.
+    """
+    if i == j:
+        return -0.5, -0.5
+
+    # Calculating induced velocity at collocation point i due to
+    # vortex j, and taking the dot-product to get the a_ij
+    u, v = constant_vortex_velocity(
+        col_pts[i, 0],
+        col_pts[i, 1],
+        start_pts[j, 0],
+        start_pts[j, 1],
+        end_pts[j, 0],
+        end_pts[j, 1],
+        panel_tangents[j, 0],
+        panel_tangents[j, 1],
+    )
+    return (
+        u * panel_normals[i, 0] + v * panel_normals[i, 1],
+        u * panel_tangents[i, 0] + v * panel_tangents[i, 1],
+    )
+
+
+@numba.jit(**BASE_NUMBA_CONFIG)
+def constant_vortex_velocity(  # noqa: D103
+    x: float,
+    y: float,
+    x_start: float,
+    y_start: float,
+    x_end: float,
+    y_end: float,
+    cos_angle: float,
+    sin_angle: float,
+) -> Tuple[float, float]:
+    """Velocity at (``x``, ``y``) induced by a panel of unit strength.
+
+    This is the allocation-free equivalent of
+    :py:func:`unit_constant_vortex_velocity`. All coordinate transforms
+    of :py:func:`vortex_c_2d` are written out on scalars, and the
+    cosine and sine of the panel angle are supplied by the caller. For
+    the kernels these are the components of the unit tangent vector of
+    the panel, hence no trigonometric function is evaluated per pair.
+
+    Args:
+        x: Global x coordinate of the point to observe the velocity
+        y: Global y coordinate of the point to observe the velocity
+        x_start: Global x coordinate of the start of the vortex panel
+        y_start: Global y coordinate of the start of the vortex panel
+        x_end: Global x coordinate of the end of the vortex panel
+        y_end: Global y coordinate of the end of the vortex panel
+        cos_angle: Cosine of the angle of the vortex panel
+        sin_angle: Sine of the angle of the vortex panel
+
+    Returns:
+        The global x and y components of the induced velocity.
+    """
+    # Transforming the point and end node to panel coordinates
+    x_diff, y_diff = x - x_start, y - y_start
+    x_p = cos_angle * x_diff + sin_angle * y_diff
+    y_p = -sin_angle * x_diff + cos_angle * y_diff
+
+    x_diff, y_diff = x_end - x_start, y_end - y_start
+    x_end_p = x_p - (cos_angle * x_diff + sin_angle * y_diff)
+    y_end_p = y_p - (-sin_angle * x_diff + cos_angle * y_diff)
+
+    # Refer to vortex_c_2d, the circulation is inverted due to the sign
+    # convention of Katz & Plotkin, i.e. gamma = -1
+    u_p = -(math.atan2(y_end_p, x_end_p) - math.atan2(y_p, x_p)) / (
+        2 * math.pi
+    )
+    v_p = math.log(
+        (x_p ** 2 + y_p ** 2) / (x_end_p ** 2 + y_end_p ** 2)
+    ) / (4 * math.pi)
+
+    # Transforming panel coordinates to global coordinates
+    return (
+        cos_angle * u_p - sin_angle * v_p,
+        sin_angle * u_p + cos_angle * v_p,
+    )
+
+
+@numba.jit(**BASE_NUMBA_CONFIG)
+def unit_constant_vortex_velocity(  # noqa: D103
+    point: numba.float64[:],
+    start_pt: numba.float64[:],
+    end_pt: numba.float64[:],
+    panel_angle: float,
+) -> numba.float64[:]:
+    """Velocity at ``point`` induced by a panel of unit strength.
+
+    Args:
+        point: Point to observe the induced velocity
+        start_pt: Start of the vortex panel
+        end_pt: End of the vortex panel
+        panel_angle: Angle of the vortex panel in SI radian
+
+    Returns:
+        The induced velocity vector.
+    """
+    # Circulation is inverted due to sign convention change from Katz &
+    # Plotkin who solved the problem on the XZ axis where a clockwise
+    # rotation is positive
+    gamma = -1
+
+    return vortex_c_2d(gamma, start_pt, end_pt, point, panel_angle)
+
+
+@numba.jit(**BASE_NUMBA_CONFIG)
+def fill_constant_vortex_row(  # noqa: D103
+    row: numba.float64[:, :],
+    i: int,
+    start_pts: numba.float64[:, :],
+    end_pts: numba.float64[:, :],
+    col_pts: numba.float64[:, :],
+    panel_normals: numba.float64[:, :],
+    panel_tangents: numba.float64[:, :],
+) -> None:
+    """Fills row ``i`` of the normal and tangent influence matrices.
+
+    Args:
+        row: Normal and tangent influence coefficients of collocation
+            point ``i`` with shape (2, n_panels) filled inplace. If the
+            shape is (1, n_panels) only the normal coefficients are
+            filled.
+        i: Index of the collocation point (row) to fill
+        start_pts: Start nodes (points) of all panels
+        end_pts: End nodes (points) of all panels
+        col_pts: Collocation points placed at the midpoint of each panel
+        panel_normals: Panel normal vectors as a set of row vectors
+        panel_tangents: Panel tangent vectors as a set of row vectors
+    """
+    n_vorts, _ = start_pts.shape
+    tangent = row.shape[0] > 1
+    for j in range(n_vorts):
+        a_n, a_t = constant_vortex_coefficients(
+            i,
+            j,
+            start_pts,
+            end_pts,
+            col_pts,
+            panel_normals,
+            panel_tangents,
+        )
+        row[0, j] = a_n
+        if tangent:
+            row[1, j] = a_t
+
+
+@eager
 @numba.jit(parallel=True, **BASE_NUMBA_CONFIG)
 def calc_constant_vortex_im(  # noqa: D103
     start_pts: numba.float64[:, :],
     end_pts: numba.float64[:, :],
     col_pts: numba.float64[:, :],
-    panel_angles: numba.float64[:, :],
     panel_normals: numba.float64[:, :],
     panel_tangents: numba.float64[:, :],
 ) -> numba.float64[:, :, :]:
@@ -231,7 +565,6 @@ def calc_constant_vortex_im(  # noqa: D103
         start_pts: Start nodes (points) of all panels
         end_pts: End nodes (points) of all panels
         col_pts: Collocation points placed at the midpoint of each panel
-        panel_angles: Panel angles in SI radian as a column vector
         panel_normals: Panel normal vectors as a set of row vectors
         panel_tangents: Panel tangent vectors as a set of row vectors
 
@@ -243,32 +576,521 @@ def calc_constant_vortex_im(  # noqa: D103
         Therefore, index 0 and 1 of the returned matrix correspond to
         the normal and tangent coefficient matrix respectively.
     """
-    # Circulation is inverted due to sign convention change from Katz &
-    # Plotkin who solved the problem on the XZ axis where a clockwise
-    # rotation is positive
-    gamma = -1
     n_vorts, _ = start_pts.shape
     n_cols, _ = col_pts.shape
 
     influence_matrix = np.zeros((2, n_cols, n_vorts), dtype=np.float64)
 
     for i in numba.prange(n_cols):
-        n_i = panel_normals[i]
-        t_i = panel_tangents[i]
-        col_pt = col_pts[i]
+        fill_constant_vortex_row(
+            influence_matrix[:, i],
+            i,
+            start_pts,
+            end_pts,
+            col_pts,
+            panel_normals,
+            panel_tangents,
+        )
+
+    return influence_matrix
+
+
+@register_kernel(ConstantVortex, "numba")
+@eager
+@numba.jit(parallel=True, **BASE_NUMBA_CONFIG)
+def fill_constant_vortex_rows(  # noqa: D103
+    out: numba.float64[:, :, :],
+    rows: numba.int64[:],
+    start_pts: numba.float64[:, :],
+    end_pts: numba.float64[:, :],
+    col_pts: numba.float64[:, :],
+    panel_normals: numba.float64[:, :],
+    panel_tangents: numba.float64[:, :],
+) -> None:
+    """Fills selected rows of the influence matrices.
+
+    Args:
+        out: Normal and tangent influence coefficients of the requested
+            rows with shape (2, n_rows, n_panels) filled inplace. If the
+            shape is (1, n_rows, n_panels) only the normal coefficients
+            are filled.
+        rows: Collocation point (row) indices
+        start_pts: Start nodes (points) of all panels
+        end_pts: End nodes (points) of all panels
+        col_pts: Collocation points placed at the midpoint of each panel
+        panel_normals: Panel normal vectors as a set of row vectors
+        panel_tangents: Panel tangent vectors as a set of row vectors
+    """
+    for k in numba.prange(rows.shape[0]):
+        fill_constant_vortex_row(
+            out[:, k],
+            rows[k],
+            start_pts,
+            end_pts,
+            col_pts,
+            panel_normals,
+            panel_tangents,
+        )
+
+
+@register_kernel(ConstantVortex, "numpy")
+def numpy_constant_vortex_rows(
+    out: np.ndarray,
+    rows: np.ndarray,
+    start_pts: np.ndarray,
+    end_pts: np.ndarray,
+    col_pts: np.ndarray,
+    panel_normals: np.ndarray,
+    panel_tangents: np.ndarray,
+) -> None:
+    """Evaluates :py:func:`fill_constant_vortex_rows` with NumPy.
+
+    The velocities of :py:func:`constant_vortex_velocity` are evaluated
+    as (n_rows, n_panels) arrays at once.
+    """
+    cos_angle, sin_angle = panel_tangents[:, 0], panel_tangents[:, 1]
+
+    # Collocation points and end nodes in panel coordinates
+    x_diff = col_pts[rows, 0, None] - start_pts[:, 0]
+    y_diff = col_pts[rows, 1, None] - start_pts[:, 1]
+    x_p = cos_angle * x_diff + sin_angle * y_diff
+    y_p = -sin_angle * x_diff + cos_angle * y_diff
+
+    x_diff, y_diff = (end_pts - start_pts).T
+    x_end_p = x_p - (cos_angle * x_diff + sin_angle * y_diff)
+    y_end_p = y_p - (-sin_angle * x_diff + cos_angle * y_diff)
+
+    u_p = -(np.arctan2(y_end_p, x_end_p) - np.arctan2(y_p, x_p)) / (
+        2 * math.pi
+    )
+    v_p = np.log((x_p ** 2 + y_p ** 2) / (x_end_p ** 2 + y_end_p ** 2)) / (
+        4 * math.pi
+    )
+    u = cos_angle * u_p - sin_angle * v_p
+    v = sin_angle * u_p + cos_angle * v_p
+
+    # Self-induced coefficients (Refer to constant_vortex_coefficients)
+    own = (np.arange(rows.size), rows)
+    for component, vectors in enumerate((panel_normals, panel_tangents)):
+        if component < out.shape[0]:
+            out[component] = u * vectors[rows, 0, None]
+            out[component] += v * vectors[rows, 1, None]
+            out[component][own] = -0.5
+
+
+@register_kernel(ConstantVortex, "tiled")
+def tiled_constant_vortex_rows(
+    out: np.ndarray, rows: np.ndarray, **kernel_args: np.ndarray
+) -> None:
+    """Fills :py:func:`fill_constant_vortex_rows` tile by tile.
+
+    Refer to :py:func:`gammapy.solver.backends.tile_shape`.
+    """
+    fill_constant_vortex_tiles(
+        out, rows, *tile_shape(out.shape[0]), **kernel_args
+    )
+
+
+@eager
+@numba.jit(parallel=True, **BASE_NUMBA_CONFIG)
+def fill_constant_vortex_tiles(  # noqa: D103
+    out: numba.float64[:, :, :],
+    rows: numba.int64[:],
+    tile_rows: int,
+    tile_cols: int,
+    start_pts: numba.float64[:, :],
+    end_pts: numba.float64[:, :],
+    col_pts: numba.float64[:, :],
+    panel_normals: numba.float64[:, :],
+    panel_tangents: numba.float64[:, :],
+) -> None:
+    """Fills selected rows of the influence matrices in tiles.
+
+    The rows are split into tiles of ``tile_rows`` collocation points,
+    which are distributed over the numba threads. Each tile sweeps the
+    panels in blocks of ``tile_cols``, hence the panel data of a block
+    is reused by all rows of the tile while it resides in cache.
+
+    Args:
+        out: Normal and tangent influence coefficients of the requested
+            rows with shape (2, n_rows, n_panels) filled inplace. If the
+            shape is (1, n_rows, n_panels) only the normal coefficients
+            are filled.
+        rows: Collocation point (row) indices
+        tile_rows: Number of rows of a tile
+        tile_cols: Number of panels (columns) of a tile
+        start_pts: Start nodes (points) of all panels
+        end_pts: End nodes (points) of all panels
+        col_pts: Collocation points placed at the midpoint of each panel
+        panel_normals: Panel normal vectors as a set of row vectors
+        panel_tangents: Panel tangent vectors as a set of row vectors
+    """
+    n_rows = rows.shape[0]
+    n_vorts, _ = start_pts.shape
+    tangent = out.shape[0] > 1
+
+    # Contiguous planes, the tangent plane aliases the normal plane if
+    # only the normal coefficients are requested
+    normal_plane = out[0]
+    tangent_plane = out[out.shape[0] - 1]
+
+    for tile in numba.prange((n_rows + tile_rows - 1) // tile_rows):
+        row_start = tile * tile_rows
+        row_end = min(row_start + tile_rows, n_rows)
+        for col_start in range(0, n_vorts, tile_cols):
+            col_end = min(col_start + tile_cols, n_vorts)
+            for k in range(row_start, row_end):
+                i = rows[k]
+                for j in range(col_start, col_end):
+                    if i == j:
+                        a_n, a_t = -0.5, -0.5
+                    else:
+                        u, v = constant_vortex_velocity(
+                            col_pts[i, 0],
+                            col_pts[i, 1],
+                            start_pts[j, 0],
+                            start_pts[j, 1],
+                            end_pts[j, 0],
+                            end_pts[j, 1],
+                            panel_tangents[j, 0],
+                            panel_tangents[j, 1],
+                        )
+                        a_n = u * panel_normals[i, 0] + v * panel_normals[i, 1]
+                        a_t = (
+                            u * panel_tangents[i, 0] + v * panel_tangents[i, 1]
+                        )
+                    normal_plane[k, j] = a_n
+                    if tangent:
+                        tangent_plane[k, j] = a_t
+
+
+@register_kernel(ConstantVortex, "nodal")
+@eager
+@numba.jit(parallel=True, **BASE_NUMBA_CONFIG)
+def fill_constant_vortex_nodal_rows(  # noqa: D103
+    out: numba.float64[:, :, :],
+    rows: numba.int64[:],
+    start_pts: numba.float64[:, :],
+    end_pts: numba.float64[:, :],
+    col_pts: numba.float64[:, :],
+    panel_normals: numba.float64[:, :],
+    panel_tangents: numba.float64[:, :],
+) -> None:
+    """Fills selected rows with terms shared by adjacent panels.
+
+    The velocity of :py:func:`constant_vortex_velocity` only depends on
+    the squared distances and directions from the nodes of a panel to
+    the collocation point. The end node of panel ``j`` is the start node
+    of panel ``j + 1``, hence the logarithm of the squared distance and
+    the polar angle are evaluated once per node and collocation point.
+    The angle subtended by a panel is the difference of the polar angles
+    of its nodes, which is free of transcendental functions.
+
+    Refer to :py:func:`fill_constant_vortex_rows` for the arguments.
+    """
+    n_vorts, _ = start_pts.shape
+    tangent = out.shape[0] > 1
+
+    for k in numba.prange(rows.shape[0]):
+        i = rows[k]
+        x, y = col_pts[i, 0], col_pts[i, 1]
+
+        # Log of the squared distance and polar angle from each node
+        log_r2 = np.empty(n_vorts + 1, dtype=np.float64)
+        theta = np.empty(n_vorts + 1, dtype=np.float64)
+        for n in range(n_vorts + 1):
+            node = start_pts[n] if n < n_vorts else end_pts[n_vorts - 1]
+            x_diff, y_diff = x - node[0], y - node[1]
+            log_r2[n] = math.log(x_diff ** 2 + y_diff ** 2)
+            theta[n] = math.atan2(y_diff, x_diff)
+
         for j in range(n_vorts):
-            # Calculating induced velocity at collocation point i due to
-            # vortex j, and taking the dot-product to get the a_ij
             if i == j:
-                influence_matrix[..., i, j] = -0.5
-            else:
-                v_induced = vortex_c_2d(
-                    gamma,
-                    start_pts[j],
-                    end_pts[j],
-                    col_pt,
-                    panel_angles[j, 0],
+                out[0, k, j] = -0.5
+                if tangent:
+                    out[1, k, j] = -0.5
+                continue
+
+            # Subtended angle, all points off the panel see less than pi
+            angle = theta[j] - theta[j + 1]
+            if angle > math.pi:
+                angle -= 2 * math.pi
+            elif angle < -math.pi:
+                angle += 2 * math.pi
+
+            # Refer to constant_vortex_velocity
+            u_p = angle / (2 * math.pi)
+            v_p = (log_r2[j] - log_r2[j + 1]) / (4 * math.pi)
+            cos_angle, sin_angle = panel_tangents[j, 0], panel_tangents[j, 1]
+            u = cos_angle * u_p - sin_angle * v_p
+            v = sin_angle * u_p + cos_angle * v_p
+            out[0, k, j] = u * panel_normals[i, 0] + v * panel_normals[i, 1]
+            if tangent:
+                out[1, k, j] = (
+                    u * panel_tangents[i, 0] + v * panel_tangents[i, 1]
                 )
-                influence_matrix[..., i, j] = v_induced @ n_i, v_induced @ t_i
+
+
+@eager
+@numba.jit(parallel=True, **BASE_NUMBA_CONFIG)
+def calc_constant_vortex_batch_im(  # noqa: D103
+    start_pts: numba.float64[:, :, :],
+    end_pts: numba.float64[:, :, :],
+    col_pts: numba.float64[:, :, :],
+    panel_normals: numba.float64[:, :, :],
+    panel_tangents: numba.float64[:, :, :],
+) -> numba.float64[:, :, :, :]:
+    """Calculates influence matrices of a batch of geometries at once.
+
+    All inputs of :py:func:`calc_constant_vortex_im` are stacked along
+    a new leading batch axis of size B. The rows of all geometries are
+    distributed over a single parallel loop such that all threads stay
+    occupied for the whole batch.
+
+    Returns:
+        Normal and tangent vortex influence matrices of each geometry
+        with shape (B, 2, n_panels, n_panels).
+    """
+    n_batch, n_vorts, _ = start_pts.shape
+    _, n_cols, _ = col_pts.shape
+
+    influence_matrix = np.zeros(
+        (n_batch, 2, n_cols, n_vorts), dtype=np.float64
+    )
+
+    for k in numba.prange(n_batch * n_cols):
+        b, i = k // n_cols, k % n_cols
+        fill_constant_vortex_row(
+            influence_matrix[b, :, i],
+            i,
+            start_pts[b],
+            end_pts[b],
+            col_pts[b],
+            panel_normals[b],
+            panel_tangents[b],
+        )
 
     return influence_matrix
+
+
+@eager
+@numba.jit(parallel=True, **BASE_NUMBA_CONFIG)
+def calc_constant_vortex_entries(  # noqa: D103
+    rows: numba.int64[:],
+    cols: numba.int64[:],
+    start_pts: numba.float64[:, :],
+    end_pts: numba.float64[:, :],
+    col_pts: numba.float64[:, :],
+    panel_normals: numba.float64[:, :],
+    panel_tangents: numba.float64[:, :],
+) -> numba.float64[:, :]:
+    """Calculates selected entries of the influence matrices.
+
+    Only the entries at (``rows[k]``, ``cols[k]``) are evaluated which
+    allows blocks or sparse patterns of the influence matrices to be
+    obtained without assembling the full matrices.
+
+    Args:
+        rows: Collocation point (row) index of each entry
+        cols: Vortex panel (column) index of each entry
+        start_pts: Start nodes (points) of all panels
+        end_pts: End nodes (points) of all panels
+        col_pts: Collocation points placed at the midpoint of each panel
+        panel_normals: Panel normal vectors as a set of row vectors
+        panel_tangents: Panel tangent vectors as a set of row vectors
+
+    Returns:
+        Normal and tangent influence coefficients of all requested
+        entries with shape (2, n_entries).
+    """
+    n_entries = rows.shape[0]
+
+    entries = np.zeros((2, n_entries), dtype=np.float64)
+
+    for k in numba.prange(n_entries):
+        entries[0, k], entries[1, k] = constant_vortex_coefficients(
+            rows[k],
+            cols[k],
+            start_pts,
+            end_pts,
+            col_pts,
+            panel_normals,
+            panel_tangents,
+        )
+
+    return entries
+
+
+@eager
+@numba.jit(parallel=True, **BASE_NUMBA_CONFIG)
+def calc_constant_vortex_matvec(  # noqa: D103
+    x: numba.float64[:, :],
+    start_pts: numba.float64[:, :],
+    end_pts: numba.float64[:, :],
+    col_pts: numba.float64[:, :],
+    panel_normals: numba.float64[:, :],
+    panel_tangents: numba.float64[:, :],
+) -> numba.float64[:, :, :]:
+    """Multiplies the influence matrices with ``x`` without storage.
+
+    The influence coefficients are evaluated on the fly and directly
+    accumulated into the product. Therefore, the memory requirement is
+    O(N) instead of the O(N^2) required by the assembled matrices.
+
+    Args:
+        x: Vortex strengths of all panels with shape (n_panels, m)
+        start_pts: Start nodes (points) of all panels
+        end_pts: End nodes (points) of all panels
+        col_pts: Collocation points placed at the midpoint of each panel
+        panel_normals: Panel normal vectors as a set of row vectors
+        panel_tangents: Panel tangent vectors as a set of row vectors
+
+    Returns:
+        Products of the normal and tangent influence matrices with
+        ``x``. The shape of the returned array is (2, n_panels, m).
+    """
+    n_vorts, _ = start_pts.shape
+    n_cols, _ = col_pts.shape
+    _, m = x.shape
+
+    product = np.zeros((2, n_cols, m), dtype=np.float64)
+
+    for i in numba.prange(n_cols):
+        for j in range(n_vorts):
+            a_n, a_t = constant_vortex_coefficients(
+                i,
+                j,
+                start_pts,
+                end_pts,
+                col_pts,
+                panel_normals,
+                panel_tangents,
+            )
+            for k in range(m):
+                product[0, i, k] += a_n * x[j, k]
+                product[1, i, k] += a_t * x[j, k]
+
+    return product
+
+
+@eager
+@numba.jit(parallel=True, **BASE_NUMBA_CONFIG)
+def calc_constant_vortex_pairs(  # noqa: D103
+    targets: numba.int64[:],
+    panels: numba.int64[:],
+    target_pts: numba.float64[:, :],
+    on_body: bool,
+    start_pts: numba.float64[:, :],
+    end_pts: numba.float64[:, :],
+    panel_normals: numba.float64[:, :],
+    panel_tangents: numba.float64[:, :],
+) -> numba.float64[:, :, :]:
+    """Calculates the influence of single panels on target points.
+
+    Args:
+        targets: Target point index of each pair
+        panels: Constant vortex panel index of each pair
+        target_pts: Collocation points if ``on_body`` is True, otherwise
+            arbitrary off-body points
+        on_body: Sets if the targets are the collocation points, in
+            which case the coefficients are taken along the panel
+            normal and tangent. Otherwise, these are the y and x axes.
+        start_pts: Start nodes (points) of all panels
+        end_pts: End nodes (points) of all panels
+        panel_normals: Panel normal vectors as a set of row vectors
+        panel_tangents: Panel tangent vectors as a set of row vectors
+
+    Returns:
+        Normal and tangent influence coefficients of the panels with
+        shape (2, 2, n_pairs). The second strength degree of freedom is
+        unused and hence zero.
+    """
+    n_pairs = targets.shape[0]
+
+    coefficients = np.zeros((2, 2, n_pairs), dtype=np.float64)
+
+    for k in numba.prange(n_pairs):
+        i, j = targets[k], panels[k]
+        if on_body:
+            cn, ct = constant_vortex_coefficients(
+                i,
+                j,
+                start_pts,
+                end_pts,
+                target_pts,
+                panel_normals,
+                panel_tangents,
+            )
+        else:
+            ct, cn = constant_vortex_velocity(
+                target_pts[i, 0],
+                target_pts[i, 1],
+                start_pts[j, 0],
+                start_pts[j, 1],
+                end_pts[j, 0],
+                end_pts[j, 1],
+                panel_tangents[j, 0],
+                panel_tangents[j, 1],
+            )
+        coefficients[0, 0, k], coefficients[1, 0, k] = cn, ct
+
+    return coefficients
+
+
+@eager
+@numba.jit(parallel=True, **BASE_NUMBA_CONFIG)
+def fill_constant_vortex_derivatives(  # noqa: D103
+    out: numba.float64[:, :, :, :, :],
+    start_pts: numba.float64[:, :],
+    end_pts: numba.float64[:, :],
+    col_pts: numba.float64[:, :],
+    panel_normals: numba.float64[:, :],
+    panel_tangents: numba.float64[:, :],
+) -> None:
+    """Fills the derivatives of the influence coefficients.
+
+    With complex coordinates, the velocity of
+    :py:func:`constant_vortex_velocity` yields the normal coefficient
+    Re(c P) / (2 pi) with P = log((zeta - z_j) / (zeta - z_j+1)),
+    refer to :py:mod:`gammapy.solver.derivatives`. The self-induced
+    coefficients are constant, hence their derivatives are left zero.
+
+    Args:
+        out: Derivatives of the normal and tangent influence
+            coefficients with shape (2, n_panels, n_panels, 4, 2) filled
+            inplace. The trailing axes are the start and end node of
+            the collocation panel followed by those of the vortex
+            panel, and the x and y coordinate. If the leading axis has
+            size 1 only the normal coefficients are filled.
+        start_pts: Start nodes (points) of all panels
+        end_pts: End nodes (points) of all panels
+        col_pts: Collocation points placed at the midpoint of each panel
+        panel_normals: Panel normal vectors as a set of row vectors
+        panel_tangents: Panel tangent vectors as a set of row vectors
+    """
+    n_vorts, _ = start_pts.shape
+    n_cols, _ = col_pts.shape
+
+    for i in numba.prange(n_cols):
+        zeta = complex(col_pts[i, 0], col_pts[i, 1])
+        tangent_col = complex(panel_tangents[i, 0], panel_tangents[i, 1])
+        length_col = math.hypot(
+            end_pts[i, 0] - start_pts[i, 0], end_pts[i, 1] - start_pts[i, 1]
+        )
+        for j in range(n_vorts):
+            if i == j:
+                continue
+            d_start = zeta - complex(start_pts[j, 0], start_pts[j, 1])
+            d_end = zeta - complex(end_pts[j, 0], end_pts[j, 1])
+            fill_pair_gradients(
+                out[:, i, j],
+                1 / (2 * math.pi),
+                cmath.log(d_start / d_end),
+                1 / d_start - 1 / d_end,
+                -1 / d_start,
+                1 / d_end,
+                tangent_col,
+                complex(panel_tangents[j, 0], panel_tangents[j, 1]),
+                length_col,
+                abs(d_start - d_end),
+            )
@@ -14,19 +14,29 @@
 
 """Contains definitions for a Linear Strength Vortex Panel Method."""
 
+import cmath
 import math
 from functools import cached_property
-from typing import Dict, Sequence, Tuple, Union
+from typing import Any, Dict, Optional, Tuple
 
 import numba
 import numpy as np
+from scipy.sparse import csr_matrix
 
 from gammapy.geometry.panel import Panel2D
+from gammapy.jit import eager
+from gammapy.solver.backends import register_kernel, tile_shape
 from gammapy.solver.base import (
     BASE_NUMBA_CONFIG,
     PanelMethod,
     ThickFlowSolution,
 )
+from gammapy.solver.derivatives import (
+    derivative_matrix,
+    fill_pair_gradients,
+    length_derivatives,
+    normal_derivatives,
+)
 
 
 class LinearVortex(PanelMethod):
@@ -61,40 +71,318 @@ class LinearVortex(PanelMethod):
         return self.panels.points_at(0.5)
 
     @cached_property
-    def influence_matrices(self) -> Dict[str, np.ndarray]:
-        """Normal and tangent influence coefficient matrices."""
+    def kernel_args(self) -> Dict[str, np.ndarray]:
+        """Geometric arguments shared by all linear vortex kernels."""
         start_pts, _ = self.panels.nodes
-        im_normal, im_tangent = calc_linear_vortex_im(
+        return dict(
             col_pts=self.collocation_points,
             vort_pts=start_pts,  # Vortices are placed on all start nodes
             panel_angles=self.panels.angles,
             panel_lengths=self.panels.lengths,
         )
-        return {"normal": im_normal, "tangent": im_tangent}
 
     @property
+    def coefficient_shape(self) -> Tuple[int, int]:
+        """Includes the Kutta condition row and trailing-edge vortex."""
+        n_panels = self.panels.n_panels
+        return n_panels + 1, n_panels + 1
+
+    def assemble(
+        self, tangent: bool = False, backend: Optional[str] = None
+    ) -> Dict[str, np.ndarray]:
+        """Inserts the Kutta condition gamma_0 + gamma_n+1 = 0."""
+        matrices = super().assemble(tangent, backend)
+        matrices["normal"][-1, [0, -1]] = 1
+        return matrices
+
+    @cached_property
+    def influence_matrices(self) -> Dict[str, np.ndarray]:
+        """Normal and tangent influence coefficient matrices."""
+        return self.assemble(tangent=True)
+
+    @cached_property
     def influence_matrix(self) -> np.ndarray:
-        """Normal influence matrix for :py:meth`get_circulations`."""
-        return self.influence_matrices["normal"]
+        """Normal influence matrix for :py:meth`get_circulations`.
+
+        The tangent influence matrix is only assembled alongside if
+        :py:attr:`influence_matrices` was already requested.
+        """
+        if "influence_matrices" in vars(self):
+            return self.influence_matrices["normal"]
+        return self.assemble()["normal"]
+
+    @property
+    def border_matrix(self) -> csr_matrix:
+        """Kutta condition row, gamma_0 + gamma_n+1 = 0."""
+        n_panels = self.panels.n_panels
+        return csr_matrix(
+            ([1.0, 1.0], ([n_panels, n_panels], [0, n_panels])),
+            shape=(n_panels + 1, n_panels + 1),
+        )
+
+    @cached_property
+    def mirror_maps(self) -> Optional[Tuple[np.ndarray, ...]]:
+        """Mirror symmetry of the system of a symmetric airfoil.
+
+        Node k is the mirror image of node n_panels - k and collocation
+        point i that of n_panels - 1 - i. A mirrored vortex distribution
+        induces the opposite normal velocity at the mirrored
+        collocation points, while the Kutta condition row maps onto
+        itself.
+        """
+        if self.airfoil.cambered:
+            return None
+        start_pts, end_pts = self.panels.nodes
+        nodes = np.vstack((start_pts, end_pts[-1:]))
+        # Perturbed nodes, i.e. by finite differences, are not symmetric
+        if not np.allclose(nodes[::-1] * (1, -1), nodes, rtol=0, atol=1e-12):
+            return None
+        n_panels = self.panels.n_panels
+        row_map = np.append(np.arange(n_panels)[::-1], n_panels)
+        row_signs = np.append(-np.ones(n_panels), 1)
+        col_map = np.arange(n_panels + 1)[::-1]
+        col_signs = np.ones(n_panels + 1)
+        return row_map, row_signs, col_map, col_signs
+
+    def influence_entries(self, rows: np.ndarray, cols: np.ndarray):
+        """Evaluates :py:attr:`influence_matrix` entries on the fly."""
+        rows = np.asarray(rows, dtype=np.int64)
+        cols = np.asarray(cols, dtype=np.int64)
+        n_panels = self.panels.n_panels
+
+        # Kutta condition row: gamma_0 + gamma_n+1 = 0
+        entries = ((cols == 0) | (cols == n_panels)).astype(np.float64)
+        interior = rows < n_panels
+        entries[interior] = self.kernel(calc_linear_vortex_entries)(
+            rows[interior], cols[interior], **self.kernel_args
+        )[0]
+        return entries
+
+    def influence_rows(self, rows: np.ndarray) -> np.ndarray:
+        """Evaluates complete :py:attr:`influence_matrix` rows."""
+        return self.influence_blocks(rows)["system"]
+
+    def influence_blocks(self, rows: np.ndarray) -> Dict[str, np.ndarray]:
+        """Rows of the system and the tangent influence matrix."""
+        rows = np.asarray(rows, dtype=np.int64)
+        n_panels = self.panels.n_panels
 
-    def solve_for(
-        self, alpha: Union[float, Sequence[float]], plot: bool = False,
-    ) -> ThickFlowSolution:
-        """Returns a :py:class:`FlowSolution` with lazy attributes.
+        # Kutta condition row: gamma_0 + gamma_n+1 = 0
+        blocks = np.zeros((2, rows.size, n_panels + 1), dtype=np.float64)
+        kutta = rows == n_panels
+        blocks[0, kutta, 0] = blocks[0, kutta, n_panels] = 1
+        interior = np.zeros((2, np.sum(~kutta), n_panels + 1))
+        self.fill_influence_rows(interior, rows[~kutta])
+        blocks[:, ~kutta] = interior
+        return {"system": blocks[0], "tangent": blocks[1]}
+
+    def perturbed_unknowns(
+        self, panels: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Collocation rows and the start and end node columns."""
+        return panels, np.union1d(panels, panels + 1)
+
+    def matvec(self, x: np.ndarray) -> np.ndarray:
+        """Matrix-free product of the influence matrix and ``x``."""
+        x_2d = x.reshape(x.shape[0], -1)
+        product = np.empty_like(x_2d, dtype=np.float64)
+        product[:-1] = self.influence_products(x_2d)[0]
+        product[-1] = x_2d[0] + x_2d[-1]  # Kutta condition
+        return product.reshape(x.shape)
+
+    def tangent_matvec(self, x: np.ndarray) -> np.ndarray:
+        """Matrix-free product of the tangent influence matrix and x.
 
         Args:
-            alpha: A value or sequence of Angle of Attack in SI degree
-            plot: Sets if plots should be shown on initialization.
-                This evaluates all attributes and negates the
-                laziness of the returned object. Defaults to 1.
+            x: Vortex strengths at all n_panels + 1 nodes
+
+        Returns:
+            Tangent influence coefficients at all collocation points
+            multiplied with ``x``, excluding the Kutta condition row.
         """
-        return self.solution_class(
-            method=self,
-            # Removing constant error term in the solution
-            circulations=self.get_circulations(alpha)[:-1, :],
-            alpha=alpha,
+        x_2d = x.reshape(x.shape[0], -1)
+        product = self.influence_products(x_2d)[1]
+        return product.reshape((product.shape[0], *x.shape[1:]))
+
+    def kernel_products(self, x: np.ndarray) -> np.ndarray:
+        """Exact normal and tangent influence of ``x``."""
+        return self.kernel(calc_linear_vortex_matvec)(
+            np.ascontiguousarray(x, dtype=np.float64), **self.kernel_args
         )
 
+    @cached_property
+    def multipole_layout(self) -> Dict[str, Any]:
+        """Singularities, targets and near-field kernel of the tree."""
+        start_pts, end_pts = self.panels.nodes
+        n_panels = self.panels.n_panels
+        return dict(
+            start_pts=start_pts,
+            end_pts=end_pts,
+            lengths=self.panels.lengths,
+            # Panel j spans the vortex strengths at nodes j and j + 1
+            dofs=np.arange(n_panels)[:, None] + np.array([[0, 1]]),
+            linear=True,
+            prefactor=1j,  # Coefficients are normalized by 2 pi
+            pair_coefficients=self.pair_coefficients,
+            target_pts=self.collocation_points,
+            target_angles=self.panels.angles,
+        )
+
+    def pair_coefficients(
+        self,
+        targets: np.ndarray,
+        panels: np.ndarray,
+        target_pts: np.ndarray,
+        on_body: bool,
+    ) -> np.ndarray:
+        """Exact influence of the near-field target-element pairs.
+
+        Refer to :py:data:`gammapy.solver.multipole.PairCoefficients`.
+        """
+        return self.kernel(calc_linear_vortex_pairs)(
+            np.asarray(targets, dtype=np.int64),
+            np.asarray(panels, dtype=np.int64),
+            np.asarray(target_pts, dtype=np.float64),
+            on_body,
+            vort_pts=self.kernel_args["vort_pts"],
+            panel_angles=self.kernel_args["panel_angles"],
+            panel_lengths=self.kernel_args["panel_lengths"],
+        )
+
+    def geometric_derivatives(
+        self, tangent: bool = False
+    ) -> Dict[str, csr_matrix]:
+        """Derivatives of the system w.r.t. the panel nodes.
+
+        The Kutta condition row doesn't depend on the geometry. Refer
+        to :py:meth:`PanelMethod.geometric_derivatives`.
+        """
+        n_panels = self.panels.n_panels
+        values = np.zeros((1 + tangent, n_panels, n_panels, 2, 4, 2))
+        self.kernel(fill_linear_vortex_derivatives)(
+            values, **self.kernel_args
+        )
+
+        # Panel j contributes to the columns of its start and end node
+        i, j, end = np.ogrid[:n_panels, :n_panels, :2]
+        nodes = np.stack(np.broadcast_arrays(i, i + 1, j, j + 1), axis=-1)
+        rows = (i * (n_panels + 1) + j + end)[..., None]
+        shape = ((n_panels + 1) ** 2, 2 * (n_panels + 1))
+        derivatives = {
+            "normal": derivative_matrix(values[0], rows, nodes, shape),
+            "rhs": normal_derivatives(self.panels, n_panels + 1),
+            "weights": self.adjacent_panels @ length_derivatives(self.panels),
+        }
+        if tangent:
+            derivatives["tangent"] = derivative_matrix(
+                values[1], rows, nodes, shape
+            )
+        return derivatives
+
+    def trim_circulations(self, circulations: np.ndarray) -> np.ndarray:
+        """Removes the trailing-edge vortex from the solution."""
+        return circulations[:-1, :]
+
+    def singularity_strengths(self, circulations: np.ndarray) -> np.ndarray:
+        """Appends the trailing-edge vortex from the Kutta condition."""
+        return np.vstack((circulations, -circulations[:1]))
+
+    @cached_property
+    def adjacent_panels(self) -> csr_matrix:
+        """Maps the panel lengths onto the circulation weights.
+
+        The strength of node k varies linearly along panels k - 1 and k,
+        hence its weight is pi times the sum of their lengths, where the
+        factor 2 pi normalizes the strengths.
+        """
+        n_panels = self.panels.n_panels
+        panel_idx = np.arange(n_panels)
+        return csr_matrix(
+            (
+                np.full(2 * n_panels, math.pi),
+                (np.append(panel_idx, panel_idx + 1), np.tile(panel_idx, 2)),
+            ),
+            shape=(n_panels + 1, n_panels),
+        )
+
+    @cached_property
+    def circulation_weights(self) -> np.ndarray:
+        """Nodal weights, refer to :py:attr:`adjacent_panels`."""
+        return self.adjacent_panels @ self.panels.lengths[:, 0]
+
+
+@numba.jit(**BASE_NUMBA_CONFIG)
+def panel_trig_table(  # noqa: D103
+    panel_angles: numba.float64[:, :],
+) -> numba.float64[:, :]:
+    """Tabulates the cosine and sine of all panel angles.
+
+    The table is computed once per assembly such that the influence
+    coefficients of the O(N^2) panel pairs only require multiplications
+    (Refer to :py:func:`trig_integration_constants`).
+
+    Args:
+        panel_angles: Panel angles in SI radian as a column vector
+
+    Returns:
+        Cosine and sine of each panel angle with shape (n_panels, 2).
+    """
+    n_panels, _ = panel_angles.shape
+    table = np.empty((n_panels, 2), dtype=np.float64)
+    for j in range(n_panels):
+        table[j, 0] = math.cos(panel_angles[j, 0])
+        table[j, 1] = math.sin(panel_angles[j, 0])
+    return table
+
+
+@numba.jit(**BASE_NUMBA_CONFIG)
+def trig_integration_constants(  # noqa: D103
+    vx: float,
+    vy: float,
+    cos_col: float,
+    sin_col: float,
+    cos_vort: float,
+    sin_vort: float,
+    vort_panel_length: float,
+) -> Tuple[float, float, float, float, float, float, float, float, float]:
+    """Calculates integration constants from tabulated trigonometry.
+
+    This is equivalent to :py:func:`calc_integration_constants`, but
+    the cosine and sine of the angle differences are obtained with the
+    angle-addition identities. Therefore, only a single ``log`` and
+    ``atan2`` are evaluated per panel pair.
+
+    Args:
+        vx: x component of the vector from vortex to collocation point
+        vy: y component of the vector from vortex to collocation point
+        cos_col: Cosine of the collocation point panel angle
+        sin_col: Sine of the collocation point panel angle
+        cos_vort: Cosine of the linear vortex panel angle
+        sin_vort: Sine of the linear vortex panel angle
+        vort_panel_length: Length of the linear vortex panel
+
+    Returns:
+        A, B, C, D, E, F, G, P, Q integration constants of the
+        linear vortex panel method for airfoils of arbitrary thickness.
+    """
+    s_j = vort_panel_length
+
+    a = -vx * cos_vort - vy * sin_vort
+    b = vx ** 2 + vy ** 2
+    c = sin_col * cos_vort - cos_col * sin_vort  # sin(col - vort)
+    d = cos_col * cos_vort + sin_col * sin_vort  # cos(col - vort)
+    e = vx * sin_vort - vy * cos_vort
+    f = math.log(1 + ((s_j ** 2 + 2 * s_j * a) / b))
+    g = math.atan2(e * s_j, b + a * s_j)
+
+    # Cosine and sine of (col - 2 * vort) = (col - vort) - vort
+    sin_2 = c * cos_vort - d * sin_vort
+    cos_2 = d * cos_vort + c * sin_vort
+    p = vx * sin_2 + vy * cos_2
+    q = vx * cos_2 - vy * sin_2
+
+    return a, b, c, d, e, f, g, p, q
+
 
 @numba.jit(**BASE_NUMBA_CONFIG)
 def calc_integration_constants(  # noqa: D103
@@ -122,28 +410,44 @@ def calc_integration_constants(  # noqa: D103
 
     .. _video: https://www.youtube.com/watch?v=5lmIv2CUpoc
     """
+    return trig_integration_constants(
+        col_pt[0] - vort_pt[0],
+        col_pt[1] - vort_pt[1],
+        math.cos(col_panel_angle),
+        math.sin(col_panel_angle),
+        math.cos(vort_panel_angle),
+        math.sin(vort_panel_angle),
+        vort_panel_length,
+    )
 
-    v = col_pt - vort_pt  # Vector from vortex to collocation point
-    vx, vy = v  # Vector from vortex to collocation point
-    s_j = vort_panel_length  # Length of the vortex panel
 
-    a = -vx * math.cos(vort_panel_angle) - vy * math.sin(vort_panel_angle)
-    b = np.sum(v ** 2)
-    c = math.sin(col_panel_angle - vort_panel_angle)
-    d = math.cos(col_panel_angle - vort_panel_angle)
-    e = vx * math.sin(vort_panel_angle) - vy * math.cos(vort_panel_angle)
-    f = math.log(1 + ((s_j ** 2 + 2 * s_j * a) / b))
-    g = math.atan2(e * s_j, b + a * s_j)
+@numba.jit(**BASE_NUMBA_CONFIG)
+def trig_vortex_coefficients(  # noqa: D103
+    vx: float,
+    vy: float,
+    cos_col: float,
+    sin_col: float,
+    cos_vort: float,
+    sin_vort: float,
+    vort_panel_length: float,
+) -> Tuple[float, float, float, float]:
+    """Calculates induced velocity coefficients from tabulated trig.
+
+    Refer to :py:func:`trig_integration_constants` for the arguments
+    and :py:func:`calc_vortex_coefficients` for the returned values.
+    """
+    a, b, c, d, e, f, g, p, q = trig_integration_constants(
+        vx, vy, cos_col, sin_col, cos_vort, sin_vort, vort_panel_length
+    )
+    s_j = vort_panel_length
 
-    # Turning Black formatter off here for redability
-    # fmt: off
-    p = vx * math.sin(col_panel_angle - 2 * vort_panel_angle) \
-        + vy * math.cos(col_panel_angle - 2 * vort_panel_angle)
-    q = vx * math.cos(col_panel_angle - 2 * vort_panel_angle) \
-        - vy * math.sin(col_panel_angle - 2 * vort_panel_angle)
-    # fmt: on
+    cn_2 = d + (0.5 * q * f / s_j) - (a * c + d * e) * g / s_j
+    cn_1 = (0.5 * d * f) + (c * g) - cn_2
 
-    return a, b, c, d, e, f, g, p, q
+    ct_2 = c + (0.5 * p * f / s_j) + (a * d - c * e) * g / s_j
+    ct_1 = (0.5 * c * f) - (d * g) - ct_2
+
+    return cn_1, cn_2, ct_1, ct_2
 
 
 @numba.jit(**BASE_NUMBA_CONFIG)
@@ -153,7 +457,7 @@ def calc_vortex_coefficients(  # noqa: D103
     col_panel_angle: float,
     vort_panel_angle: float,
     vort_panel_length: float,
-) -> Tuple[float, float]:
+) -> Tuple[float, float, float, float]:
     """Calculates induced velocity coefficients.
 
     Refer to pg. 157-159 of Foundations of Aerodynamics: 5th Edition.
@@ -171,20 +475,105 @@ def calc_vortex_coefficients(  # noqa: D103
         velocities respectively. Furthermore, the subscript 1 is the
         velocity starting intensity
     """
-    a, b, c, d, e, f, g, p, q = calc_integration_constants(
-        col_pt, vort_pt, col_panel_angle, vort_panel_angle, vort_panel_length,
+    return trig_vortex_coefficients(
+        col_pt[0] - vort_pt[0],
+        col_pt[1] - vort_pt[1],
+        math.cos(col_panel_angle),
+        math.sin(col_panel_angle),
+        math.cos(vort_panel_angle),
+        math.sin(vort_panel_angle),
+        vort_panel_length,
     )
-    s_j = vort_panel_length
 
-    cn_2 = d + (0.5 * q * f / s_j) - (a * c + d * e) * g / s_j
-    cn_1 = (0.5 * d * f) + (c * g) - cn_2
 
-    ct_2 = c + (0.5 * p * f / s_j) + (a * d - c * e) * g / s_j
-    ct_1 = (0.5 * c * f) - (d * g) - ct_2
+@numba.jit(**BASE_NUMBA_CONFIG)
+def linear_vortex_coefficients(  # noqa: D103
+    i: int,
+    j: int,
+    col_pts: numba.float64[:, :],
+    vort_pts: numba.float64[:, :],
+    panel_trig: numba.float64[:, :],
+    panel_lengths: numba.float64[:, :],
+) -> Tuple[float, float, float, float]:
+    """Induced velocity coefficients of panel ``j`` at panel ``i``.
 
-    return cn_1, cn_2, ct_1, ct_2
+    This wraps :py:func:`trig_vortex_coefficients` such that the
+    self-induced coefficients are returned when ``i`` equals ``j``.
 
+    Args:
+        i: Index of the collocation point
+        j: Index of the linear vortex panel
+        col_pts: Collocation points placed at the midpoint of each panel
+        vort_pts: Start nodes (points) of all panels
+        panel_trig: Cosine and sine of the panel angles, refer to
+            :py:func:`panel_trig_table`
+        panel_lengths: Panel lengths as a column vector
+
+    Returns:
+        CN_1, CN_2, CT_1, CT_2 induced velocity coefficients.
+    """
+    if i == j:
+        return -1.0, 1.0, math.pi / 2, math.pi / 2
+    return trig_vortex_coefficients(
+        col_pts[i, 0] - vort_pts[j, 0],
+        col_pts[i, 1] - vort_pts[j, 1],
+        panel_trig[i, 0],
+        panel_trig[i, 1],
+        panel_trig[j, 0],
+        panel_trig[j, 1],
+        panel_lengths[j, 0],
+    )
+
+
+@numba.jit(**BASE_NUMBA_CONFIG)
+def fill_linear_vortex_row(  # noqa: D103
+    row: numba.float64[:, :],
+    i: int,
+    col_pts: numba.float64[:, :],
+    vort_pts: numba.float64[:, :],
+    panel_trig: numba.float64[:, :],
+    panel_lengths: numba.float64[:, :],
+) -> None:
+    """Fills row ``i`` of the normal and tangent influence matrices.
 
+    Args:
+        row: Normal and tangent influence coefficients of collocation
+            point ``i`` with shape (2, n_panels + 1) filled inplace. If
+            the shape is (1, n_panels + 1) only the normal coefficients
+            are filled.
+        i: Index of the collocation point (row) to fill
+        col_pts: Collocation points placed at the midpoint of each panel
+        vort_pts: Start nodes (points) of all panels
+        panel_trig: Cosine and sine of the panel angles, refer to
+            :py:func:`panel_trig_table`
+        panel_lengths: Panel lengths as a column vector
+    """
+    n_vorts, _ = vort_pts.shape
+    tangent = row.shape[0] > 1
+
+    # cn = Normal induced velocity coefficient
+    # ct = Tangent induced velocity coefficient
+    # Subscript 1 = Panel start value
+    # Subscript 2 = Panel end value
+    # Initial end value coefficients are zero
+    cn_2_old, ct_2_old = float(0), float(0)
+    for j in range(n_vorts):
+        cn_1, cn_2, ct_1, ct_2 = linear_vortex_coefficients(
+            i, j, col_pts, vort_pts, panel_trig, panel_lengths
+        )
+        # Storing normal/tangent coefficient and updating end value
+        row[0, j] = cn_1 + cn_2_old
+        if tangent:
+            row[1, j] = ct_1 + ct_2_old
+        cn_2_old, ct_2_old = cn_2, ct_2
+
+    # Vortex at TE gets final end value coefficients
+    row[0, n_vorts] = cn_2_old
+    if tangent:
+        row[1, n_vorts] = ct_2_old
+
+
+@eager
 @numba.jit(parallel=True, **BASE_NUMBA_CONFIG)
 def calc_linear_vortex_im(  # noqa: D103
     col_pts: numba.float64[:, :],
@@ -201,12 +590,10 @@ def calc_linear_vortex_im(  # noqa: D103
     equations.
 
     Args:
-        start_pts: Start nodes (points) of all panels
-        end_pts: End nodes (points) of all panels
         col_pts: Collocation points placed at the midpoint of each panel
+        vort_pts: Start nodes (points) of all panels
         panel_angles: Panel angles in SI radian as a column vector
-        panel_normals: Panel normal vectors as a set of row vectors
-        panel_tangents: Panel tangent vectors as a set of row vectors
+        panel_lengths: Panel lengths as a column vector
 
     Returns:
         Normal and tangent vortex influence matrices for the Linear
@@ -221,35 +608,17 @@ def calc_linear_vortex_im(  # noqa: D103
     n_cols, _ = col_pts.shape
 
     influence_matrix = np.zeros((2, n_cols + 1, n_vorts + 1), dtype=np.float64)
+    panel_trig = panel_trig_table(panel_angles)
 
-    # cn = Normal induced velocity coefficient
-    # ct = Tangent induced velocity coefficient
-    # Subscript 1 = Panel start value
-    # Subscript 2 = Panel end value
     for i in numba.prange(n_cols):
-
-        col_pt = col_pts[i]
-        col_panel_angle = panel_angles[i, 0]
-
-        # Initial end value coefficients are zero
-        cn_2_old, ct_2_old = float(0), float(0)
-        for j in range(n_vorts):
-            if i == j:
-                cn_1, cn_2, ct_1, ct_2 = -1, 1, math.pi / 2, math.pi / 2
-            else:
-                cn_1, cn_2, ct_1, ct_2 = calc_vortex_coefficients(
-                    col_pt=col_pt,
-                    vort_pt=vort_pts[j],
-                    col_panel_angle=col_panel_angle,
-                    vort_panel_angle=panel_angles[j, 0],
-                    vort_panel_length=panel_lengths[j, 0],
-                )
-            # Storing normal/tangent coefficient and updating end value
-            influence_matrix[..., i, j] = cn_1 + cn_2_old, ct_1 + ct_2_old
-            cn_2_old, ct_2_old = cn_2, ct_2
-
-        # Vortex at TE gets final end value coefficients
-        influence_matrix[..., i, j + 1] = cn_2_old, ct_2_old
+        fill_linear_vortex_row(
+            influence_matrix[:, i],
+            i,
+            col_pts,
+            vort_pts,
+            panel_trig,
+            panel_lengths,
+        )
 
     # Inserting kutta condition gamma_0 + gamma_n+1 = 0 for normal
     # coefficient matrix (Index = 0)
@@ -257,3 +626,475 @@ def calc_linear_vortex_im(  # noqa: D103
     influence_matrix[0, -1, -1] = 1
 
     return influence_matrix
+
+
+@eager
+@numba.jit(parallel=True, **BASE_NUMBA_CONFIG)
+def calc_linear_vortex_batch_im(  # noqa: D103
+    col_pts: numba.float64[:, :, :],
+    vort_pts: numba.float64[:, :, :],
+    panel_angles: numba.float64[:, :, :],
+    panel_lengths: numba.float64[:, :, :],
+) -> numba.float64[:, :, :, :]:
+    """Calculates influence matrices of a batch of geometries at once.
+
+    All inputs of :py:func:`calc_linear_vortex_im` are stacked along a
+    new leading batch axis of size B. The rows of all geometries are
+    distributed over a single parallel loop such that all threads stay
+    occupied for the whole batch.
+
+    Returns:
+        Normal and tangent vortex influence matrices of each geometry
+        with shape (B, 2, n_panels + 1, n_panels + 1).
+    """
+    n_batch, n_vorts, _ = vort_pts.shape
+    _, n_cols, _ = col_pts.shape
+
+    influence_matrix = np.zeros(
+        (n_batch, 2, n_cols + 1, n_vorts + 1), dtype=np.float64
+    )
+    panel_trig = np.empty((n_batch, n_vorts, 2), dtype=np.float64)
+    for b in range(n_batch):
+        panel_trig[b] = panel_trig_table(panel_angles[b])
+
+    for k in numba.prange(n_batch * n_cols):
+        b, i = k // n_cols, k % n_cols
+        fill_linear_vortex_row(
+            influence_matrix[b, :, i],
+            i,
+            col_pts[b],
+            vort_pts[b],
+            panel_trig[b],
+            panel_lengths[b],
+        )
+
+    # Inserting kutta condition gamma_0 + gamma_n+1 = 0 for all normal
+    # coefficient matrices (Index = 0)
+    influence_matrix[:, 0, -1, 0] = 1
+    influence_matrix[:, 0, -1, -1] = 1
+
+    return influence_matrix
+
+
+@register_kernel(LinearVortex, "numba")
+@eager
+@numba.jit(parallel=True, **BASE_NUMBA_CONFIG)
+def fill_linear_vortex_rows(  # noqa: D103
+    out: numba.float64[:, :, :],
+    rows: numba.int64[:],
+    col_pts: numba.float64[:, :],
+    vort_pts: numba.float64[:, :],
+    panel_angles: numba.float64[:, :],
+    panel_lengths: numba.float64[:, :],
+) -> None:
+    """Fills selected rows of the influence matrices.
+
+    Args:
+        out: Normal and tangent influence coefficients of the requested
+            rows with shape (2, n_rows, n_panels + 1) filled inplace. If
+            the shape is (1, n_rows, n_panels + 1) only the normal
+            coefficients are filled.
+        rows: Collocation point (row) indices, excluding the Kutta
+            condition row
+        col_pts: Collocation points placed at the midpoint of each panel
+        vort_pts: Start nodes (points) of all panels
+        panel_angles: Panel angles in SI radian as a column vector
+        panel_lengths: Panel lengths as a column vector
+    """
+    panel_trig = panel_trig_table(panel_angles)
+
+    for k in numba.prange(rows.shape[0]):
+        fill_linear_vortex_row(
+            out[:, k],
+            rows[k],
+            col_pts,
+            vort_pts,
+            panel_trig,
+            panel_lengths,
+        )
+
+
+@register_kernel(LinearVortex, "numpy")
+def numpy_linear_vortex_rows(
+    out: np.ndarray,
+    rows: np.ndarray,
+    col_pts: np.ndarray,
+    vort_pts: np.ndarray,
+    panel_angles: np.ndarray,
+    panel_lengths: np.ndarray,
+) -> None:
+    """Evaluates :py:func:`fill_linear_vortex_rows` with NumPy.
+
+    All integration constants of :py:func:`trig_integration_constants`
+    are evaluated as (n_rows, n_panels) arrays at once.
+    """
+    cos_vort = np.cos(panel_angles[:, 0])
+    sin_vort = np.sin(panel_angles[:, 0])
+    cos_col, sin_col = cos_vort[rows, None], sin_vort[rows, None]
+    s_j = panel_lengths[:, 0]
+    vx = col_pts[rows, 0, None] - vort_pts[:, 0]
+    vy = col_pts[rows, 1, None] - vort_pts[:, 1]
+
+    a = -vx * cos_vort - vy * sin_vort
+    b = vx ** 2 + vy ** 2
+    c = sin_col * cos_vort - cos_col * sin_vort
+    d = cos_col * cos_vort + sin_col * sin_vort
+    e = vx * sin_vort - vy * cos_vort
+    f = np.log(1 + ((s_j ** 2 + 2 * s_j * a) / b))
+    g = np.arctan2(e * s_j, b + a * s_j)
+    sin_2 = c * cos_vort - d * sin_vort
+    cos_2 = d * cos_vort + c * sin_vort
+
+    # Self-induced coefficients (Refer to linear_vortex_coefficients)
+    own = (np.arange(rows.size), rows)
+    q = vx * cos_2 - vy * sin_2
+    cn_2 = d + (0.5 * q * f / s_j) - (a * c + d * e) * g / s_j
+    cn_1 = (0.5 * d * f) + (c * g) - cn_2
+    cn_1[own], cn_2[own] = -1.0, 1.0
+    coefficients = [(cn_1, cn_2)]
+    if out.shape[0] > 1:
+        p = vx * sin_2 + vy * cos_2
+        ct_2 = c + (0.5 * p * f / s_j) + (a * d - c * e) * g / s_j
+        ct_1 = (0.5 * c * f) - (d * g) - ct_2
+        ct_1[own] = ct_2[own] = math.pi / 2
+        coefficients.append((ct_1, ct_2))
+
+    # Node j receives the start value of panel j and the end value of
+    # panel j - 1 (Refer to fill_linear_vortex_row)
+    for component, (start_values, end_values) in enumerate(coefficients):
+        out[component, :, :-1] = start_values
+        out[component, :, -1] = 0
+        out[component, :, 1:] += end_values
+
+
+@register_kernel(LinearVortex, "tiled")
+def tiled_linear_vortex_rows(
+    out: np.ndarray, rows: np.ndarray, **kernel_args: np.ndarray
+) -> None:
+    """Fills :py:func:`fill_linear_vortex_rows` tile by tile.
+
+    Refer to :py:func:`gammapy.solver.backends.tile_shape`.
+    """
+    fill_linear_vortex_tiles(
+        out, rows, *tile_shape(out.shape[0]), **kernel_args
+    )
+
+
+@eager
+@numba.jit(parallel=True, **BASE_NUMBA_CONFIG)
+def fill_linear_vortex_tiles(  # noqa: D103
+    out: numba.float64[:, :, :],
+    rows: numba.int64[:],
+    tile_rows: int,
+    tile_cols: int,
+    col_pts: numba.float64[:, :],
+    vort_pts: numba.float64[:, :],
+    panel_angles: numba.float64[:, :],
+    panel_lengths: numba.float64[:, :],
+) -> None:
+    """Fills selected rows of the influence matrices in tiles.
+
+    The rows are split into tiles of ``tile_rows`` collocation points,
+    which are distributed over the numba threads. Each tile sweeps the
+    panels in blocks of ``tile_cols``, hence the panel data of a block
+    is reused by all rows of the tile while it resides in cache. The
+    end value coefficients of the last panel of a block are carried
+    over to the first node of the next block.
+
+    Args:
+        out: Normal and tangent influence coefficients of the requested
+            rows with shape (2, n_rows, n_panels + 1) filled inplace. If
+            the shape is (1, n_rows, n_panels + 1) only the normal
+            coefficients are filled.
+        rows: Collocation point (row) indices, excluding the Kutta
+            condition row
+        tile_rows: Number of rows of a tile
+        tile_cols: Number of panels (columns) of a tile
+        col_pts: Collocation points placed at the midpoint of each panel
+        vort_pts: Start nodes (points) of all panels
+        panel_angles: Panel angles in SI radian as a column vector
+        panel_lengths: Panel lengths as a column vector
+    """
+    panel_trig = panel_trig_table(panel_angles)
+    n_rows = rows.shape[0]
+    n_vorts, _ = vort_pts.shape
+    tangent = out.shape[0] > 1
+    normal_plane = out[0]
+    tangent_plane = out[out.shape[0] - 1]
+
+    for tile in numba.prange((n_rows + tile_rows - 1) // tile_rows):
+        row_start = tile * tile_rows
+        row_end = min(row_start + tile_rows, n_rows)
+
+        # End value coefficients of the previous panel of each row
+        carry = np.zeros((row_end - row_start, 2), dtype=np.float64)
+        for col_start in range(0, n_vorts, tile_cols):
+            col_end = min(col_start + tile_cols, n_vorts)
+            for k in range(row_start, row_end):
+                i = rows[k]
+                cn_2_old = carry[k - row_start, 0]
+                ct_2_old = carry[k - row_start, 1]
+                for j in range(col_start, col_end):
+                    cn_1, cn_2, ct_1, ct_2 = linear_vortex_coefficients(
+                        i, j, col_pts, vort_pts, panel_trig, panel_lengths
+                    )
+                    normal_plane[k, j] = cn_1 + cn_2_old
+                    if tangent:
+                        tangent_plane[k, j] = ct_1 + ct_2_old
+                    cn_2_old, ct_2_old = cn_2, ct_2
+                carry[k - row_start, 0] = cn_2_old
+                carry[k - row_start, 1] = ct_2_old
+
+        # Vortex at TE gets final end value coefficients
+        for k in range(row_start, row_end):
+            normal_plane[k, n_vorts] = carry[k - row_start, 0]
+            if tangent:
+                tangent_plane[k, n_vorts] = carry[k - row_start, 1]
+
+
+@eager
+@numba.jit(parallel=True, **BASE_NUMBA_CONFIG)
+def calc_linear_vortex_entries(  # noqa: D103
+    rows: numba.int64[:],
+    cols: numba.int64[:],
+    col_pts: numba.float64[:, :],
+    vort_pts: numba.float64[:, :],
+    panel_angles: numba.float64[:, :],
+    panel_lengths: numba.float64[:, :],
+) -> numba.float64[:, :]:
+    """Calculates selected entries of the influence matrices.
+
+    Only the entries at (``rows[k]``, ``cols[k]``) are evaluated which
+    allows blocks or sparse patterns of the influence matrices to be
+    obtained without assembling the full matrices. Row indices must
+    belong to a collocation point, hence the Kutta condition row is
+    excluded.
+
+    Args:
+        rows: Collocation point (row) index of each entry
+        cols: Vortex node (column) index of each entry
+        col_pts: Collocation points placed at the midpoint of each panel
+        vort_pts: Start nodes (points) of all panels
+        panel_angles: Panel angles in SI radian as a column vector
+        panel_lengths: Panel lengths as a column vector
+
+    Returns:
+        Normal and tangent influence coefficients of all requested
+        entries with shape (2, n_entries).
+    """
+    n_vorts, _ = vort_pts.shape
+    n_entries = rows.shape[0]
+
+    entries = np.zeros((2, n_entries), dtype=np.float64)
+    panel_trig = panel_trig_table(panel_angles)
+
+    for k in numba.prange(n_entries):
+        i, j = rows[k], cols[k]
+        # Column j receives the start value of panel j and the end value
+        # of panel j - 1 (Refer to fill_linear_vortex_row)
+        if j < n_vorts:
+            cn_1, _, ct_1, _ = linear_vortex_coefficients(
+                i, j, col_pts, vort_pts, panel_trig, panel_lengths
+            )
+            entries[0, k] += cn_1
+            entries[1, k] += ct_1
+        if j > 0:
+            _, cn_2, _, ct_2 = linear_vortex_coefficients(
+                i, j - 1, col_pts, vort_pts, panel_trig, panel_lengths
+            )
+            entries[0, k] += cn_2
+            entries[1, k] += ct_2
+
+    return entries
+
+
+@eager
+@numba.jit(parallel=True, **BASE_NUMBA_CONFIG)
+def calc_linear_vortex_matvec(  # noqa: D103
+    x: numba.float64[:, :],
+    col_pts: numba.float64[:, :],
+    vort_pts: numba.float64[:, :],
+    panel_angles: numba.float64[:, :],
+    panel_lengths: numba.float64[:, :],
+) -> numba.float64[:, :, :]:
+    """Multiplies the influence matrices with ``x`` without storage.
+
+    The influence coefficients are evaluated on the fly and directly
+    accumulated into the product. Therefore, the memory requirement is
+    O(N) instead of the O(N^2) required by the assembled matrices.
+
+    Args:
+        x: Vortex strengths at all n_panels + 1 nodes with shape
+            (n_panels + 1, m)
+        col_pts: Collocation points placed at the midpoint of each panel
+        vort_pts: Start nodes (points) of all panels
+        panel_angles: Panel angles in SI radian as a column vector
+        panel_lengths: Panel lengths as a column vector
+
+    Returns:
+        Products of the normal and tangent influence matrices, excluding
+        the Kutta condition row, with ``x``. The shape of the returned
+        array is (2, n_panels, m).
+    """
+    n_vorts, _ = vort_pts.shape
+    n_cols, _ = col_pts.shape
+    _, m = x.shape
+
+    product = np.zeros((2, n_cols, m), dtype=np.float64)
+    panel_trig = panel_trig_table(panel_angles)
+
+    for i in numba.prange(n_cols):
+        for j in range(n_vorts):
+            cn_1, cn_2, ct_1, ct_2 = linear_vortex_coefficients(
+                i, j, col_pts, vort_pts, panel_trig, panel_lengths
+            )
+            for k in range(m):
+                product[0, i, k] += cn_1 * x[j, k] + cn_2 * x[j + 1, k]
+                product[1, i, k] += ct_1 * x[j, k] + ct_2 * x[j + 1, k]
+
+    return product
+
+
+@eager
+@numba.jit(parallel=True, **BASE_NUMBA_CONFIG)
+def calc_linear_vortex_pairs(  # noqa: D103
+    targets: numba.int64[:],
+    panels: numba.int64[:],
+    target_pts: numba.float64[:, :],
+    on_body: bool,
+    vort_pts: numba.float64[:, :],
+    panel_angles: numba.float64[:, :],
+    panel_lengths: numba.float64[:, :],
+) -> numba.float64[:, :, :]:
+    """Calculates the influence of single panels on target points.
+
+    Args:
+        targets: Target point index of each pair
+        panels: Linear vortex panel index of each pair
+        target_pts: Collocation points if ``on_body`` is True, otherwise
+            arbitrary off-body points
+        on_body: Sets if the targets are the collocation points, in
+            which case the coefficients are taken along the panel
+            normal and tangent. Otherwise, these are the y and x axes.
+        vort_pts: Start nodes (points) of all panels
+        panel_angles: Panel angles in SI radian as a column vector
+        panel_lengths: Panel lengths as a column vector
+
+    Returns:
+        Normal and tangent influence coefficients of the start and end
+        strength of the panels with shape (2, 2, n_pairs).
+    """
+    n_pairs = targets.shape[0]
+
+    coefficients = np.zeros((2, 2, n_pairs), dtype=np.float64)
+    panel_trig = panel_trig_table(panel_angles)
+
+    for k in numba.prange(n_pairs):
+        i, j = targets[k], panels[k]
+        if on_body:
+            cn_1, cn_2, ct_1, ct_2 = linear_vortex_coefficients(
+                i, j, target_pts, vort_pts, panel_trig, panel_lengths
+            )
+        else:
+            # Off-body coefficients are taken along the x and y axes
+            cn_1, cn_2, ct_1, ct_2 = trig_vortex_coefficients(
+                target_pts[i, 0] - vort_pts[j, 0],
+                target_pts[i, 1] - vort_pts[j, 1],
+                1.0,
+                0.0,
+                panel_trig[j, 0],
+                panel_trig[j, 1],
+                panel_lengths[j, 0],
+            )
+        coefficients[0, 0, k], coefficients[0, 1, k] = cn_1, cn_2
+        coefficients[1, 0, k], coefficients[1, 1, k] = ct_1, ct_2
+
+    return coefficients
+
+
+@eager
+@numba.jit(parallel=True, **BASE_NUMBA_CONFIG)
+def fill_linear_vortex_derivatives(  # noqa: D103
+    out: numba.float64[:, :, :, :, :, :],
+    col_pts: numba.float64[:, :],
+    vort_pts: numba.float64[:, :],
+    panel_angles: numba.float64[:, :],
+    panel_lengths: numba.float64[:, :],
+) -> None:
+    """Fills the derivatives of the influence coefficients per panel.
+
+    With complex coordinates, the normal coefficients CN_1 and CN_2 of
+    :py:func:`trig_vortex_coefficients` are Re(-c P) with the potential
+    P = M_0 - M_1 of the start node and P = M_1 of the end node::
+
+        M_0 = log((zeta - z_j) / (zeta - z_j+1))
+        M_1 = (zeta - z_j) / (z_j+1 - z_j) M_0 - 1
+
+    Refer to :py:mod:`gammapy.solver.derivatives`. The self-induced
+    coefficients are constant, hence their derivatives are left zero.
+
+    Args:
+        out: Derivatives of the normal and tangent coefficients with
+            shape (2, n_panels, n_panels, 2, 4, 2) filled inplace. The
+            trailing axes are the start and end node strength of the
+            vortex panel, the start and end node of the collocation
+            panel followed by those of the vortex panel, and the x and
+            y coordinate. If the leading axis has size 1 only the normal
+            coefficients are filled.
+        col_pts: Collocation points placed at the midpoint of each panel
+        vort_pts: Start nodes (points) of all panels
+        panel_angles: Panel angles in SI radian as a column vector
+        panel_lengths: Panel lengths as a column vector
+    """
+    n_vorts, _ = vort_pts.shape
+    n_cols, _ = col_pts.shape
+    panel_trig = panel_trig_table(panel_angles)
+
+    for i in numba.prange(n_cols):
+        zeta = complex(col_pts[i, 0], col_pts[i, 1])
+        tangent_col = complex(panel_trig[i, 0], panel_trig[i, 1])
+        for j in range(n_vorts):
+            if i == j:
+                continue
+            tangent_vort = complex(panel_trig[j, 0], panel_trig[j, 1])
+            chord = panel_lengths[j, 0] * tangent_vort
+            d_start = zeta - complex(vort_pts[j, 0], vort_pts[j, 1])
+            d_end = d_start - chord
+
+            # Potentials and their derivatives w.r.t. the collocation
+            # point, the start node and the end node
+            m_0 = cmath.log(d_start / d_end)
+            dm_0 = (1 / d_start - 1 / d_end, -1 / d_start, 1 / d_end)
+            ratio = d_start / chord
+            d_ratio = (1 / chord, d_end / chord ** 2, -d_start / chord ** 2)
+            m_1 = ratio * m_0 - 1
+            dm_1 = (
+                d_ratio[0] * m_0 + ratio * dm_0[0],
+                d_ratio[1] * m_0 + ratio * dm_0[1],
+                d_ratio[2] * m_0 + ratio * dm_0[2],
+            )
+
+            fill_pair_gradients(
+                out[:, i, j, 0],
+                -1.0,
+                m_0 - m_1,
+                dm_0[0] - dm_1[0],
+                dm_0[1] - dm_1[1],
+                dm_0[2] - dm_1[2],
+                tangent_col,
+                tangent_vort,
+                panel_lengths[i, 0],
+                panel_lengths[j, 0],
+            )
+            fill_pair_gradients(
+                out[:, i, j, 1],
+                -1.0,
+                m_1,
+                dm_1[0],
+                dm_1[1],
+                dm_1[2],
+                tangent_col,
+                tangent_vort,
+                panel_lengths[i, 0],
+                panel_lengths[j, 0],
+            )
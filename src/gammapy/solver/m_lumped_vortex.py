@@ -16,11 +16,14 @@
 
 import math
 from functools import cached_property
+from typing import Any, Dict
 
 import numba
 import numpy as np
 
 from gammapy.geometry.panel import Panel2D
+from gammapy.jit import eager
+from gammapy.solver.backends import register_kernel, tile_shape
 from gammapy.solver.base import BASE_NUMBA_CONFIG, PanelMethod
 
 AFFINE_90_CW = np.array([[0, -1], [1, 0]], dtype=np.float64)
@@ -49,11 +52,67 @@ class LumpedVortex(PanelMethod):
         return self.panels.normals
 
     @cached_property
-    def influence_matrix(self):
-        return calc_lumped_vortex_im(
+    def kernel_args(self) -> Dict[str, np.ndarray]:
+        """Geometric arguments shared by all lumped vortex kernels."""
+        return dict(
             vortex_pts=self.collocation_points,
             col_pts=self.panels.points_at(0.75),
             panel_normals=self.panels.normals,
+            panel_tangents=self.panels.tangents,
+        )
+
+    @cached_property
+    def influence_matrix(self):
+        return self.assemble()["normal"]
+
+    def influence_entries(self, rows: np.ndarray, cols: np.ndarray):
+        """Evaluates :py:attr:`influence_matrix` entries on the fly."""
+        return self.kernel(calc_lumped_vortex_entries)(
+            np.asarray(rows, dtype=np.int64),
+            np.asarray(cols, dtype=np.int64),
+            **self.kernel_args,
+        )[0]
+
+    def kernel_products(self, x: np.ndarray) -> np.ndarray:
+        """Exact normal and tangent influence of ``x``."""
+        return self.kernel(calc_lumped_vortex_matvec)(
+            np.ascontiguousarray(x, dtype=np.float64), **self.kernel_args
+        )
+
+    @cached_property
+    def multipole_layout(self) -> Dict[str, Any]:
+        """Singularities, targets and near-field kernel of the tree."""
+        return dict(
+            start_pts=self.collocation_points,
+            end_pts=self.collocation_points,
+            lengths=None,  # Vortices are concentrated in a point
+            dofs=np.repeat(np.arange(self.panels.n_panels)[:, None], 2, 1),
+            linear=False,
+            prefactor=1j / (2 * math.pi),
+            pair_coefficients=self.pair_coefficients,
+            target_pts=self.panels.points_at(0.75),
+            target_angles=self.panels.angles,
+        )
+
+    def pair_coefficients(
+        self,
+        targets: np.ndarray,
+        vortices: np.ndarray,
+        target_pts: np.ndarray,
+        on_body: bool,
+    ) -> np.ndarray:
+        """Exact influence of the near-field target-element pairs.
+
+        Refer to :py:data:`gammapy.solver.multipole.PairCoefficients`.
+        """
+        return self.kernel(calc_lumped_vortex_pairs)(
+            np.asarray(targets, dtype=np.int64),
+            np.asarray(vortices, dtype=np.int64),
+            np.asarray(target_pts, dtype=np.float64),
+            on_body,
+            vortex_pts=self.collocation_points,
+            panel_normals=self.panels.normals,
+            panel_tangents=self.panels.tangents,
         )
 
 
@@ -84,6 +143,32 @@ def vortex_2d(  # noqa: D103
     return (gamma / (2 * math.pi * (r_j2))) * (v_j @ AFFINE_90_CW)
 
 
+@numba.jit(**BASE_NUMBA_CONFIG)
+def unit_vortex_coefficient(  # noqa: D103
+    dx: float, dy: float, direction_x: float, direction_y: float,
+) -> float:
+    """Velocity component induced by a vortex of unit circulation.
+
+    This is the closed form of the projection of :py:func:`vortex_2d`
+    onto a direction. Rotating the vortex to point vector (dx, dy) by
+    90 degrees clockwise yields (dy, -dx), hence the projection is the
+    2D cross product of the vectors divided by 2 pi r^2.
+
+    Args:
+        dx: X component of the vector from the vortex to the point
+        dy: Y component of the vector from the vortex to the point
+        direction_x: X component of the unit projection direction
+        direction_y: Y component of the unit projection direction
+
+    Returns:
+        The induced velocity along the provided direction.
+    """
+    return (dy * direction_x - dx * direction_y) / (
+        2 * math.pi * (dx * dx + dy * dy)
+    )
+
+
+@eager
 @numba.jit(parallel=True, **BASE_NUMBA_CONFIG)
 def calc_lumped_vortex_im(  # noqa: D103
     vortex_pts: numba.float64[:, :],
@@ -101,8 +186,9 @@ def calc_lumped_vortex_im(  # noqa: D103
     a circulation strength of Gamma = 1 is assumed to obtain the
     geometric influence of a vortex on the current panel. Then the
     induced velocity due to vortex `j` on collocation point `i` is
-    calculated with :py:func`vortex_2d` function. The result is then
-    projected onto the normal vector of the current panel `i`.
+    calculated with :py:func:`vortex_2d` function. The result is then
+    projected onto the normal vector of the current panel `i`, which is
+    evaluated in closed form by :py:func:`unit_vortex_coefficient`.
 
     By projecting this induced velocity onto the panel normal vector, a
     scalar influence coefficient is obtained, which when used with the
@@ -117,26 +203,307 @@ def calc_lumped_vortex_im(  # noqa: D103
     Returns:
         Vortex influence matrix with assumed circulation, Gamma = 1.
     """
-    gamma = 1  # Assuming that the circulation is 1 to solve for
     n_vorts, _ = vortex_pts.shape
     n_cols, _ = col_pts.shape
 
-    influence_matrix = np.zeros((n_cols, n_vorts), dtype=np.float64)
+    influence_matrix = np.empty((n_cols, n_vorts), dtype=np.float64)
 
     for i in numba.prange(n_cols):
-        n_i = panel_normals[i]
-        col_pt = col_pts[i]
+        x_i, y_i = col_pts[i, 0], col_pts[i, 1]
+        n_x, n_y = panel_normals[i, 0], panel_normals[i, 1]
         for j in range(n_vorts):
-            # Calculating induced velocity at collocation point i due to
-            # vortex j, and taking the dot-product with the normal
-            # vector to get the influence coefficient a_ij
-            influence_matrix[i, j] = (
-                vortex_2d(gamma, vortex_pts[j], col_pt) @ n_i
+            # Induced velocity at collocation point i due to vortex j
+            # projected onto the normal vector, the coefficient a_ij
+            influence_matrix[i, j] = unit_vortex_coefficient(
+                x_i - vortex_pts[j, 0], y_i - vortex_pts[j, 1], n_x, n_y
             )
 
     return influence_matrix
 
 
+@register_kernel(LumpedVortex, "numba")
+@eager
+@numba.jit(parallel=True, **BASE_NUMBA_CONFIG)
+def fill_lumped_vortex_rows(  # noqa: D103
+    out: numba.float64[:, :, :],
+    rows: numba.int64[:],
+    vortex_pts: numba.float64[:, :],
+    col_pts: numba.float64[:, :],
+    panel_normals: numba.float64[:, :],
+    panel_tangents: numba.float64[:, :],
+) -> None:
+    """Fills selected rows of the influence matrices.
+
+    Args:
+        out: Normal and tangent influence coefficients of the requested
+            rows with shape (2, n_rows, n_vortices) filled inplace. If
+            the shape is (1, n_rows, n_vortices) only the normal
+            coefficients are filled.
+        rows: Collocation point (row) indices
+        vortex_pts: Vortex points
+        col_pts: Collocation points placed along each panel.
+        panel_normals: Normal vectors of each panel.
+        panel_tangents: Tangent vectors of each panel.
+    """
+    n_components, _, n_vorts = out.shape
+
+    for k in numba.prange(rows.shape[0]):
+        i = rows[k]
+        x_i, y_i = col_pts[i, 0], col_pts[i, 1]
+        n_x, n_y = panel_normals[i, 0], panel_normals[i, 1]
+        t_x, t_y = panel_tangents[i, 0], panel_tangents[i, 1]
+        for j in range(n_vorts):
+            dx, dy = x_i - vortex_pts[j, 0], y_i - vortex_pts[j, 1]
+            out[0, k, j] = unit_vortex_coefficient(dx, dy, n_x, n_y)
+            if n_components > 1:
+                out[1, k, j] = unit_vortex_coefficient(dx, dy, t_x, t_y)
+
+
+@register_kernel(LumpedVortex, "numpy")
+def numpy_lumped_vortex_rows(
+    out: np.ndarray,
+    rows: np.ndarray,
+    vortex_pts: np.ndarray,
+    col_pts: np.ndarray,
+    panel_normals: np.ndarray,
+    panel_tangents: np.ndarray,
+) -> None:
+    """Evaluates :py:func:`fill_lumped_vortex_rows` with NumPy.
+
+    The closed form of :py:func:`unit_vortex_coefficient` is evaluated
+    as (n_rows, n_vortices) arrays at once. Apart from the separation
+    vectors and their inverse squared length, the coefficients are
+    computed inplace in ``out``.
+    """
+    dx = col_pts[rows, 0, None] - vortex_pts[:, 0]
+    dy = col_pts[rows, 1, None] - vortex_pts[:, 1]
+    factor = dx * dx
+    factor += dy * dy
+    factor *= 2 * math.pi
+    np.reciprocal(factor, out=factor)
+
+    for component, vectors in enumerate((panel_normals, panel_tangents)):
+        if component < out.shape[0]:
+            plane = out[component]
+            np.multiply(dy, vectors[rows, 0, None], out=plane)
+            plane -= dx * vectors[rows, 1, None]
+            plane *= factor
+
+
+@register_kernel(LumpedVortex, "tiled")
+def tiled_lumped_vortex_rows(
+    out: np.ndarray, rows: np.ndarray, **kernel_args: np.ndarray
+) -> None:
+    """Fills :py:func:`fill_lumped_vortex_rows` tile by tile.
+
+    Refer to :py:func:`gammapy.solver.backends.tile_shape`.
+    """
+    fill_lumped_vortex_tiles(
+        out, rows, *tile_shape(out.shape[0]), **kernel_args
+    )
+
+
+@eager
+@numba.jit(parallel=True, **BASE_NUMBA_CONFIG)
+def fill_lumped_vortex_tiles(  # noqa: D103
+    out: numba.float64[:, :, :],
+    rows: numba.int64[:],
+    tile_rows: int,
+    tile_cols: int,
+    vortex_pts: numba.float64[:, :],
+    col_pts: numba.float64[:, :],
+    panel_normals: numba.float64[:, :],
+    panel_tangents: numba.float64[:, :],
+) -> None:
+    """Fills selected rows of the influence matrices in tiles.
+
+    The rows are split into tiles of ``tile_rows`` collocation points,
+    which are distributed over the numba threads. Each tile sweeps the
+    vortices in blocks of ``tile_cols`` to reuse them from cache.
+
+    Args:
+        out: Normal and tangent influence coefficients of the requested
+            rows with shape (2, n_rows, n_vortices) filled inplace. If
+            the shape is (1, n_rows, n_vortices) only the normal
+            coefficients are filled.
+        rows: Collocation point (row) indices
+        tile_rows: Number of rows of a tile
+        tile_cols: Number of vortices (columns) of a tile
+        vortex_pts: Vortex points
+        col_pts: Collocation points placed along each panel.
+        panel_normals: Normal vectors of each panel.
+        panel_tangents: Tangent vectors of each panel.
+    """
+    n_rows = rows.shape[0]
+    n_vorts, _ = vortex_pts.shape
+    tangent = out.shape[0] > 1
+    normal_plane = out[0]
+    tangent_plane = out[out.shape[0] - 1]
+
+    for tile in numba.prange((n_rows + tile_rows - 1) // tile_rows):
+        row_start = tile * tile_rows
+        row_end = min(row_start + tile_rows, n_rows)
+        for col_start in range(0, n_vorts, tile_cols):
+            col_end = min(col_start + tile_cols, n_vorts)
+            for k in range(row_start, row_end):
+                i = rows[k]
+                for j in range(col_start, col_end):
+                    dx = col_pts[i, 0] - vortex_pts[j, 0]
+                    dy = col_pts[i, 1] - vortex_pts[j, 1]
+                    normal_plane[k, j] = unit_vortex_coefficient(
+                        dx, dy, panel_normals[i, 0], panel_normals[i, 1]
+                    )
+                    if tangent:
+                        tangent_plane[k, j] = unit_vortex_coefficient(
+                            dx, dy, panel_tangents[i, 0], panel_tangents[i, 1]
+                        )
+
+
+@eager
+@numba.jit(parallel=True, **BASE_NUMBA_CONFIG)
+def calc_lumped_vortex_entries(  # noqa: D103
+    rows: numba.int64[:],
+    cols: numba.int64[:],
+    vortex_pts: numba.float64[:, :],
+    col_pts: numba.float64[:, :],
+    panel_normals: numba.float64[:, :],
+    panel_tangents: numba.float64[:, :],
+) -> numba.float64[:, :]:
+    """Calculates selected entries of the influence matrices.
+
+    Only the entries at (``rows[k]``, ``cols[k]``) are evaluated which
+    allows blocks or sparse patterns of the influence matrices to be
+    obtained without assembling the full matrices.
+
+    Args:
+        rows: Collocation point (row) index of each entry
+        cols: Vortex (column) index of each entry
+        vortex_pts: Vortex points
+        col_pts: Collocation points placed along each panel.
+        panel_normals: Normal vectors of each panel.
+        panel_tangents: Tangent vectors of each panel.
+
+    Returns:
+        Normal and tangent influence coefficients of all requested
+        entries with shape (2, n_entries).
+    """
+    n_entries = rows.shape[0]
+
+    entries = np.zeros((2, n_entries), dtype=np.float64)
+
+    for k in numba.prange(n_entries):
+        i, j = rows[k], cols[k]
+        dx = col_pts[i, 0] - vortex_pts[j, 0]
+        dy = col_pts[i, 1] - vortex_pts[j, 1]
+        entries[0, k] = unit_vortex_coefficient(
+            dx, dy, panel_normals[i, 0], panel_normals[i, 1]
+        )
+        entries[1, k] = unit_vortex_coefficient(
+            dx, dy, panel_tangents[i, 0], panel_tangents[i, 1]
+        )
+
+    return entries
+
+
+@eager
+@numba.jit(parallel=True, **BASE_NUMBA_CONFIG)
+def calc_lumped_vortex_matvec(  # noqa: D103
+    x: numba.float64[:, :],
+    vortex_pts: numba.float64[:, :],
+    col_pts: numba.float64[:, :],
+    panel_normals: numba.float64[:, :],
+    panel_tangents: numba.float64[:, :],
+) -> numba.float64[:, :, :]:
+    """Multiplies the influence matrices with ``x`` without storage.
+
+    The influence coefficients are evaluated on the fly and directly
+    accumulated into the product. Therefore, the memory requirement is
+    O(N) instead of the O(N^2) required by the assembled matrix.
+
+    Args:
+        x: Vortex strengths with shape (n_vortices, m)
+        vortex_pts: Vortex points
+        col_pts: Collocation points placed along each panel.
+        panel_normals: Normal vectors of each panel.
+        panel_tangents: Tangent vectors of each panel.
+
+    Returns:
+        Products of the normal and tangent influence matrices with
+        ``x``. The shape of the returned array is (2, n_panels, m).
+    """
+    n_vorts, _ = vortex_pts.shape
+    n_cols, _ = col_pts.shape
+    _, m = x.shape
+
+    product = np.zeros((2, n_cols, m), dtype=np.float64)
+
+    for i in numba.prange(n_cols):
+        x_i, y_i = col_pts[i, 0], col_pts[i, 1]
+        n_x, n_y = panel_normals[i, 0], panel_normals[i, 1]
+        t_x, t_y = panel_tangents[i, 0], panel_tangents[i, 1]
+        for j in range(n_vorts):
+            dx, dy = x_i - vortex_pts[j, 0], y_i - vortex_pts[j, 1]
+            a_n = unit_vortex_coefficient(dx, dy, n_x, n_y)
+            a_t = unit_vortex_coefficient(dx, dy, t_x, t_y)
+            for k in range(m):
+                product[0, i, k] += a_n * x[j, k]
+                product[1, i, k] += a_t * x[j, k]
+
+    return product
+
+
+@eager
+@numba.jit(parallel=True, **BASE_NUMBA_CONFIG)
+def calc_lumped_vortex_pairs(  # noqa: D103
+    targets: numba.int64[:],
+    vortices: numba.int64[:],
+    target_pts: numba.float64[:, :],
+    on_body: bool,
+    vortex_pts: numba.float64[:, :],
+    panel_normals: numba.float64[:, :],
+    panel_tangents: numba.float64[:, :],
+) -> numba.float64[:, :, :]:
+    """Calculates the influence of single vortices on target points.
+
+    Args:
+        targets: Target point index of each pair
+        vortices: Vortex index of each pair
+        target_pts: Collocation points if ``on_body`` is True, otherwise
+            arbitrary off-body points
+        on_body: Sets if the targets are the collocation points, in
+            which case the coefficients are taken along the panel
+            normal and tangent. Otherwise, these are the y and x axes.
+        vortex_pts: Vortex points
+        panel_normals: Normal vectors of each panel.
+        panel_tangents: Tangent vectors of each panel.
+
+    Returns:
+        Normal and tangent influence coefficients of the vortices with
+        shape (2, 2, n_pairs). The second strength degree of freedom is
+        unused and hence zero.
+    """
+    n_pairs = targets.shape[0]
+
+    coefficients = np.zeros((2, 2, n_pairs), dtype=np.float64)
+
+    for k in numba.prange(n_pairs):
+        i, j = targets[k], vortices[k]
+        dx = target_pts[i, 0] - vortex_pts[j, 0]
+        dy = target_pts[i, 1] - vortex_pts[j, 1]
+        if on_body:
+            coefficients[0, 0, k] = unit_vortex_coefficient(
+                dx, dy, panel_normals[i, 0], panel_normals[i, 1]
+            )
+            coefficients[1, 0, k] = unit_vortex_coefficient(
+                dx, dy, panel_tangents[i, 0], panel_tangents[i, 1]
+            )
+        else:
+            coefficients[0, 0, k] = unit_vortex_coefficient(dx, dy, 0.0, 1.0)
+            coefficients[1, 0, k] = unit_vortex_coefficient(dx, dy, 1.0, 0.0)
+
+    return coefficients
+
+
 if __name__ == "__main__":
     from gammapy.geometry.airfoil import NACA4Airfoil, ParabolicCamberAirfoil
 
@@ -0,0 +1,759 @@
+# Copyright 2020 Kilian Swannet, San Kilkis
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied. See the License for the specific language governing
+# permissions and limitations under the License.
+
+"""Implements a Quadratic Strength Vortex Panel Method on curved panels.
+
+Each panel is a parabolic arc through its end nodes and a point of the
+airfoil surface sampled halfway between them. In the frame of the
+panel chord, with s along the chord of length l, the arc is offset
+along the panel normal by::
+
+    eta(s) = c * s * (l - s)
+
+The vortex strength varies quadratically along the chord and is set by
+its values at both nodes and the midpoint of each panel, hence the
+system has 2N + 1 unknowns for N panels. These satisfy flow tangency at
+two collocation points per panel, placed on the arc at the Gauss points
+of the chord, and the Kutta condition gamma_0 + gamma_2N = 0.
+
+The strength of the two trailing edge panels is linear instead, with a
+single collocation point at their midpoint. On these panels a strength
+common to both surfaces hardly induces any normal velocity, since the
+panels nearly coincide at a sharp trailing edge. With two collocation
+points each this mode is left to the quadratic terms, which makes the
+system nearly singular at certain panel counts.
+
+The velocity induced by a strength s^k is split into the contribution
+of the straight chord, which follows from closed-form integration
+constants, and a correction for the offset of the arc, which is smooth
+and integrated with Gauss-Legendre quadrature. On its own panel the
+Cauchy singularity of the kernel is removed analytically instead.
+
+Flat panels limit the lift coefficient to second order convergence
+regardless of the order of the strength, since the polygon itself
+deviates from the airfoil by O(h^2). The arcs reduce this to O(h^3).
+Combined with the "graded" spacing the lift coefficient converges at
+roughly third order, refer to the benchmark
+``benchmarks/quadratic_vortex_convergence.py``.
+"""
+
+import math
+from functools import cached_property
+from typing import Dict, Optional, Sequence, Tuple, Type
+
+import numba
+import numpy as np
+
+from gammapy.geometry.panel import Panel2D
+from gammapy.jit import eager
+from gammapy.solver.backends import register_kernel
+from gammapy.solver.base import (
+    BASE_NUMBA_CONFIG,
+    FlowSolution,
+    PanelMethod,
+    ThickFlowSolution,
+)
+
+# Collocation points of each panel as a fraction of its chord
+COLLOCATION_PARAMETERS = 0.5 + np.array([-1, 1]) * math.sqrt(3) / 6
+
+# Gauss-Legendre rules with 1 to 8 points on the interval [0, 1], the
+# rule with n points is stored in the first n columns of row n - 1
+GAUSS_POINTS = np.zeros((8, 8))
+GAUSS_WEIGHTS = np.zeros((8, 8))
+for _n in range(1, 9):
+    _points, _weights = np.polynomial.legendre.leggauss(_n)
+    GAUSS_POINTS[_n - 1, :_n] = 0.5 * (_points + 1)
+    GAUSS_WEIGHTS[_n - 1, :_n] = 0.5 * _weights
+
+# Gauss-Legendre rule of the arc correction of nearby panels
+QUADRATURE_POINTS, QUADRATURE_WEIGHTS = GAUSS_POINTS[-1], GAUSS_WEIGHTS[-1]
+
+# Maximum number of sub-intervals of the arc correction of a panel
+# close to the field point, i.e. across a thin trailing edge
+MAX_SUBDIVISIONS = 64
+
+# Admissible absolute error of the arc correction of a panel, which
+# sets the number of Gauss points of the panels far from the point
+ARC_TOLERANCE = 1e-12
+
+
+class QuadraticVortexSolution(ThickFlowSolution):
+    """Flow solution of the nodal and midpoint vortex strengths.
+
+    The pressure coefficients are obtained at the 2N collocation
+    points.
+    """
+
+    def tangent_product(self, circulations: np.ndarray) -> np.ndarray:
+        """Tangent velocities induced at the collocation points."""
+        return self.method.tangent_matvec(circulations)
+
+    @cached_property
+    def lift_coefficient(self) -> float:
+        """Lift coefficient of the total circulation of the panels."""
+        weights = self.method.circulation_weights
+        if self.superposition:
+            return 2 * weights @ self.basis_circulations @ (
+                self.flow_directions.T
+            )
+        return 2 * weights @ self.circulations
+
+    @cached_property
+    def delta_pressure_coefficients(self) -> np.ndarray:
+        """Pressure coefficient change between both surfaces.
+
+        The strengths of the nodes and midpoints do not map onto the
+        panels one-to-one. Instead, the lower surface pressure is
+        paired with the upper surface pressure at the mirrored
+        collocation point, from the leading edge to the trailing edge.
+        """
+        cp = self.pressure_coefficients
+        n_half = len(cp) // 2
+        return cp[n_half - 1 :: -1] - cp[n_half:]
+
+    @cached_property
+    def delta_pressure_locations(self) -> np.ndarray:
+        """Mean chord-wise location of each pair of surface points."""
+        x = self.method.collocation_points[:, 0]
+        n_half = len(x) // 2
+        return 0.5 * (x[n_half - 1 :: -1] + x[n_half:])
+
+
+class QuadraticVortex(PanelMethod):
+    """Implements a Quadratic Strength Vortex panel method.
+
+    The unknowns are ordered along the panels, such that unknowns 2j,
+    2j + 1 and 2j + 2 are the strengths at the start node, midpoint and
+    end node of panel j. The 2N - 2 rows of the collocation points are
+    followed by the linearity conditions of the first and last panel
+    and the Kutta condition. Only the "direct" solver in "double"
+    precision is supported. Since the arcs pass through the panel
+    midpoints, :py:meth:`with_perturbed_nodes` is not available and a
+    perturbed geometry requires a new method.
+    """
+
+    SUPPORTED_SOLVERS = ("direct",)
+    SUPPORTED_PRECISIONS = ("double",)
+    SUPPORTS_MULTIPOLE = False
+
+    @property
+    def solution_class(self) -> Type[FlowSolution]:
+        """Solution of the nodal and midpoint vortex strengths."""
+        return QuadraticVortexSolution
+
+    @cached_property
+    def surface_points(self) -> np.ndarray:
+        """Nodes and midpoints of the panels on the airfoil surface.
+
+        The points run from TE -> Bottom -> Top -> TE, where the even
+        points are the panel nodes and the odd points the midpoints.
+        """
+        sample_u = PanelMethod.get_sample_parameters(
+            num=2 * (self.n_panels // 2) + 1, spacing=self.spacing
+        )
+        bot_pts = self.airfoil.lower_surface_at(sample_u[::-1])
+        top_pts = self.airfoil.upper_surface_at(sample_u[1:])
+        return np.vstack((bot_pts, top_pts))
+
+    @cached_property
+    def panels(self) -> Panel2D:
+        """Panel chords that run from TE -> Bottom -> Top -> TE."""
+        return Panel2D(self.surface_points[::2])
+
+    @cached_property
+    def arc_coefficients(self) -> np.ndarray:
+        """Coefficient c of the arc of each panel as a column vector.
+
+        The arc passes through the midpoint of the panel on the surface,
+        which is located at (x_m, d) in the frame of the panel chord.
+        """
+        start_pts, _ = self.panels.nodes
+        offsets = self.surface_points[1::2] - start_pts
+        x_m = np.sum(offsets * self.panels.tangents, axis=1, keepdims=True)
+        d = np.sum(offsets * self.panels.normals, axis=1, keepdims=True)
+        return d / (x_m * (self.panels.lengths - x_m))
+
+    @cached_property
+    def end_scales(self) -> np.ndarray:
+        """Ratio of the arc and chord length elements at the nodes.
+
+        The strengths are taken per unit arc length, whereas the
+        kernels integrate a strength per unit chord length.
+        """
+        lengths = self.panels.lengths[:, 0]
+        return np.sqrt(1 + (self.arc_coefficients[:, 0] * lengths) ** 2)
+
+    @cached_property
+    def collocation_panels(self) -> np.ndarray:
+        """Panel of each collocation point.
+
+        The trailing edge panels have a single collocation point, all
+        other panels have two.
+        """
+        n_panels = self.panels.n_panels
+        inner = np.repeat(np.arange(1, n_panels - 1), 2)
+        return np.concatenate(([0], inner, [n_panels - 1]))
+
+    @cached_property
+    def collocation_slopes(self) -> np.ndarray:
+        """Slope of the arc relative to the chord at each point.
+
+        Returns:
+            The chord-wise coordinate and slope of each collocation
+            point as the columns of a (2N - 2, 2) array.
+        """
+        inner = np.tile(COLLOCATION_PARAMETERS, self.panels.n_panels - 2)
+        fractions = np.concatenate(([0.5], inner, [0.5]))
+        panels = self.collocation_panels
+        lengths = self.panels.lengths[panels, 0]
+        x = lengths * fractions
+        slopes = self.arc_coefficients[panels, 0] * (lengths - 2 * x)
+        return np.column_stack((x, slopes))
+
+    @cached_property
+    def collocation_points(self) -> np.ndarray:
+        """Collocation points on the arcs of the panels."""
+        start_pts, _ = self.panels.nodes
+        panels = self.collocation_panels
+        x = self.collocation_slopes[:, 0, None]
+        eta = self.arc_coefficients[panels] * x * (
+            self.panels.lengths[panels] - x
+        )
+        return (
+            start_pts[panels]
+            + x * self.panels.tangents[panels]
+            + eta * self.panels.normals[panels]
+        )
+
+    @cached_property
+    def collocation_tangents(self) -> np.ndarray:
+        """Unit tangents of the arcs at the collocation points."""
+        panels = self.collocation_panels
+        slopes = self.collocation_slopes[:, 1, None]
+        tangents = (
+            self.panels.tangents[panels] + slopes * self.panels.normals[panels]
+        )
+        return tangents / np.sqrt(1 + slopes ** 2)
+
+    @cached_property
+    def collocation_normals(self) -> np.ndarray:
+        """Unit normal vectors of the arcs at the collocation points."""
+        tangents = self.collocation_tangents
+        return np.column_stack((-tangents[:, 1], tangents[:, 0]))
+
+    @cached_property
+    def collocation_lengths(self) -> np.ndarray:
+        """Arc length of each collocation point as a column vector.
+
+        The two collocation points of a panel are the Gauss points of
+        its chord, hence each acts on half of the chord scaled by the
+        ratio of the arc and chord length elements at the point.
+        """
+        panels = self.collocation_panels
+        n_points = np.bincount(panels)[panels]
+        chords = self.panels.lengths[panels, 0] / n_points
+        return (chords * np.hypot(1, self.collocation_slopes[:, 1]))[:, None]
+
+    @cached_property
+    def unit_rhs_vector(self) -> np.ndarray:
+        """Collocation normals followed by (0, 0) of the last 3 rows."""
+        return np.vstack((self.collocation_normals, np.zeros((3, 2))))
+
+    @cached_property
+    def kernel_args(self) -> Dict[str, np.ndarray]:
+        """Geometric arguments of the quadratic vortex kernels."""
+        start_pts, _ = self.panels.nodes
+        return dict(
+            start_pts=start_pts,
+            col_pts=self.collocation_points,
+            col_panels=self.collocation_panels,
+            col_normals=self.collocation_normals,
+            col_tangents=self.collocation_tangents,
+            panel_lengths=self.panels.lengths,
+            panel_normals=self.panels.normals,
+            panel_tangents=self.panels.tangents,
+            arc_coefficients=self.arc_coefficients,
+        )
+
+    @property
+    def coefficient_shape(self) -> Tuple[int, int]:
+        """Two rows per panel, one column per node and midpoint."""
+        size = 2 * self.panels.n_panels + 1
+        return size, size
+
+    def assemble(
+        self, tangent: bool = False, backend: Optional[str] = None
+    ) -> Dict[str, np.ndarray]:
+        """Inserts the linearity and Kutta conditions.
+
+        The strength per unit chord of the first and last panel is
+        linear if its value at the midpoint is the mean of the values at
+        both nodes.
+        """
+        matrices = super().assemble(tangent, backend)
+        end_scales = self.end_scales[[0, -1]]
+        normal_im = matrices["normal"]
+        normal_im[-3, :3] = end_scales[0], -2, end_scales[0]
+        normal_im[-2, -3:] = end_scales[1], -2, end_scales[1]
+        normal_im[-1, [0, -1]] = 1
+        return matrices
+
+    def with_perturbed_nodes(
+        self, indices: Sequence[int], points: np.ndarray
+    ) -> PanelMethod:
+        """Rejects node perturbations of the curved panels.
+
+        Each arc passes through the start node, midpoint and end node
+        of its panel, see :py:attr:`surface_points`. Moving the nodes
+        alone supplies neither the new midpoints nor the curvature of
+        the adjacent arcs, hence the perturbed geometry is undefined.
+        Construct a new method of the perturbed airfoil instead.
+
+        Raises:
+            TypeError: Always, as quadratic panels need the midpoints
+                that a node perturbation does not supply.
+        """
+        raise TypeError(
+            f"{type(self).__name__} does not support perturbed nodes, as "
+            "the arc of each panel also passes through its midpoint, "
+            "which a node perturbation does not supply. Please construct "
+            "a new method of the perturbed airfoil instead."
+        )
+
+    @cached_property
+    def influence_matrices(self) -> Dict[str, np.ndarray]:
+        """Normal and tangent influence coefficient matrices."""
+        return self.assemble(tangent=True)
+
+    @cached_property
+    def influence_matrix(self) -> np.ndarray:
+        """Normal influence matrix bordered by the Kutta condition.
+
+        The tangent influence matrix is only assembled alongside if
+        :py:attr:`influence_matrices` was already requested.
+        """
+        if "influence_matrices" in vars(self):
+            return self.influence_matrices["normal"]
+        return self.assemble()["normal"]
+
+    def tangent_matvec(self, x: np.ndarray) -> np.ndarray:
+        """Product of the tangent influence matrix and ``x``.
+
+        The out-of-core solver streams the rows with
+        :py:meth:`streamed_tangent_matvec` instead of assembling the
+        dense :py:attr:`influence_matrices`.
+
+        Args:
+            x: Strengths at the nodes and midpoints of all panels
+
+        Returns:
+            Tangent velocities induced at all collocation points.
+        """
+        if "influence_matrices" in vars(self) or self.storage_dir is None:
+            return self.influence_matrices["tangent"][:-3] @ x
+        return self.streamed_tangent_matvec(x)
+
+    @cached_property
+    def circulation_weights(self) -> np.ndarray:
+        """Weights of the strengths that yield the total circulation.
+
+        Simpson's rule integrates the quadratic strength along the
+        chord exactly.
+        """
+        lengths = self.panels.lengths[:, 0]
+        weights = np.zeros(2 * self.panels.n_panels + 1)
+        weights[:-1:2] += lengths * self.end_scales / 6
+        weights[1::2] += 4 * lengths / 6
+        weights[2::2] += lengths * self.end_scales / 6
+        return weights
+
+    def induced_velocities(
+        self, points: np.ndarray, strengths: np.ndarray
+    ) -> np.ndarray:
+        """Velocities induced by the panels at off-body points."""
+        return self.kernel(calc_quadratic_vortex_velocities)(
+            np.asarray(points, dtype=np.float64),
+            np.ascontiguousarray(strengths, dtype=np.float64),
+            start_pts=self.kernel_args["start_pts"],
+            panel_lengths=self.kernel_args["panel_lengths"],
+            panel_normals=self.kernel_args["panel_normals"],
+            panel_tangents=self.kernel_args["panel_tangents"],
+            arc_coefficients=self.kernel_args["arc_coefficients"],
+        )
+
+
+@numba.jit(**BASE_NUMBA_CONFIG)
+def chord_moments(  # noqa: D103
+    x: float, y: float, length: float
+) -> Tuple[float, float, float, float, float, float]:
+    """Closed-form integration constants of a straight panel.
+
+    The constants are the integrals over the panel of::
+
+        I_k = s^k (x - s) / r^2,    J_k = s^k y / r^2
+
+    Here r is the distance from (s, 0) to the point. The higher powers
+    follow from the recurrences of s (x - s) = x (x - s) - (x - s)^2.
+
+    Args:
+        x: Local x coordinate of the point along the panel
+        y: Local y coordinate of the point along the panel normal
+        length: Length of the panel
+
+    Returns:
+        The constants I_0, I_1, I_2, J_0, J_1 and J_2.
+    """
+    # The logarithm of r1^2 / r2^2 is evaluated from the difference
+    # r1^2 - r2^2 to retain its relative accuracy far from the panel
+    r2_squared = (x - length) ** 2 + y * y
+    i_0 = 0.5 * math.log1p(length * (2 * x - length) / r2_squared)
+    j_0 = math.atan2(y * length, x * (x - length) + y * y)
+    i_1 = x * i_0 - length + y * j_0
+    j_1 = x * j_0 - y * i_0
+    i_2 = x * i_1 - 0.5 * length * length + y * j_1
+    j_2 = x * j_1 - y * i_1
+    return i_0, i_1, i_2, j_0, j_1, j_2
+
+
+@numba.jit(**BASE_NUMBA_CONFIG)
+def arc_correction_points(  # noqa: D103
+    length: float, arc: float, distance: float
+) -> int:
+    """Number of Gauss points of the arc correction of a far panel.
+
+    The correction is bounded by the sagitta of the arc relative to
+    the distance d of the point from the chord. Nearly flat panels
+    skip the correction below :py:data:`ARC_TOLERANCE`. Otherwise, the
+    Gauss rule needs at least 3 points to integrate the leading far
+    field terms exactly, and each further point reduces the error by
+    at least (l / 2d)^1.5 for d no shorter than the panel length l.
+
+    Args:
+        length: Length of the panel chord
+        arc: Coefficient c of the arc of the panel
+        distance: Distance of the point from the panel chord
+
+    Returns:
+        The number of Gauss points between 0 and 8.
+    """
+    error = 0.25 * abs(arc) * length * length / distance
+    if error <= ARC_TOLERANCE:
+        return 0
+    ratio = (0.5 * length / distance) ** 1.5
+    error *= ratio * ratio
+    n_points = 3
+    while error > ARC_TOLERANCE and n_points < GAUSS_POINTS.shape[0]:
+        error *= ratio
+        n_points += 1
+    return n_points
+
+
+@numba.jit(**BASE_NUMBA_CONFIG)
+def panel_moments(  # noqa: D103
+    x: float, y: float, length: float, arc: float
+) -> Tuple[float, float, float, float, float, float]:
+    """Velocities induced by the strengths s^k of a curved panel.
+
+    The chord contributes the :py:func:`chord_moments`. The difference
+    of the kernel on the arc and on the chord is integrated with the
+    Gauss-Legendre rule, which is applied on sub-intervals no longer
+    than the distance of the point to the chord. Panels further than
+    their length from the point use a single interval with the
+    number of points of :py:func:`arc_correction_points`.
+
+    Args:
+        x: Local x coordinate of the point along the panel
+        y: Local y coordinate of the point along the panel normal
+        length: Length of the panel chord
+        arc: Coefficient c of the arc of the panel
+
+    Returns:
+        The local x velocities u_0, u_1, u_2 and y velocities v_0, v_1
+        and v_2 of the clockwise strengths 1, s and s^2.
+    """
+    i_0, i_1, i_2, j_0, j_1, j_2 = chord_moments(x, y, length)
+    u_0, u_1, u_2 = j_0, j_1, j_2
+    v_0, v_1, v_2 = -i_0, -i_1, -i_2
+
+    dx = max(0.0, -x, x - length)
+    distance = math.sqrt(dx * dx + y * y)
+    n_sub = MAX_SUBDIVISIONS
+    n_points = GAUSS_POINTS.shape[0]
+    if distance * MAX_SUBDIVISIONS > length:
+        n_sub = int(math.ceil(length / distance))
+    if n_sub == 1:
+        n_points = arc_correction_points(length, arc, distance)
+    for sub in range(n_sub):
+        for g in range(n_points):
+            s = length * (sub + GAUSS_POINTS[n_points - 1, g]) / n_sub
+            weight = length * GAUSS_WEIGHTS[n_points - 1, g] / n_sub
+            a = x - s
+            b = y - arc * s * (length - s)
+            r_squared = a * a + b * b
+            r0_squared = a * a + y * y
+            du = weight * (b / r_squared - y / r0_squared)
+            dv = weight * a * (1 / r0_squared - 1 / r_squared)
+            u_0 += du
+            u_1 += du * s
+            u_2 += du * s * s
+            v_0 += dv
+            v_1 += dv * s
+            v_2 += dv * s * s
+
+    factor = 1 / (2 * math.pi)
+    return (
+        factor * u_0,
+        factor * u_1,
+        factor * u_2,
+        factor * v_0,
+        factor * v_1,
+        factor * v_2,
+    )
+
+
+@numba.jit(**BASE_NUMBA_CONFIG)
+def own_panel_moments(  # noqa: D103
+    x: float, length: float, arc: float
+) -> Tuple[float, float, float, float, float, float]:
+    """Velocities induced by the strengths s^k at a point of the arc.
+
+    The point lies on the arc at chord-wise coordinate ``x``. Relative
+    to the chord the arc has the slope m(s) = c (l - x - s) between
+    this point and (s, eta(s)), hence the normal velocity reduces to
+    the Cauchy kernel of the chord plus the smooth remainder::
+
+        -1 / (2 pi q) * (1 / (x - s) - c m / (1 + m^2))
+
+    The tangent velocity is smooth apart from the jump of half the
+    strength across the vortex sheet. Here q is the norm of the
+    tangent (1, eta'(x)) of the arc.
+
+    Args:
+        x: Chord-wise coordinate of the point along the panel
+        length: Length of the panel chord
+        arc: Coefficient c of the arc of the panel
+
+    Returns:
+        The normal velocities n_0, n_1, n_2 and tangent velocities t_0,
+        t_1 and t_2 of the clockwise strengths 1, s and s^2 along the
+        arc normal and tangent on the side of the panel normal.
+    """
+    # Principal values of the chord integration constants at y = 0
+    i_0 = math.log(x / (length - x))
+    i_1 = x * i_0 - length
+    i_2 = x * i_1 - 0.5 * length * length
+
+    n_0, n_1, n_2 = i_0, i_1, i_2
+    t_0, t_1, t_2 = 0.0, 0.0, 0.0
+    for g in range(QUADRATURE_POINTS.shape[0]):
+        s = length * QUADRATURE_POINTS[g]
+        weight = length * QUADRATURE_WEIGHTS[g]
+        slope = arc * (length - x - s)
+        dt = weight * arc / (1 + slope * slope)
+        dn = -dt * slope
+        n_0 += dn
+        n_1 += dn * s
+        n_2 += dn * s * s
+        t_0 += dt
+        t_1 += dt * s
+        t_2 += dt * s * s
+
+    q = math.sqrt(1 + (arc * (length - 2 * x)) ** 2)
+    factor = 1 / (2 * math.pi * q)
+    return (
+        -factor * n_0,
+        -factor * n_1,
+        -factor * n_2,
+        factor * t_0 + 0.5 / q,
+        factor * t_1 + 0.5 * x / q,
+        factor * t_2 + 0.5 * x * x / q,
+    )
+
+
+@numba.jit(**BASE_NUMBA_CONFIG)
+def strength_polynomial(  # noqa: D103
+    gamma_start: float,
+    gamma_mid: float,
+    gamma_end: float,
+    length: float,
+    end_scale: float,
+) -> Tuple[float, float, float]:
+    """Coefficients of the strength per unit chord along a panel.
+
+    The strengths per unit arc length at the nodes are scaled by the
+    ratio ``end_scale`` of the arc and chord length elements, which is
+    the same at both ends of a parabolic arc and 1 at its midpoint.
+
+    Returns:
+        The coefficients p_0, p_1 and p_2 of p_0 + p_1 s + p_2 s^2.
+    """
+    start = end_scale * gamma_start
+    end = end_scale * gamma_end
+    return (
+        start,
+        (4 * gamma_mid - 3 * start - end) / length,
+        2 * (start + end - 2 * gamma_mid) / (length * length),
+    )
+
+
+@register_kernel(QuadraticVortex, "numba")
+@eager
+@numba.jit(parallel=True, **BASE_NUMBA_CONFIG)
+def fill_quadratic_vortex_rows(  # noqa: D103
+    out: numba.float64[:, :, :],
+    rows: numba.int64[:],
+    start_pts: numba.float64[:, :],
+    col_pts: numba.float64[:, :],
+    col_panels: numba.int64[:],
+    col_normals: numba.float64[:, :],
+    col_tangents: numba.float64[:, :],
+    panel_lengths: numba.float64[:, :],
+    panel_normals: numba.float64[:, :],
+    panel_tangents: numba.float64[:, :],
+    arc_coefficients: numba.float64[:, :],
+) -> None:
+    """Fills selected rows of the influence matrices.
+
+    Args:
+        out: Normal and tangent influence coefficients of the requested
+            rows with shape (2, n_rows, 2 * n_panels + 1) filled
+            inplace. If the shape is (1, n_rows, 2 * n_panels + 1) only
+            the normal coefficients are filled.
+        rows: Collocation point (row) indices
+        start_pts: Start nodes (points) of all panels
+        col_pts: Collocation points on the arcs of the panels
+        col_panels: Panel index of each collocation point
+        col_normals: Unit normal vectors of the arcs at ``col_pts``
+        col_tangents: Unit tangent vectors of the arcs at ``col_pts``
+        panel_lengths: Panel chord lengths as a column vector
+        panel_normals: Panel chord normal vectors as row vectors
+        panel_tangents: Panel chord tangent vectors as row vectors
+        arc_coefficients: Arc coefficients as a column vector
+    """
+    n_components = out.shape[0]
+    n_panels, _ = start_pts.shape
+
+    for k in numba.prange(rows.shape[0]):
+        i = rows[k]
+        for c in range(n_components):
+            out[c, k, :] = 0.0
+        for j in range(n_panels):
+            length, arc = panel_lengths[j, 0], arc_coefficients[j, 0]
+            t_x, t_y = panel_tangents[j, 0], panel_tangents[j, 1]
+            n_x, n_y = panel_normals[j, 0], panel_normals[j, 1]
+            dx = col_pts[i, 0] - start_pts[j, 0]
+            dy = col_pts[i, 1] - start_pts[j, 1]
+            if col_panels[i] == j:
+                a_n0, a_n1, a_n2, a_t0, a_t1, a_t2 = own_panel_moments(
+                    dx * t_x + dy * t_y, length, arc
+                )
+            else:
+                u_0, u_1, u_2, v_0, v_1, v_2 = panel_moments(
+                    dx * t_x + dy * t_y, dx * n_x + dy * n_y, length, arc
+                )
+                # Projecting the local velocities onto the arc normal
+                # and tangent at the collocation point
+                nt = col_normals[i, 0] * t_x + col_normals[i, 1] * t_y
+                nn = col_normals[i, 0] * n_x + col_normals[i, 1] * n_y
+                tt = col_tangents[i, 0] * t_x + col_tangents[i, 1] * t_y
+                tn = col_tangents[i, 0] * n_x + col_tangents[i, 1] * n_y
+                a_n0, a_n1, a_n2 = (
+                    u_0 * nt + v_0 * nn,
+                    u_1 * nt + v_1 * nn,
+                    u_2 * nt + v_2 * nn,
+                )
+                a_t0, a_t1, a_t2 = (
+                    u_0 * tt + v_0 * tn,
+                    u_1 * tt + v_1 * tn,
+                    u_2 * tt + v_2 * tn,
+                )
+
+            end_scale = math.sqrt(1 + (arc * length) ** 2)
+            for b in range(3):
+                # Polynomial of the unit strength at node or midpoint b
+                p_0, p_1, p_2 = strength_polynomial(
+                    1.0 if b == 0 else 0.0,
+                    1.0 if b == 1 else 0.0,
+                    1.0 if b == 2 else 0.0,
+                    length,
+                    end_scale,
+                )
+                out[0, k, 2 * j + b] += p_0 * a_n0 + p_1 * a_n1 + p_2 * a_n2
+                if n_components > 1:
+                    out[1, k, 2 * j + b] += (
+                        p_0 * a_t0 + p_1 * a_t1 + p_2 * a_t2
+                    )
+
+
+@eager
+@numba.jit(parallel=True, **BASE_NUMBA_CONFIG)
+def calc_quadratic_vortex_velocities(  # noqa: D103
+    points: numba.float64[:, :],
+    strengths: numba.float64[:, :],
+    start_pts: numba.float64[:, :],
+    panel_lengths: numba.float64[:, :],
+    panel_normals: numba.float64[:, :],
+    panel_tangents: numba.float64[:, :],
+    arc_coefficients: numba.float64[:, :],
+) -> numba.float64[:, :, :]:
+    """Calculates the velocities induced at off-body points.
+
+    The arc correction is accurate for points further than about
+    1 / :py:data:`MAX_SUBDIVISIONS` of a panel length from the panel.
+
+    Args:
+        points: Field points as a set of row vectors
+        strengths: Strengths at the nodes and midpoints of all panels
+            with shape (2 * n_panels + 1, m)
+        start_pts: Start nodes (points) of all panels
+        panel_lengths: Panel chord lengths as a column vector
+        panel_normals: Panel chord normal vectors as row vectors
+        panel_tangents: Panel chord tangent vectors as row vectors
+        arc_coefficients: Arc coefficients as a column vector
+
+    Returns:
+        Induced velocity vectors with shape (n_points, 2, m).
+    """
+    n_points, _ = points.shape
+    n_panels, _ = start_pts.shape
+    _, m = strengths.shape
+
+    velocities = np.zeros((n_points, 2, m), dtype=np.float64)
+
+    for p in numba.prange(n_points):
+        for j in range(n_panels):
+            length, arc = panel_lengths[j, 0], arc_coefficients[j, 0]
+            t_x, t_y = panel_tangents[j, 0], panel_tangents[j, 1]
+            n_x, n_y = panel_normals[j, 0], panel_normals[j, 1]
+            dx = points[p, 0] - start_pts[j, 0]
+            dy = points[p, 1] - start_pts[j, 1]
+            u_0, u_1, u_2, v_0, v_1, v_2 = panel_moments(
+                dx * t_x + dy * t_y, dx * n_x + dy * n_y, length, arc
+            )
+            end_scale = math.sqrt(1 + (arc * length) ** 2)
+            for k in range(m):
+                p_0, p_1, p_2 = strength_polynomial(
+                    strengths[2 * j, k],
+                    strengths[2 * j + 1, k],
+                    strengths[2 * j + 2, k],
+                    length,
+                    end_scale,
+                )
+                u = p_0 * u_0 + p_1 * u_1 + p_2 * u_2
+                v = p_0 * v_0 + p_1 * v_1 + p_2 * v_2
+                velocities[p, 0, k] += u * t_x + v * n_x
+                velocities[p, 1, k] += u * t_y + v * n_y
+
+    return velocities
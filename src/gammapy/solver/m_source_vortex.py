@@ -0,0 +1,430 @@
+# Copyright 2020 Kilian Swannet, San Kilkis
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied. See the License for the specific language governing
+# permissions and limitations under the License.
+
+"""Implements the Hess-Smith Source and Vortex Panel Method.
+
+Each panel carries a source of constant strength q_j, while a vortex of
+uniform strength gamma is distributed over all panels. The N source
+strengths satisfy the flow tangency condition at the N collocation
+points and gamma is set by the Kutta condition, which requires equal
+tangential velocities leaving the trailing edge on both surfaces.
+
+The induced velocity of a vortex panel is that of a source panel
+rotated by 90 degrees, hence only the source influence coefficients are
+evaluated. With the circulation taken positive clockwise, the normal
+and tangent influence of the uniform vortex at collocation point i is::
+
+    b_n[i] = -sum_j a_t[i, j]
+    b_t[i] = sum_j a_n[i, j]
+
+Here a_n and a_t are the normal and tangent source influence
+coefficients (Hess & Smith, 1967; Katz & Plotkin pg. 280, 2001).
+"""
+
+import math
+from functools import cached_property
+from typing import Dict, Optional, Tuple, Type
+
+import numba
+import numpy as np
+
+from gammapy.geometry.panel import Panel2D
+from gammapy.jit import eager
+from gammapy.solver.backends import register_kernel
+from gammapy.solver.base import (
+    BASE_NUMBA_CONFIG,
+    FlowSolution,
+    PanelMethod,
+    ThickFlowSolution,
+)
+
+
+class SourceVortexSolution(ThickFlowSolution):
+    """Flow solution of the source strengths and uniform vortex.
+
+    The circulations of this solution are the N source strengths
+    followed by the strength of the uniform vortex.
+    """
+
+    def tangent_product(self, circulations: np.ndarray) -> np.ndarray:
+        """Tangent velocities induced at the collocation points."""
+        return self.method.tangent_matvec(circulations)
+
+    @cached_property
+    def lift_coefficient(self) -> float:
+        """Lift coefficient of the total circulation of the vortex.
+
+        The circulation is the uniform vortex strength times the
+        perimeter of the airfoil, from which the lift follows by the
+        Kutta-Joukowski theorem.
+        """
+        perimeter = np.sum(self.method.panels.lengths)
+        if self.superposition:
+            return 2 * perimeter * self.basis_circulations[-1] @ (
+                self.flow_directions.T
+            )
+        return 2 * perimeter * self.circulations[-1]
+
+    @cached_property
+    def delta_pressure_coefficients(self) -> np.ndarray:
+        """Pressure coefficient change between both surfaces.
+
+        The source strengths carry no pressure jump across a panel.
+        Instead, the lower surface pressure is paired with the upper
+        surface pressure at the same chord fraction, from the leading
+        edge to the trailing edge.
+        """
+        cp = self.pressure_coefficients
+        n_half = len(cp) // 2
+        return cp[n_half - 1 :: -1] - cp[n_half:]
+
+    @cached_property
+    def delta_pressure_locations(self) -> np.ndarray:
+        """Mean chord-wise location of each pair of surface points."""
+        x = self.method.collocation_points[:, 0]
+        n_half = len(x) // 2
+        return 0.5 * (x[n_half - 1 :: -1] + x[n_half:])
+
+
+class SourceVortex(PanelMethod):
+    """Implements the Hess-Smith Source and Vortex panel method.
+
+    The system has N + 1 unknowns, the source strength of each panel
+    and the uniform vortex strength. Unlike :py:class:`ConstantVortex`
+    no auxiliary unknown is required to make the system solvable.
+    Only the "direct" and "hmatrix" solvers in "double" precision are
+    supported.
+    """
+
+    SUPPORTED_SOLVERS = ("direct", "hmatrix")
+    SUPPORTED_PRECISIONS = ("double",)
+    SUPPORTS_MULTIPOLE = False
+
+    @property
+    def solution_class(self) -> Type[FlowSolution]:
+        """Solution that includes the uniform vortex strength."""
+        return SourceVortexSolution
+
+    @cached_property
+    def panels(self) -> Panel2D:
+        """Panels that run from TE -> Bottom -> Top -> TE."""
+        sample_u = PanelMethod.get_sample_parameters(
+            num=(self.n_panels // 2) + 1, spacing=self.spacing
+        )
+        bot_pts = self.airfoil.lower_surface_at(sample_u[::-1])
+        top_pts = self.airfoil.upper_surface_at(sample_u[1:])
+        return Panel2D(np.vstack((bot_pts, top_pts)))
+
+    @cached_property
+    def collocation_points(self) -> np.ndarray:
+        """Collocation points located at the midpoint of each panel."""
+        return self.panels.points_at(0.5)
+
+    @cached_property
+    def unit_rhs_vector(self) -> np.ndarray:
+        """Panel normals and the tangents of the Kutta condition.
+
+        The Kutta condition sums the tangential velocities of the first
+        and last panel, hence its free-stream term is the sum of their
+        tangents.
+        """
+        tangents = self.panels.tangents
+        return np.vstack((self.panels.normals, tangents[0] + tangents[-1]))
+
+    @cached_property
+    def kernel_args(self) -> Dict[str, np.ndarray]:
+        """Geometric arguments shared by all source vortex kernels."""
+        start_pts, _ = self.panels.nodes
+        return dict(
+            start_pts=start_pts,
+            col_pts=self.collocation_points,
+            panel_lengths=self.panels.lengths,
+            panel_normals=self.panels.normals,
+            panel_tangents=self.panels.tangents,
+        )
+
+    @property
+    def coefficient_shape(self) -> Tuple[int, int]:
+        """Includes the Kutta condition row and the vortex column."""
+        n_panels = self.panels.n_panels
+        return n_panels + 1, n_panels + 1
+
+    def assemble(
+        self, tangent: bool = False, backend: Optional[str] = None
+    ) -> Dict[str, np.ndarray]:
+        """Inserts the Kutta condition v_t[0] + v_t[N - 1] = 0."""
+        matrices = super().assemble(tangent, backend)
+        n_panels = self.panels.n_panels
+        te_rows = np.zeros((2, 2, n_panels + 1))
+        self.fill_influence_rows(te_rows, [0, n_panels - 1], backend)
+        matrices["normal"][-1] = te_rows[1].sum(axis=0)
+        return matrices
+
+    def perturbed_unknowns(
+        self, panels: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Includes the Kutta condition row and the vortex column.
+
+        The vortex column sums the source influence of all panels,
+        while the Kutta condition row depends on the first and last
+        panel. Both are hence affected by any perturbed panel.
+        """
+        n_panels = self.panels.n_panels
+        return np.append(panels, n_panels), np.append(panels, n_panels)
+
+    @cached_property
+    def influence_matrices(self) -> Dict[str, np.ndarray]:
+        """Normal and tangent influence coefficient matrices."""
+        return self.assemble(tangent=True)
+
+    @cached_property
+    def influence_matrix(self) -> np.ndarray:
+        """Normal influence matrix bordered by the Kutta condition.
+
+        The tangent influence matrix is only assembled alongside if
+        :py:attr:`influence_matrices` was already requested.
+        """
+        if "influence_matrices" in vars(self):
+            return self.influence_matrices["normal"]
+        return self.assemble()["normal"]
+
+    @cached_property
+    def circulation_weights(self) -> np.ndarray:
+        """Weights of the source strengths and the uniform vortex.
+
+        The sources carry no circulation, while the circulation of the
+        uniform vortex is its strength times the perimeter of the
+        airfoil.
+        """
+        weights = np.zeros(self.panels.n_panels + 1)
+        weights[-1] = np.sum(self.panels.lengths)
+        return weights
+
+    def tangent_matvec(self, x: np.ndarray) -> np.ndarray:
+        """Product of the tangent influence matrix and ``x``.
+
+        The in-memory "direct" solver reuses the cached
+        :py:attr:`influence_matrices`, otherwise the rows are streamed
+        with :py:meth:`streamed_tangent_matvec`.
+
+        Args:
+            x: Source strengths followed by the vortex strength
+
+        Returns:
+            Tangent velocities induced at all collocation points.
+        """
+        if "influence_matrices" in vars(self) or (
+            self.solver == "direct" and self.storage_dir is None
+        ):
+            return self.influence_matrices["tangent"][:-1] @ x
+        return self.streamed_tangent_matvec(x)
+
+    def induced_velocities(
+        self, points: np.ndarray, strengths: np.ndarray
+    ) -> np.ndarray:
+        """Velocities induced by the panels at off-body points."""
+        return self.kernel(calc_source_vortex_velocities)(
+            np.asarray(points, dtype=np.float64),
+            np.ascontiguousarray(strengths, dtype=np.float64),
+            start_pts=self.kernel_args["start_pts"],
+            panel_lengths=self.kernel_args["panel_lengths"],
+            panel_normals=self.kernel_args["panel_normals"],
+            panel_tangents=self.kernel_args["panel_tangents"],
+        )
+
+
+@numba.jit(**BASE_NUMBA_CONFIG)
+def source_panel_velocity(  # noqa: D103
+    x: float, y: float, length: float,
+) -> Tuple[float, float]:
+    """Velocity induced by a source panel of unit strength.
+
+    The panel runs along the local x axis from the origin to
+    (``length``, 0). The angle subtended by the panel is evaluated with
+    a single ``atan2`` of the cross and dot product of the vectors from
+    both panel ends to the point.
+
+    Args:
+        x: Local x coordinate of the point along the panel
+        y: Local y coordinate of the point along the panel normal
+        length: Length of the source panel
+
+    Returns:
+        The local x and y velocity components, which on the panel
+        midpoint are (0, 0.5) on the side of the panel normal.
+    """
+    r1_squared = x * x + y * y
+    r2_squared = (x - length) ** 2 + y * y
+    beta = math.atan2(y * length, x * (x - length) + y * y)
+    u = math.log(r1_squared / r2_squared) / (4 * math.pi)
+    v = beta / (2 * math.pi)
+    return u, v
+
+
+@register_kernel(SourceVortex, "numba")
+@eager
+@numba.jit(parallel=True, **BASE_NUMBA_CONFIG)
+def fill_source_vortex_rows(  # noqa: D103
+    out: numba.float64[:, :, :],
+    rows: numba.int64[:],
+    start_pts: numba.float64[:, :],
+    col_pts: numba.float64[:, :],
+    panel_lengths: numba.float64[:, :],
+    panel_normals: numba.float64[:, :],
+    panel_tangents: numba.float64[:, :],
+) -> None:
+    """Fills selected rows of the influence matrices.
+
+    The last column holds the influence of the uniform vortex, which is
+    accumulated from the source influence coefficients of the row.
+
+    Args:
+        out: Normal and tangent influence coefficients of the requested
+            rows with shape (2, n_rows, n_panels + 1) filled inplace. If
+            the shape is (1, n_rows, n_panels + 1) only the normal
+            coefficients are filled.
+        rows: Collocation point (row) indices
+        start_pts: Start nodes (points) of all panels
+        col_pts: Collocation points placed at the midpoint of each panel
+        panel_lengths: Panel lengths as a column vector
+        panel_normals: Panel normal vectors as a set of row vectors
+        panel_tangents: Panel tangent vectors as a set of row vectors
+    """
+    n_components = out.shape[0]
+    n_panels, _ = start_pts.shape
+
+    for k in numba.prange(rows.shape[0]):
+        i = rows[k]
+        sum_n, sum_t = 0.0, 0.0
+        for j in range(n_panels):
+            if i == j:
+                # Jump of the normal velocity across the source sheet
+                a_n, a_t = 0.5, 0.0
+            else:
+                dx = col_pts[i, 0] - start_pts[j, 0]
+                dy = col_pts[i, 1] - start_pts[j, 1]
+                t_x, t_y = panel_tangents[j, 0], panel_tangents[j, 1]
+                n_x, n_y = panel_normals[j, 0], panel_normals[j, 1]
+                x_local, y_local = dx * t_x + dy * t_y, dx * n_x + dy * n_y
+                u, v = source_panel_velocity(
+                    x_local, y_local, panel_lengths[j, 0]
+                )
+                # Transforming the local velocity to the global axes
+                vel_x, vel_y = u * t_x + v * n_x, u * t_y + v * n_y
+                a_n = vel_x * panel_normals[i, 0] + vel_y * panel_normals[i, 1]
+                a_t = (
+                    vel_x * panel_tangents[i, 0] + vel_y * panel_tangents[i, 1]
+                )
+            out[0, k, j] = a_n
+            if n_components > 1:
+                out[1, k, j] = a_t
+            sum_n += a_n
+            sum_t += a_t
+        out[0, k, n_panels] = -sum_t
+        if n_components > 1:
+            out[1, k, n_panels] = sum_n
+
+
+@register_kernel(SourceVortex, "numpy")
+def numpy_source_vortex_rows(
+    out: np.ndarray,
+    rows: np.ndarray,
+    start_pts: np.ndarray,
+    col_pts: np.ndarray,
+    panel_lengths: np.ndarray,
+    panel_normals: np.ndarray,
+    panel_tangents: np.ndarray,
+) -> None:
+    """Evaluates :py:func:`fill_source_vortex_rows` with NumPy.
+
+    The velocities of :py:func:`source_panel_velocity` are evaluated as
+    (n_rows, n_panels) arrays at once.
+    """
+    n_panels = start_pts.shape[0]
+    dx = col_pts[rows, 0, None] - start_pts[:, 0]
+    dy = col_pts[rows, 1, None] - start_pts[:, 1]
+    x = dx * panel_tangents[:, 0] + dy * panel_tangents[:, 1]
+    y = dx * panel_normals[:, 0] + dy * panel_normals[:, 1]
+    length = panel_lengths[:, 0]
+
+    u = np.log((x ** 2 + y ** 2) / ((x - length) ** 2 + y ** 2))
+    u /= 4 * math.pi
+    v = np.arctan2(y * length, x * (x - length) + y ** 2) / (2 * math.pi)
+
+    # Jump of the normal velocity across the source sheet
+    own = rows[:, None] == np.arange(n_panels)
+    u[own], v[own] = 0, 0.5
+
+    vel_x = u * panel_tangents[:, 0] + v * panel_normals[:, 0]
+    vel_y = u * panel_tangents[:, 1] + v * panel_normals[:, 1]
+    a_n = vel_x * panel_normals[rows, 0, None]
+    a_n += vel_y * panel_normals[rows, 1, None]
+    a_t = vel_x * panel_tangents[rows, 0, None]
+    a_t += vel_y * panel_tangents[rows, 1, None]
+
+    out[0, :, :n_panels] = a_n
+    out[0, :, n_panels] = -a_t.sum(axis=1)
+    if out.shape[0] > 1:
+        out[1, :, :n_panels] = a_t
+        out[1, :, n_panels] = a_n.sum(axis=1)
+
+
+@eager
+@numba.jit(parallel=True, **BASE_NUMBA_CONFIG)
+def calc_source_vortex_velocities(  # noqa: D103
+    points: numba.float64[:, :],
+    strengths: numba.float64[:, :],
+    start_pts: numba.float64[:, :],
+    panel_lengths: numba.float64[:, :],
+    panel_normals: numba.float64[:, :],
+    panel_tangents: numba.float64[:, :],
+) -> numba.float64[:, :, :]:
+    """Calculates the velocities induced at off-body points.
+
+    Args:
+        points: Field points as a set of row vectors
+        strengths: Source strengths followed by the vortex strength
+            with shape (n_panels + 1, m)
+        start_pts: Start nodes (points) of all panels
+        panel_lengths: Panel lengths as a column vector
+        panel_normals: Panel normal vectors as a set of row vectors
+        panel_tangents: Panel tangent vectors as a set of row vectors
+
+    Returns:
+        Induced velocity vectors with shape (n_points, 2, m).
+    """
+    n_points, _ = points.shape
+    n_panels, _ = start_pts.shape
+    _, m = strengths.shape
+
+    velocities = np.zeros((n_points, 2, m), dtype=np.float64)
+
+    for p in numba.prange(n_points):
+        for j in range(n_panels):
+            dx = points[p, 0] - start_pts[j, 0]
+            dy = points[p, 1] - start_pts[j, 1]
+            t_x, t_y = panel_tangents[j, 0], panel_tangents[j, 1]
+            n_x, n_y = panel_normals[j, 0], panel_normals[j, 1]
+            u, v = source_panel_velocity(
+                dx * t_x + dy * t_y, dx * n_x + dy * n_y, panel_lengths[j, 0]
+            )
+            # Source velocity and the clockwise vortex velocity, which
+            # is the source velocity rotated by -90 degrees
+            source_x, source_y = u * t_x + v * n_x, u * t_y + v * n_y
+            for k in range(m):
+                q, gamma = strengths[j, k], strengths[n_panels, k]
+                velocities[p, 0, k] += q * source_x + gamma * source_y
+                velocities[p, 1, k] += q * source_y - gamma * source_x
+
+    return velocities
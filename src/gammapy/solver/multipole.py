@@ -0,0 +1,680 @@
+# Copyright 2020 Kilian Swannet, San Kilkis
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied. See the License for the specific language governing
+# permissions and limitations under the License.
+
+"""Contains a multipole accelerated evaluation of panel influences.
+
+Evaluating the influence of all singularities on all target points is
+an O(N^2) operation. The :py:class:`MultipoleTree` approximates the
+influence of clusters of panels that are well separated from a target
+by a truncated complex multipole expansion. Together with a binary
+cluster tree this reduces a matrix-vector product to O(N log N)
+operations (Barnes-Hut treecode).
+
+In complex notation the velocity w = u - iv induced at z by point
+vortices of strength q_s located at zeta_s is::
+
+    w(z) = c * sum_s q_s / (z - zeta_s)
+
+where the prefactor c depends on the sign convention and normalization
+of the panel method. Expanding about the center z_c of a cluster
+results in::
+
+    w(z) = c * sum_k a_k / (z - z_c)^(k + 1)
+    a_k = sum_s q_s (zeta_s - z_c)^k
+
+which converges for all z outside of the cluster radius. Panels with a
+distributed vortex strength are represented by Gauss-Legendre points,
+enough such that the moments up to the expansion order are exact.
+
+The accuracy is controlled by:
+
+    * order: Highest power k retained in the expansion.
+    * opening_angle: A cluster of radius r is only approximated by its
+      expansion if r < opening_angle * |z - z_c|. The truncation error
+      is proportional to opening_angle^(order + 1).
+
+All remaining near-field interactions are evaluated with the exact
+influence coefficient kernels of the panel method.
+"""
+
+from functools import cached_property
+from typing import Callable, Dict, Optional, Tuple
+
+import numba
+import numpy as np
+from scipy.sparse import csr_matrix
+
+from gammapy.jit import eager
+from gammapy.solver.base import BASE_NUMBA_CONFIG
+
+# Signature of the exact near-field kernel of a panel method. Evaluates
+# the normal and tangent influence coefficients of the elements on the
+# targets for both strength degrees of freedom, shape (2, 2, n_pairs)
+PairCoefficients = Callable[
+    [np.ndarray, np.ndarray, np.ndarray, bool], np.ndarray
+]
+
+
+def gauss_legendre(n_points: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Returns Gauss-Legendre points and weights on the interval 0-1."""
+    points, weights = np.polynomial.legendre.leggauss(n_points)
+    return 0.5 * (points + 1), 0.5 * weights
+
+
+def build_cluster_tree(
+    start_pts: np.ndarray, end_pts: np.ndarray, leaf_size: int
+) -> Dict[str, np.ndarray]:
+    """Recursively bisects the elements into a binary cluster tree.
+
+    Elements are split by their index, which groups panels that are
+    neighbours along the airfoil contour. Nodes are stored in
+    depth-first pre-order, hence children always succeed their parent.
+
+    Args:
+        start_pts: Start nodes (points) of all elements
+        end_pts: End nodes (points) of all elements
+        leaf_size: Maximum number of elements in a leaf cluster
+
+    Returns:
+        The element ``ranges``, ``children`` (-1 for leaves), complex
+        ``centers`` and ``radii`` of all clusters as well as the
+        ``depth`` of the tree.
+    """
+    ranges, children, centers, radii = [], [], [], []
+    stack = [(0, start_pts.shape[0], -1, 0, 1)]
+    depth = 1
+    while stack:
+        start, end, parent, side, level = stack.pop()
+        node = len(ranges)
+        if parent >= 0:
+            children[parent][side] = node
+        depth = max(depth, level)
+
+        # Bounding circle containing every element of the cluster
+        pts = np.vstack((start_pts[start:end], end_pts[start:end]))
+        center = 0.5 * (pts.min(axis=0) + pts.max(axis=0))
+        ranges.append((start, end))
+        children.append([-1, -1])
+        centers.append(complex(*center))
+        radii.append(np.sqrt(np.max(np.sum((pts - center) ** 2, axis=1))))
+
+        if end - start > leaf_size:
+            middle = (start + end) // 2
+            # Pushing the right child first to keep pre-order
+            stack.append((middle, end, node, 1, level + 1))
+            stack.append((start, middle, node, 0, level + 1))
+
+    return {
+        "ranges": np.array(ranges, dtype=np.int64),
+        "children": np.array(children, dtype=np.int64),
+        "centers": np.array(centers, dtype=np.complex128),
+        "radii": np.array(radii, dtype=np.float64),
+        "depth": depth,
+    }
+
+
+@numba.jit(**BASE_NUMBA_CONFIG)
+def traverse_cluster_tree(  # noqa: D103
+    z: complex,
+    ranges: numba.int64[:, :],
+    children: numba.int64[:, :],
+    centers: numba.complex128[:],
+    radii: numba.float64[:],
+    opening_angle: float,
+    stack: numba.int64[:],
+    far_nodes: numba.int64[:],
+    near_elements: numba.int64[:],
+) -> Tuple[int, int]:
+    """Sorts the clusters into the far and near-field of ``z``.
+
+    Args:
+        z: Target point in complex notation
+        ranges: Element index range of each cluster
+        children: Child clusters of each cluster, -1 for leaves
+        centers: Cluster centers in complex notation
+        radii: Radius of the bounding circle of each cluster
+        opening_angle: Maximum ratio of the cluster radius to the
+            distance between ``z`` and the cluster center for the
+            multipole expansion to be used
+        stack: Work array with room for twice the tree depth
+        far_nodes: Output array of far-field clusters. Only counted if
+            it has a size of zero.
+        near_elements: Output array of near-field elements. Only
+            counted if it has a size of zero.
+
+    Returns:
+        Number of far-field clusters and near-field elements.
+    """
+    fill = far_nodes.shape[0] > 0 or near_elements.shape[0] > 0
+    n_far, n_near = 0, 0
+    stack[0] = 0
+    n_stack = 1
+    while n_stack > 0:
+        n_stack -= 1
+        node = stack[n_stack]
+        if radii[node] < opening_angle * abs(z - centers[node]):
+            if fill:
+                far_nodes[n_far] = node
+            n_far += 1
+        elif children[node, 0] < 0:
+            for j in range(ranges[node, 0], ranges[node, 1]):
+                if fill:
+                    near_elements[n_near] = j
+                n_near += 1
+        else:
+            stack[n_stack] = children[node, 1]
+            stack[n_stack + 1] = children[node, 0]
+            n_stack += 2
+    return n_far, n_near
+
+
+@eager
+@numba.jit(parallel=True, **BASE_NUMBA_CONFIG)
+def calc_interaction_lists(  # noqa: D103
+    targets: numba.complex128[:],
+    ranges: numba.int64[:, :],
+    children: numba.int64[:, :],
+    centers: numba.complex128[:],
+    radii: numba.float64[:],
+    opening_angle: float,
+    depth: int,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Calculates the far and near-field interactions of all targets.
+
+    Args:
+        targets: Target points in complex notation
+        ranges: Element index range of each cluster
+        children: Child clusters of each cluster, -1 for leaves
+        centers: Cluster centers in complex notation
+        radii: Radius of the bounding circle of each cluster
+        opening_angle: Refer to :py:func:`traverse_cluster_tree`
+        depth: Depth of the cluster tree
+
+    Returns:
+        The far-field clusters of target i, ``far_nodes[far_ptr[i]:
+        far_ptr[i + 1]]``, as well as the near-field pairs as arrays of
+        target and element indices.
+    """
+    n_targets = targets.shape[0]
+    empty = np.zeros(0, dtype=np.int64)
+    n_far = np.zeros(n_targets + 1, dtype=np.int64)
+    n_near = np.zeros(n_targets + 1, dtype=np.int64)
+
+    # First pass counts the interactions such that the second pass can
+    # fill the preallocated arrays in parallel
+    for i in numba.prange(n_targets):
+        stack = np.empty(2 * depth + 2, dtype=np.int64)
+        n_far[i + 1], n_near[i + 1] = traverse_cluster_tree(
+            targets[i],
+            ranges,
+            children,
+            centers,
+            radii,
+            opening_angle,
+            stack,
+            empty,
+            empty,
+        )
+    far_ptr = np.cumsum(n_far)
+    near_ptr = np.cumsum(n_near)
+
+    far_nodes = np.empty(far_ptr[-1], dtype=np.int64)
+    near_targets = np.empty(near_ptr[-1], dtype=np.int64)
+    near_elements = np.empty(near_ptr[-1], dtype=np.int64)
+    for i in numba.prange(n_targets):
+        stack = np.empty(2 * depth + 2, dtype=np.int64)
+        traverse_cluster_tree(
+            targets[i],
+            ranges,
+            children,
+            centers,
+            radii,
+            opening_angle,
+            stack,
+            far_nodes[far_ptr[i] : far_ptr[i + 1]],
+            near_elements[near_ptr[i] : near_ptr[i + 1]],
+        )
+        near_targets[near_ptr[i] : near_ptr[i + 1]] = i
+
+    return far_ptr, far_nodes, near_targets, near_elements
+
+
+@numba.jit(**BASE_NUMBA_CONFIG)
+def accumulate_moments(  # noqa: D103
+    moments: numba.complex128[:, :],
+    strengths: numba.float64[:, :, :],
+    sources: numba.complex128[:, :],
+    center: complex,
+) -> None:
+    """Adds the moments of point sources about ``center`` in-place.
+
+    Args:
+        moments: Moments a_k of the cluster with shape (order + 1, m)
+        strengths: Point source strengths of the cluster elements with
+            shape (n_elements, n_quadrature, m)
+        sources: Point source locations in complex notation with shape
+            (n_elements, n_quadrature)
+        center: Cluster center in complex notation
+    """
+    n_terms, m = moments.shape
+    n_elements, n_quad = sources.shape
+    for j in range(n_elements):
+        for g in range(n_quad):
+            dz = sources[j, g] - center
+            dz_k = 1.0 + 0.0j
+            for k in range(n_terms):
+                for c in range(m):
+                    moments[k, c] += strengths[j, g, c] * dz_k
+                dz_k *= dz
+
+
+@numba.jit(**BASE_NUMBA_CONFIG)
+def calc_binomials(order: int) -> numba.float64[:, :]:  # noqa: D103
+    """Pascal's triangle up to and including row ``order``."""
+    binomials = np.zeros((order + 1, order + 1), dtype=np.float64)
+    for n in range(order + 1):
+        binomials[n, 0] = 1.0
+        for k in range(1, n + 1):
+            binomials[n, k] = binomials[n - 1, k - 1] + binomials[n - 1, k]
+    return binomials
+
+
+@numba.jit(**BASE_NUMBA_CONFIG)
+def shift_moments(  # noqa: D103
+    parent: numba.complex128[:, :],
+    child: numba.complex128[:, :],
+    shift: complex,
+    binomials: numba.float64[:, :],
+) -> None:
+    """Adds the moments of ``child`` shifted by ``shift`` in-place.
+
+    Args:
+        parent: Moments of the parent cluster with shape (order + 1, m)
+        child: Moments of the child cluster with shape (order + 1, m)
+        shift: Child center relative to the parent center
+        binomials: Binomial coefficients, refer to
+            :py:func:`calc_binomials`
+    """
+    n_terms, m = parent.shape
+    for n in range(n_terms):
+        shift_k = 1.0 + 0.0j
+        for k in range(n, -1, -1):
+            for c in range(m):
+                parent[n, c] += binomials[n, k] * child[k, c] * shift_k
+            shift_k *= shift
+
+
+@eager
+@numba.jit(parallel=True, **BASE_NUMBA_CONFIG)
+def calc_multipole_moments(  # noqa: D103
+    strengths: numba.float64[:, :, :],
+    sources: numba.complex128[:, :],
+    ranges: numba.int64[:, :],
+    children: numba.int64[:, :],
+    centers: numba.complex128[:],
+    order: int,
+) -> numba.complex128[:, :, :]:
+    """Calculates the multipole moments of all clusters.
+
+    The moments of the leaf clusters are obtained directly from the
+    point sources. These are then shifted to the center of the parent
+    clusters, from the bottom of the tree up.
+
+    Args:
+        strengths: Point source strengths with shape
+            (n_elements, n_quadrature, m)
+        sources: Point source locations in complex notation with shape
+            (n_elements, n_quadrature)
+        ranges: Element index range of each cluster
+        children: Child clusters of each cluster, -1 for leaves
+        centers: Cluster centers in complex notation
+        order: Highest power of the multipole expansion
+
+    Returns:
+        Moments a_k of each cluster with shape (n_nodes, order + 1, m).
+    """
+    n_nodes = centers.shape[0]
+    m = strengths.shape[2]
+
+    moments = np.zeros((n_nodes, order + 1, m), dtype=np.complex128)
+
+    for node in numba.prange(n_nodes):
+        if children[node, 0] < 0:
+            accumulate_moments(
+                moments[node],
+                strengths[ranges[node, 0] : ranges[node, 1]],
+                sources[ranges[node, 0] : ranges[node, 1]],
+                centers[node],
+            )
+
+    binomials = calc_binomials(order)
+
+    # Children succeed their parent, hence reverse order is bottom-up
+    for node in range(n_nodes - 1, -1, -1):
+        for side in range(2):
+            child = children[node, side]
+            if child >= 0:
+                shift_moments(
+                    moments[node],
+                    moments[child],
+                    centers[child] - centers[node],
+                    binomials,
+                )
+
+    return moments
+
+
+@eager
+@numba.jit(parallel=True, **BASE_NUMBA_CONFIG)
+def calc_far_field(  # noqa: D103
+    targets: numba.complex128[:],
+    far_ptr: numba.int64[:],
+    far_nodes: numba.int64[:],
+    centers: numba.complex128[:],
+    moments: numba.complex128[:, :, :],
+) -> numba.complex128[:, :]:
+    """Evaluates the multipole expansions of the far-field clusters.
+
+    Args:
+        targets: Target points in complex notation
+        far_ptr: Start index of the far-field clusters of each target
+        far_nodes: Far-field clusters of all targets
+        centers: Cluster centers in complex notation
+        moments: Multipole moments of each cluster
+
+    Returns:
+        The sum of a_k / (z - z_c)^(k + 1) over all far-field clusters,
+        with shape (n_targets, m).
+    """
+    n_targets = targets.shape[0]
+    _, n_terms, m = moments.shape
+
+    w = np.zeros((n_targets, m), dtype=np.complex128)
+
+    for i in numba.prange(n_targets):
+        for p in range(far_ptr[i], far_ptr[i + 1]):
+            node = far_nodes[p]
+            inv_dz = 1.0 / (targets[i] - centers[node])
+            term = inv_dz
+            for k in range(n_terms):
+                for c in range(m):
+                    w[i, c] += moments[node, k, c] * term
+                term *= inv_dz
+
+    return w
+
+
+class MultipoleTree:
+    """Multipole accelerated influence of a set of panel elements.
+
+    The elements are either straight panels with a constant or linear
+    vortex strength, or point vortices when ``lengths`` is None. Each
+    element depends on two degrees of freedom of the strength vector x,
+    ``dofs[j, 0]`` at the start and ``dofs[j, 1]`` at the end of the
+    element. Constant strength elements use the first only.
+
+    Args:
+        start_pts: Start nodes (points) of all elements
+        end_pts: End nodes (points) of all elements
+        lengths: Lengths of all elements as a column vector, or None
+            for point vortices
+        dofs: Indices in x of the strength at the start and end of each
+            element with shape (n_elements, 2)
+        linear: Sets if the strength varies linearly along an element
+        prefactor: Complex prefactor c of the induced velocity
+        pair_coefficients: Exact near-field influence kernel of the
+            panel method. Refer to :py:data:`PairCoefficients`.
+        target_pts: Collocation points of the panel method
+        target_angles: Panel angles in SI radian at the collocation
+            points as a column vector
+        order: Highest power of the multipole expansion. Defaults to 16.
+        opening_angle: Maximum ratio of cluster radius to target
+            distance for which the expansion is used. Defaults to 0.5.
+        leaf_size: Maximum number of elements in a leaf cluster.
+            Defaults to 16.
+    """
+
+    def __init__(
+        self,
+        start_pts: np.ndarray,
+        end_pts: np.ndarray,
+        lengths: Optional[np.ndarray],
+        dofs: np.ndarray,
+        linear: bool,
+        prefactor: complex,
+        pair_coefficients: PairCoefficients,
+        target_pts: np.ndarray,
+        target_angles: np.ndarray,
+        order: int = 16,
+        opening_angle: float = 0.5,
+        leaf_size: int = 16,
+    ):
+        start_pts = np.asarray(start_pts, dtype=np.float64)
+        end_pts = np.asarray(end_pts, dtype=np.float64)
+        self.dofs = np.asarray(dofs, dtype=np.int64)
+        self.prefactor = prefactor
+        self.pair_coefficients = pair_coefficients
+        self.target_pts = np.asarray(target_pts, dtype=np.float64)
+        self.target_angles = np.asarray(target_angles, dtype=np.float64)
+        self.order = order
+        self.opening_angle = opening_angle
+        self.tree = build_cluster_tree(start_pts, end_pts, leaf_size)
+
+        # Point sources that reproduce the moments of each element up to
+        # the expansion order, the strength is at most linear
+        if lengths is None:
+            t, w = np.zeros(1), np.ones(1)
+            scales = np.ones((self.dofs.shape[0], 1))
+        else:
+            t, w = gauss_legendre((order + 3) // 2)
+            scales = np.asarray(lengths, dtype=np.float64)
+        start = start_pts[:, 0] + 1j * start_pts[:, 1]
+        end = end_pts[:, 0] + 1j * end_pts[:, 1]
+        self.sources = start[:, None] + t[None, :] * (end - start)[:, None]
+        weights = np.zeros((self.dofs.shape[0], t.size, 2))
+        if linear:
+            weights[..., 0] = scales * w * (1 - t)
+            weights[..., 1] = scales * w * t
+        else:
+            weights[..., 0] = scales * w
+        self.weights = weights
+
+    @property
+    def n_elements(self) -> int:
+        """Returns the number of elements in the tree."""
+        return self.dofs.shape[0]
+
+    def interactions(
+        self, target_pts: np.ndarray, on_body: bool
+    ) -> Dict[str, np.ndarray]:
+        """Calculates the far-field lists and near-field matrices.
+
+        Args:
+            target_pts: Points at which the influence is evaluated
+            on_body: Sets if ``target_pts`` are the collocation points,
+                otherwise the targets are treated as off-body points
+
+        Returns:
+            Far-field clusters of each target and the sparse near-field
+            normal and tangent influence matrices.
+        """
+        targets = target_pts[:, 0] + 1j * target_pts[:, 1]
+        lists = calc_interaction_lists(
+            targets,
+            self.tree["ranges"],
+            self.tree["children"],
+            self.tree["centers"],
+            self.tree["radii"],
+            self.opening_angle,
+            self.tree["depth"],
+        )
+        far_ptr, far_nodes, near_targets, near_elements = lists
+        near_normal, near_tangent = self.near_field(
+            near_targets, near_elements, target_pts, on_body
+        )
+        return {
+            "targets": targets,
+            "far_ptr": far_ptr,
+            "far_nodes": far_nodes,
+            "near_normal": near_normal,
+            "near_tangent": near_tangent,
+        }
+
+    def near_field(
+        self,
+        targets: np.ndarray,
+        elements: np.ndarray,
+        target_pts: np.ndarray,
+        on_body: bool,
+    ) -> Tuple[csr_matrix, csr_matrix]:
+        """Assembles the exact influence of the ``elements`` on targets.
+
+        Args:
+            targets: Target index of each interaction
+            elements: Element index of each interaction
+            target_pts: Points at which the influence is evaluated
+            on_body: Refer to :py:meth:`interactions`
+
+        Returns:
+            Sparse normal and tangent influence matrices with shape
+            (n_targets, n_dofs).
+        """
+        shape = (target_pts.shape[0], int(self.dofs.max()) + 1)
+        coefficients = self.pair_coefficients(
+            targets, elements, target_pts, on_body
+        )
+        rows = np.concatenate((targets, targets))
+        cols = np.concatenate((self.dofs[elements, 0], self.dofs[elements, 1]))
+        # Duplicate entries of the start and end dofs are summed
+        return tuple(
+            csr_matrix((coefficients[c].ravel(), (rows, cols)), shape=shape)
+            for c in range(2)
+        )
+
+    @cached_property
+    def collocation_interactions(self) -> Dict[str, np.ndarray]:
+        """Interactions with the collocation points of the method."""
+        return self.interactions(self.target_pts, on_body=True)
+
+    def moments(self, x: np.ndarray) -> np.ndarray:
+        """Multipole moments of all clusters for strengths ``x``."""
+        x_elements = x[self.dofs]  # Shape (n_elements, 2, m)
+        strengths = np.einsum("jgd,jdm->jgm", self.weights, x_elements)
+        return calc_multipole_moments(
+            np.ascontiguousarray(strengths),
+            self.sources,
+            self.tree["ranges"],
+            self.tree["children"],
+            self.tree["centers"],
+            self.order,
+        )
+
+    def evaluate(
+        self,
+        x: np.ndarray,
+        interactions: Dict[str, np.ndarray],
+        target_angles: np.ndarray,
+    ) -> np.ndarray:
+        """Evaluates the normal and tangent influence of ``x``.
+
+        Args:
+            x: Strengths of the elements with shape (n_dofs, m)
+            interactions: Refer to :py:meth:`interactions`
+            target_angles: Angle of the normal and tangent directions at
+                the targets as a column vector
+
+        Returns:
+            Normal and tangent influence with shape (2, n_targets, m).
+        """
+        w = self.prefactor * calc_far_field(
+            interactions["targets"],
+            interactions["far_ptr"],
+            interactions["far_nodes"],
+            self.tree["centers"],
+            self.moments(x),
+        )
+        # Projecting u - iv onto the tangent and normal, n = i * t
+        tangents = np.exp(1j * target_angles)
+        products = np.stack(
+            (np.real(w * 1j * tangents), np.real(w * tangents))
+        )
+        products[0] += interactions["near_normal"] @ x
+        products[1] += interactions["near_tangent"] @ x
+        return products
+
+    def products(self, x: np.ndarray) -> np.ndarray:
+        """Normal and tangent influence of ``x`` on collocation points.
+
+        Args:
+            x: Strengths of the elements with shape (n_dofs, m)
+
+        Returns:
+            Influence of ``x`` with shape (2, n_targets, m).
+        """
+        return self.evaluate(
+            x, self.collocation_interactions, self.target_angles
+        )
+
+    def velocities_at(self, points: np.ndarray, x: np.ndarray) -> np.ndarray:
+        """Velocities induced by ``x`` at off-body ``points``.
+
+        Args:
+            points: Field points as a set of row vectors
+            x: Strengths of the elements with shape (n_dofs, m)
+
+        Returns:
+            Induced velocity vectors with shape (n_points, 2, m).
+        """
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        interactions = self.interactions(points, on_body=False)
+        # Off-body normal and tangent directions are the y and x axes
+        normal, tangent = self.evaluate(
+            x, interactions, np.zeros((points.shape[0], 1))
+        )
+        return np.stack((tangent, normal), axis=1)
+
+
+def direct_velocities(
+    pair_coefficients: PairCoefficients,
+    dofs: np.ndarray,
+    points: np.ndarray,
+    x: np.ndarray,
+) -> np.ndarray:
+    """Velocities induced by ``x`` at off-body ``points``.
+
+    All interactions are evaluated with the exact kernel, hence this
+    requires O(N * n_points) operations and memory.
+
+    Args:
+        pair_coefficients: Exact influence kernel of the panel method
+        dofs: Refer to :py:class:`MultipoleTree`
+        points: Field points as a set of row vectors
+        x: Strengths of the elements with shape (n_dofs, m)
+
+    Returns:
+        Induced velocity vectors with shape (n_points, 2, m).
+    """
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    n_points, n_elements = points.shape[0], dofs.shape[0]
+    targets = np.repeat(np.arange(n_points), n_elements)
+    elements = np.tile(np.arange(n_elements), n_points)
+    coefficients = pair_coefficients(targets, elements, points, False)
+    coefficients = coefficients.reshape(2, 2, n_points, n_elements)
+
+    velocities = np.zeros((n_points, 2, x.shape[1]), dtype=np.float64)
+    for d in range(2):
+        # Off-body normal and tangent directions are the y and x axes
+        velocities[:, 1] += coefficients[0, d] @ x[dofs[:, d]]
+        velocities[:, 0] += coefficients[1, d] @ x[dofs[:, d]]
+    return velocities
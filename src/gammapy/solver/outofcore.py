@@ -0,0 +1,182 @@
+# Copyright 2020 Kilian Swannet, San Kilkis
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied. See the License for the specific language governing
+# permissions and limitations under the License.
+
+"""Contains an out-of-core LU factorization of memory-mapped matrices.
+
+For a large number of panels the dense influence matrices no longer fit
+in memory. These are then stored in :py:class:`numpy.memmap` backed
+files and factorized with a left-looking blocked LU factorization. Only
+a single panel of ``block_size`` columns is factorized in memory at a
+time, after it is updated with the previously factorized panels that
+are streamed from disk. Therefore, the memory requirement is O(N b)
+for a block size b instead of O(N^2).
+
+Rows are never moved on disk. Instead, the factors are stored at the
+original row index and the partial pivoting is tracked with a single
+row permutation, which is applied while reading a panel.
+"""
+
+import os
+from typing import Dict
+
+import numpy as np
+from scipy.linalg import get_lapack_funcs, solve_triangular
+
+# Number of columns of a panel factorized in memory
+LU_BLOCK_SIZE = 256
+
+
+def open_memmaps(
+    directory: str, shapes: Dict[str, tuple]
+) -> Dict[str, np.memmap]:
+    """Creates float64 ``.npy`` memory-mapped files in ``directory``.
+
+    Args:
+        directory: Existing directory in which the files are created
+        shapes: Shape of each array, the keys are used as file names
+
+    Returns:
+        The memory-mapped arrays with the same keys as ``shapes``.
+    """
+    return {
+        name: np.lib.format.open_memmap(
+            os.path.join(directory, f"{name}.npy"),
+            mode="w+",
+            dtype=np.float64,
+            shape=shape,
+        )
+        for name, shape in shapes.items()
+    }
+
+
+def stream_rows(
+    matrix: np.ndarray,
+    x: np.ndarray,
+    block_size: int = LU_BLOCK_SIZE,
+) -> np.ndarray:
+    """Multiplies ``matrix`` with ``x`` while reading blocks of rows.
+
+    Args:
+        matrix: Matrix with shape (m, n), which can be memory-mapped
+        x: Array with shape (n,) or (n, k)
+        block_size: Number of rows read at once
+
+    Returns:
+        The product with shape (m,) or (m, k).
+    """
+    product = np.empty((matrix.shape[0], *x.shape[1:]), dtype=np.float64)
+    for start in range(0, matrix.shape[0], block_size):
+        stop = start + block_size
+        product[start:stop] = np.asarray(matrix[start:stop]) @ x
+    return product
+
+
+class OutOfCoreLU:
+    """Left-looking blocked LU factorization with partial pivoting.
+
+    The factorization is performed in-place, hence ``matrix`` contains
+    the unit lower and upper triangular factors afterwards, stored at
+    the original row index such that P A = L U for the row permutation
+    :py:attr:`permutation`.
+
+    Args:
+        matrix: Square (memory-mapped) matrix which is overwritten
+        block_size: Number of columns factorized in memory at once.
+            Defaults to :py:data:`LU_BLOCK_SIZE`.
+    """
+
+    def __init__(self, matrix: np.ndarray, block_size: int = LU_BLOCK_SIZE):
+        self.matrix = matrix
+        self.size = matrix.shape[0]
+        self.block_size = block_size
+        self.permutation = np.arange(self.size)
+        self.factorize()
+
+    @property
+    def blocks(self) -> range:
+        """Returns the first column of each panel."""
+        return range(0, self.size, self.block_size)
+
+    def read_panel(
+        self, start: int, stop: int, rows: slice = slice(None)
+    ) -> np.ndarray:
+        """Reads columns ``start`` to ``stop`` in the pivoted row order.
+
+        Only the pivoted ``rows`` are read, which defaults to all rows.
+        """
+        return self.matrix[self.permutation[rows], start:stop]
+
+    def factorize(self) -> None:
+        """Factorizes all panels from left to right."""
+        getrf = get_lapack_funcs("getrf", dtype=np.float64)
+        for start in self.blocks:
+            stop = min(start + self.block_size, self.size)
+            panel = self.read_panel(start, stop)
+
+            # Applying the updates of all previously factorized panels
+            for prev in range(0, start, self.block_size):
+                prev_stop = prev + self.block_size
+                factors = self.read_panel(prev, prev_stop, slice(prev, None))
+                panel[prev:prev_stop] = solve_triangular(
+                    factors[: self.block_size],
+                    panel[prev:prev_stop],
+                    lower=True,
+                    unit_diagonal=True,
+                    check_finite=False,
+                )
+                panel[prev_stop:] -= (
+                    factors[self.block_size :] @ panel[prev:prev_stop]
+                )
+
+            # Factorizing the remaining tall part of the panel
+            lu, pivots, info = getrf(panel[start:], overwrite_a=True)
+            if info > 0:
+                raise np.linalg.LinAlgError("Matrix is singular")
+            panel[start:] = lu
+            rows = self.permutation[start:]
+            for i, p in enumerate(pivots):
+                rows[[i, p]] = rows[[p, i]]
+            self.matrix[self.permutation, start:stop] = panel
+        if isinstance(self.matrix, np.memmap):
+            self.matrix.flush()
+
+    def solve(self, rhs: np.ndarray) -> np.ndarray:
+        """Solves the system for ``rhs`` with shape (N,) or (N, m).
+
+        The factors are streamed from disk once per solve, a panel at a
+        time.
+        """
+        solution = rhs.reshape(self.size, -1)[self.permutation]
+        for start in self.blocks:
+            stop = start + self.block_size
+            factors = self.read_panel(start, stop, slice(start, None))
+            solution[start:stop] = solve_triangular(
+                factors[: self.block_size],
+                solution[start:stop],
+                lower=True,
+                unit_diagonal=True,
+                check_finite=False,
+            )
+            solution[stop:] -= (
+                factors[self.block_size :] @ solution[start:stop]
+            )
+
+        for start in reversed(self.blocks):
+            stop = start + self.block_size
+            factors = self.read_panel(start, stop, slice(stop))
+            solution[start:stop] = solve_triangular(
+                factors[start:stop], solution[start:stop], check_finite=False
+            )
+            solution[:start] -= factors[:start] @ solution[start:stop]
+        return solution.reshape(rhs.shape)
@@ -0,0 +1,76 @@
+# Copyright 2020 Kilian Swannet, San Kilkis
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied. See the License for the specific language governing
+# permissions and limitations under the License.
+
+"""Contains low-rank updates of an already factorized linear system.
+
+A local change of the panel geometry, such as a flap deflection, only
+changes the rows and columns of the influence matrix that belong to the
+moved panels. The updated matrix is therefore A + U @ V.T, where the
+rank k of the update is the number of changed rows and columns. The
+Sherman-Morrison-Woodbury identity::
+
+    (A + U V^T)^-1 = A^-1 - A^-1 U (I + V^T A^-1 U)^-1 V^T A^-1
+
+solves the updated system with the existing solver of A and a small
+k x k capacitance matrix. This costs O(k N^2) instead of the O(N^3) of
+a new factorization.
+"""
+
+from typing import Callable
+
+import numpy as np
+from scipy.linalg import lu_factor, lu_solve
+
+
+class LowRankUpdate:
+    """Solver of the system A + ``u`` @ ``v``.T.
+
+    Args:
+        solve: Solves the original system A x = b for a Right-Hand-Side
+            with shape (N,) or (N, m)
+        u: Left factor of the update with shape (N, k)
+        v: Right factor of the update with shape (N, k)
+    """
+
+    def __init__(
+        self,
+        solve: Callable[[np.ndarray], np.ndarray],
+        u: np.ndarray,
+        v: np.ndarray,
+    ):
+        self.base_solve = solve
+        self.u, self.v = u, v
+        # A^-1 U is reused by all later solves
+        self.solved_u = solve(u)
+        capacitance = np.eye(self.rank) + v.T @ self.solved_u
+        self.capacitance_factors = lu_factor(capacitance, check_finite=False)
+
+    @property
+    def rank(self) -> int:
+        """Returns the rank k of the update."""
+        return self.u.shape[1]
+
+    def solve(self, rhs: np.ndarray) -> np.ndarray:
+        """Solves the updated system for ``rhs``, shape (N,) or (N, m).
+
+        Only a solve of the original system and O(k N) operations are
+        required per Right-Hand-Side.
+        """
+        rhs_2d = rhs.reshape(rhs.shape[0], -1)
+        solution = self.base_solve(rhs_2d)
+        correction = lu_solve(
+            self.capacitance_factors, self.v.T @ solution, check_finite=False
+        )
+        solution -= self.solved_u @ correction
+        return solution.reshape(rhs.shape)
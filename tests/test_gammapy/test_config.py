@@ -0,0 +1,118 @@
+# Copyright 2020 Kilian Swannet, San Kilkis
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied. See the License for the specific language governing
+# permissions and limitations under the License.
+
+import os
+
+import numba
+import numpy as np
+import pytest
+
+from gammapy import config
+from gammapy.geometry.airfoil import NACA4Airfoil
+from gammapy.solver.m_linear_vortex import LinearVortex
+
+AIRFOIL = NACA4Airfoil("2412")
+
+
+@pytest.fixture(autouse=True)
+def clear_env(monkeypatch):
+    """Removes thread limits of the environment running the tests."""
+    monkeypatch.delenv(config.NUMBA_THREADS_ENV, raising=False)
+    monkeypatch.delenv(config.BLAS_THREADS_ENV, raising=False)
+
+
+def test_numba_threads():
+    """Tests that the numba thread limit is restored on exit."""
+    previous = numba.get_num_threads()
+    with config.threads(numba_threads=1) as budget:
+        assert numba.get_num_threads() == 1
+        assert budget["numba_threads"] == 1
+        assert budget["pid"] == os.getpid()
+        # Nested contexts inherit the limits of the enclosing context
+        with config.threads() as inner_budget:
+            assert inner_budget["numba_threads"] == 1
+    assert numba.get_num_threads() == previous
+
+
+@pytest.mark.parametrize("numba_threads", [0, -1, "max"])
+def test_invalid_numba_threads(numba_threads):
+    """Tests that limits outside of the numba thread pool raise."""
+    if numba_threads == "max":
+        numba_threads = numba.config.NUMBA_NUM_THREADS + 1
+    with pytest.raises(ValueError):
+        with config.threads(numba_threads=numba_threads):
+            pass
+
+
+def test_env_threads(monkeypatch):
+    """Tests that limits are read from the environment variables."""
+    monkeypatch.setenv(config.NUMBA_THREADS_ENV, "1")
+    with config.threads() as budget:
+        assert budget["numba_threads"] == 1
+
+    monkeypatch.setenv(config.NUMBA_THREADS_ENV, "one")
+    with pytest.raises(ValueError):
+        with config.threads():
+            pass
+
+
+def test_blas_threads():
+    """Tests the BLAS limit, which requires threadpoolctl."""
+    if config.threadpoolctl is None:
+        with pytest.raises(ImportError):
+            with config.threads(blas_threads=1):
+                pass
+    else:
+        with config.threads(blas_threads=1) as budget:
+            assert budget["blas_threads"] in (1, None)
+
+
+@pytest.mark.parametrize("superposition", [False, True])
+def test_solution_metadata(superposition):
+    """Tests that the thread budget of a solve is reported."""
+    method = LinearVortex(AIRFOIL, n_panels=40)
+    with config.threads(numba_threads=1):
+        solution = method.solve_for(5, superposition=superposition)
+    budget = solution.metadata["threads"]
+    assert budget["pid"] == os.getpid()
+    assert budget["numba_threads"] == 1
+    if superposition:
+        # The cached metadata of the basis solution is left untouched
+        assert "threads" not in method.basis_solution[1]
+
+
+@numba.njit
+def kernel_threads(x):
+    """Returns the number of numba threads seen by a kernel."""
+    return numba.get_num_threads() + 0 * x
+
+
+def test_limit_numba_threads(monkeypatch):
+    """Tests that the environment limit applies to lazy kernels."""
+    previous = numba.get_num_threads()
+    method = LinearVortex(AIRFOIL, n_panels=40)
+    monkeypatch.setenv(config.NUMBA_THREADS_ENV, "1")
+    assert method.kernel(kernel_threads)(0) == 1
+    assert config.limit_numba_threads(numba.get_num_threads)() == 1
+    assert numba.get_num_threads() == previous
+
+    # Tangent velocities of the pressure coefficients run lazily
+    solution = method.solve_for(5)
+    assert solution.metadata["threads"]["numba_threads"] == 1
+    monkeypatch.setattr(
+        method,
+        "kernel_products",
+        lambda x: np.full((2, 40, x.shape[1]), numba.get_num_threads()),
+    )
+    assert np.all(solution.normalized_induced_velocities == 1)
@@ -266,6 +266,43 @@ class TestNACA4Airfoil:
         else:
             assert airfoil.half_thickness_at(1) != 0
 
+    @pytest.mark.parametrize("name", ["naca2412", "naca4415"])
+    @pytest.mark.parametrize("upper", [True, False])
+    def test_surface_derivatives_at(self, name, upper):
+        """Tests the shape derivatives against finite differences."""
+        airfoil = self.test_class(name)
+        # The camber slope is not differentiable w.r.t. p at x = p
+        x = np.linspace(0, 1, num=20)
+        result = airfoil.surface_derivatives_at(x, upper)
+
+        step = 1e-6
+        surface_at = "upper_surface_at" if upper else "lower_surface_at"
+        for idx, parameter in enumerate(airfoil.PARAMETERS):
+            value = getattr(airfoil, parameter)
+            setattr(airfoil, parameter, value + step)
+            forward = getattr(airfoil, surface_at)(x)
+            setattr(airfoil, parameter, value - step)
+            backward = getattr(airfoil, surface_at)(x)
+            setattr(airfoil, parameter, value)
+            expected = (forward - backward) / (2 * step)
+            assert np.allclose(result[..., idx], expected, atol=1e-8)
+
+    @pytest.mark.parametrize("upper", [True, False])
+    def test_surface_derivatives_at_symmetric(self, upper):
+        """Tests the derivatives of "0012" as the limit p -> 0."""
+        x = np.linspace(0, 1, num=21)
+        airfoil = self.test_class("naca0012")
+        result = airfoil.surface_derivatives_at(x, upper)
+        assert np.all(np.isfinite(result))
+
+        # Maximum ordinate just aft of the LE, the camber line is then
+        # close to y_c = m (1 - x^2) on all points but the LE
+        airfoil.camber_location = 1e-9
+        expected = airfoil.surface_derivatives_at(x, upper)
+        assert np.allclose(result, expected, atol=1e-8)
+        assert np.allclose(result[1:, 1, 0], 1 - x[1:] ** 2)
+        assert np.all(result[..., 1] == 0)
+
     PARSE_NACA_CODE_TEST_CASES = {
         "argnames": "code, expected_result",
         "argvalues": [
@@ -0,0 +1,183 @@
+# Copyright 2020 Kilian Swannet, San Kilkis
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied. See the License for the specific language governing
+# permissions and limitations under the License.
+
+import subprocess
+import sys
+
+import numba
+import numpy as np
+import pytest
+
+from gammapy import __main__ as cli
+from gammapy import jit
+from gammapy.geometry.airfoil import NACA4Airfoil
+from gammapy.solver.base import ThickFlowSolution
+from gammapy.solver.m_constant_vortex import (
+    ConstantVortex,
+    fill_constant_vortex_rows,
+)
+from gammapy.solver.m_linear_vortex import LinearVortex
+from gammapy.solver.m_lumped_vortex import LumpedVortex
+from gammapy.solver.m_quadratic_vortex import QuadraticVortex
+
+
+def scale_rows(x: numba.float64[:, :], row: int, factor: float) -> float:
+    """Returns the sum of ``row`` of ``x`` scaled by ``factor``."""
+    return x[row].sum() * factor
+
+
+@pytest.fixture
+def kernel(monkeypatch):
+    """Returns an eager kernel that isn't cached."""
+    monkeypatch.setattr(jit, "EAGER_KERNELS", [])
+    return jit.eager(numba.jit(nopython=True)(scale_rows))
+
+
+def test_annotated_signature():
+    """Tests that scalar annotations are converted to numba types."""
+    assert jit.annotated_signature(scale_rows) == (
+        numba.float64[:, :],
+        numba.int64,
+        numba.float64,
+    )
+    with pytest.raises(TypeError):
+        jit.annotated_signature(lambda x: x)
+
+
+def test_eager(kernel):
+    """Tests that arrays are converted instead of compiled."""
+    assert kernel.signatures == []
+    x = np.arange(12, dtype=np.float64).reshape(3, 4)
+    assert kernel(x, 1, 2) == 44
+    assert kernel.signatures == [jit.annotated_signature(scale_rows)]
+    assert kernel(x[:, ::2], np.int32(1), 1.0) == 10
+    assert len(kernel.signatures) == 1
+
+
+def test_eager_without_jit():
+    """Tests that plain Python functions are returned unchanged."""
+    assert jit.eager(scale_rows) is scale_rows
+
+
+def test_kernels_not_recompiled():
+    """Tests that solving doesn't compile additional kernels."""
+    for method_cls in (
+        LumpedVortex,
+        ConstantVortex,
+        LinearVortex,
+        QuadraticVortex,
+    ):
+        method = method_cls(NACA4Airfoil("2412"), n_panels=40)
+        solution = method.solve_for(5)
+        if isinstance(solution, ThickFlowSolution):
+            solution.pressure_coefficients
+        method.influence_entries([0, 1], [1, 0])
+    assert jit.EAGER_KERNELS
+    assert all(len(k.signatures) <= 1 for k in jit.EAGER_KERNELS)
+    assert fill_constant_vortex_rows.signatures == [
+        jit.annotated_signature(fill_constant_vortex_rows.py_func)
+    ]
+
+
+def test_eager_import():
+    """Tests that importing the kernel modules doesn't compile."""
+    code = (
+        "import sys; import gammapy.solver; from gammapy import jit; "
+        "sys.exit(any(k.signatures for k in jit.EAGER_KERNELS))"
+    )
+    assert subprocess.run([sys.executable, "-c", code]).returncode == 0
+
+
+def test_cache_report():
+    """Tests that all kernel modules are reported."""
+    report = jit.cache_report()
+    assert set(report.values()) <= {"cached", "compiled"}
+    for module in jit.KERNEL_MODULES:
+        assert any(name.startswith(module) for name in report)
+
+
+def test_check_cache(kernel):
+    """Tests that compiled kernels are reported with a warning."""
+    with pytest.warns(RuntimeWarning, match="scale_rows"):
+        report = jit.check_cache()
+    assert report[jit.kernel_name(kernel)] == "compiled"
+
+
+@pytest.mark.parametrize("check, expected_status", [(False, 0), (True, 1)])
+def test_warmup_command(kernel, check, expected_status, capsys):
+    """Tests that the check fails if a kernel was compiled."""
+    argv = ["warmup", "--verbose"] + ["--check"] * check
+    assert cli.main(argv) == expected_status
+    output = capsys.readouterr().out
+    assert "compiled  tests.test_gammapy.test_jit.scale_rows" in output
+    assert "0 of 1 kernels loaded from the cache" in output
+
+
+@pytest.mark.parametrize("profile", ["strict", "checked"])
+@pytest.mark.parametrize("method_cls", [ConstantVortex, LinearVortex])
+def test_profiles(method_cls, profile):
+    """Tests that the profiles agree with the fast-math kernels."""
+    fast = method_cls(NACA4Airfoil("2412"), n_panels=40)
+    method = method_cls(NACA4Airfoil("2412"), n_panels=40, profile=profile)
+    expected = fast.assemble(tangent=True)
+    for backend in ("numba", "tiled"):
+        result = method.assemble(tangent=True, backend=backend)
+        for name in expected:
+            assert np.allclose(result[name], expected[name], atol=1e-12)
+    assert np.allclose(
+        method.solve_for(5).lift_coefficient,
+        fast.solve_for(5).lift_coefficient,
+    )
+
+
+def test_profile_variants():
+    """Tests that each profile compiles separate kernel variants."""
+    strict = jit.profiled(fill_constant_vortex_rows, "strict")
+    assert jit.profiled(fill_constant_vortex_rows) is fill_constant_vortex_rows
+    assert jit.profiled(fill_constant_vortex_rows, "strict") is strict
+    assert strict.py_func.__qualname__ == "fill_constant_vortex_rows__strict"
+    assert strict.targetoptions["fastmath"] is False
+
+    # Callees of the kernel are compiled with the same profile
+    callee = strict.py_func.__globals__["fill_constant_vortex_row"]
+    assert callee.py_func.__qualname__ == "fill_constant_vortex_row__strict"
+
+    with pytest.raises(ValueError):
+        jit.profiled(fill_constant_vortex_rows, "unsafe")
+    with pytest.raises(ValueError):
+        ConstantVortex(NACA4Airfoil("2412"), n_panels=40, profile="unsafe")
+
+
+def test_checked_profile():
+    """Tests that non-finite values raise a FloatingPointError."""
+    method = ConstantVortex(NACA4Airfoil("2412"), 40, profile="checked")
+    solution = method.solve_for(5)
+    assert np.all(np.isfinite(solution.velocities_at([[2.0, 0.0]])))
+
+    # The singular velocity at a panel node isn't finite
+    with pytest.raises(FloatingPointError):
+        solution.velocities_at(method.panels.nodes[0][3:4])
+
+
+def test_kernel_reference():
+    """Tests that profiled kernels are loaded by their reference."""
+    strict = jit.profiled(fill_constant_vortex_rows, "strict")
+    reference = jit.kernel_reference(strict)
+    assert reference == (
+        "gammapy.solver.m_constant_vortex",
+        "fill_constant_vortex_rows",
+        "strict",
+    )
+    assert jit.load_kernel(*reference) is strict
+    assert jit.kernel_reference(fill_constant_vortex_rows)[2] == "fast"
@@ -0,0 +1,160 @@
+# Copyright 2020 Kilian Swannet, San Kilkis
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied. See the License for the specific language governing
+# permissions and limitations under the License.
+
+import numpy as np
+import pytest
+
+from gammapy import config
+from gammapy.geometry.airfoil import NACA4Airfoil
+from gammapy.solver import backends
+from gammapy.solver.m_constant_vortex import (
+    ConstantVortex,
+    fill_constant_vortex_rows,
+)
+from gammapy.solver.m_linear_vortex import LinearVortex
+from gammapy.solver.m_lumped_vortex import LumpedVortex
+from gammapy.solver.m_quadratic_vortex import QuadraticVortex
+from gammapy.solver.m_source_vortex import SourceVortex
+
+AIRFOIL = NACA4Airfoil("2412")
+METHODS = [LinearVortex, ConstantVortex, LumpedVortex]
+
+
+@pytest.fixture(autouse=True)
+def small_blocks(monkeypatch):
+    """Splits the rows into several blocks and tiles of the backends."""
+    monkeypatch.setattr(backends, "THREADED_BLOCK_SIZE", 16)
+    monkeypatch.setattr(backends, "TILE_ROWS", 8)
+    monkeypatch.setattr(backends, "TILE_BYTES", 8 * 8 * 2 * 24)
+    monkeypatch.delenv(config.BACKEND_ENV, raising=False)
+
+
+@pytest.mark.parametrize(
+    "backend", ["numpy", "threaded", "tiled", "nodal", "process"]
+)
+@pytest.mark.parametrize("method_cls", METHODS)
+def test_backend_agreement(method_cls, backend):
+    """Tests all backends against the numba kernels."""
+    method = method_cls(AIRFOIL, n_panels=80)
+    expected = method.assemble(tangent=True, backend="numba")
+    result = method.assemble(tangent=True, backend=backend)
+    for name in ("normal", "tangent"):
+        assert np.allclose(result[name], expected[name], rtol=0, atol=1e-12)
+
+    # Normal-only assembly leaves the tangent coefficients out
+    assert list(method.assemble(backend=backend)) == ["normal"]
+
+
+@pytest.mark.parametrize("backend", backends.BACKENDS)
+@pytest.mark.parametrize("method_cls", METHODS)
+def test_backend_solution(method_cls, backend):
+    """Tests that the backend of a method yields the same solution."""
+    expected = method_cls(AIRFOIL, n_panels=80).solve_for([0, 5])
+    solution = method_cls(AIRFOIL, n_panels=80, backend=backend).solve_for(
+        [0, 5]
+    )
+    assert np.allclose(solution.circulations, expected.circulations)
+
+
+@pytest.mark.parametrize("backend", backends.BACKENDS)
+@pytest.mark.parametrize("method_cls", [SourceVortex, QuadraticVortex])
+def test_numba_fallback(method_cls, backend):
+    """Tests that methods without a backend kernel use numba kernels."""
+    expected = method_cls(AIRFOIL, n_panels=40).solve_for(5)
+    with config.backend(backend):
+        solution = method_cls(AIRFOIL, n_panels=40).solve_for(5)
+        pressures = solution.pressure_coefficients
+    assert np.allclose(solution.circulations, expected.circulations)
+    assert np.allclose(pressures, expected.pressure_coefficients)
+
+
+def test_tile_shape():
+    """Tests that the output of a tile fills the configured bytes."""
+    assert backends.tile_shape(2) == (8, 24)
+    assert backends.tile_shape(1) == (8, 48)
+
+
+def test_influence_blocks():
+    """Tests that the out-of-core rows are filled by the backend."""
+    expected = LinearVortex(AIRFOIL, n_panels=80).influence_blocks([3, 80])
+    method = LinearVortex(AIRFOIL, n_panels=80, backend="numpy")
+    blocks = method.influence_blocks([3, 80])
+    for name in ("system", "tangent"):
+        assert np.allclose(blocks[name], expected[name], atol=1e-12)
+
+
+@pytest.mark.parametrize("profile", ["fast", "strict"])
+def test_process_backend(profile, monkeypatch):
+    """Tests that workers fill the shared memory of the matrices."""
+    monkeypatch.setattr(backends, "pool_size", lambda: 2)
+    method = LinearVortex(AIRFOIL, n_panels=80, profile=profile)
+    expected = method.assemble(tangent=True)
+    result = method.assemble(tangent=True, backend="process")
+    assert backends.SharedBlock.locate(result["tangent"]) is not None
+    for name in ("normal", "tangent"):
+        assert np.array_equal(result[name], expected[name])
+
+    # Other outputs are filled through a temporary shared block
+    out = np.zeros((1, 3, expected["normal"].shape[1]))
+    assert backends.SharedBlock.locate(out) is None
+    method.fill_influence_rows(out, [0, 40, 79], backend="process")
+    assert np.array_equal(out[0], expected["normal"][[0, 40, 79]])
+
+
+def test_configured_backend(monkeypatch):
+    """Tests the backend selection of the config and the environment."""
+    assert backends.get_kernel(ConstantVortex) is fill_constant_vortex_rows
+    with config.backend("numpy"):
+        assert backends.resolve_backend() == "numpy"
+        # A backend of the method or of the call takes precedence
+        assert backends.resolve_backend("numba") == "numba"
+    assert backends.resolve_backend() == "numba"
+
+    monkeypatch.setenv(config.BACKEND_ENV, "threaded")
+    assert backends.resolve_backend() == "threaded"
+
+
+def test_invalid_backend():
+    """Tests that an unknown backend raises a ValueError."""
+    with pytest.raises(ValueError):
+        LinearVortex(AIRFOIL, n_panels=80, backend="cuda")
+    with config.backend("cuda"):
+        with pytest.raises(ValueError):
+            LinearVortex(AIRFOIL, n_panels=80).influence_matrix
+
+
+def test_registered_backends():
+    """Tests that the threaded backend is derived from NumPy kernels."""
+    assert backends.registered_backends(LinearVortex) == backends.BACKENDS
+
+    # Methods without terms shared by adjacent panels use numba kernels
+    assert backends.get_kernel(LinearVortex, "nodal") is backends.get_kernel(
+        LinearVortex, "numba"
+    )
+
+    class CustomVortex(LinearVortex):
+        pass
+
+    # Specializations inherit the kernels of their base class
+    assert backends.get_kernel(CustomVortex, "numpy") is backends.get_kernel(
+        LinearVortex, "numpy"
+    )
+
+
+def test_shared_block_release():
+    """Tests that releasing an unlinked block doesn't raise."""
+    block = backends.SharedBlock((2, 3))
+    block.shm.unlink()
+    block.__del__()
+    assert block.array is None
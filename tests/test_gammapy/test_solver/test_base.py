@@ -17,7 +17,16 @@ import math
 import numpy as np
 import pytest
 
-from gammapy.solver.base import PanelMethod
+from gammapy.geometry.airfoil import NACA4Airfoil
+from gammapy.solver.base import FlowSolution, PanelMethod
+from gammapy.solver.m_linear_vortex import LinearVortex
+from gammapy.solver.m_lumped_vortex import LumpedVortex
+
+
+@pytest.fixture(scope="module")
+def naca2412():
+    """Returns a NACA2412 :py:class:`NACA4Airfoil` object."""
+    return NACA4Airfoil(naca_code="naca2412", te_closed=True)
 
 
 class TestPanelMethod:
@@ -35,6 +44,8 @@ class TestPanelMethod:
             ((5, "cosine"), np.array([0, 0.14644, 0.5, 0.85355, 1])),
             # Checking if linear spacing works with n_points = 5
             ((5, "linear"), np.array([0, 0.25, 0.5, 0.75, 1])),
+            # Checking if graded spacing refines the trailing edge
+            ((5, "graded"), np.array([0, 0.21142, 0.64645, 0.94396, 1])),
             # Checking if ValueError is raised with invalid spacing
             pytest.param(
                 (0, None), None, marks=pytest.mark.xfail(raises=ValueError)
@@ -48,7 +59,23 @@ class TestPanelMethod:
         result = PanelMethod.get_sample_parameters(*func_args)
         assert np.allclose(result, expected_result, atol=1e-5)
 
-    @pytest.mark.parametrize("attribute", ["airfoil", "n_panels", "spacing"])
+    @pytest.mark.parametrize(
+        "attribute",
+        [
+            "airfoil",
+            "n_panels",
+            "spacing",
+            "solver",
+            "preconditioner",
+            "tolerance",
+            "multipole_order",
+            "opening_angle",
+            "precision",
+            "storage_dir",
+            "backend",
+            "profile",
+        ],
+    )
     def test_settable(self, attribute, monkeypatch):
         """Tests that users can't set reserved attributes."""
         # Temporarily disable ABC module with monkeypatch
@@ -83,3 +110,55 @@ class TestPanelMethod:
         """Tests conversion of angles to velocity vectors."""
         result = PanelMethod.get_flow_direction(alpha)
         assert np.allclose(result, expected_result)
+
+    def test_lu_factors_reused(self, naca2412, monkeypatch):
+        """Tests that the influence matrix is only factorized once."""
+        method = LinearVortex(naca2412, n_panels=20)
+        alpha = [0, 5]
+        expected = np.linalg.solve(
+            method.influence_matrix,
+            method.unit_rhs_vector @ -method.get_flow_direction(alpha).T,
+        )
+        assert np.allclose(method.get_circulations(alpha), expected)
+
+        # Subsequent solves must only use the cached factorization
+        monkeypatch.setattr(
+            "gammapy.solver.base.lu_factor",
+            lambda *args, **kwargs: pytest.fail("Matrix refactorized"),
+        )
+        assert np.allclose(method.get_circulations(alpha), expected)
+        assert np.allclose(method.get_circulations(5), expected[:, 1:])
+
+    @pytest.mark.parametrize("method_cls", [LinearVortex, LumpedVortex])
+    def test_superposition(self, naca2412, method_cls):
+        """Tests that superimposed solutions match direct solutions."""
+        method = method_cls(naca2412, n_panels=20)
+        alpha = np.linspace(-5, 10, num=7)
+        direct = method.solve_for(alpha)
+        superimposed = method.solve_for(alpha, superposition=True)
+
+        assert superimposed.superposition and not direct.superposition
+        assert np.allclose(superimposed.circulations, direct.circulations)
+        assert np.allclose(
+            superimposed.lift_coefficient, direct.lift_coefficient
+        )
+        assert np.allclose(
+            superimposed.delta_pressure_coefficients,
+            direct.delta_pressure_coefficients,
+        )
+        if method_cls is LinearVortex:
+            assert np.allclose(
+                superimposed.pressure_coefficients,
+                direct.pressure_coefficients,
+            )
+            assert np.allclose(
+                superimposed.normalized_induced_velocities,
+                direct.normalized_induced_velocities,
+            )
+
+    def test_solution_requires_circulations(self, naca2412):
+        """Tests that a solution can't be created without strengths."""
+        with pytest.raises(ValueError):
+            FlowSolution(
+                method=LumpedVortex(naca2412, 10), circulations=None, alpha=0
+            )
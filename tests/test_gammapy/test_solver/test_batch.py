@@ -0,0 +1,73 @@
+# Copyright 2020 Kilian Swannet, San Kilkis
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied. See the License for the specific language governing
+# permissions and limitations under the License.
+
+import numpy as np
+import pytest
+
+from gammapy import config
+from gammapy.geometry.airfoil import NACA4Airfoil
+from gammapy.solver.batch import BatchPanelMethod
+from gammapy.solver.m_constant_vortex import ConstantVortex
+from gammapy.solver.m_linear_vortex import LinearVortex
+from gammapy.solver.m_lumped_vortex import LumpedVortex
+
+AIRFOILS = [NACA4Airfoil(code) for code in ("0012", "2412", "4415")]
+ALPHA = [-2, 0, 5]
+
+
+@pytest.mark.parametrize("method_cls", [LinearVortex, ConstantVortex])
+def test_batch_matches_individual(method_cls):
+    """Tests that a batched solve equals the individual solves."""
+    batch = BatchPanelMethod(AIRFOILS, n_panels=30, method=method_cls)
+    assert len(batch) == len(AIRFOILS)
+    assert batch.influence_tensor.shape == (3, 31, 31)
+
+    circulations = batch.get_circulations(ALPHA)
+    solutions = batch.solve_for(ALPHA)
+    superimposed = batch.solve_for(ALPHA, superposition=True)
+    for b, airfoil in enumerate(AIRFOILS):
+        method = method_cls(airfoil, n_panels=30)
+        assert np.allclose(batch.influence_tensor[b], method.influence_matrix)
+        expected = method.get_circulations(ALPHA)
+        assert np.allclose(circulations[b], expected)
+        assert np.allclose(solutions[b].circulations, expected[:-1])
+        assert np.allclose(superimposed[b].circulations, expected[:-1])
+
+
+@pytest.mark.parametrize("superposition", [False, True])
+def test_batch_metadata(superposition):
+    """Tests that batched solves report the thread budget."""
+    batch = BatchPanelMethod(AIRFOILS, n_panels=20)
+    with config.threads(numba_threads=1):
+        solutions = batch.solve_for(ALPHA, superposition=superposition)
+    for solution in solutions:
+        assert solution.metadata["batch_size"] == len(AIRFOILS)
+        assert solution.metadata["threads"]["numba_threads"] == 1
+
+
+def test_batch_populates_methods():
+    """Tests that the batched matrices are reused by each method."""
+    batch = BatchPanelMethod(AIRFOILS, n_panels=20)
+    tensor = batch.influence_tensor
+    for b, method in enumerate(batch.methods):
+        assert "influence_matrices" in vars(method)
+        assert np.shares_memory(method.influence_matrix, tensor)
+
+
+def test_batch_invalid_inputs():
+    """Tests that unsupported methods and empty batches are rejected."""
+    with pytest.raises(ValueError):
+        BatchPanelMethod(AIRFOILS, n_panels=20, method=LumpedVortex)
+    with pytest.raises(ValueError):
+        BatchPanelMethod([], n_panels=20)
@@ -0,0 +1,77 @@
+# Copyright 2020 Kilian Swannet, San Kilkis
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied. See the License for the specific language governing
+# permissions and limitations under the License.
+
+import numpy as np
+import pytest
+
+from gammapy.geometry.airfoil import NACA4Airfoil
+from gammapy.geometry.panel import Panel2D
+from gammapy.solver.m_constant_vortex import ConstantVortex
+from gammapy.solver.m_linear_vortex import LinearVortex
+from gammapy.solver.m_lumped_vortex import LumpedVortex
+
+AIRFOIL = NACA4Airfoil("2412")
+
+
+def system_arrays(method, nodes):
+    """Returns the system of ``method`` for panels through ``nodes``."""
+    perturbed = type(method)(method.airfoil, method.n_panels)
+    vars(perturbed)["panels"] = Panel2D(nodes)
+    return {
+        "normal": perturbed.influence_matrix,
+        "tangent": perturbed.assemble(tangent=True)["tangent"],
+        "rhs": perturbed.unit_rhs_vector,
+        "weights": perturbed.circulation_weights,
+    }
+
+
+@pytest.mark.parametrize("method_cls", [ConstantVortex, LinearVortex])
+def test_geometric_derivatives(method_cls):
+    """Tests the derivatives against central finite differences."""
+    method = method_cls(AIRFOIL, n_panels=20)
+    derivatives = method.geometric_derivatives(tangent=True)
+    start_pts, end_pts = method.panels.nodes
+    nodes = np.vstack((start_pts, end_pts[-1:]))
+
+    step = 1e-6
+    for k in range(nodes.size):
+        forward, backward = nodes.copy(), nodes.copy()
+        forward.flat[k] += step
+        backward.flat[k] -= step
+        forward = system_arrays(method, forward)
+        backward = system_arrays(method, backward)
+        for name, derivative in derivatives.items():
+            expected = (forward[name] - backward[name]) / (2 * step)
+            result = derivative[:, k].toarray().reshape(expected.shape)
+            assert np.allclose(result, expected, atol=1e-7)
+
+
+@pytest.mark.parametrize(
+    "method_cls, nodes_per_entry", [(ConstantVortex, 4), (LinearVortex, 5)]
+)
+def test_sparsity(method_cls, nodes_per_entry):
+    """Tests that each entry only depends on the nodes of its panels."""
+    method = method_cls(AIRFOIL, n_panels=40)
+    derivatives = method.geometric_derivatives()
+    assert "tangent" not in derivatives
+    n_entries = np.prod(method.influence_matrix.shape)
+    assert derivatives["normal"].shape == (n_entries, 2 * 41)
+    assert derivatives["normal"].nnz <= 2 * nodes_per_entry * n_entries
+    assert derivatives["rhs"].nnz == 2 * 2 * 2 * 40
+
+
+def test_not_implemented():
+    """Tests that methods without derivative kernels raise."""
+    with pytest.raises(NotImplementedError):
+        LumpedVortex(AIRFOIL, n_panels=40).geometric_derivatives()
@@ -0,0 +1,98 @@
+# Copyright 2020 Kilian Swannet, San Kilkis
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied. See the License for the specific language governing
+# permissions and limitations under the License.
+
+import numpy as np
+import pytest
+
+from gammapy.geometry.airfoil import NACA4Airfoil
+from gammapy.solver.hmatrix import HMatrix, adaptive_cross_approximation
+from gammapy.solver.m_constant_vortex import ConstantVortex
+from gammapy.solver.m_linear_vortex import LinearVortex
+from gammapy.solver.m_lumped_vortex import LumpedVortex
+
+AIRFOIL = NACA4Airfoil("2412")
+ALPHA = [0, 5]
+
+
+def smooth_kernel(rows: np.ndarray, cols: np.ndarray) -> np.ndarray:
+    """Logarithmic kernel of points on a circle shifted apart."""
+    theta = np.linspace(0, 2 * np.pi, 400, endpoint=False)
+    z = np.exp(1j * theta)
+    return np.log(np.abs(z[rows] - 3 - z[cols]))
+
+
+def test_adaptive_cross_approximation():
+    """Tests that a smooth block is approximated with a low rank."""
+    rows, cols = np.meshgrid(np.arange(400), np.arange(400), indexing="ij")
+    block = smooth_kernel(rows, cols)
+    u, v = adaptive_cross_approximation(
+        get_row=lambda i: block[i],
+        get_col=lambda j: block[:, j],
+        shape=block.shape,
+        tolerance=1e-10,
+    )
+    assert u.shape[1] < 40
+    error = np.linalg.norm(u @ v.T - block)
+    assert error < 1e-9 * np.linalg.norm(block)
+
+
+@pytest.mark.parametrize(
+    "method_cls", [LinearVortex, ConstantVortex, LumpedVortex]
+)
+def test_compression(method_cls):
+    """Tests the compressed matrix against the dense matrix."""
+    expected = method_cls(AIRFOIL, n_panels=300).influence_matrix
+    method = method_cls(
+        AIRFOIL, n_panels=300, solver="hmatrix", tolerance=1e-8
+    )
+    matrix = method.hierarchical_matrix
+    dense = matrix.matvec(np.eye(matrix.size))
+    error = np.linalg.norm(dense - expected)
+    assert error < 1e-7 * np.linalg.norm(expected)
+    assert matrix.nbytes < expected.nbytes
+
+    # Compression never assembles the dense influence matrices
+    assert "influence_matrices" not in vars(method)
+
+
+@pytest.mark.parametrize(
+    "method_cls", [LinearVortex, ConstantVortex, LumpedVortex]
+)
+def test_hierarchical_solve(method_cls):
+    """Tests the hierarchical LU solve against the direct solve."""
+    expected = method_cls(AIRFOIL, n_panels=300).solve_for(ALPHA)
+    method = method_cls(
+        AIRFOIL, n_panels=300, solver="hmatrix", tolerance=1e-8
+    )
+    solution = method.solve_for(ALPHA)
+    assert np.allclose(
+        solution.lift_coefficient, expected.lift_coefficient, atol=1e-6
+    )
+
+    metadata = solution.metadata
+    assert metadata["solver"] == "hmatrix"
+    assert metadata["max_rank"] > 0
+    assert 0 < metadata["compression"] < 1
+    assert np.all(np.array(metadata["residuals"]) < 1e-6)
+
+
+def test_factorized_matvec():
+    """Tests that the factors are not mistaken for the matrix."""
+    matrix = HMatrix(smooth_kernel, size=400, leaf_size=32)
+    factors = matrix.lu()
+    assert not matrix.factorized
+    with pytest.raises(RuntimeError):
+        factors.matvec(np.ones(400))
+    with pytest.raises(RuntimeError):
+        matrix.solve(np.ones(400))
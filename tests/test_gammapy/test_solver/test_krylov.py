@@ -0,0 +1,95 @@
+# Copyright 2020 Kilian Swannet, San Kilkis
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied. See the License for the specific language governing
+# permissions and limitations under the License.
+
+import numpy as np
+import pytest
+
+from gammapy.geometry.airfoil import NACA4Airfoil
+from gammapy.solver.m_constant_vortex import ConstantVortex
+from gammapy.solver.m_linear_vortex import LinearVortex
+from gammapy.solver.m_lumped_vortex import LumpedVortex
+
+AIRFOIL = NACA4Airfoil("2412")
+ALPHA = [-2, 0, 5]
+
+
+@pytest.mark.parametrize("method_cls", [LinearVortex, ConstantVortex])
+def test_matrix_free_products(method_cls):
+    """Tests that the matrix-free kernels equal the dense matrices."""
+    method = method_cls(AIRFOIL, n_panels=40)
+    n = method.influence_matrix.shape[0]
+    x = np.random.default_rng(0).standard_normal((n, 2))
+    assert np.allclose(method.matvec(x), method.influence_matrix @ x)
+
+    rows, cols = np.indices((n, n)).reshape(2, -1)
+    entries = method.influence_entries(rows, cols).reshape(n, n)
+    assert np.allclose(entries, method.influence_matrix)
+
+
+@pytest.mark.parametrize("solver", ["gmres", "bicgstab"])
+@pytest.mark.parametrize(
+    "preconditioner", ["block-jacobi", "nearest-neighbour"]
+)
+@pytest.mark.parametrize(
+    "method_cls", [LinearVortex, ConstantVortex, LumpedVortex]
+)
+def test_krylov_matches_direct(method_cls, solver, preconditioner):
+    """Tests that the Krylov solvers reproduce the direct solution."""
+    expected = method_cls(AIRFOIL, n_panels=60).solve_for(ALPHA)
+    method = method_cls(
+        AIRFOIL, n_panels=60, solver=solver, preconditioner=preconditioner
+    )
+    solution = method.solve_for(ALPHA)
+    assert np.allclose(solution.circulations, expected.circulations)
+    assert np.allclose(
+        solution.lift_coefficient, expected.lift_coefficient, atol=1e-8
+    )
+
+    metadata = solution.metadata
+    assert metadata["solver"] == solver
+    assert metadata["converged"]
+    assert len(metadata["iterations"]) == len(ALPHA)
+    assert all(n > 0 for n in metadata["iterations"])
+
+
+def test_unpreconditioned_gmres():
+    """Tests that GMRES converges without a preconditioner."""
+    expected = LinearVortex(AIRFOIL, n_panels=60).get_circulations(ALPHA)
+    method = LinearVortex(
+        AIRFOIL, n_panels=60, solver="gmres", preconditioner=None
+    )
+    circulations, metadata = method.solve_system(method.get_rhs(ALPHA))
+    assert np.allclose(circulations, expected)
+    assert metadata["preconditioner"] is None
+    assert metadata["converged"]
+
+
+def test_krylov_does_not_assemble():
+    """Tests that the pressure distribution is obtained matrix-free."""
+    expected = LinearVortex(AIRFOIL, n_panels=60).solve_for(ALPHA)
+    method = LinearVortex(AIRFOIL, n_panels=60, solver="gmres")
+    solution = method.solve_for(ALPHA, superposition=True)
+    assert np.allclose(
+        solution.pressure_coefficients, expected.pressure_coefficients
+    )
+    assert "influence_matrices" not in vars(method)
+    assert "influence_matrix" not in vars(method)
+
+
+def test_invalid_options():
+    """Tests that invalid solver options raise a ValueError."""
+    with pytest.raises(ValueError):
+        LinearVortex(AIRFOIL, n_panels=20, solver="cholesky")
+    with pytest.raises(ValueError):
+        LinearVortex(AIRFOIL, n_panels=20, preconditioner="ilu")
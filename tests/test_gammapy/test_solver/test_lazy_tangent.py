@@ -0,0 +1,58 @@
+# Copyright 2020 Kilian Swannet, San Kilkis
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied. See the License for the specific language governing
+# permissions and limitations under the License.
+
+import numpy as np
+import pytest
+
+from gammapy.geometry.airfoil import NACA4Airfoil
+from gammapy.solver.m_constant_vortex import ConstantVortex
+from gammapy.solver.m_linear_vortex import LinearVortex
+
+AIRFOIL = NACA4Airfoil("2412")
+ALPHA = [-2, 0, 5]
+
+
+@pytest.mark.parametrize("method_cls", [LinearVortex, ConstantVortex])
+def test_normal_influence_matrix(method_cls):
+    """Tests the normal-only assembly against the full assembly."""
+    method = method_cls(AIRFOIL, n_panels=60)
+    influence_matrix = method.influence_matrix
+    assert "influence_matrices" not in vars(method)
+
+    expected = method_cls(AIRFOIL, n_panels=60)
+    _ = expected.influence_matrices
+    assert np.array_equal(influence_matrix, expected.influence_matrix)
+
+
+@pytest.mark.parametrize("superposition", [False, True])
+def test_lazy_tangent_product(superposition):
+    """Tests that the pressure never assembles the tangent matrix."""
+    method = LinearVortex(AIRFOIL, n_panels=60)
+    solution = method.solve_for(ALPHA, superposition=superposition)
+    _ = solution.lift_coefficient
+    pressure_coefficients = solution.pressure_coefficients
+    assert "influence_matrices" not in vars(method)
+
+    # Reusing the dense tangent matrix if it was already assembled
+    expected = LinearVortex(AIRFOIL, n_panels=60)
+    _ = expected.influence_matrices
+    expected_solution = expected.solve_for(
+        ALPHA, superposition=superposition
+    )
+    assert np.allclose(
+        pressure_coefficients,
+        expected_solution.pressure_coefficients,
+        rtol=1e-12,
+        atol=1e-12,
+    )
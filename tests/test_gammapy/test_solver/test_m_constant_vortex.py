@@ -18,9 +18,13 @@ import numpy as np
 import pytest
 from scipy import integrate
 
+from gammapy.geometry.airfoil import NACA4Airfoil
 from gammapy.solver.m_constant_vortex import (
+    ConstantVortex,
+    constant_vortex_velocity,
     gcs_to_pcs,
     pcs_to_gcs,
+    unit_constant_vortex_velocity,
     vortex_c_2d,
 )
 from gammapy.solver.m_lumped_vortex import vortex_2d
@@ -186,3 +190,38 @@ def integrated_vortex_c_2d(start_pt, end_pt, col_pt):
         return vortex_2d(1, vortex_pt, col_pt)
 
     return integrate.quad_vec(integrand, 0, panel_length, epsabs=1e-9)[0]
+
+
+def test_constant_vortex_velocity():
+    """Tests the scalar kernel against :py:func:`vortex_c_2d`."""
+    rng = np.random.default_rng(0)
+    for start_pt, end_pt, point in rng.uniform(-1, 1, (50, 3, 2)):
+        tangent = (end_pt - start_pt) / np.linalg.norm(end_pt - start_pt)
+        angle = math.atan2(tangent[1], tangent[0])
+        result = constant_vortex_velocity(*point, *start_pt, *end_pt, *tangent)
+        expected = unit_constant_vortex_velocity(
+            point, start_pt, end_pt, angle
+        )
+        assert np.allclose(result, expected, rtol=1e-12, atol=1e-14)
+
+
+def test_influence_matrices():
+    """Tests the assembled matrices against :py:func:`vortex_c_2d`."""
+    method = ConstantVortex(NACA4Airfoil("2412"), n_panels=40)
+    panels = method.panels
+    start_pts, end_pts = panels.nodes
+    expected = np.full((2, 40, 40), -0.5)
+    for i, j in zip(*np.nonzero(~np.eye(40, dtype=bool))):
+        velocity = unit_constant_vortex_velocity(
+            method.collocation_points[i],
+            start_pts[j],
+            end_pts[j],
+            panels.angles[j, 0],
+        )
+        expected[:, i, j] = (
+            velocity @ panels.normals[i],
+            velocity @ panels.tangents[i],
+        )
+    influence_matrices = method.influence_matrices
+    assert np.allclose(influence_matrices["normal"], expected[0])
+    assert np.allclose(influence_matrices["tangent"], expected[1])
@@ -12,6 +12,7 @@
 # implied. See the License for the specific language governing
 # permissions and limitations under the License.
 
+import math
 from pathlib import Path
 
 import numpy as np
@@ -24,6 +25,7 @@ from gammapy.solver.m_linear_vortex import (
     calc_integration_constants,
     calc_linear_vortex_im,
     calc_vortex_coefficients,
+    panel_trig_table,
 )
 
 REL_TOL = 5e-5
@@ -85,6 +87,26 @@ def test_calc_integration_constants(panels):
         assert result[i] == pytest.approx(expected_result[coef], rel=REL_TOL)
 
 
+def test_angle_addition():
+    """Tests the tabulated trigonometry against direct evaluation."""
+    rng = np.random.default_rng(0)
+    angles = rng.uniform(-math.pi, math.pi, (20, 1))
+    vx, vy = rng.uniform(-1, 1, 2)
+    for col_angle, vort_angle in zip(angles[:, 0], angles[::-1, 0]):
+        result = calc_integration_constants(
+            np.array([vx, vy]), np.zeros(2), col_angle, vort_angle, 0.1
+        )
+        col_2_vort = col_angle - 2 * vort_angle
+        expected_p = vx * math.sin(col_2_vort) + vy * math.cos(col_2_vort)
+        expected_q = vx * math.cos(col_2_vort) - vy * math.sin(col_2_vort)
+        assert result[2] == pytest.approx(math.sin(col_angle - vort_angle))
+        assert result[3] == pytest.approx(math.cos(col_angle - vort_angle))
+        assert result[7:] == pytest.approx((expected_p, expected_q))
+
+    table = panel_trig_table(angles)
+    assert np.allclose(table, np.hstack((np.cos(angles), np.sin(angles))))
+
+
 CALC_VORTEX_COEFFICIENTS_TEST_CASES = {
     # Expected result is of the form (cn_1, cn_2, ct_1, ct_2)
     "argnames": "col_idx, vort_idx, expected_result",
@@ -17,7 +17,11 @@ import math
 import numpy as np
 import pytest
 
-from gammapy.solver.m_lumped_vortex import calc_lumped_vortex_im, vortex_2d
+from gammapy.solver.m_lumped_vortex import (
+    calc_lumped_vortex_im,
+    unit_vortex_coefficient,
+    vortex_2d,
+)
 
 VORTEX_2D_TEST_CASES = {
     "argnames": "gamma, vortex_pt, col_pt, expected_result",
@@ -42,6 +46,21 @@ def test_vortex_2d(gamma, vortex_pt, col_pt, expected_result):
     assert np.allclose(jit_result, expected_result)
 
 
+@pytest.mark.parametrize("direction", [(0, 1), (1, 0), (0.6, -0.8)])
+def test_unit_vortex_coefficient(direction):
+    """Tests if the closed form is the projection of the velocity."""
+    vortex_pt = np.array([[0.3, -0.1]])
+    col_pt = np.array([[1.2, 0.5]])
+    dx, dy = (col_pt - vortex_pt)[0]
+    expected_result = vortex_2d(1, vortex_pt, col_pt)[0] @ direction
+
+    result = unit_vortex_coefficient(dx, dy, *direction)
+    jit_result = unit_vortex_coefficient.py_func(dx, dy, *direction)
+
+    assert np.isclose(result, expected_result)
+    assert np.isclose(jit_result, expected_result)
+
+
 offset_matrix = np.stack((np.arange(5) * 0.2, np.zeros(5)), axis=1)
 CALC_LUMPED_VORTEX_IM_TEST_CASES = {
     "argnames": "vortex_pts, col_pts, panel_normals, expected_result",
@@ -0,0 +1,234 @@
+# Copyright 2020 Kilian Swannet, San Kilkis
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied. See the License for the specific language governing
+# permissions and limitations under the License.
+
+import math
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pytest
+from scipy.integrate import quad
+
+from gammapy.geometry.airfoil import NACA4Airfoil
+from gammapy.solver.m_linear_vortex import LinearVortex
+from gammapy.solver.m_quadratic_vortex import (
+    QuadraticVortex,
+    arc_correction_points,
+    chord_moments,
+    own_panel_moments,
+    panel_moments,
+)
+
+# Converged lift coefficient of a NACA 2412 at an AoA of 5 degree
+NACA2412_CL = 0.8616920
+
+
+@pytest.fixture(scope="module")
+def airfoil():
+    """Returns a NACA 2412 airfoil with a closed trailing edge."""
+    return NACA4Airfoil("2412", te_closed=True)
+
+
+@pytest.fixture(scope="module")
+def method(airfoil):
+    """Returns a quadratic vortex method with a graded spacing."""
+    return QuadraticVortex(airfoil, n_panels=80, spacing="graded")
+
+
+@pytest.mark.parametrize("x, y", [(0.3, 0.2), (1.5, -0.1), (-0.4, 0.0)])
+def test_chord_moments(x, y):
+    """Tests the integration constants against quadrature."""
+
+    def integrand(s, k, numerator):
+        return s ** k * numerator(s) / ((x - s) ** 2 + y ** 2)
+
+    expected_result = [
+        quad(integrand, 0, 1, args=(k, lambda s: x - s))[0] for k in range(3)
+    ] + [quad(integrand, 0, 1, args=(k, lambda s: y))[0] for k in range(3)]
+
+    assert np.allclose(chord_moments(x, y, 1.0), expected_result)
+    assert np.allclose(chord_moments.py_func(x, y, 1.0), expected_result)
+
+
+@pytest.mark.parametrize(
+    "x, y", [(0.5, 0.02), (0.3, -0.4), (1.8, 1.1), (-6.0, 9.0), (40.0, 3.0)]
+)
+@pytest.mark.parametrize("arc", [0.0, 1e-9, 0.4])
+def test_panel_moments(x, y, arc):
+    """Tests the velocities of an arc against quadrature."""
+
+    def integrand(s, k, axis):
+        a, b = x - s, y - arc * s * (1 - s)
+        return s ** k * (b, -a)[axis] / (2 * math.pi * (a * a + b * b))
+
+    expected_result = [
+        quad(integrand, 0, 1, args=(k, axis), epsabs=1e-14, limit=200)[0]
+        for axis in range(2)
+        for k in range(3)
+    ]
+    result = panel_moments(x, y, 1.0, arc)
+    assert np.allclose(result, expected_result, rtol=1e-9, atol=1e-13)
+
+
+def test_arc_correction_points():
+    """Tests that far and nearly flat panels use fewer Gauss points."""
+    assert arc_correction_points(1.0, 0.4, 1.0) == 8
+    assert 3 <= arc_correction_points(1.0, 0.4, 100.0) < 8
+    assert arc_correction_points(1.0, 1e-12, 10.0) == 0
+    assert arc_correction_points(1.0, 0.0, 1.0) == 0
+
+
+@pytest.mark.parametrize("x", [0.2, 0.5, 0.9])
+@pytest.mark.parametrize("arc", [0.0, 0.4])
+def test_own_panel_moments(x, arc):
+    """Tests the velocities on the arc against Cauchy integrals."""
+    slope = arc * (1 - 2 * x)
+    q = math.sqrt(1 + slope ** 2)
+
+    def normal(s, k):
+        # Kernel of the normal velocity times (s - x)
+        m = arc * (1 - x - s)
+        return s ** k * (slope * m + 1) / (2 * math.pi * q * (1 + m ** 2))
+
+    def tangent(s, k):
+        m = arc * (1 - x - s)
+        return s ** k * arc / (2 * math.pi * q * (1 + m ** 2))
+
+    expected_result = [
+        quad(normal, 0, 1, args=(k,), weight="cauchy", wvar=x)[0]
+        for k in range(3)
+    ] + [
+        # Jump of the tangent velocity across the vortex sheet
+        quad(tangent, 0, 1, args=(k,))[0] + 0.5 * x ** k / q
+        for k in range(3)
+    ]
+
+    assert np.allclose(own_panel_moments(x, 1.0, arc), expected_result)
+
+
+def test_lift_coefficient(method):
+    """Tests the circulation and pressure lift coefficients."""
+    solution = method.solve_for([0, 5])
+    assert solution.lift_coefficient[1] == pytest.approx(NACA2412_CL, 1e-5)
+
+    # Integrating the pressure over the arcs with the collocation
+    # points as the Gauss points of each panel
+    panels = method.collocation_panels
+    lengths = method.panels.lengths[panels, 0]
+    n_points = np.bincount(panels)[panels]
+    arc_lengths = lengths / n_points * np.hypot(
+        1, method.collocation_slopes[:, 1]
+    )
+    alpha = math.radians(5)
+    lift_direction = np.array([-math.sin(alpha), math.cos(alpha)])
+    pressure_lift = -np.sum(
+        solution.pressure_coefficients[:, 1]
+        * (method.collocation_normals @ lift_direction)
+        * arc_lengths
+    )
+    assert pressure_lift == pytest.approx(NACA2412_CL, 1e-4)
+
+    superimposed = method.solve_for([0, 5], superposition=True)
+    assert np.allclose(
+        superimposed.lift_coefficient, solution.lift_coefficient
+    )
+    assert np.allclose(
+        superimposed.pressure_coefficients, solution.pressure_coefficients
+    )
+
+
+def test_delta_pressure_coefficients(method):
+    """Tests the pressure difference between both surfaces."""
+    solution = method.solve_for([0, 5])
+    delta_cp = solution.delta_pressure_coefficients
+    x = solution.delta_pressure_locations
+    assert delta_cp.shape == (method.panels.n_panels - 1, 2)
+    assert np.all(np.diff(x) > 0)
+
+    # The chord-wise integral of the pressure difference is the lift
+    mean_delta_cp = 0.5 * (delta_cp[1:] + delta_cp[:-1])
+    integral = np.diff(x) @ mean_delta_cp
+    assert np.allclose(integral, solution.lift_coefficient, atol=1e-2)
+
+    solution.plot_delta_cp(alpha=5)
+    line = plt.gca().lines[0]
+    assert np.allclose(line.get_xdata(), x)
+    plt.close("all")
+
+
+def test_convergence_order(airfoil):
+    """Tests that the lift coefficient converges at third order."""
+    errors = [
+        abs(
+            QuadraticVortex(airfoil, n_panels, "graded")
+            .solve_for(5)
+            .lift_coefficient[0]
+            - NACA2412_CL
+        )
+        for n_panels in (20, 40)
+    ]
+    assert errors[0] / errors[1] > 8
+
+
+def test_velocities_at(airfoil, method):
+    """Tests the off-body velocities against the linear vortex."""
+    rows = [10, 60, 100, 140]
+    points = method.collocation_points[rows]
+    points += 0.05 * method.collocation_normals[rows]
+    points = np.vstack((points, [[1.05, 0.0], [-0.05, 0.0], [50.0, 20.0]]))
+
+    result = method.solve_for(5).velocities_at(points)
+    expected = LinearVortex(airfoil, 800).solve_for(5).velocities_at(points)
+    assert np.allclose(result, expected, atol=2e-4)
+
+
+def test_strict_profile(method, airfoil):
+    """Tests the strict kernels against the fast-math kernels."""
+    strict = QuadraticVortex(airfoil, 80, "graded", profile="strict")
+    expected = method.assemble(tangent=True)
+    result = strict.assemble(tangent=True)
+    for name in ("normal", "tangent"):
+        assert np.allclose(result[name], expected[name], rtol=0, atol=1e-10)
+
+
+def test_streamed_pressure(method, airfoil, tmp_path):
+    """Tests that the out-of-core pressure streams the tangent rows."""
+    streamed = QuadraticVortex(airfoil, 80, "graded", storage_dir=tmp_path)
+    result = streamed.solve_for(5).pressure_coefficients
+    assert "influence_matrices" not in vars(streamed)
+    assert np.allclose(
+        result, method.solve_for(5).pressure_coefficients, atol=1e-8
+    )
+
+
+@pytest.mark.parametrize(
+    "option",
+    [
+        {"solver": "gmres"},
+        {"solver": "bicgstab"},
+        {"solver": "hmatrix"},
+        {"precision": "mixed"},
+        {"multipole_order": 8},
+    ],
+)
+def test_unsupported_options(airfoil, option):
+    """Tests that only the direct solver in double precision works."""
+    with pytest.raises(ValueError):
+        QuadraticVortex(airfoil, n_panels=40, **option)
+
+
+def test_perturbed_nodes(method):
+    """Tests that moving the chord nodes alone is rejected."""
+    start_pts, _ = method.panels.nodes
+    with pytest.raises(TypeError, match="midpoint"):
+        method.with_perturbed_nodes([20], start_pts[20] + [0, 0.005])
@@ -0,0 +1,170 @@
+# Copyright 2020 Kilian Swannet, San Kilkis
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied. See the License for the specific language governing
+# permissions and limitations under the License.
+
+import math
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pytest
+from scipy.integrate import quad
+
+from gammapy.geometry.airfoil import NACA4Airfoil
+from gammapy.solver.m_source_vortex import SourceVortex, source_panel_velocity
+
+# Converged lift coefficient of a NACA 0012 at an AoA of 5 degree
+NACA0012_CL = 0.6030
+
+
+@pytest.fixture(scope="module")
+def method():
+    """Returns a Hess-Smith method of a closed NACA 0012 airfoil."""
+    return SourceVortex(NACA4Airfoil("0012", te_closed=True), n_panels=400)
+
+
+@pytest.mark.parametrize(
+    "x, y", [(0.5, 1e-12), (0.5, -1e-12), (1.5, 0.2), (-0.3, -0.7)]
+)
+def test_source_panel_velocity(x, y):
+    """Tests the velocity against an integrated point source."""
+    if abs(y) < 1e-6:
+        # Jump of the normal velocity across the source sheet
+        expected_result = (0, math.copysign(0.5, y))
+    else:
+        # Velocity of point sources distributed along the panel
+        def velocity(s, axis):
+            delta = (x - s, y)
+            return delta[axis] / (2 * math.pi * (delta[0] ** 2 + y ** 2))
+
+        expected_result = [quad(velocity, 0, 1, args=(a,))[0] for a in (0, 1)]
+    result = source_panel_velocity(x, y, 1.0)
+    jit_result = source_panel_velocity.py_func(x, y, 1.0)
+
+    assert np.allclose(result, expected_result, atol=1e-9)
+    assert np.allclose(jit_result, expected_result, atol=1e-9)
+
+
+def test_lift_coefficient(method):
+    """Tests the circulation and pressure lift against each other."""
+    solution = method.solve_for([0, 5])
+    assert np.allclose(solution.lift_coefficient, [0, NACA0012_CL], atol=2e-3)
+
+    # Integrating the pressure over the panels yields the same lift
+    alpha = math.radians(5)
+    lift_direction = np.array([-math.sin(alpha), math.cos(alpha)])
+    pressure_lift = -np.sum(
+        solution.pressure_coefficients[:, 1]
+        * (method.panels.normals @ lift_direction)
+        * method.panels.lengths[:, 0]
+    )
+    assert pressure_lift == pytest.approx(NACA0012_CL, abs=2e-3)
+
+    superimposed = method.solve_for([0, 5], superposition=True)
+    assert np.allclose(
+        superimposed.lift_coefficient, solution.lift_coefficient
+    )
+    assert np.allclose(
+        superimposed.pressure_coefficients, solution.pressure_coefficients
+    )
+
+
+def test_delta_pressure_coefficients(method):
+    """Tests the pressure difference between both surfaces."""
+    solution = method.solve_for([0, 5])
+    delta_cp = solution.delta_pressure_coefficients
+    x = solution.delta_pressure_locations
+    assert delta_cp.shape == (method.n_panels // 2, 2)
+    assert np.allclose(delta_cp[:, 0], 0, atol=1e-10)
+
+    # The chord-wise integral of the pressure difference is the lift
+    integral = np.sum(0.5 * (delta_cp[1:, 1] + delta_cp[:-1, 1]) * np.diff(x))
+    assert integral == pytest.approx(NACA0012_CL, abs=5e-3)
+
+    solution.plot_delta_cp(alpha=5)
+    line = plt.gca().lines[0]
+    assert np.allclose(line.get_xdata(), x)
+    plt.close("all")
+
+
+def test_velocities_at(method):
+    """Tests the far-field and surface velocities."""
+    solution = method.solve_for(5)
+    far_field = solution.velocities_at([[50.0, 20.0]])[0, :, 0]
+    assert np.allclose(far_field, solution.flow_directions[0], atol=1e-2)
+
+    # Velocity just outside of a panel agrees with its pressure
+    i = 300
+    point = method.collocation_points[i] + 1e-9 * method.panels.normals[i]
+    speed = np.linalg.norm(solution.velocities_at(point[None])[0, :, 0])
+    cp = solution.pressure_coefficients[i, 0]
+    assert speed ** 2 == pytest.approx(1 - cp, rel=1e-6)
+
+
+@pytest.mark.parametrize("backend", ["numpy", "threaded"])
+def test_backend_agreement(method, backend):
+    """Tests the NumPy kernels against the numba kernels."""
+    expected = method.assemble(tangent=True)
+    result = method.assemble(tangent=True, backend=backend)
+    for name in ("normal", "tangent"):
+        assert np.allclose(result[name], expected[name], rtol=0, atol=1e-12)
+
+
+@pytest.mark.parametrize(
+    "option",
+    [{"solver": "gmres"}, {"precision": "mixed"}, {"multipole_order": 8}],
+)
+def test_unsupported_options(option):
+    """Tests that Krylov solvers and mixed precision are rejected."""
+    with pytest.raises(ValueError):
+        SourceVortex(NACA4Airfoil("0012"), n_panels=40, **option)
+
+
+def test_hmatrix_solver(method):
+    """Tests the hierarchical solver against the direct solver."""
+    hmatrix = SourceVortex(method.airfoil, method.n_panels, solver="hmatrix")
+    assert np.allclose(
+        hmatrix.solve_for(5).lift_coefficient,
+        method.solve_for(5).lift_coefficient,
+    )
+
+
+@pytest.mark.parametrize(
+    "option", [{"solver": "hmatrix"}, {"storage_dir": True}]
+)
+def test_streamed_pressure(method, option, tmp_path):
+    """Tests that the pressure does not assemble dense matrices."""
+    if "storage_dir" in option:
+        option = {"storage_dir": tmp_path}
+    streamed = SourceVortex(method.airfoil, method.n_panels, **option)
+    result = streamed.solve_for(5).pressure_coefficients
+    assert "influence_matrices" not in vars(streamed)
+    assert np.allclose(
+        result, method.solve_for(5).pressure_coefficients, atol=1e-8
+    )
+
+
+def test_perturbed_nodes():
+    """Tests a perturbed geometry against a fresh solve."""
+    method = SourceVortex(NACA4Airfoil("2412"), n_panels=60)
+    method.solve_for(5)
+    start_pts, _ = method.panels.nodes
+    perturbed = method.with_perturbed_nodes(
+        [20, 40], start_pts[[20, 40]] + [0, 0.005]
+    )
+    reference = SourceVortex(method.airfoil, method.n_panels)
+    vars(reference)["panels"] = perturbed.panels
+    expected = reference.solve_for(5)
+    result = perturbed.solve_for(5)
+    assert perturbed.low_rank_update is not None
+    assert np.allclose(result.circulations, expected.circulations)
+    assert np.allclose(result.lift_coefficient, expected.lift_coefficient)
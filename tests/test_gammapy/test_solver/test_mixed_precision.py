@@ -0,0 +1,83 @@
+# Copyright 2020 Kilian Swannet, San Kilkis
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied. See the License for the specific language governing
+# permissions and limitations under the License.
+
+import numpy as np
+import pytest
+
+from gammapy.geometry.airfoil import NACA4Airfoil
+from gammapy.solver import base
+from gammapy.solver.m_constant_vortex import ConstantVortex
+from gammapy.solver.m_linear_vortex import LinearVortex
+from gammapy.solver.m_lumped_vortex import LumpedVortex
+
+AIRFOIL = NACA4Airfoil("2412")
+ALPHA = [0, 5]
+
+
+@pytest.mark.parametrize(
+    "method_cls", [LinearVortex, ConstantVortex, LumpedVortex]
+)
+def test_single_precision_matrix(method_cls):
+    """Tests the block-wise float32 assembly of the system."""
+    expected = method_cls(AIRFOIL, n_panels=150).influence_matrix
+    method = method_cls(AIRFOIL, n_panels=150, precision="mixed")
+    matrix = method.single_precision_matrix
+    assert matrix.dtype == np.float32
+    assert np.allclose(matrix, expected, rtol=1e-6, atol=1e-6)
+
+    # Block assembly never stores the float64 matrices
+    assert "influence_matrices" not in vars(method)
+    assert "influence_matrix" not in vars(method)
+
+
+@pytest.mark.parametrize(
+    "method_cls", [LinearVortex, ConstantVortex, LumpedVortex]
+)
+def test_refined_solve(method_cls):
+    """Tests that refinement recovers the double precision solution."""
+    expected = method_cls(AIRFOIL, n_panels=200).solve_for(ALPHA)
+    method = method_cls(AIRFOIL, n_panels=200, precision="mixed")
+    solution = method.solve_for(ALPHA)
+    assert np.allclose(
+        solution.circulations, expected.circulations, rtol=1e-8, atol=1e-8
+    )
+    assert np.allclose(
+        solution.lift_coefficient, expected.lift_coefficient, atol=1e-8
+    )
+
+    metadata = solution.metadata
+    assert metadata["precision"] == "mixed"
+    assert metadata["converged"]
+    assert metadata["refinements"] >= 1
+    assert np.all(np.array(metadata["residuals"]) <= method.tolerance)
+
+
+def test_refinement_not_converged(monkeypatch):
+    """Tests that a stagnating refinement is reported."""
+    monkeypatch.setattr(base, "MAX_REFINEMENTS", 0)
+    method = LinearVortex(AIRFOIL, n_panels=100, precision="mixed")
+    with pytest.warns(RuntimeWarning):
+        solution = method.solve_for(ALPHA)
+    assert not solution.metadata["converged"]
+    assert solution.metadata["refinements"] == 0
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [{"precision": "half"}, {"precision": "mixed", "solver": "gmres"}],
+)
+def test_invalid_options(kwargs):
+    """Tests that invalid precision options raise a ValueError."""
+    with pytest.raises(ValueError):
+        LinearVortex(AIRFOIL, n_panels=20, **kwargs)
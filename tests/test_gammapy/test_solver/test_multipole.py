@@ -0,0 +1,115 @@
+# Copyright 2020 Kilian Swannet, San Kilkis
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied. See the License for the specific language governing
+# permissions and limitations under the License.
+
+import numpy as np
+import pytest
+
+from gammapy.geometry.airfoil import NACA4Airfoil
+from gammapy.solver.m_constant_vortex import ConstantVortex
+from gammapy.solver.m_linear_vortex import LinearVortex
+from gammapy.solver.m_lumped_vortex import LumpedVortex
+
+AIRFOIL = NACA4Airfoil("2412")
+ALPHA = [0, 5]
+FIELD_POINTS = np.array([[0.3, 0.5], [1.5, -0.1], [-0.2, 0.02], [20, 20]])
+
+
+@pytest.mark.parametrize("method_cls", [LinearVortex, ConstantVortex])
+@pytest.mark.parametrize("order, rtol", [(8, 1e-4), (16, 1e-6)])
+def test_products(method_cls, order, rtol):
+    """Tests that the multipole products converge with the order."""
+    method = method_cls(AIRFOIL, n_panels=200, multipole_order=order)
+    exact = method_cls(AIRFOIL, n_panels=200)
+    n_dofs = method.multipole_layout["dofs"].max() + 1
+    x = np.random.default_rng(0).standard_normal((n_dofs, 2))
+
+    expected = exact.kernel_products(x)
+    error = np.max(np.abs(method.influence_products(x) - expected))
+    assert error < rtol * np.max(np.abs(expected))
+
+
+def test_lumped_vortex_products():
+    """Tests that the thin airfoil system is accelerated as well."""
+    method = LumpedVortex(AIRFOIL, n_panels=200, multipole_order=16)
+    x = np.random.default_rng(0).standard_normal((200, 2))
+    expected = method.influence_matrix @ x
+    error = np.max(np.abs(method.matvec(x) - expected))
+    assert error < 1e-6 * np.max(np.abs(expected))
+
+
+def test_opening_angle():
+    """Tests that a smaller opening angle reduces the error."""
+    exact = LinearVortex(AIRFOIL, n_panels=200)
+    x = np.random.default_rng(0).standard_normal((201, 1))
+    expected = exact.kernel_products(x)
+
+    errors = []
+    for opening_angle in (0.8, 0.3):
+        method = LinearVortex(
+            AIRFOIL,
+            n_panels=200,
+            multipole_order=6,
+            opening_angle=opening_angle,
+        )
+        products = method.influence_products(x)
+        errors.append(np.max(np.abs(products - expected)))
+    assert errors[1] < 0.1 * errors[0]
+
+
+@pytest.mark.parametrize(
+    "method_cls", [LinearVortex, ConstantVortex, LumpedVortex]
+)
+def test_iterative_solve(method_cls):
+    """Tests a Krylov solve with multipole accelerated products."""
+    expected = method_cls(AIRFOIL, n_panels=200).solve_for(ALPHA)
+    method = method_cls(
+        AIRFOIL, n_panels=200, solver="gmres", multipole_order=16
+    )
+    solution = method.solve_for(ALPHA)
+    assert np.allclose(
+        solution.lift_coefficient, expected.lift_coefficient, rtol=1e-5
+    )
+
+
+@pytest.mark.parametrize(
+    "method_cls", [LinearVortex, ConstantVortex, LumpedVortex]
+)
+def test_velocities_at(method_cls):
+    """Tests off-body velocities against the exact evaluation."""
+    expected = method_cls(AIRFOIL, n_panels=100).solve_for(ALPHA)
+    method = method_cls(AIRFOIL, n_panels=100, multipole_order=16)
+    velocities = method.solve_for(ALPHA).velocities_at(FIELD_POINTS)
+    assert velocities.shape == (len(FIELD_POINTS), 2, len(ALPHA))
+    assert np.allclose(
+        velocities, expected.velocities_at(FIELD_POINTS), atol=1e-6
+    )
+
+    # Disturbance vanishes far away from the airfoil
+    assert np.allclose(velocities[-1], expected.flow_directions.T, atol=0.01)
+
+
+def test_stagnant_interior():
+    """Tests that the linear vortex sheet cancels the interior flow."""
+    solution = LinearVortex(AIRFOIL, n_panels=200).solve_for(ALPHA)
+    interior = solution.velocities_at([[0.5, 0.01]])
+    assert np.allclose(interior, 0, atol=1e-4)
+
+
+@pytest.mark.parametrize(
+    "kwargs", [{"multipole_order": 0}, {"opening_angle": 1.5}]
+)
+def test_invalid_options(kwargs):
+    """Tests that invalid accuracy controls raise a ValueError."""
+    with pytest.raises(ValueError):
+        LinearVortex(AIRFOIL, n_panels=20, **kwargs)
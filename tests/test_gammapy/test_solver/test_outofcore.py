@@ -0,0 +1,88 @@
+# Copyright 2020 Kilian Swannet, San Kilkis
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied. See the License for the specific language governing
+# permissions and limitations under the License.
+
+import os
+
+import numpy as np
+import pytest
+
+from gammapy.geometry.airfoil import NACA4Airfoil
+from gammapy.solver.m_constant_vortex import ConstantVortex
+from gammapy.solver.m_linear_vortex import LinearVortex
+from gammapy.solver.m_lumped_vortex import LumpedVortex
+from gammapy.solver.outofcore import OutOfCoreLU, open_memmaps, stream_rows
+
+AIRFOIL = NACA4Airfoil("2412")
+ALPHA = [0, 5]
+
+
+@pytest.mark.parametrize("size, block_size", [(10, 4), (300, 64), (64, 64)])
+def test_out_of_core_lu(tmp_path, size, block_size):
+    """Tests the blocked factorization against a dense solve."""
+    rng = np.random.default_rng(0)
+    matrix = rng.standard_normal((size, size))
+    rhs = rng.standard_normal((size, 2))
+
+    mapped = open_memmaps(str(tmp_path), {"matrix": (size, size)})
+    mapped["matrix"][:] = matrix
+    lu = OutOfCoreLU(mapped["matrix"], block_size=block_size)
+    expected = np.linalg.solve(matrix, rhs)
+    assert np.allclose(lu.solve(rhs), expected)
+    assert np.allclose(lu.solve(rhs[:, 0]), expected[:, 0])
+
+
+def test_stream_rows():
+    """Tests the product of a matrix read in blocks of rows."""
+    rng = np.random.default_rng(0)
+    matrix = rng.standard_normal((50, 30))
+    x = rng.standard_normal((30, 2))
+    assert np.allclose(stream_rows(matrix, x, block_size=7), matrix @ x)
+
+
+@pytest.mark.parametrize(
+    "method_cls", [LinearVortex, ConstantVortex, LumpedVortex]
+)
+def test_out_of_core_solve(tmp_path, method_cls):
+    """Tests the memory-mapped solve against the in-memory solve."""
+    expected = method_cls(AIRFOIL, n_panels=300).solve_for(ALPHA)
+    method = method_cls(AIRFOIL, n_panels=300, storage_dir=str(tmp_path))
+    solution = method.solve_for(ALPHA)
+    assert np.allclose(solution.circulations, expected.circulations)
+    assert "influence_matrices" not in vars(method)
+
+    path = solution.metadata["storage_path"]
+    assert os.path.dirname(path) == str(tmp_path)
+    assert "system.npy" in os.listdir(path)
+
+
+def test_streamed_pressure_coefficients(tmp_path):
+    """Tests that Cp is obtained from the mapped tangent matrix."""
+    expected = LinearVortex(AIRFOIL, n_panels=300).solve_for(ALPHA)
+    method = LinearVortex(AIRFOIL, n_panels=300, storage_dir=str(tmp_path))
+    solution = method.solve_for(ALPHA)
+    assert np.allclose(
+        solution.pressure_coefficients, expected.pressure_coefficients
+    )
+    assert "influence_matrices" not in vars(method)
+
+
+@pytest.mark.parametrize(
+    "kwargs", [{"solver": "gmres"}, {"precision": "mixed"}]
+)
+def test_invalid_options(tmp_path, kwargs):
+    """Tests that out-of-core storage requires the direct solver."""
+    with pytest.raises(ValueError):
+        LinearVortex(
+            AIRFOIL, n_panels=20, storage_dir=str(tmp_path), **kwargs
+        )
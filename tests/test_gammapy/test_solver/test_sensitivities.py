@@ -0,0 +1,171 @@
+# Copyright 2020 Kilian Swannet, San Kilkis
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied. See the License for the specific language governing
+# permissions and limitations under the License.
+
+import numpy as np
+import pytest
+
+from gammapy.geometry.airfoil import NACA4Airfoil, ParabolicCamberAirfoil
+from gammapy.geometry.panel import Panel2D
+from gammapy.solver.base import ThickFlowSolution
+from gammapy.solver.m_constant_vortex import ConstantVortex
+from gammapy.solver.m_linear_vortex import LinearVortex
+from gammapy.solver.m_lumped_vortex import LumpedVortex
+from gammapy.solver.m_quadratic_vortex import QuadraticVortex
+from gammapy.solver.m_source_vortex import SourceVortex
+
+ALPHA = [2.0, 6.0]
+STEP = 1e-6
+
+SCENARIOS = [
+    (
+        LinearVortex,
+        "circulation_lift_coefficient",
+        "circulation_lift_sensitivities",
+    ),
+    (
+        LinearVortex,
+        "pressure_lift_coefficient",
+        "pressure_lift_sensitivities",
+    ),
+]
+
+
+def lift_at(method_cls, airfoil, quantity, nodes=None):
+    """Returns ``quantity`` of the solution with panels at ``nodes``."""
+    method = method_cls(airfoil, n_panels=20)
+    if nodes is not None:
+        vars(method)["panels"] = Panel2D(nodes)
+    return getattr(method.solve_for(ALPHA), quantity)
+
+
+@pytest.mark.parametrize("naca_code", ["2412", "0012"])
+@pytest.mark.parametrize("superposition", [False, True])
+@pytest.mark.parametrize("method_cls, quantity, sensitivities", SCENARIOS)
+def test_node_sensitivities(
+    method_cls, quantity, sensitivities, superposition, naca_code
+):
+    """Tests the node gradients against central finite differences."""
+    airfoil = NACA4Airfoil(naca_code)
+    method = method_cls(airfoil, n_panels=20)
+    solution = method.solve_for(ALPHA, superposition=superposition)
+    result = getattr(solution, sensitivities)()["nodes"]
+    start_pts, end_pts = method.panels.nodes
+    nodes = np.vstack((start_pts, end_pts[-1:]))
+
+    assert result.shape == (*nodes.shape, len(ALPHA))
+    for k in range(nodes.size):
+        forward, backward = nodes.copy(), nodes.copy()
+        forward.flat[k] += STEP
+        backward.flat[k] -= STEP
+        expected = (
+            lift_at(method_cls, airfoil, quantity, forward)
+            - lift_at(method_cls, airfoil, quantity, backward)
+        ) / (2 * STEP)
+        assert np.allclose(result.reshape(-1, len(ALPHA))[k], expected)
+
+
+@pytest.mark.parametrize("method_cls, quantity, sensitivities", SCENARIOS)
+def test_parameter_sensitivities(method_cls, quantity, sensitivities):
+    """Tests the NACA parameter gradients against finite differences."""
+    airfoil = NACA4Airfoil("2412")
+    solution = method_cls(airfoil, n_panels=20).solve_for(ALPHA)
+    result = getattr(solution, sensitivities)()
+
+    for parameter in NACA4Airfoil.PARAMETERS:
+        value = getattr(airfoil, parameter)
+        setattr(airfoil, parameter, value + STEP)
+        forward = lift_at(method_cls, airfoil, quantity)
+        setattr(airfoil, parameter, value - STEP)
+        backward = lift_at(method_cls, airfoil, quantity)
+        setattr(airfoil, parameter, value)
+        expected = (forward - backward) / (2 * STEP)
+        assert np.allclose(result[parameter], expected, atol=1e-7)
+
+
+@pytest.mark.parametrize(
+    "method_cls",
+    [
+        LumpedVortex,
+        ConstantVortex,
+        LinearVortex,
+        SourceVortex,
+        QuadraticVortex,
+    ],
+)
+def test_pressure_lift_coefficient(method_cls):
+    """Tests the pressure lift of all methods against circulation."""
+    method = method_cls(NACA4Airfoil("2412"), n_panels=100)
+    solution = method.solve_for(ALPHA)
+    if not isinstance(solution, ThickFlowSolution):
+        assert not hasattr(solution, "pressure_lift_coefficient")
+        return
+    assert np.allclose(
+        solution.pressure_lift_coefficient,
+        solution.circulation_lift_coefficient,
+        rtol=2e-2,
+    )
+    if method_cls is LinearVortex:
+        result = solution.pressure_lift_sensitivities()
+        assert result["nodes"].shape == (101, 2, len(ALPHA))
+    else:
+        with pytest.raises(NotImplementedError):
+            solution.pressure_lift_sensitivities()
+
+
+def test_circulation_lift_coefficient():
+    """Tests the circulation of the linear strength distribution."""
+    airfoil = NACA4Airfoil("2412")
+    result = LinearVortex(airfoil, n_panels=200).solve_for(5)
+    expected = QuadraticVortex(airfoil, n_panels=200).solve_for(5)
+    assert np.allclose(
+        result.circulation_lift_coefficient,
+        expected.lift_coefficient,
+        rtol=1e-3,
+    )
+    assert np.allclose(
+        result.pressure_lift_coefficient,
+        result.circulation_lift_coefficient,
+        rtol=1e-2,
+    )
+
+
+def test_shape_derivatives_subclass():
+    """Tests that NACA4Airfoil subclasses have no shape derivatives."""
+    method = LumpedVortex(ParabolicCamberAirfoil(), n_panels=20)
+    with pytest.raises(NotImplementedError):
+        method.shape_derivatives
+
+
+@pytest.mark.parametrize("naca_code", ["2412", "0012"])
+def test_solve_adjoint(naca_code):
+    """Tests the transposed solve, including the symmetric system."""
+    method = LinearVortex(NACA4Airfoil(naca_code), n_panels=20)
+    rhs = np.random.default_rng(0).random((21, 2))
+    expected = np.linalg.solve(method.influence_matrix.T, rhs)
+    assert method.symmetric == (naca_code == "0012")
+    assert np.allclose(method.solve_adjoint(rhs), expected)
+
+
+def test_solve_adjoint_not_implemented():
+    """Tests that iterative solvers don't provide adjoint solves."""
+    method = LinearVortex(NACA4Airfoil("2412"), n_panels=20, solver="gmres")
+    with pytest.raises(NotImplementedError):
+        method.solve_for(ALPHA).circulation_lift_sensitivities()
+
+
+def test_constant_vortex_not_implemented():
+    """Tests that the inconsistent constant vortex lift is rejected."""
+    solution = ConstantVortex(NACA4Airfoil("2412"), n_panels=20).solve_for(5)
+    with pytest.raises(NotImplementedError, match="does not converge"):
+        solution.circulation_lift_sensitivities()
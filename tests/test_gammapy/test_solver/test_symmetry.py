@@ -0,0 +1,61 @@
+# Copyright 2020 Kilian Swannet, San Kilkis
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied. See the License for the specific language governing
+# permissions and limitations under the License.
+
+import numpy as np
+import pytest
+
+from gammapy.geometry.airfoil import NACA4Airfoil
+from gammapy.solver.m_constant_vortex import ConstantVortex
+from gammapy.solver.m_linear_vortex import LinearVortex
+
+SYMMETRIC_AIRFOIL = NACA4Airfoil("0012")
+ALPHA = [-3, 0, 5]
+
+
+@pytest.mark.parametrize("spacing", ["cosine", "linear"])
+def test_mirror_maps(spacing):
+    """Tests the mirror symmetry of the influence matrix."""
+    method = LinearVortex(SYMMETRIC_AIRFOIL, n_panels=40, spacing=spacing)
+    row_map, row_signs, col_map, col_signs = method.mirror_maps
+    matrix = method.influence_matrix
+    mirrored = matrix[np.ix_(row_map, col_map)]
+    signs = row_signs[:, None] * col_signs[None, :]
+    assert np.allclose(mirrored, signs * matrix, atol=1e-12)
+
+
+def test_symmetric_solve():
+    """Tests the even and odd half-size systems against the full."""
+    method = LinearVortex(SYMMETRIC_AIRFOIL, n_panels=100)
+    assert method.symmetric
+    assert [len(f[1]) for f in method.symmetric_lu_factors] == [51, 50]
+
+    expected = np.linalg.solve(method.influence_matrix, method.get_rhs(ALPHA))
+    solution = method.solve_for(ALPHA)
+    assert solution.metadata["symmetric"]
+    assert np.allclose(solution.circulations, expected[:-1])
+
+
+@pytest.mark.parametrize(
+    "method",
+    [
+        LinearVortex(NACA4Airfoil("2412"), n_panels=20),
+        LinearVortex(SYMMETRIC_AIRFOIL, n_panels=20, solver="gmres"),
+        LinearVortex(SYMMETRIC_AIRFOIL, n_panels=20, precision="mixed"),
+        ConstantVortex(SYMMETRIC_AIRFOIL, n_panels=20),
+    ],
+)
+def test_not_symmetric(method):
+    """Tests that the reduction is only used where it is exact."""
+    assert not method.symmetric
+    assert "symmetric_lu_factors" not in vars(method)
@@ -0,0 +1,102 @@
+# Copyright 2020 Kilian Swannet, San Kilkis
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied. See the License for the specific language governing
+# permissions and limitations under the License.
+
+import numpy as np
+import pytest
+
+from gammapy.geometry.airfoil import NACA4Airfoil
+from gammapy.solver.m_constant_vortex import ConstantVortex
+from gammapy.solver.m_linear_vortex import LinearVortex
+from gammapy.solver.m_lumped_vortex import LumpedVortex
+from gammapy.solver.woodbury import LowRankUpdate
+
+AIRFOIL = NACA4Airfoil("2412")
+ALPHA = [0, 5]
+
+
+def deflect_flap(method, hinge: float = 0.8, angle: float = 10):
+    """Returns the nodes aft of ``hinge`` rotated by ``angle`` deg."""
+    start_pts, end_pts = method.panels.nodes
+    nodes = np.vstack((start_pts, end_pts[-1:]))
+    indices = np.flatnonzero(nodes[:, 0] > hinge)
+    theta = np.radians(-angle)
+    rotation = np.array(
+        [[np.cos(theta), -np.sin(theta)], [np.sin(theta), np.cos(theta)]]
+    )
+    hinge_pt = np.array([hinge, 0])
+    return indices, (nodes[indices] - hinge_pt) @ rotation.T + hinge_pt
+
+
+def reference_solution(method, alpha):
+    """Solves the system of ``method`` with its assembled matrix."""
+    reference = type(method)(method.airfoil, method.n_panels)
+    vars(reference)["panels"] = method.panels
+    return np.linalg.solve(
+        reference.influence_matrix, reference.get_rhs(alpha)
+    )
+
+
+def test_low_rank_update():
+    """Tests the Woodbury identity against a dense solve."""
+    rng = np.random.default_rng(0)
+    matrix = rng.standard_normal((50, 50)) + 50 * np.eye(50)
+    u, v = rng.standard_normal((2, 50, 3))
+    rhs = rng.standard_normal((50, 2))
+
+    update = LowRankUpdate(lambda b: np.linalg.solve(matrix, b), u, v)
+    expected = np.linalg.solve(matrix + u @ v.T, rhs)
+    assert update.rank == 3
+    assert np.allclose(update.solve(rhs), expected)
+    assert np.allclose(update.solve(rhs[:, 0]), expected[:, 0])
+
+
+@pytest.mark.parametrize(
+    "method_cls", [LinearVortex, ConstantVortex, LumpedVortex]
+)
+def test_flap_deflection(method_cls, monkeypatch):
+    """Tests that a flap deflection only updates the factorization."""
+    method = method_cls(AIRFOIL, n_panels=100)
+    method.solve_for(ALPHA)
+
+    # The perturbed system must not be factorized again
+    monkeypatch.setattr(
+        "gammapy.solver.base.lu_factor",
+        lambda *args, **kwargs: pytest.fail("Matrix refactorized"),
+    )
+    perturbed = method.with_perturbed_nodes(*deflect_flap(method))
+    circulations, metadata = perturbed.solve_system(perturbed.get_rhs(ALPHA))
+    assert np.allclose(circulations, reference_solution(perturbed, ALPHA))
+    assert metadata["update_rank"] == perturbed.low_rank_update.rank
+    assert "influence_matrix" not in vars(perturbed)
+
+    # The original method remains unchanged
+    assert method.low_rank_update is None
+    assert not np.allclose(perturbed.panels.nodes[0], method.panels.nodes[0])
+
+
+@pytest.mark.parametrize(
+    "method_cls, rank", [(LinearVortex, 5), (ConstantVortex, 4)]
+)
+def test_repeated_perturbation(method_cls, rank):
+    """Tests the rank of a single node update and repeated updates."""
+    method = method_cls(AIRFOIL, n_panels=60)
+    start_pts, _ = method.panels.nodes
+    bump = method.with_perturbed_nodes([20], start_pts[20] + [0, 0.005])
+    assert bump.low_rank_update.rank == rank
+
+    bumps = bump.with_perturbed_nodes([40], start_pts[40] - [0, 0.005])
+    assert np.allclose(
+        bumps.solve_system(bumps.get_rhs(ALPHA))[0],
+        reference_solution(bumps, ALPHA),
+    )